@@ -0,0 +1,81 @@
+"""
+Microbenchmark for EventRecord hashing.
+
+Compares EventRecord.calculate_hash (canonical encoder fed incrementally into the hash)
+with the reference implementation (sorted JSON dump of to_dict()) and checks that both
+produce the same digest, then times the other registered hash algorithms.
+
+Usage:
+    python benchmarks/bench_event_hash.py [--number N]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from universal_history.models.event_record import (  # noqa: E402
+    EventRecord, DomainType, ContentType, SourceType, RawInput, Source, Creator, ProcessedData
+)
+from universal_history.utils.hash_utils import get_hash_algorithms  # noqa: E402
+
+
+def reference_hash(event_record: EventRecord) -> str:
+    """Hash an EventRecord through to_dict() and a sorted JSON dump."""
+    data = event_record.to_dict()
+    data.pop("current_re_hash", None)
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def make_event_record() -> EventRecord:
+    """Create a representative EventRecord."""
+    event_record = EventRecord(
+        subject_id="student123",
+        domain_type=DomainType.EDUCATION,
+        event_type="exam",
+        raw_input=RawInput(type=ContentType.TEXT, content="Student scored 92/100 on Algebra final exam."),
+        source=Source(
+            type=SourceType.INSTITUTION,
+            id="school001",
+            name="Springfield High School",
+            creator=Creator(id="teacher7", role="teacher", name="Edna", qualifications=["Math"])
+        ),
+        processed_data=ProcessedData(
+            quantitative_metrics={"score": 92, "max_score": 100},
+            qualitative_assessments={"teacher": "Excellent work"},
+            derived_insights=["Strong algebra skills"]
+        ),
+        previous_re_hash="0" * 64
+    )
+    event_record.metadata.tags = ["math", "algebra", "exam"]
+    return event_record
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000, help="hashes per measurement")
+    args = parser.parse_args()
+    
+    event_record = make_event_record()
+    assert event_record.calculate_hash() == reference_hash(event_record)
+    
+    reference = min(timeit.repeat(lambda: reference_hash(event_record), number=args.number, repeat=5))
+    canonical = min(timeit.repeat(event_record.calculate_hash, number=args.number, repeat=5))
+    
+    print(f"reference (to_dict + json.dumps): {reference / args.number * 1e6:8.2f} us/hash")
+    print(f"canonical encoder:                {canonical / args.number * 1e6:8.2f} us/hash")
+    print(f"speedup:                          {reference / canonical:8.2f}x")
+    
+    for algorithm in get_hash_algorithms():
+        if algorithm == "sha256":
+            continue
+        event_record.hash_algorithm = algorithm
+        elapsed = min(timeit.repeat(event_record.calculate_hash, number=args.number, repeat=5))
+        print(f"canonical encoder ({algorithm}):{' ' * max(0, 16 - len(algorithm))}{elapsed / args.number * 1e6:8.2f} us/hash")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Microbenchmark for model serialization.
+
+Times to_dict() and from_dict() of each model class, and the round trip of a
+Universal History holding a few hundred Event Records and Trajectory Syntheses,
+both as a dictionary and as JSON with each available JSON backend.
+
+Usage:
+    python benchmarks/bench_serialization.py [--number N] [--events N]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from universal_history.models.event_record import (  # noqa: E402
+    EventRecord, DomainType, ContentType, SourceType, RawInput, Source, Creator, ProcessedData
+)
+from universal_history.models.trajectory_synthesis import (  # noqa: E402
+    TrajectorySynthesis, TimeFrame, SignificantEvent, Metric
+)
+from universal_history.models.state_document import (  # noqa: E402
+    StateDocument, DomainState, EventReference
+)
+from universal_history.models.domain_catalog import DomainCatalog, Organization  # noqa: E402
+from universal_history.models.universal_history import UniversalHistory  # noqa: E402
+from universal_history.utils import json_utils  # noqa: E402
+
+
+def make_event_record(subject_id: str, index: int) -> EventRecord:
+    """Create a representative EventRecord."""
+    return EventRecord(
+        subject_id=subject_id,
+        domain_type=DomainType.EDUCATION if index % 2 else DomainType.HEALTH,
+        event_type="exam",
+        raw_input=RawInput(type=ContentType.TEXT, content=f"Student scored {index}/100 on the exam."),
+        source=Source(
+            type=SourceType.INSTITUTION,
+            id="school001",
+            name="Springfield High School",
+            creator=Creator(id="teacher7", role="teacher", name="Edna", qualifications=["Math"])
+        ),
+        processed_data=ProcessedData(
+            quantitative_metrics={"score": index, "max_score": 100},
+            qualitative_assessments={"teacher": "Excellent work"},
+            derived_insights=["Strong algebra skills"]
+        ),
+        timestamp=datetime(2023, 1, 1) + timedelta(hours=index)
+    )
+
+
+def make_synthesis(subject_id: str, index: int) -> TrajectorySynthesis:
+    """Create a representative TrajectorySynthesis."""
+    return TrajectorySynthesis(
+        subject_id=subject_id,
+        domain_type=DomainType.EDUCATION,
+        time_frame=TimeFrame(start=datetime(2023, 1, 1), end=datetime(2023, 2, 1)),
+        summary=f"Synthesis {index}",
+        source_events=[f"re-{i}" for i in range(10)],
+        key_insights=["Improving"],
+        significant_events=[SignificantEvent(re_id="re-1", description="Exam", significance="high")],
+        metrics={"score": Metric(value=90.0, trend="improving")}
+    )
+
+
+def make_state_document(subject_id: str) -> StateDocument:
+    """Create a representative StateDocument."""
+    reference = EventReference(re_id="re-1", description="Exam")
+    return StateDocument(
+        subject_id=subject_id,
+        general_summary="Doing well",
+        domains={
+            domain.value: DomainState(
+                last_updated=datetime(2023, 1, 1),
+                current_status="active",
+                key_attributes={"score": 90},
+                recent_events=[reference] * 5,
+                significant_events=[reference]
+            )
+            for domain in (DomainType.EDUCATION, DomainType.HEALTH)
+        }
+    )
+
+
+def make_domain_catalog() -> DomainCatalog:
+    """Create a representative DomainCatalog."""
+    catalog = DomainCatalog(
+        domain_type=DomainType.EDUCATION,
+        organization=Organization(id="org-1", name="School"),
+        last_updated=date(2023, 1, 1)
+    )
+    for i in range(10):
+        catalog.add_term(f"term-{i}", "Definition", examples=["example"])
+        catalog.add_metric(f"metric-{i}", "Description", "points", 0, 100)
+    return catalog
+
+
+def make_history(events: int) -> UniversalHistory:
+    """Create a Universal History with the given number of events."""
+    history = UniversalHistory(subject_id="student123")
+    for i in range(events):
+        history.add_event_record(make_event_record(history.subject_id, i))
+    for i in range(events // 10):
+        history.add_trajectory_synthesis(make_synthesis(history.subject_id, i))
+    history.state_document = make_state_document(history.subject_id)
+    history.domain_catalogs[DomainType.EDUCATION.value] = make_domain_catalog()
+    return history
+
+
+REPEAT = 5
+
+
+def measure(label: str, func, number: int) -> None:
+    """Print the best time per call of a function."""
+    elapsed = min(timeit.repeat(func, number=number, repeat=REPEAT))
+    print(f"{label:<45} {elapsed / number * 1e6:10.2f} us/op")
+
+
+def measure_decode(label: str, cls, data: dict, number: int) -> None:
+    """Print the best time per from_dict() call, each on a fresh copy of the data."""
+    encoded = json.dumps(data, default=str)
+    copies = iter([json.loads(encoded) for _ in range(number * REPEAT)])
+    measure(label, lambda: cls.from_dict(next(copies)), number)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=5000, help="calls per measurement")
+    parser.add_argument("--events", type=int, default=500, help="events in the benchmark history")
+    args = parser.parse_args()
+
+    models = [
+        make_event_record("student123", 1),
+        make_synthesis("student123", 1),
+        make_state_document("student123"),
+        make_domain_catalog(),
+    ]
+    for model in models:
+        data = model.to_dict()
+        name = type(model).__name__
+        measure(f"{name}.to_dict", model.to_dict, args.number)
+        measure_decode(f"{name}.from_dict", type(model), data, args.number)
+
+    history = make_history(args.events)
+    data = history.to_dict()
+    rounds = max(1, args.number // args.events)
+    measure(f"UniversalHistory.to_dict ({args.events} events)", history.to_dict, rounds)
+    measure_decode(f"UniversalHistory.from_dict ({args.events} events)", UniversalHistory, data, rounds)
+
+    for backend in ("json", "orjson"):
+        try:
+            json_utils.set_json_backend(backend)
+        except ImportError:
+            print(f"{backend}: not installed")
+            continue
+        json_str = history.to_json()
+        measure(f"UniversalHistory.to_json [{backend}]", history.to_json, rounds)
+        measure(f"UniversalHistory.from_json [{backend}]", lambda: UniversalHistory.from_json(json_str), rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from .models.universal_history import UniversalHistory
 
 from .storage.repository import HistoryRepository
 from .storage.memory_repository import MemoryHistoryRepository
+from .storage.query import EventFilter, EventPage
 try:
     from .storage.mongodb_repository import MongoDBHistoryRepository
 except ImportError:
@@ -22,6 +23,7 @@ from .services.event_service import EventService
 from .services.synthesis_service import SynthesisService
 from .services.state_service import StateService
 from .services.history_service import HistoryService
+from .services.context_builder import ContextBuilder, LLMContext
 
 from .config import Config, configure
 
@@ -83,13 +85,49 @@ class UniversalHistoryClient:
         self.synthesis_service = SynthesisService(self.repository)
         self.state_service = StateService(self.repository)
         self.history_service = HistoryService(self.repository)
+        self.context_builder = ContextBuilder(self.repository)
+        
+        # Optional background writer (see enable_write_behind)
+        self.write_behind = None
+    
+    def enable_write_behind(self, **kwargs):
+        """
+        Persist events created with create_event in the background.
+        
+        create_event then returns as soon as the event is built, with None as the
+        history ID. Call flush() before reading events back, and close() on shutdown.
+        See WriteBehindQueue for the options.
+        """
+        from .services.write_behind_queue import WriteBehindQueue
+        if self.write_behind is None:
+            self.write_behind = WriteBehindQueue(self.event_service, **kwargs)
+        return self.write_behind
+    
+    def flush(self, timeout=None):
+        """Wait until queued events are written. See WriteBehindQueue.flush for details."""
+        if self.write_behind is None:
+            return True
+        return self.write_behind.flush(timeout)
+    
+    def close(self, timeout=None):
+        """Write queued events and stop the background writer. See WriteBehindQueue.close for details."""
+        if self.write_behind is None:
+            return True
+        write_behind, self.write_behind = self.write_behind, None
+        return write_behind.close(timeout)
     
     # Delegate methods to appropriate services
     # Methods for EventService
     def create_event(self, **kwargs):
         """Create an event record. See EventService.create_event_record for details."""
+        if self.write_behind is not None:
+            return None, self.write_behind.submit(**kwargs)
         return self.event_service.create_event_record(**kwargs)
     
+    def create_events(self, events):
+        """Create event records in bulk. See EventService.create_event_records for details."""
+        return self.event_service.create_event_records(events)
+    
     def get_event(self, re_id, hu_id):
         """Get an event record by ID. See EventService.get_event_record for details."""
         return self.event_service.get_event_record(re_id, hu_id)
@@ -98,6 +136,18 @@ class UniversalHistoryClient:
         """Search for events. See EventService.search_events for details."""
         return self.event_service.search_events(**kwargs)
     
+    def search_text(self, subject_id, query, limit=10):
+        """Search the text of events. See EventService.search_text for details."""
+        return self.event_service.search_text(subject_id, query, limit)
+    
+    def aggregate_metric(self, subject_id, domain_type, metric, **kwargs):
+        """Aggregate a metric over a time window. See EventService.aggregate_metric for details."""
+        return self.event_service.aggregate_metric(subject_id, domain_type, metric, **kwargs)
+    
+    def query_events(self, subject_id, **kwargs):
+        """Query events one page at a time. See EventService.query_events for details."""
+        return self.event_service.query_events(subject_id, **kwargs)
+    
     # Methods for SynthesisService
     def create_synthesis(self, **kwargs):
         """Create a trajectory synthesis. See SynthesisService.create_trajectory_synthesis for details."""
@@ -111,6 +161,15 @@ class UniversalHistoryClient:
         """Generate a synthesis from events. See SynthesisService.generate_synthesis_from_events for details."""
         return self.synthesis_service.generate_synthesis_from_events(**kwargs)
     
+    def rollup_syntheses(self, subject_id, domain_type):
+        """Build or refresh quarterly and yearly syntheses. See SynthesisService.rollup_syntheses for details."""
+        return self.synthesis_service.rollup_syntheses(subject_id, domain_type)
+    
+    def generate_syntheses(self, workers=None, **kwargs):
+        """Generate syntheses for many subjects in parallel. See BatchSynthesisService.generate_syntheses for details."""
+        from .services.batch_synthesis_service import BatchSynthesisService
+        return BatchSynthesisService(self.repository, workers).generate_syntheses(**kwargs)
+    
     # Methods for StateService
     def create_state_document(self, subject_id):
         """Create a state document. See StateService.create_state_document for details."""
@@ -120,6 +179,14 @@ class UniversalHistoryClient:
         """Update a domain state. See StateService.update_domain_state for details."""
         return self.state_service.update_domain_state(**kwargs)
     
+    def track_state(self, limit=10):
+        """Keep state documents current as events are created. See StateService.track_events for details."""
+        self.state_service.track_events(self.event_service, limit)
+    
+    def state_session(self, subject_id):
+        """Start a unit of work on a state document. See StateService.session for details."""
+        return self.state_service.session(subject_id)
+    
     def get_state_document(self, subject_id):
         """Get a state document. See StateService.get_state_document for details."""
         return self.state_service.get_state_document(subject_id)
@@ -132,6 +199,10 @@ class UniversalHistoryClient:
         """Get LLM-optimized context. See StateService.get_llm_optimized_summary for details."""
         return self.state_service.get_llm_optimized_summary(subject_id, **kwargs)
     
+    def build_llm_context(self, subject_id, token_budget=2000, **kwargs):
+        """Build LLM context within a token budget. See ContextBuilder.build for details."""
+        return self.context_builder.build(subject_id, token_budget, **kwargs)
+    
     # Methods for HistoryService
     def create_history(self, subject_id):
         """Create a history. See HistoryService.create_history for details."""
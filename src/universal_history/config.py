@@ -19,6 +19,7 @@ class Config:
     DEFAULT_STORAGE_DIR = "./universal_history_data"
     DEFAULT_MONGODB_CONNECTION = "mongodb://localhost:27017/"
     DEFAULT_MONGODB_DATABASE = "universal_history"
+    DEFAULT_HASH_ALGORITHM = "sha256"
     
     def __init__(self, config_dict: Optional[Dict[str, Any]] = None):
         """
@@ -50,6 +51,11 @@ class Config:
             self.DEFAULT_MONGODB_DATABASE
         )
         
+        self.config["hash_algorithm"] = self._get_env_or_default(
+            "UNIVERSAL_HISTORY_HASH_ALGORITHM", 
+            self.DEFAULT_HASH_ALGORITHM
+        )
+        
         # Update with provided config dictionary
         if config_dict:
             self.config.update(config_dict)
@@ -107,6 +113,16 @@ class Config:
         """Set the MongoDB database name."""
         self.config["mongodb_database"] = value
     
+    @property
+    def hash_algorithm(self) -> str:
+        """Get the hash algorithm used for new Event Records."""
+        return self.config["hash_algorithm"]
+    
+    @hash_algorithm.setter
+    def hash_algorithm(self, value: str):
+        """Set the hash algorithm used for new Event Records."""
+        self.config["hash_algorithm"] = value
+    
     def get_repository_args(self) -> Dict[str, Any]:
         """
         Get arguments for initializing a repository based on the configuration.
@@ -146,4 +162,13 @@ def configure(config_dict: Dict[str, Any]) -> None:
         config_dict (Dict[str, Any]): Configuration dictionary
     """
     global config
-    config = Config(config_dict)
\ No newline at end of file
+    config = Config(config_dict)
+
+def get_config() -> Config:
+    """
+    Get the current configuration.
+    
+    Returns:
+        Config: The configuration set by the last call to configure()
+    """
+    return config
@@ -6,9 +6,10 @@ from datetime import date
 from enum import Enum
 from typing import Dict, List, Optional, Any, Union
 import uuid
-import json
 
 from .event_record import DomainType
+from .serialization import Serializer, serializer_for
+from ..utils import json_utils
 
 @dataclass
 class TermDefinition:
@@ -250,131 +251,7 @@ class DomainCatalog:
         Returns:
             Dict[str, Any]: Dictionary representation of the DomainCatalog
         """
-        domain_type_value = self.domain_type.value if isinstance(self.domain_type, DomainType) else self.domain_type
-        
-        result = {
-            'cdd_id': self.cdd_id,
-            'domain_type': domain_type_value,
-            'version': self.version,
-            'last_updated': self.last_updated.isoformat() if hasattr(self.last_updated, 'isoformat') else str(self.last_updated),
-            'definitions': {},
-            'mappings': {},
-            'custom_extensions': {}
-        }
-        
-        # Add organization safely
-        try:
-            if hasattr(self, 'organization') and self.organization:
-                if hasattr(self.organization, 'to_dict') and callable(getattr(self.organization, 'to_dict')):
-                    result['organization'] = self.organization.to_dict()
-                else:
-                    result['organization'] = {
-                        'id': getattr(self.organization, 'id', None),
-                        'name': getattr(self.organization, 'name', None)
-                    }
-        except (RecursionError, AttributeError):
-            result['organization'] = {}
-        
-        # Process definitions dictionary safely
-        try:
-            if hasattr(self, 'definitions') and self.definitions:
-                definitions_dict = {}
-                
-                # Terms
-                if 'terms' in self.definitions:
-                    try:
-                        terms_dict = {}
-                        for k, v in self.definitions['terms'].items():
-                            if hasattr(v, 'to_dict') and callable(getattr(v, 'to_dict')):
-                                terms_dict[k] = v.to_dict()
-                            else:
-                                terms_dict[k] = {'definition': getattr(v, 'definition', None)}
-                        definitions_dict['terms'] = terms_dict
-                    except (RecursionError, AttributeError):
-                        definitions_dict['terms'] = {}
-                
-                # Metrics
-                if 'metrics' in self.definitions:
-                    try:
-                        metrics_dict = {}
-                        for k, v in self.definitions['metrics'].items():
-                            if hasattr(v, 'to_dict') and callable(getattr(v, 'to_dict')):
-                                metrics_dict[k] = v.to_dict()
-                            else:
-                                metrics_dict[k] = {'description': getattr(v, 'description', None)}
-                        definitions_dict['metrics'] = metrics_dict
-                    except (RecursionError, AttributeError):
-                        definitions_dict['metrics'] = {}
-                
-                # Classifications
-                if 'classifications' in self.definitions:
-                    try:
-                        classifications_dict = {}
-                        for k, v in self.definitions['classifications'].items():
-                            if hasattr(v, 'to_dict') and callable(getattr(v, 'to_dict')):
-                                classifications_dict[k] = v.to_dict()
-                            else:
-                                classifications_dict[k] = {'description': getattr(v, 'description', None)}
-                        definitions_dict['classifications'] = classifications_dict
-                    except (RecursionError, AttributeError):
-                        definitions_dict['classifications'] = {}
-                
-                # Attributes
-                if 'attributes' in self.definitions:
-                    try:
-                        attributes_dict = {}
-                        for k, v in self.definitions['attributes'].items():
-                            if hasattr(v, 'to_dict') and callable(getattr(v, 'to_dict')):
-                                attributes_dict[k] = v.to_dict()
-                            else:
-                                attributes_dict[k] = {'name': getattr(v, 'name', None)}
-                        definitions_dict['attributes'] = attributes_dict
-                    except (RecursionError, AttributeError):
-                        definitions_dict['attributes'] = {}
-                
-                result['definitions'] = definitions_dict
-        except (RecursionError, AttributeError):
-            result['definitions'] = {}
-        
-        # Process mappings dictionary safely
-        try:
-            if hasattr(self, 'mappings') and self.mappings:
-                mappings_dict = {}
-                
-                # External frameworks
-                if 'external_frameworks' in self.mappings:
-                    try:
-                        frameworks_dict = {}
-                        for k, v in self.mappings['external_frameworks'].items():
-                            if hasattr(v, 'to_dict') and callable(getattr(v, 'to_dict')):
-                                frameworks_dict[k] = v.to_dict()
-                            else:
-                                frameworks_dict[k] = {
-                                    'url': getattr(v, 'url', None),
-                                    'version': getattr(v, 'version', None)
-                                }
-                        mappings_dict['external_frameworks'] = frameworks_dict
-                    except (RecursionError, AttributeError):
-                        mappings_dict['external_frameworks'] = {}
-                
-                result['mappings'] = mappings_dict
-        except (RecursionError, AttributeError):
-            result['mappings'] = {}
-        
-        # Process custom extensions safely
-        try:
-            if hasattr(self, 'custom_extensions') and self.custom_extensions:
-                extensions_dict = {}
-                for k, v in self.custom_extensions.items():
-                    if hasattr(v, 'to_dict') and callable(getattr(v, 'to_dict')):
-                        extensions_dict[k] = v.to_dict()
-                    else:
-                        extensions_dict[k] = {'description': getattr(v, 'description', None)}
-                result['custom_extensions'] = extensions_dict
-        except (RecursionError, AttributeError):
-            result['custom_extensions'] = {}
-        
-        return result
+        return _DOMAIN_CATALOG_SERIALIZER.encode(self)
     
     def to_json(self) -> str:
         """
@@ -383,7 +260,7 @@ class DomainCatalog:
         Returns:
             str: JSON representation of the DomainCatalog
         """
-        return json.dumps(self.to_dict(), default=str)
+        return json_utils.dumps(self.to_dict())
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'DomainCatalog':
@@ -396,78 +273,7 @@ class DomainCatalog:
         Returns:
             DomainCatalog: New DomainCatalog instance
         """
-        # Create a copy to avoid modifying the original
-        catalog_data = data.copy()
-        
-        # Handle domain_type
-        if 'domain_type' in catalog_data:
-            catalog_data['domain_type'] = DomainType(catalog_data['domain_type'])
-        
-        # Handle organization
-        if 'organization' in catalog_data:
-            catalog_data['organization'] = Organization.from_dict(catalog_data['organization'])
-        
-        # Handle definitions
-        if 'definitions' in catalog_data:
-            definitions_data = catalog_data['definitions']
-            definitions_dict = {}
-            
-            # Terms
-            if 'terms' in definitions_data:
-                definitions_dict['terms'] = {
-                    k: TermDefinition.from_dict(v) if isinstance(v, dict) else v
-                    for k, v in definitions_data['terms'].items()
-                }
-            
-            # Metrics
-            if 'metrics' in definitions_data:
-                definitions_dict['metrics'] = {
-                    k: MetricDefinition.from_dict(v) if isinstance(v, dict) else v
-                    for k, v in definitions_data['metrics'].items()
-                }
-            
-            # Classifications
-            if 'classifications' in definitions_data:
-                definitions_dict['classifications'] = {
-                    k: Classification.from_dict(v) if isinstance(v, dict) else v
-                    for k, v in definitions_data['classifications'].items()
-                }
-            
-            # Attributes
-            if 'attributes' in definitions_data:
-                definitions_dict['attributes'] = {
-                    k: AttributeFramework.from_dict(v) if isinstance(v, dict) else v
-                    for k, v in definitions_data['attributes'].items()
-                }
-            
-            catalog_data['definitions'] = definitions_dict
-        
-        # Handle mappings
-        if 'mappings' in catalog_data:
-            mappings_data = catalog_data['mappings']
-            mappings_dict = {}
-            
-            # External frameworks
-            if 'external_frameworks' in mappings_data:
-                mappings_dict['external_frameworks'] = {
-                    k: ExternalFrameworkMapping.from_dict(v) if isinstance(v, dict) else v
-                    for k, v in mappings_data['external_frameworks'].items()
-                }
-            
-            catalog_data['mappings'] = mappings_dict
-        
-        # Handle custom extensions
-        if 'custom_extensions' in catalog_data:
-            catalog_data['custom_extensions'] = {
-                k: CustomExtension.from_dict(v) if isinstance(v, dict) else v
-                for k, v in catalog_data['custom_extensions'].items()
-            }
-        
-        # Handle last_updated
-        if 'last_updated' in catalog_data and isinstance(catalog_data['last_updated'], str):
-            catalog_data['last_updated'] = date.fromisoformat(catalog_data['last_updated'])
-        
-        return cls(**catalog_data)
+        return _DOMAIN_CATALOG_SERIALIZER.decode(data)
     
     @classmethod
     def from_json(cls, json_str: str) -> 'DomainCatalog':
@@ -480,7 +286,7 @@ class DomainCatalog:
         Returns:
             DomainCatalog: New DomainCatalog instance
         """
-        data = json.loads(json_str)
+        data = json_utils.loads(json_str)
         return cls.from_dict(data)
     
     def add_term(self, term_key: str, definition: str, context: Optional[str] = None, 
@@ -595,3 +401,62 @@ class DomainCatalog:
             return None
             
         return self.definitions['classifications'].get(classification_key)
+
+# Known sections of the definitions and mappings dictionaries, and their entry types
+_DEFINITION_SECTIONS = {
+    'terms': TermDefinition,
+    'metrics': MetricDefinition,
+    'classifications': Classification,
+    'attributes': AttributeFramework
+}
+_MAPPING_SECTIONS = {
+    'external_frameworks': ExternalFrameworkMapping
+}
+
+def _encode_entries(entries: Dict[str, Any], entry_type: type) -> Dict[str, Any]:
+    """Encode the entries of a catalog section, keeping values that are not entry objects."""
+    encode = serializer_for(entry_type).encode
+    return {k: encode(v) if isinstance(v, entry_type) else v for k, v in entries.items()}
+
+def _decode_entries(entries: Dict[str, Any], entry_type: type) -> Dict[str, Any]:
+    """Decode the entries of a catalog section, keeping values that are not dictionaries."""
+    decode = serializer_for(entry_type).decode
+    return {k: decode(v) if isinstance(v, dict) else v for k, v in entries.items()}
+
+def _encode_sections(sections: Optional[Dict[str, Dict[str, Any]]],
+                     section_types: Dict[str, type]) -> Dict[str, Any]:
+    """Encode the known sections of a definitions or mappings dictionary."""
+    if not sections:
+        return {}
+    return {
+        name: _encode_entries(sections[name], entry_type)
+        for name, entry_type in section_types.items() if name in sections
+    }
+
+def _decode_sections(sections: Dict[str, Dict[str, Any]],
+                     section_types: Dict[str, type]) -> Dict[str, Any]:
+    """Decode the known sections of a definitions or mappings dictionary."""
+    return {
+        name: _decode_entries(sections[name], entry_type)
+        for name, entry_type in section_types.items() if name in sections
+    }
+
+_DOMAIN_CATALOG_SERIALIZER = Serializer(
+    DomainCatalog,
+    order=[
+        'cdd_id', 'domain_type', 'version', 'last_updated', 'definitions', 'mappings',
+        'custom_extensions', 'organization'
+    ],
+    exclude=['event_types', 'properties'],
+    omit_if_falsy=['organization'],
+    encoders={
+        'definitions': lambda v: _encode_sections(v, _DEFINITION_SECTIONS),
+        'mappings': lambda v: _encode_sections(v, _MAPPING_SECTIONS),
+        'custom_extensions': lambda v: _encode_entries(v, CustomExtension) if v else {}
+    },
+    decoders={
+        'definitions': lambda v: _decode_sections(v, _DEFINITION_SECTIONS),
+        'mappings': lambda v: _decode_sections(v, _MAPPING_SECTIONS),
+        'custom_extensions': lambda v: _decode_entries(v, CustomExtension)
+    }
+)
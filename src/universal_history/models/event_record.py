@@ -4,10 +4,43 @@ Event Record module representing the basic unit of information in the Universal
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Iterator
+from json.encoder import encode_basestring_ascii, c_make_encoder
 import uuid
 import json
 
+from .serialization import Serializer
+from ..config import get_config
+from ..utils.hash_utils import get_hash_algorithm, LEGACY_HASH_ALGORITHM
+from ..utils import json_utils
+
+# Canonical JSON encoding used to hash Event Records: the output of
+# json.dumps(..., sort_keys=True, default=str), produced by encoders built once and reused
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+if c_make_encoder is not None:
+    _encode_canonical = c_make_encoder(
+        None, str, encode_basestring_ascii, None, ': ', ', ', True, False, True
+    )
+    
+    def _canonical_value(value: Any) -> str:
+        """Encode a value exactly as json.dumps(value, sort_keys=True, default=str) would."""
+        if value is None:
+            return 'null'
+        value_type = type(value)
+        if value_type is str:
+            return encode_basestring_ascii(value)
+        if not value and (value_type is list or value_type is dict):
+            return '[]' if value_type is list else '{}'
+        return ''.join(_encode_canonical(value, 0))
+else:  # pragma: no cover - interpreters without the C accelerator
+    def _canonical_value(value: Any) -> str:
+        """Encode a value exactly as json.dumps(value, sort_keys=True, default=str) would."""
+        return _CANONICAL_ENCODER.encode(value)
+
+def _canonical_enum(value: Any) -> str:
+    """Encode an enumeration field the way to_dict stores it (by value) in canonical JSON."""
+    return _canonical_value(value.value if isinstance(value, Enum) else value)
+
 class DomainType(str, Enum):
     """Enumeration of possible domains for an Event Record."""
     EDUCATION = "education"
@@ -147,6 +180,7 @@ class EventRecord:
     metadata: Metadata = field(default_factory=Metadata)
     confidence_level: DataConfidence = field(default_factory=DataConfidence)
     verification_status: VerificationStatus = VerificationStatus.PENDING
+    hash_algorithm: Optional[str] = None  # None for records hashed before algorithms were recorded (SHA-256)
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -155,85 +189,7 @@ class EventRecord:
         Returns:
             Dict[str, Any]: Dictionary representation of the EventRecord
         """
-        # Crear un diccionario directamente con las propiedades clave
-        result = {
-            "subject_id": self.subject_id,
-            "domain_type": self.domain_type.value if isinstance(self.domain_type, Enum) else self.domain_type,
-            "event_type": self.event_type,
-            "re_id": self.re_id,
-            "timestamp": self.timestamp.isoformat() if isinstance(self.timestamp, datetime) else self.timestamp,
-            "previous_re_hash": self.previous_re_hash,
-            "current_re_hash": self.current_re_hash,
-            "verification_status": self.verification_status.value if isinstance(self.verification_status, Enum) else self.verification_status
-        }
-        
-        # Convertir raw_input
-        if self.raw_input:
-            result["raw_input"] = {
-                "type": self.raw_input.type.value if isinstance(self.raw_input.type, Enum) else self.raw_input.type,
-                "content": self.raw_input.content,
-                "duration": self.raw_input.duration,
-                "context": self.raw_input.context
-            }
-        
-        # Convertir source
-        if self.source:
-            source_dict = {
-                "type": self.source.type.value if isinstance(self.source.type, Enum) else self.source.type,
-                "id": self.source.id,
-                "name": self.source.name,
-                "input_method": self.source.input_method.value if isinstance(self.source.input_method, Enum) else self.source.input_method,
-                "processing_method": self.source.processing_method.value if isinstance(self.source.processing_method, Enum) else self.source.processing_method
-            }
-            
-            # Añadir creator si existe
-            if self.source.creator:
-                source_dict["creator"] = {
-                    "id": self.source.creator.id,
-                    "role": self.source.creator.role,
-                    "name": self.source.creator.name,
-                    "qualifications": self.source.creator.qualifications,
-                    "experience_years": self.source.creator.experience_years
-                }
-            
-            result["source"] = source_dict
-        
-        # Convertir processed_data
-        if hasattr(self, 'processed_data') and self.processed_data:
-            result["processed_data"] = {
-                "quantitative_metrics": self.processed_data.quantitative_metrics,
-                "qualitative_assessments": self.processed_data.qualitative_assessments,
-                "derived_insights": self.processed_data.derived_insights
-            }
-        
-        # Convertir context
-        if hasattr(self, 'context') and self.context:
-            result["context"] = {
-                "location": self.context.location,
-                "participants": self.context.participants,
-                "environmental_factors": self.context.environmental_factors
-            }
-        
-        # Convertir metadata
-        if hasattr(self, 'metadata') and self.metadata:
-            result["metadata"] = {
-                "confidentiality_level": self.metadata.confidentiality_level.value if isinstance(self.metadata.confidentiality_level, Enum) else self.metadata.confidentiality_level,
-                "access_level": self.metadata.access_level,
-                "tags": self.metadata.tags,
-                "related_documents": self.metadata.related_documents,
-                "version": self.metadata.version,
-                "last_modified": self.metadata.last_modified.isoformat() if isinstance(self.metadata.last_modified, datetime) else self.metadata.last_modified,
-                "modified_by": self.metadata.modified_by
-            }
-        
-        # Convertir confidence_level
-        if hasattr(self, 'confidence_level') and self.confidence_level:
-            result["confidence_level"] = {
-                "raw_data": self.confidence_level.raw_data.value if isinstance(self.confidence_level.raw_data, Enum) else self.confidence_level.raw_data,
-                "processed_data": self.confidence_level.processed_data.value if isinstance(self.confidence_level.processed_data, Enum) else self.confidence_level.processed_data
-            }
-        
-        return result
+        return _EVENT_RECORD_SERIALIZER.encode(self)
     
     def to_json(self) -> str:
         """
@@ -242,7 +198,7 @@ class EventRecord:
         Returns:
             str: JSON representation of the EventRecord
         """
-        return json.dumps(self.to_dict(), default=str)
+        return json_utils.dumps(self.to_dict())
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'EventRecord':
@@ -255,57 +211,7 @@ class EventRecord:
         Returns:
             EventRecord: New EventRecord instance
         """
-        # Create copies of data to avoid modifying the original
-        event_data = data.copy()
-        
-        # Handle nested objects
-        if 'raw_input' in event_data:
-            raw_input_data = event_data.pop('raw_input')
-            raw_input_data['type'] = ContentType(raw_input_data['type'])
-            event_data['raw_input'] = RawInput(**raw_input_data)
-        
-        if 'processed_data' in event_data:
-            event_data['processed_data'] = ProcessedData(**event_data['processed_data'])
-        
-        if 'source' in event_data:
-            source_data = event_data.pop('source')
-            source_data['type'] = SourceType(source_data['type'])
-            source_data['input_method'] = InputMethod(source_data['input_method'])
-            source_data['processing_method'] = ProcessingMethod(source_data['processing_method'])
-            
-            if 'creator' in source_data:
-                source_data['creator'] = Creator(**source_data['creator'])
-            
-            event_data['source'] = Source(**source_data)
-        
-        if 'context' in event_data:
-            event_data['context'] = Context(**event_data['context'])
-        
-        if 'metadata' in event_data:
-            metadata_data = event_data.pop('metadata')
-            metadata_data['confidentiality_level'] = ConfidentialityLevel(
-                metadata_data['confidentiality_level']
-            )
-            if 'last_modified' in metadata_data and isinstance(metadata_data['last_modified'], str):
-                metadata_data['last_modified'] = datetime.fromisoformat(metadata_data['last_modified'])
-            event_data['metadata'] = Metadata(**metadata_data)
-        
-        if 'confidence_level' in event_data:
-            confidence_data = event_data.pop('confidence_level')
-            confidence_data['raw_data'] = ConfidenceLevel(confidence_data['raw_data'])
-            confidence_data['processed_data'] = ConfidenceLevel(confidence_data['processed_data'])
-            event_data['confidence_level'] = DataConfidence(**confidence_data)
-        
-        if 'verification_status' in event_data:
-            event_data['verification_status'] = VerificationStatus(event_data['verification_status'])
-        
-        if 'domain_type' in event_data:
-            event_data['domain_type'] = DomainType(event_data['domain_type'])
-        
-        if 'timestamp' in event_data and isinstance(event_data['timestamp'], str):
-            event_data['timestamp'] = datetime.fromisoformat(event_data['timestamp'])
-        
-        return cls(**event_data)
+        return _EVENT_RECORD_SERIALIZER.decode(data)
     
     @classmethod
     def from_json(cls, json_str: str) -> 'EventRecord':
@@ -318,29 +224,176 @@ class EventRecord:
         Returns:
             EventRecord: New EventRecord instance
         """
-        data = json.loads(json_str)
+        data = json_utils.loads(json_str)
         return cls.from_dict(data)
     
+    def _iter_canonical_fields(self) -> Iterator[str]:
+        """
+        Yield the canonical JSON encoding of each hashed field, in sorted key order.
+        
+        The concatenation of the fields (joined by ", " and wrapped in braces) is
+        byte-identical to json.dumps(to_dict() without current_re_hash, sort_keys=True,
+        default=str), but is produced without building the intermediate dictionary or
+        sorting keys at runtime. Plain strings (including str-based enumeration members,
+        which JSON encodes by value) are escaped inline; any other value goes through the
+        canonical encoder. Any change to to_dict must be mirrored here.
+        
+        Yields:
+            str: '"key": value' fragments in sorted key order
+        """
+        esc = encode_basestring_ascii
+        value = _canonical_value
+        enum = _canonical_enum
+        
+        confidence = self.confidence_level
+        if confidence:
+            raw_data = confidence.raw_data
+            processed = confidence.processed_data
+            yield ('"confidence_level": {"processed_data": '
+                   + (esc(processed) if isinstance(processed, str) else enum(processed))
+                   + ', "raw_data": ' + (esc(raw_data) if isinstance(raw_data, str) else enum(raw_data)) + '}')
+        
+        context = self.context
+        if context:
+            location = context.location
+            yield ('"context": {"environmental_factors": ' + value(context.environmental_factors)
+                   + ', "location": ' + (esc(location) if type(location) is str else value(location))
+                   + ', "participants": ' + value(context.participants) + '}')
+        
+        domain_type = self.domain_type
+        yield '"domain_type": ' + (esc(domain_type) if isinstance(domain_type, str) else enum(domain_type))
+        event_type = self.event_type
+        yield '"event_type": ' + (esc(event_type) if type(event_type) is str else value(event_type))
+        
+        hash_algorithm = self.hash_algorithm
+        if hash_algorithm is not None:
+            yield '"hash_algorithm": ' + (esc(hash_algorithm) if type(hash_algorithm) is str else value(hash_algorithm))
+        
+        metadata = self.metadata
+        if metadata:
+            confidentiality = metadata.confidentiality_level
+            last_modified = metadata.last_modified
+            if isinstance(last_modified, datetime):
+                last_modified = last_modified.isoformat()
+            modified_by = metadata.modified_by
+            version = metadata.version
+            yield ('"metadata": {"access_level": ' + value(metadata.access_level)
+                   + ', "confidentiality_level": '
+                   + (esc(confidentiality) if isinstance(confidentiality, str) else enum(confidentiality))
+                   + ', "last_modified": ' + (esc(last_modified) if type(last_modified) is str else value(last_modified))
+                   + ', "modified_by": ' + (esc(modified_by) if type(modified_by) is str else value(modified_by))
+                   + ', "related_documents": ' + value(metadata.related_documents)
+                   + ', "tags": ' + value(metadata.tags)
+                   + ', "version": ' + (esc(version) if type(version) is str else value(version)) + '}')
+        
+        previous_re_hash = self.previous_re_hash
+        yield '"previous_re_hash": ' + (esc(previous_re_hash) if type(previous_re_hash) is str else value(previous_re_hash))
+        
+        processed_data = self.processed_data
+        if processed_data:
+            yield ('"processed_data": {"derived_insights": ' + value(processed_data.derived_insights)
+                   + ', "qualitative_assessments": ' + value(processed_data.qualitative_assessments)
+                   + ', "quantitative_metrics": ' + value(processed_data.quantitative_metrics) + '}')
+        
+        raw_input = self.raw_input
+        if raw_input:
+            content = raw_input.content
+            raw_context = raw_input.context
+            duration = raw_input.duration
+            content_type = raw_input.type
+            yield ('"raw_input": {"content": ' + (esc(content) if type(content) is str else value(content))
+                   + ', "context": ' + (esc(raw_context) if type(raw_context) is str else value(raw_context))
+                   + ', "duration": ' + (esc(duration) if type(duration) is str else value(duration))
+                   + ', "type": ' + (esc(content_type) if isinstance(content_type, str) else enum(content_type)) + '}')
+        
+        re_id = self.re_id
+        yield '"re_id": ' + (esc(re_id) if type(re_id) is str else value(re_id))
+        
+        source = self.source
+        if source:
+            fragment = '"source": {'
+            creator = source.creator
+            if creator:
+                creator_id = creator.id
+                creator_name = creator.name
+                creator_role = creator.role
+                fragment += ('"creator": {"experience_years": ' + value(creator.experience_years)
+                             + ', "id": ' + (esc(creator_id) if type(creator_id) is str else value(creator_id))
+                             + ', "name": ' + (esc(creator_name) if type(creator_name) is str else value(creator_name))
+                             + ', "qualifications": ' + value(creator.qualifications)
+                             + ', "role": ' + (esc(creator_role) if type(creator_role) is str else value(creator_role)) + '}, ')
+            source_id = source.id
+            source_name = source.name
+            input_method = source.input_method
+            processing_method = source.processing_method
+            source_type = source.type
+            yield (fragment + '"id": ' + (esc(source_id) if type(source_id) is str else value(source_id))
+                   + ', "input_method": '
+                   + (esc(input_method) if isinstance(input_method, str) else enum(input_method))
+                   + ', "name": ' + (esc(source_name) if type(source_name) is str else value(source_name))
+                   + ', "processing_method": '
+                   + (esc(processing_method) if isinstance(processing_method, str) else enum(processing_method))
+                   + ', "type": ' + (esc(source_type) if isinstance(source_type, str) else enum(source_type)) + '}')
+        
+        subject_id = self.subject_id
+        yield '"subject_id": ' + (esc(subject_id) if type(subject_id) is str else value(subject_id))
+        
+        timestamp = self.timestamp
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.isoformat()
+        yield '"timestamp": ' + (esc(timestamp) if type(timestamp) is str else value(timestamp))
+        
+        status = self.verification_status
+        yield '"verification_status": ' + (esc(status) if isinstance(status, str) else enum(status))
+    
     def calculate_hash(self) -> str:
         """
         Calculate the hash of the current EventRecord.
         
         This method should be called after all fields have been set except current_re_hash.
+        The canonical encoding of the fields is fed to the hash incrementally; the result is
+        the hash of the sorted JSON dump of to_dict() without current_re_hash, computed with
+        the record's hash_algorithm (SHA-256 for records without one).
         
         Returns:
             str: Hash of the EventRecord
         """
-        # We need to make a copy of the object to avoid modifying it
-        temp_dict = self.to_dict()
-        # Remove the current_re_hash from the hash calculation
-        temp_dict.pop('current_re_hash', None)
-        # Convert to string and hash
-        import hashlib
-        data_str = json.dumps(temp_dict, sort_keys=True, default=str)
-        return hashlib.sha256(data_str.encode()).hexdigest()
+        hasher = get_hash_algorithm(self.hash_algorithm)()
+        separator = b'{'
+        for fragment in self._iter_canonical_fields():
+            hasher.update(separator)
+            hasher.update(fragment.encode())
+            separator = b', '
+        hasher.update(b'}')
+        return hasher.hexdigest()
     
     def update_hash(self) -> None:
         """
         Update the current_re_hash field based on the current state of the EventRecord.
+        
+        Records without a hash algorithm are stamped with the configured default,
+        unless it is the legacy SHA-256 (so their hashes stay as they were).
         """
+        if self.hash_algorithm is None:
+            default_algorithm = get_config().hash_algorithm
+            if default_algorithm != LEGACY_HASH_ALGORITHM:
+                get_hash_algorithm(default_algorithm)  # Fail before stamping an unknown algorithm
+                self.hash_algorithm = default_algorithm
         self.current_re_hash = self.calculate_hash()
+
+_SOURCE_SERIALIZER = Serializer(
+    Source,
+    order=['type', 'id', 'name', 'input_method', 'processing_method', 'creator'],
+    omit_if_falsy=['creator']
+)
+
+_EVENT_RECORD_SERIALIZER = Serializer(
+    EventRecord,
+    order=[
+        'subject_id', 'domain_type', 'event_type', 're_id', 'timestamp', 'previous_re_hash',
+        'current_re_hash', 'verification_status', 'hash_algorithm', 'raw_input', 'source',
+        'processed_data', 'context', 'metadata', 'confidence_level'
+    ],
+    omit_if_none=['hash_algorithm'],  # Only records hashed with an explicit algorithm carry it
+    omit_if_falsy=['raw_input', 'source', 'processed_data', 'context', 'metadata', 'confidence_level']
+)
@@ -0,0 +1,148 @@
+"""
+Lazy mapping of record IDs to model objects decoded on first access.
+"""
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Set
+
+class LazyRecordMapping(MutableMapping):
+    """
+    Dictionary of records that keeps their serialized form until they are used.
+
+    Entries are stored as the dictionaries they were loaded from and decoded the
+    first time they are read (through indexing, get, values or items); assigned
+    entries are stored as given. Keys, length, membership and insertion order are
+    available without decoding anything, and to_dict() returns undecoded entries
+    as they were loaded.
+    """
+
+    def __init__(self, raw: Dict[str, Dict[str, Any]], decode: Callable[[Dict[str, Any]], Any]):
+        """
+        Initialize the mapping.
+
+        Args:
+            raw (Dict[str, Dict[str, Any]]): Serialized records by key
+            decode (Callable[[Dict[str, Any]], Any]): Function creating a record from its dictionary
+        """
+        self._data: Dict[str, Any] = dict(raw)
+        self._pending: Set[str] = set(self._data)
+        self._decode = decode
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._data[key]
+        if key in self._pending:
+            value = self._decode(value)
+            self._data[key] = value
+            self._pending.discard(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self._pending.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+        self._pending.discard(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyRecordMapping):
+            other = dict(other.items())
+        return dict(self.items()) == other
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self._data)} records, {len(self._pending)} not decoded)"
+
+    @property
+    def pending_count(self) -> int:
+        """Number of records that have not been decoded yet."""
+        return len(self._pending)
+
+    def is_decoded(self, key: str) -> bool:
+        """
+        Check whether a record has been decoded.
+
+        Args:
+            key (str): Key of the record
+
+        Returns:
+            bool: True if the record is a model object, False if it is still a dictionary
+        """
+        return key in self._data and key not in self._pending
+
+    def peek(self, key: str, field_name: str, default: Any = None) -> Any:
+        """
+        Read one field of a record without decoding it.
+
+        Args:
+            key (str): Key of the record
+            field_name (str): Name of the field
+            default (Any): Value returned when the field is missing
+
+        Returns:
+            Any: The field value (as serialized, for records not decoded yet)
+        """
+        value = self._data[key]
+        if key in self._pending:
+            return value.get(field_name, default)
+        return getattr(value, field_name, default)
+
+    def to_dict(self, encode: Callable[[Any], Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Serialize the records, reusing the dictionaries of records not decoded yet.
+
+        Args:
+            encode (Callable[[Any], Dict[str, Any]]): Function serializing a decoded record
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Serialized records by key
+        """
+        pending = self._pending
+        return {
+            key: value if key in pending else encode(value)
+            for key, value in self._data.items()
+        }
+
+    def decode_all(self) -> None:
+        """Decode every pending record."""
+        for key in list(self._pending):
+            self[key]
+
+def encode_records(records: Dict[str, Any], encode: Callable[[Any], Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Serialize a dictionary of records, which may be a LazyRecordMapping.
+
+    Args:
+        records (Dict[str, Any]): The records by key
+        encode (Callable[[Any], Dict[str, Any]]): Function serializing one record
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Serialized records by key
+    """
+    if isinstance(records, LazyRecordMapping):
+        return records.to_dict(encode)
+    return {key: encode(record) for key, record in records.items()}
+
+def peek_field(records: Dict[str, Any], key: str, field_name: str, default: Any = None) -> Any:
+    """
+    Read one field of a record, without decoding it if the records are lazy.
+
+    Args:
+        records (Dict[str, Any]): The records by key
+        key (str): Key of the record
+        field_name (str): Name of the field
+        default (Any): Value returned when the field is missing
+
+    Returns:
+        Any: The field value
+    """
+    if isinstance(records, LazyRecordMapping):
+        return records.peek(key, field_name, default)
+    return getattr(records[key], field_name, default)
@@ -0,0 +1,284 @@
+"""
+Compiled serializers converting model dataclasses to and from dictionaries.
+
+A Serializer generates an encode and a decode function specialized for one
+dataclass from its field types: enumerations are stored by value, datetimes
+and dates as ISO strings, and nested dataclasses (alone, in lists or as dict
+values) through their own serializers. The functions are generated the first
+time they are used and called directly afterwards, so no per-call type checks
+or reflection remain on the hot path.
+"""
+import dataclasses
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union, get_type_hints
+
+try:
+    from typing import get_args, get_origin
+except ImportError:  # pragma: no cover - Python < 3.8
+    def get_origin(tp: Any) -> Any:
+        return getattr(tp, '__origin__', None)
+
+    def get_args(tp: Any) -> Tuple[Any, ...]:
+        return getattr(tp, '__args__', ())
+
+_SERIALIZERS: Dict[type, 'Serializer'] = {}
+
+def serializer_for(cls: type) -> 'Serializer':
+    """
+    Get the serializer of a dataclass, creating a default one if none is registered.
+
+    Args:
+        cls (type): The dataclass
+
+    Returns:
+        Serializer: The registered serializer
+    """
+    serializer = _SERIALIZERS.get(cls)
+    if serializer is None:
+        serializer = Serializer(cls)
+    return serializer
+
+class Serializer:
+    """
+    Encoder/decoder pair generated for a dataclass.
+
+    The encoded dictionary holds the fields in declaration order (or the given
+    order). Fields can be left out of the output, left out when None or falsy,
+    or shallow-copied; any field can also take custom encode/decode callables.
+    Decoding converts the known fields and passes everything else to the class
+    constructor, so unexpected keys raise TypeError unless ignore_unknown is set,
+    in which case only the keys the encoder writes are read.
+    """
+
+    def __init__(self, cls: type, order: Optional[Iterable[str]] = None,
+                 exclude: Iterable[str] = (), omit_if_none: Iterable[str] = (),
+                 omit_if_falsy: Iterable[str] = (), copy: Iterable[str] = (),
+                 encoders: Optional[Dict[str, Callable[[Any], Any]]] = None,
+                 decoders: Optional[Dict[str, Callable[[Any], Any]]] = None,
+                 ignore_unknown: bool = False, register: bool = True):
+        """
+        Register a serializer for a dataclass.
+
+        Args:
+            cls (type): The dataclass to serialize
+            order (Optional[Iterable[str]]): Output key order (defaults to field order)
+            exclude (Iterable[str]): Fields that are not encoded
+            omit_if_none (Iterable[str]): Fields left out of the output when None
+            omit_if_falsy (Iterable[str]): Fields left out of the output when falsy
+            copy (Iterable[str]): Container fields encoded as shallow copies
+            encoders (Optional[Dict[str, Callable[[Any], Any]]]): Custom encoders per field
+            decoders (Optional[Dict[str, Callable[[Any], Any]]]): Custom decoders per field
+            ignore_unknown (bool): Whether to ignore keys the encoder does not write
+            register (bool): Whether serializer_for(cls) should return this serializer
+        """
+        self.cls = cls
+        self.exclude = frozenset(exclude)
+        field_names = [f.name for f in dataclasses.fields(cls)]
+        self.order = [name for name in (order or field_names) if name not in self.exclude]
+        self.omit_if_none = frozenset(omit_if_none)
+        self.omit_if_falsy = frozenset(omit_if_falsy)
+        self.copy = frozenset(copy)
+        self.encoders = dict(encoders or {})
+        self.decoders = dict(decoders or {})
+        self.ignore_unknown = ignore_unknown
+
+        self._compiled = False
+        self._compiling = False
+        self._plain_decode = False  # Whether decoding is just calling the class with the data
+        self.encode: Callable[[Any], Dict[str, Any]] = self._compile_and_encode
+        self.decode: Callable[[Dict[str, Any]], Any] = self._compile_and_decode
+        if register:
+            _SERIALIZERS[cls] = self
+
+    @property
+    def plain(self) -> bool:
+        """Whether the class is encoded with every field, in field order, without options."""
+        return (
+            self.order == [f.name for f in dataclasses.fields(self.cls)]
+            and not (self.omit_if_none or self.omit_if_falsy or self.copy or self.encoders or self.decoders)
+        )
+
+    def _compile_and_encode(self, obj: Any) -> Dict[str, Any]:
+        """Generate the functions, then encode."""
+        self.compile()
+        return self.encode(obj)
+
+    def _compile_and_decode(self, data: Dict[str, Any]) -> Any:
+        """Generate the functions, then decode."""
+        self.compile()
+        return self.decode(data)
+
+    def compile(self) -> None:
+        """Generate the encode and decode functions (once)."""
+        if self._compiled or self._compiling:
+            return
+
+        self._compiling = True
+        try:
+            namespace: Dict[str, Any] = {
+                '_cls': self.cls,
+                '_Enum': Enum,
+                '_datetime': datetime,
+                '_date': date,
+            }
+            hints = get_type_hints(self.cls)
+            codecs = {}
+            for name in set(self.order) | set(hints):
+                codecs[name] = self._field_codec(name, hints.get(name, Any), namespace)
+                if name in self.copy:
+                    codecs[name] = ('{v}.copy()', codecs[name][1])
+
+            exec(self._encode_source(codecs), namespace)
+            exec(self._decode_source(codecs, namespace), namespace)
+            self.encode = namespace['encode']
+            self.decode = namespace['decode']
+            self._compiled = True
+        finally:
+            self._compiling = False
+
+    def _field_codec(self, name: str, tp: Any, namespace: Dict[str, Any]) -> Tuple[str, str]:
+        """Encode and decode expressions of a field, honoring custom encoders and decoders."""
+        if name in self.encoders and name in self.decoders:
+            encode, decode = '{v}', '{v}'
+        else:
+            encode, decode = _build_codec(tp, namespace, name)
+        if name in self.encoders:
+            namespace[f'_enc_{name}'] = self.encoders[name]
+            encode = f'_enc_{name}({{v}})'
+        if name in self.decoders:
+            namespace[f'_dec_{name}'] = self.decoders[name]
+            decode = f'_dec_{name}({{v}})'
+        return encode, decode
+
+    def _encode_source(self, codecs: Dict[str, Tuple[str, str]]) -> str:
+        """Source code of the generated encode function."""
+        omitted = self.omit_if_none | self.omit_if_falsy
+        head: List[str] = []
+        index = 0
+        while index < len(self.order) and self.order[index] not in omitted:
+            name = self.order[index]
+            head.append(f'{name!r}: ' + codecs[name][0].replace('{v}', f'obj.{name}'))
+            index += 1
+
+        lines = ['def encode(obj):', '    result = {' + ', '.join(head) + '}']
+        for name in self.order[index:]:
+            if name in omitted:
+                condition = 'value is not None' if name in self.omit_if_none else 'value'
+                lines.append(f'    value = obj.{name}')
+                lines.append(f'    if {condition}:')
+                lines.append(f'        result[{name!r}] = ' + codecs[name][0].replace('{v}', 'value'))
+            else:
+                lines.append(f'    result[{name!r}] = ' + codecs[name][0].replace('{v}', f'obj.{name}'))
+        lines.append('    return result')
+        return '\n'.join(lines)
+
+    def _decode_source(self, codecs: Dict[str, Tuple[str, str]], namespace: Dict[str, Any]) -> str:
+        """Source code of the generated decode function."""
+        converted = [(name, decode) for name, (_, decode) in codecs.items() if decode != '{v}']
+        lines = ['def decode(data):']
+        if self.ignore_unknown:
+            namespace['_keys'] = tuple(self.order)
+            lines.append('    kwargs = {key: data[key] for key in _keys if key in data}')
+        elif converted:
+            lines.append('    kwargs = data.copy()')
+        else:
+            self._plain_decode = True
+            lines.append('    return _cls(**data)')
+            return '\n'.join(lines)
+
+        for name, decode in converted:
+            lines.append(f'    if {name!r} in kwargs:')
+            lines.append(f'        value = kwargs[{name!r}]')
+            lines.append(f'        kwargs[{name!r}] = ' + decode.replace('{v}', 'value'))
+        lines.append('    return _cls(**kwargs)')
+        return '\n'.join(lines)
+
+def _build_codec(tp: Any, namespace: Dict[str, Any], name: str, depth: int = 0,
+                 inlined: Tuple[type, ...] = ()) -> Tuple[str, str]:
+    """
+    Build the encode and decode expression templates for a field type.
+
+    Args:
+        tp (Any): The annotated type
+        namespace (Dict[str, Any]): Namespace of the generated code, for the helpers it needs
+        name (str): Unique name for the helpers of this field
+        depth (int): Nesting depth, used to name comprehension variables
+        inlined (Tuple[type, ...]): Dataclasses whose encoders are being inlined (to stop recursion)
+
+    Returns:
+        Tuple[str, str]: Encode and decode expressions in which {v} stands for the value
+    """
+    passthrough = ('{v}', '{v}')
+    origin = get_origin(tp)
+    args = get_args(tp)
+
+    if origin is Union:
+        members = [arg for arg in args if arg is not type(None)]
+        if len(members) != 1:
+            return passthrough
+        encode, decode = _build_codec(members[0], namespace, name, depth, inlined)
+        if (encode, decode) == passthrough:
+            return passthrough
+        return (f'(None if {{v}} is None else {encode})' if encode != '{v}' else encode,
+                f'(None if {{v}} is None else {decode})' if decode != '{v}' else decode)
+
+    if origin in (list, List) and args:
+        item = f'x{depth}'
+        encode, decode = _build_codec(args[0], namespace, name, depth + 1, inlined)
+        if (encode, decode) == passthrough:
+            return passthrough
+        return ('[' + encode.replace('{v}', item) + f' for {item} in ' + '{v}]',
+                '[' + decode.replace('{v}', item) + f' for {item} in ' + '{v}]')
+
+    if origin in (dict, Dict) and len(args) == 2:
+        key, item = f'k{depth}', f'x{depth}'
+        encode, decode = _build_codec(args[1], namespace, name, depth + 1, inlined)
+        if (encode, decode) == passthrough:
+            return passthrough
+        return ('{' + f'{key}: ' + encode.replace('{v}', item) + f' for {key}, {item} in ' + '{v}.items()}',
+                '{' + f'{key}: ' + decode.replace('{v}', item) + f' for {key}, {item} in ' + '{v}.items()}')
+
+    if not isinstance(tp, type):
+        return passthrough
+
+    if issubclass(tp, Enum):
+        # Look members up by value directly; calling the class handles members and invalid values
+        namespace[f'_enum_{name}_{depth}'] = tp
+        namespace[f'_members_{name}_{depth}'] = tp._value2member_map_
+        return ('({v}._value_ if isinstance({v}, _Enum) else {v})',
+                f'(_members_{name}_{depth}.get({{v}}) or _enum_{name}_{depth}({{v}}))')
+
+    if issubclass(tp, datetime):
+        return ('({v}.isoformat() if isinstance({v}, _datetime) else {v})',
+                '(_datetime.fromisoformat({v}) if isinstance({v}, str) else {v})')
+
+    if issubclass(tp, date):
+        return ('({v}.isoformat() if isinstance({v}, _date) else {v})',
+                '(_date.fromisoformat({v}) if isinstance({v}, str) else {v})')
+
+    if dataclasses.is_dataclass(tp):
+        nested = serializer_for(tp)
+        nested.compile()
+        if nested._compiled:
+            namespace[f'_enc_{name}_{depth}'] = nested.encode
+            namespace[f'_dec_{name}_{depth}'] = tp if nested._plain_decode else nested.decode
+        else:  # Recursive type still being compiled: dispatch at call time
+            namespace[f'_enc_{name}_{depth}'] = lambda obj: nested.encode(obj)
+            namespace[f'_dec_{name}_{depth}'] = lambda data: nested.decode(data)
+        decode = f'_dec_{name}_{depth}(**{{v}})' if nested._plain_decode else f'_dec_{name}_{depth}({{v}})'
+        decode = f'({decode} if isinstance({{v}}, dict) else {{v}})'
+
+        if not nested.plain or tp in inlined:
+            return f'_enc_{name}_{depth}({{v}})', decode
+
+        # Encode classes without options as a dict display in the caller, saving a call per object
+        hints = get_type_hints(tp)
+        items = []
+        for field_name in nested.order:
+            field_encode, _ = _build_codec(hints.get(field_name, Any), namespace, f'{name}_{field_name}',
+                                           depth, inlined + (tp,))
+            items.append(f'{field_name!r}: ' + field_encode.replace('{v}', '{v}.' + field_name))
+        return '{' + ', '.join(items) + '}', decode
+
+    return passthrough
@@ -6,9 +6,11 @@ from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any, Union
 import uuid
-import json
 
-from .event_record import DomainType
+from .event_record import EventRecord, DomainType
+from .serialization import Serializer
+from ..utils import json_utils
+from ..utils.hash_utils import calculate_hash
 
 @dataclass
 class EventReference:
@@ -17,6 +19,24 @@ class EventReference:
     description: str
     impact: Optional[str] = None
     significance: Optional[str] = None
+    timestamp: Optional[datetime] = None  # Time of the event, used to keep recent events ordered
+    
+    @classmethod
+    def from_event_record(cls, event_record: EventRecord) -> 'EventReference':
+        """
+        Create a reference to an Event Record, with a short description of it.
+        
+        Args:
+            event_record (EventRecord): The event record
+            
+        Returns:
+            EventReference: The reference
+        """
+        return cls(
+            re_id=event_record.re_id,
+            description=f"{event_record.event_type} - {event_record.raw_input.content[:50]}...",
+            timestamp=event_record.timestamp
+        )
 
 @dataclass
 class DomainState:
@@ -29,14 +49,51 @@ class DomainState:
     trends: Dict[str, str] = field(default_factory=dict)
     domain_specific_data: Dict[str, Any] = field(default_factory=dict)
     
+    @classmethod
+    def empty(cls) -> 'DomainState':
+        """
+        Create the state of a domain without detailed state information.
+        
+        Returns:
+            DomainState: The domain state
+        """
+        return cls(
+            last_updated=datetime.now(),
+            current_status="No detailed state information available yet"
+        )
+    
+    def add_recent_event(self, reference: EventReference, limit: int = 10) -> None:
+        """
+        Add an event to recent_events, keeping the newest `limit` events, newest first.
+        
+        An event already in the list is replaced. Events without a timestamp are
+        ordered after the ones with a timestamp. The cost is bounded by the limit.
+        
+        Args:
+            reference (EventReference): Reference to the event
+            limit (int): Maximum number of recent events
+        """
+        recent_events = [r for r in self.recent_events if r.re_id != reference.re_id]
+        
+        # Find the position of the event, usually the front
+        position = len(recent_events)
+        if reference.timestamp is not None:
+            for index, existing in enumerate(recent_events):
+                if existing.timestamp is None or existing.timestamp <= reference.timestamp:
+                    position = index
+                    break
+        
+        recent_events.insert(position, reference)
+        self.recent_events = recent_events[:max(0, limit)]
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         result = {
             'last_updated': self.last_updated.isoformat(),
             'current_status': self.current_status,
             'key_attributes': self.key_attributes,
-            'recent_events': [er.__dict__ for er in self.recent_events],
-            'significant_events': [er.__dict__ for er in self.significant_events],
+            'recent_events': [_EVENT_REFERENCE_SERIALIZER.encode(er) for er in self.recent_events],
+            'significant_events': [_EVENT_REFERENCE_SERIALIZER.encode(er) for er in self.significant_events],
             'trends': self.trends,
             'domain_specific_data': self.domain_specific_data
         }
@@ -54,12 +111,12 @@ class DomainState:
         # Handle event references
         if 'recent_events' in domain_data:
             domain_data['recent_events'] = [
-                EventReference(**event) for event in domain_data['recent_events']
+                _EVENT_REFERENCE_SERIALIZER.decode(event) for event in domain_data['recent_events']
             ]
             
         if 'significant_events' in domain_data:
             domain_data['significant_events'] = [
-                EventReference(**event) for event in domain_data['significant_events']
+                _EVENT_REFERENCE_SERIALIZER.decode(event) for event in domain_data['significant_events']
             ]
             
         return cls(**domain_data)
@@ -124,6 +181,7 @@ class StateDocument:
     version: str = "1.0"
     aggregated_insights: AggregatedInsights = field(default_factory=AggregatedInsights)
     llm_optimized_summary: Optional[str] = None
+    llm_summary_hash: Optional[str] = None  # Hash of the state the summary was generated from
     source_events: List[str] = field(default_factory=list)
     source_syntheses: List[str] = field(default_factory=list)
     metadata: StateDocumentMetadata = field(default_factory=lambda: StateDocumentMetadata(
@@ -139,67 +197,7 @@ class StateDocument:
         Returns:
             Dict[str, Any]: Dictionary representation of the StateDocument
         """
-        result = {
-            'de_id': self.de_id,
-            'subject_id': self.subject_id,
-            'general_summary': self.general_summary,
-            'last_updated': self.last_updated.isoformat() if isinstance(self.last_updated, datetime) else self.last_updated,
-            'version': self.version,
-            'llm_optimized_summary': self.llm_optimized_summary,
-            'source_events': self.source_events.copy() if hasattr(self, 'source_events') else [],
-            'source_syntheses': self.source_syntheses.copy() if hasattr(self, 'source_syntheses') else []
-        }
-        
-        # Add domains safely
-        try:
-            if hasattr(self, 'domains') and self.domains:
-                domains_dict = {}
-                for k, v in self.domains.items():
-                    if hasattr(v, 'to_dict') and callable(getattr(v, 'to_dict')):
-                        domains_dict[k] = v.to_dict()
-                    else:
-                        domains_dict[k] = {
-                            'last_updated': v.last_updated.isoformat() if hasattr(v, 'last_updated') and isinstance(v.last_updated, datetime) else None,
-                            'current_status': getattr(v, 'current_status', None)
-                        }
-                result['domains'] = domains_dict
-            else:
-                result['domains'] = {}
-        except (RecursionError, AttributeError):
-            result['domains'] = {}
-            
-        # Add aggregated_insights safely
-        try:
-            if hasattr(self, 'aggregated_insights') and self.aggregated_insights:
-                if hasattr(self.aggregated_insights, 'to_dict') and callable(getattr(self.aggregated_insights, 'to_dict')):
-                    result['aggregated_insights'] = self.aggregated_insights.to_dict()
-                else:
-                    result['aggregated_insights'] = {
-                        'cross_domain_patterns': getattr(self.aggregated_insights, 'cross_domain_patterns', []),
-                        'recommended_actions': getattr(self.aggregated_insights, 'recommended_actions', [])
-                    }
-            else:
-                result['aggregated_insights'] = {}
-        except (RecursionError, AttributeError):
-            result['aggregated_insights'] = {}
-            
-        # Add metadata safely
-        try:
-            if hasattr(self, 'metadata') and self.metadata:
-                if hasattr(self.metadata, 'to_dict') and callable(getattr(self.metadata, 'to_dict')):
-                    result['metadata'] = self.metadata.to_dict()
-                else:
-                    result['metadata'] = {
-                        'generated_by': getattr(self.metadata, 'generated_by', 'system'),
-                        'generated_on': getattr(self.metadata, 'generated_on', datetime.now()).isoformat() if isinstance(getattr(self.metadata, 'generated_on', None), datetime) else None,
-                        'confidence_level': getattr(self.metadata, 'confidence_level', 'medium')
-                    }
-            else:
-                result['metadata'] = {}
-        except (RecursionError, AttributeError):
-            result['metadata'] = {}
-            
-        return result
+        return _STATE_DOCUMENT_SERIALIZER.encode(self)
     
     def to_json(self) -> str:
         """
@@ -208,7 +206,7 @@ class StateDocument:
         Returns:
             str: JSON representation of the StateDocument
         """
-        return json.dumps(self.to_dict(), default=str)
+        return json_utils.dumps(self.to_dict())
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'StateDocument':
@@ -221,30 +219,7 @@ class StateDocument:
         Returns:
             StateDocument: New StateDocument instance
         """
-        # Create a copy to avoid modifying the original
-        state_data = data.copy()
-        
-        # Handle domains
-        if 'domains' in state_data:
-            domains_data = state_data.pop('domains')
-            state_data['domains'] = {
-                domain_key: DomainState.from_dict(domain_data) 
-                for domain_key, domain_data in domains_data.items()
-            }
-        
-        # Handle aggregated insights
-        if 'aggregated_insights' in state_data:
-            state_data['aggregated_insights'] = AggregatedInsights.from_dict(state_data['aggregated_insights'])
-        
-        # Handle metadata
-        if 'metadata' in state_data:
-            state_data['metadata'] = StateDocumentMetadata.from_dict(state_data['metadata'])
-        
-        # Handle datetime
-        if 'last_updated' in state_data and isinstance(state_data['last_updated'], str):
-            state_data['last_updated'] = datetime.fromisoformat(state_data['last_updated'])
-        
-        return cls(**state_data)
+        return _STATE_DOCUMENT_SERIALIZER.decode(data)
     
     @classmethod
     def from_json(cls, json_str: str) -> 'StateDocument':
@@ -257,7 +232,7 @@ class StateDocument:
         Returns:
             StateDocument: New StateDocument instance
         """
-        data = json.loads(json_str)
+        data = json_utils.loads(json_str)
         return cls.from_dict(data)
     
     def get_domain_state(self, domain_type: Union[str, DomainType]) -> Optional[DomainState]:
@@ -287,6 +262,38 @@ class StateDocument:
         # Update metadata to reflect the change
         self.metadata.generated_on = datetime.now()
     
+    def llm_summary_source_hash(self) -> str:
+        """
+        Hash the parts of the document the LLM-optimized summary is generated from.
+        
+        Returns:
+            str: Hash that changes whenever the summary would change
+        """
+        return calculate_hash({
+            'subject_id': self.subject_id,
+            'general_summary': self.general_summary,
+            'domains': [
+                [
+                    domain_key,
+                    domain_state.last_updated,
+                    domain_state.current_status,
+                    domain_state.key_attributes,
+                    [event.description for event in domain_state.significant_events[:3]]
+                ]
+                for domain_key, domain_state in self.domains.items()
+            ],
+            'cross_domain_patterns': self.aggregated_insights.cross_domain_patterns
+        })
+    
+    def is_llm_summary_current(self) -> bool:
+        """
+        Check whether the stored LLM-optimized summary matches the current state.
+        
+        Returns:
+            bool: True if a summary exists and nothing it is generated from changed since
+        """
+        return self.llm_optimized_summary is not None and self.llm_summary_hash == self.llm_summary_source_hash()
+    
     def generate_llm_optimized_summary(self) -> str:
         """
         Generate a summary optimized for LLM context.
@@ -323,9 +330,51 @@ class StateDocument:
                 summary_parts.append(f"- {pattern}")
         
         self.llm_optimized_summary = "\n".join(summary_parts)
+        self.llm_summary_hash = self.llm_summary_source_hash()
         return self.llm_optimized_summary
     
+    def add_recent_events(self, event_records: List[EventRecord], limit: int = 10) -> None:
+        """
+        Add Event Records to the recent events of their domains.
+        
+        Each domain keeps its newest events, newest first, up to the limit (see
+        DomainState.add_recent_event); domains without a state get an empty one.
+        
+        Args:
+            event_records (List[EventRecord]): The event records
+            limit (int): Maximum number of recent events per domain
+        """
+        if not event_records:
+            return
+        
+        now = datetime.now()
+        for event_record in event_records:
+            domain_type = event_record.domain_type
+            domain_key = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+            domain_state = self.domains.get(domain_key)
+            if domain_state is None:
+                domain_state = self.domains[domain_key] = DomainState.empty()
+            domain_state.add_recent_event(EventReference.from_event_record(event_record), limit)
+            domain_state.last_updated = now
+        
+        self.update_last_updated()
+    
     def update_last_updated(self) -> None:
         """Update the last_updated timestamp."""
         self.last_updated = datetime.now()
         self.metadata.generated_on = datetime.now()
+
+_EVENT_REFERENCE_SERIALIZER = Serializer(
+    EventReference,
+    omit_if_none=['timestamp']
+)
+
+_STATE_DOCUMENT_SERIALIZER = Serializer(
+    StateDocument,
+    order=[
+        'de_id', 'subject_id', 'general_summary', 'last_updated', 'version', 'llm_optimized_summary',
+        'llm_summary_hash', 'source_events', 'source_syntheses', 'domains', 'aggregated_insights', 'metadata'
+    ],
+    omit_if_none=['llm_summary_hash'],
+    copy=['source_events', 'source_syntheses']
+)
@@ -6,9 +6,10 @@ from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any, Union
 import uuid
-import json
 
 from .event_record import DomainType, ConfidenceLevel
+from .serialization import Serializer
+from ..utils import json_utils
 
 @dataclass
 class TimeFrame:
@@ -156,93 +157,7 @@ class TrajectorySynthesis:
         Returns:
             Dict[str, Any]: Dictionary representation of the TrajectorySynthesis
         """
-        domain_type_value = self.domain_type.value if isinstance(self.domain_type, DomainType) else self.domain_type
-        
-        result = {
-            'st_id': self.st_id,
-            'subject_id': self.subject_id,
-            'domain_type': domain_type_value,
-            'level': self.level,
-            'summary': self.summary,
-            'source_events': self.source_events.copy() if hasattr(self, 'source_events') else [],
-            'key_insights': self.key_insights.copy() if hasattr(self, 'key_insights') else [],
-            'patterns': self.patterns.copy() if hasattr(self, 'patterns') else [],
-            'recommendations': self.recommendations.copy() if hasattr(self, 'recommendations') else [],
-            'domain_specific_data': self.domain_specific_data.copy() if hasattr(self, 'domain_specific_data') and isinstance(self.domain_specific_data, dict) else {},
-            'confidence_level': self.confidence_level.value if isinstance(self.confidence_level, ConfidenceLevel) else self.confidence_level
-        }
-        
-        # Add time_frame safely
-        try:
-            if hasattr(self, 'time_frame') and self.time_frame:
-                if hasattr(self.time_frame, 'to_dict') and callable(getattr(self.time_frame, 'to_dict')):
-                    result['time_frame'] = self.time_frame.to_dict()
-                else:
-                    result['time_frame'] = {
-                        'start': self.time_frame.start.isoformat() if hasattr(self.time_frame, 'start') and isinstance(self.time_frame.start, datetime) else None,
-                        'end': self.time_frame.end.isoformat() if hasattr(self.time_frame, 'end') and isinstance(self.time_frame.end, datetime) else None
-                    }
-        except (RecursionError, AttributeError):
-            result['time_frame'] = {}
-        
-        # Add significant_events safely
-        try:
-            if hasattr(self, 'significant_events') and self.significant_events:
-                events_list = []
-                for event in self.significant_events:
-                    if hasattr(event, 'to_dict') and callable(getattr(event, 'to_dict')):
-                        events_list.append(event.to_dict())
-                    else:
-                        events_list.append({
-                            're_id': getattr(event, 're_id', None),
-                            'description': getattr(event, 'description', None),
-                            'significance': getattr(event, 'significance', None)
-                        })
-                result['significant_events'] = events_list
-            else:
-                result['significant_events'] = []
-        except (RecursionError, AttributeError):
-            result['significant_events'] = []
-            
-        # Add metrics safely
-        try:
-            if hasattr(self, 'metrics') and self.metrics:
-                metrics_dict = {}
-                for k, v in self.metrics.items():
-                    if hasattr(v, 'to_dict') and callable(getattr(v, 'to_dict')):
-                        metrics_dict[k] = v.to_dict()
-                    else:
-                        metrics_dict[k] = {
-                            'value': getattr(v, 'value', None),
-                            'trend': getattr(v, 'trend', None),
-                            'analysis': getattr(v, 'analysis', None)
-                        }
-                result['metrics'] = metrics_dict
-            else:
-                result['metrics'] = {}
-        except (RecursionError, AttributeError):
-            result['metrics'] = {}
-            
-        # Add metadata safely
-        try:
-            if hasattr(self, 'metadata') and self.metadata:
-                if hasattr(self.metadata, 'to_dict') and callable(getattr(self.metadata, 'to_dict')):
-                    result['metadata'] = self.metadata.to_dict()
-                else:
-                    result['metadata'] = {
-                        'generated_by': getattr(self.metadata, 'generated_by', 'system'),
-                        'generated_on': getattr(self.metadata, 'generated_on', datetime.now()).isoformat() if isinstance(getattr(self.metadata, 'generated_on', None), datetime) else None
-                    }
-            else:
-                result['metadata'] = {}
-        except (RecursionError, AttributeError):
-            result['metadata'] = {}
-        
-        # Add next_review_date safely
-        if hasattr(self, 'next_review_date') and self.next_review_date:
-            result['next_review_date'] = self.next_review_date.isoformat() if isinstance(self.next_review_date, datetime) else self.next_review_date
-            
-        return result
+        return _TRAJECTORY_SYNTHESIS_SERIALIZER.encode(self)
     
     def to_json(self) -> str:
         """
@@ -251,7 +166,7 @@ class TrajectorySynthesis:
         Returns:
             str: JSON representation of the TrajectorySynthesis
         """
-        return json.dumps(self.to_dict(), default=str)
+        return json_utils.dumps(self.to_dict())
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'TrajectorySynthesis':
@@ -264,42 +179,7 @@ class TrajectorySynthesis:
         Returns:
             TrajectorySynthesis: New TrajectorySynthesis instance
         """
-        # Create a copy to avoid modifying the original
-        synthesis_data = data.copy()
-        
-        # Handle domain_type
-        if 'domain_type' in synthesis_data:
-            synthesis_data['domain_type'] = DomainType(synthesis_data['domain_type'])
-        
-        # Handle time_frame
-        if 'time_frame' in synthesis_data:
-            synthesis_data['time_frame'] = TimeFrame.from_dict(synthesis_data['time_frame'])
-        
-        # Handle significant_events
-        if 'significant_events' in synthesis_data:
-            synthesis_data['significant_events'] = [
-                SignificantEvent.from_dict(event) for event in synthesis_data['significant_events']
-            ]
-        
-        # Handle metrics
-        if 'metrics' in synthesis_data:
-            synthesis_data['metrics'] = {
-                k: Metric.from_dict(v) for k, v in synthesis_data['metrics'].items()
-            }
-        
-        # Handle metadata
-        if 'metadata' in synthesis_data:
-            synthesis_data['metadata'] = SynthesisMetadata.from_dict(synthesis_data['metadata'])
-        
-        # Handle confidence_level
-        if 'confidence_level' in synthesis_data:
-            synthesis_data['confidence_level'] = ConfidenceLevel(synthesis_data['confidence_level'])
-        
-        # Handle next_review_date
-        if 'next_review_date' in synthesis_data and isinstance(synthesis_data['next_review_date'], str):
-            synthesis_data['next_review_date'] = datetime.fromisoformat(synthesis_data['next_review_date'])
-        
-        return cls(**synthesis_data)
+        return _TRAJECTORY_SYNTHESIS_SERIALIZER.decode(data)
     
     @classmethod
     def from_json(cls, json_str: str) -> 'TrajectorySynthesis':
@@ -312,5 +192,21 @@ class TrajectorySynthesis:
         Returns:
             TrajectorySynthesis: New TrajectorySynthesis instance
         """
-        data = json.loads(json_str)
-        return cls.from_dict(data)
\ No newline at end of file
+        data = json_utils.loads(json_str)
+        return cls.from_dict(data)
+
+_SYNTHESIS_METADATA_SERIALIZER = Serializer(
+    SynthesisMetadata,
+    omit_if_falsy=['reviewed_by', 'reviewed_on']
+)
+
+_TRAJECTORY_SYNTHESIS_SERIALIZER = Serializer(
+    TrajectorySynthesis,
+    order=[
+        'st_id', 'subject_id', 'domain_type', 'level', 'summary', 'source_events', 'key_insights',
+        'patterns', 'recommendations', 'domain_specific_data', 'confidence_level', 'time_frame',
+        'significant_events', 'metrics', 'metadata', 'next_review_date'
+    ],
+    omit_if_falsy=['time_frame', 'next_review_date'],
+    copy=['source_events', 'key_insights', 'patterns', 'recommendations', 'domain_specific_data']
+)
@@ -3,14 +3,158 @@ Universal History module representing the complete history of a subject.
 """
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Tuple
 import uuid
-import json
 
 from .event_record import EventRecord, DomainType
 from .trajectory_synthesis import TrajectorySynthesis
 from .state_document import StateDocument
 from .domain_catalog import DomainCatalog, Organization
+from .serialization import Serializer
+from .lazy_mapping import LazyRecordMapping, encode_records, peek_field
+from ..utils.merkle_utils import MerkleTree, InclusionProof
+from ..utils.hash_utils import create_hash_chain, verify_hashes
+from ..utils import json_utils
+
+@dataclass
+class ChainHead:
+    """Latest link of the event hash chain for a domain."""
+    re_id: str
+    current_re_hash: Optional[str]
+    timestamp: datetime
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            're_id': self.re_id,
+            'current_re_hash': self.current_re_hash,
+            'timestamp': self.timestamp.isoformat() if isinstance(self.timestamp, datetime) else self.timestamp
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ChainHead':
+        """Create from dictionary."""
+        head_data = data.copy()
+        
+        # Handle datetime
+        if 'timestamp' in head_data and isinstance(head_data['timestamp'], str):
+            head_data['timestamp'] = datetime.fromisoformat(head_data['timestamp'])
+            
+        return cls(**head_data)
+    
+    @classmethod
+    def from_event_record(cls, event_record: EventRecord) -> 'ChainHead':
+        """Create from the Event Record that currently ends the chain."""
+        return cls(
+            re_id=event_record.re_id,
+            current_re_hash=event_record.current_re_hash,
+            timestamp=event_record.timestamp
+        )
+
+@dataclass
+class VerificationCheckpoint:
+    """Last event up to which the hash chain of a domain has been verified."""
+    re_id: str
+    current_re_hash: Optional[str]
+    event_count: int
+    verified_at: datetime = field(default_factory=datetime.now)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            're_id': self.re_id,
+            'current_re_hash': self.current_re_hash,
+            'event_count': self.event_count,
+            'verified_at': self.verified_at.isoformat() if isinstance(self.verified_at, datetime) else self.verified_at
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'VerificationCheckpoint':
+        """Create from dictionary."""
+        checkpoint_data = data.copy()
+        
+        # Handle datetime
+        if 'verified_at' in checkpoint_data and isinstance(checkpoint_data['verified_at'], str):
+            checkpoint_data['verified_at'] = datetime.fromisoformat(checkpoint_data['verified_at'])
+            
+        return cls(**checkpoint_data)
+
+@dataclass
+class DomainMerkleTree:
+    """Merkle tree over the current_re_hash values of a domain's events, in append order."""
+    re_ids: List[str] = field(default_factory=list)
+    tree: MerkleTree = field(default_factory=MerkleTree)
+    
+    def __post_init__(self):
+        """Index the leaf positions by event ID."""
+        self._positions: Dict[str, int] = {re_id: i for i, re_id in enumerate(self.re_ids)}
+    
+    @property
+    def root(self) -> Optional[str]:
+        """Root hash of the tree."""
+        return self.tree.root
+    
+    def append(self, event_record: EventRecord) -> None:
+        """Add an Event Record as the next leaf, unless it is already in the tree."""
+        if event_record.re_id in self._positions:
+            return
+        self._positions[event_record.re_id] = len(self.re_ids)
+        self.re_ids.append(event_record.re_id)
+        self.tree.append(event_record.current_re_hash or "")
+    
+    def get_proof(self, re_id: str) -> Optional[InclusionProof]:
+        """Build the inclusion proof for an Event Record, or None if it is not in the tree."""
+        index = self._positions.get(re_id)
+        if index is None:
+            return None
+        return self.tree.get_proof(index)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            're_ids': list(self.re_ids),
+            'leaves': list(self.tree.values),
+            'frontier': [[height, node] for height, node in self.tree.frontier],
+            'root': self.tree.root
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DomainMerkleTree':
+        """Create from dictionary."""
+        tree = MerkleTree(values=data.get('leaves', []), frontier=data.get('frontier'))
+        return cls(re_ids=list(data.get('re_ids', [])), tree=tree)
+
+def find_chain_break(events: List[EventRecord], start: int = 0) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Find the first break in the hash chain formed by the events of a single domain.
+    
+    Args:
+        events (List[EventRecord]): Events of one domain, sorted by timestamp
+        start (int): Number of leading events already verified, whose hashes are not recomputed
+        
+    Returns:
+        Tuple[Optional[str], Optional[str]]: ID of the first failing event and a
+            description of the failure, or (None, None) if the chain is intact
+    """
+    if not events:
+        return None, None
+    
+    # Check first event has no previous hash (or it's None)
+    if start == 0 and events[0].previous_re_hash not in (None, ""):
+        return events[0].re_id, "first event has a previous hash"
+    
+    # Check that each event's current hash is correct
+    rehashed = events[start:]
+    for event, valid in zip(rehashed, verify_hashes(rehashed, [event.current_re_hash for event in rehashed])):
+        if not valid:
+            return event.re_id, "hash mismatch"
+    
+    # Check the chain
+    for i in range(max(start, 1), len(events)):
+        if events[i].previous_re_hash != events[i-1].current_re_hash:
+            return events[i].re_id, "broken link to previous event"
+    
+    return None, None
 
 @dataclass
 class UniversalHistory:
@@ -31,6 +175,9 @@ class UniversalHistory:
     trajectory_syntheses: Dict[str, TrajectorySynthesis] = field(default_factory=dict)  # ID -> TrajectorySynthesis
     state_document: Optional[StateDocument] = None
     domain_catalogs: Dict[str, DomainCatalog] = field(default_factory=dict)  # Domain type -> DomainCatalog
+    chain_heads: Dict[str, ChainHead] = field(default_factory=dict)  # Domain type -> ChainHead
+    verification_checkpoints: Dict[str, VerificationCheckpoint] = field(default_factory=dict)  # Domain type -> VerificationCheckpoint
+    merkle_trees: Dict[str, DomainMerkleTree] = field(default_factory=dict)  # Domain type -> DomainMerkleTree (opt-in)
     
     def add_event_record(self, event_record: EventRecord) -> None:
         """
@@ -44,11 +191,10 @@ class UniversalHistory:
             raise ValueError(f"Event Record subject ID {event_record.subject_id} does not match Universal History subject ID {self.subject_id}")
         
         # Update hash chain if there are previous events in the same domain
-        domain_events = self.get_events_by_domain(event_record.domain_type)
-        if domain_events:
-            # Find the most recent event in the domain by timestamp
-            most_recent = max(domain_events, key=lambda e: e.timestamp)
-            event_record.previous_re_hash = most_recent.current_re_hash
+        domain_key = event_record.domain_type.value if isinstance(event_record.domain_type, DomainType) else event_record.domain_type
+        head = self.get_chain_head(domain_key)
+        if head:
+            event_record.previous_re_hash = head.current_re_hash
         
         # Update the hash of the new event
         event_record.update_hash()
@@ -56,9 +202,36 @@ class UniversalHistory:
         # Add the event to the history
         self.event_records[event_record.re_id] = event_record
         
+        # Add the event to the Merkle tree of the domain, if enabled
+        merkle_tree = self.merkle_trees.get(domain_key)
+        if merkle_tree is not None:
+            merkle_tree.append(event_record)
+        
+        # Advance the chain head if the new event is the most recent in the domain
+        if head is None or event_record.timestamp >= head.timestamp:
+            self.chain_heads[domain_key] = ChainHead.from_event_record(event_record)
+        
         # Update last_updated timestamp
         self.last_updated = datetime.now()
     
+    def add_event_records(self, event_records: List[EventRecord]) -> None:
+        """
+        Add several Event Records to the Universal History.
+        
+        The records are added in timestamp order, so each domain's hash chain
+        links them in the order they happened whatever the order of the list.
+        
+        Args:
+            event_records (List[EventRecord]): The Event Records to add
+        """
+        # Check all subject IDs first so a mismatch leaves the history unchanged
+        for event_record in event_records:
+            if event_record.subject_id != self.subject_id:
+                raise ValueError(f"Event Record subject ID {event_record.subject_id} does not match Universal History subject ID {self.subject_id}")
+        
+        for event_record in sorted(event_records, key=lambda er: er.timestamp):
+            self.add_event_record(event_record)
+    
     def add_trajectory_synthesis(self, trajectory_synthesis: TrajectorySynthesis) -> None:
         """
         Add a Trajectory Synthesis to the Universal History.
@@ -106,6 +279,143 @@ class UniversalHistory:
         # Update last_updated timestamp
         self.last_updated = datetime.now()
     
+    def get_chain_head(self, domain_type: DomainType) -> Optional[ChainHead]:
+        """
+        Get the head of the event hash chain for a domain.
+        
+        The head is the most recent Event Record of the domain by timestamp. It is
+        kept up to date by add_event_record, so reading it does not scan the events.
+        
+        Args:
+            domain_type (DomainType): The domain type to get the chain head for
+            
+        Returns:
+            Optional[ChainHead]: The chain head or None if the domain has no events
+        """
+        domain_key = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        head = self.chain_heads.get(domain_key)
+        
+        # Stale or missing heads (e.g. histories persisted before chain heads existed,
+        # or events inserted directly into event_records) are rebuilt from the events
+        if head is None or head.re_id not in self.event_records:
+            head = self._rebuild_chain_head(domain_key)
+        
+        return head
+    
+    def _rebuild_chain_head(self, domain_key: str) -> Optional[ChainHead]:
+        """
+        Rebuild the chain head of a domain by scanning its events.
+        
+        Args:
+            domain_key (str): The domain type value
+            
+        Returns:
+            Optional[ChainHead]: The rebuilt chain head or None if the domain has no events
+        """
+        domain_events = self.get_events_by_domain(domain_key)
+        if not domain_events:
+            self.chain_heads.pop(domain_key, None)
+            return None
+        
+        most_recent = max(domain_events, key=lambda e: e.timestamp)
+        head = ChainHead.from_event_record(most_recent)
+        self.chain_heads[domain_key] = head
+        return head
+    
+    def rebuild_event_chain(self, domain_type: DomainType) -> Optional[str]:
+        """
+        Relink and rehash the events of a domain in timestamp order.
+        
+        Used when importing or backfilling events whose hashes are missing or stale.
+        The chain head is reset, the verification checkpoint dropped and an enabled
+        Merkle tree rebuilt over the new hashes.
+        
+        Args:
+            domain_type (DomainType): The domain type to rebuild
+            
+        Returns:
+            Optional[str]: Hash of the last event of the chain, or None if the domain has no events
+        """
+        domain_key = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        events = sorted(self.get_events_by_domain(domain_key), key=lambda e: e.timestamp)
+        
+        def link(event: EventRecord, previous_hash: Optional[str]) -> None:
+            event.previous_re_hash = previous_hash
+        
+        def rehash(event: EventRecord) -> str:
+            event.update_hash()
+            return event.current_re_hash
+        
+        last_hash = create_hash_chain(events, rehash, link)
+        
+        # Reset the state derived from the old hashes
+        self.chain_heads.pop(domain_key, None)
+        self.verification_checkpoints.pop(domain_key, None)
+        if self.merkle_trees.pop(domain_key, None) is not None:
+            self.enable_merkle_tree(domain_key)
+        self.get_chain_head(domain_key)
+        
+        return last_hash
+    
+    def enable_merkle_tree(self, domain_type: DomainType) -> Optional[str]:
+        """
+        Maintain a Merkle tree over the event hashes of a domain.
+        
+        Existing events are added in timestamp order; later events are appended
+        as they are added to the history.
+        
+        Args:
+            domain_type (DomainType): The domain type to build the tree for
+            
+        Returns:
+            Optional[str]: The Merkle root, or None if the domain has no events yet
+        """
+        domain_key = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        
+        merkle_tree = self.merkle_trees.get(domain_key)
+        if merkle_tree is None:
+            merkle_tree = DomainMerkleTree()
+            for event in sorted(self.get_events_by_domain(domain_key), key=lambda e: e.timestamp):
+                merkle_tree.append(event)
+            self.merkle_trees[domain_key] = merkle_tree
+        
+        return merkle_tree.root
+    
+    def get_merkle_root(self, domain_type: DomainType) -> Optional[str]:
+        """
+        Get the Merkle root of a domain.
+        
+        Args:
+            domain_type (DomainType): The domain type to get the root for
+            
+        Returns:
+            Optional[str]: The Merkle root, or None if the tree is not enabled or empty
+        """
+        domain_key = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        merkle_tree = self.merkle_trees.get(domain_key)
+        return merkle_tree.root if merkle_tree else None
+    
+    def get_inclusion_proof(self, re_id: str) -> Optional[InclusionProof]:
+        """
+        Get the proof that an Event Record is included in the Merkle tree of its domain.
+        
+        Args:
+            re_id (str): ID of the Event Record
+            
+        Returns:
+            Optional[InclusionProof]: The proof, or None if the event is not in a Merkle tree
+        """
+        event_record = self.event_records.get(re_id)
+        if not event_record:
+            return None
+        
+        domain_key = event_record.domain_type.value if isinstance(event_record.domain_type, DomainType) else event_record.domain_type
+        merkle_tree = self.merkle_trees.get(domain_key)
+        if merkle_tree is None:
+            return None
+        
+        return merkle_tree.get_proof(re_id)
+    
     def get_event_record(self, re_id: str) -> Optional[EventRecord]:
         """
         Get an Event Record by ID.
@@ -154,8 +464,10 @@ class UniversalHistory:
             List[EventRecord]: List of Event Records for the specified domain
         """
         domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
-        return [er for er in self.event_records.values() if 
-                (er.domain_type.value if isinstance(er.domain_type, DomainType) else er.domain_type) == domain_type_value]
+        # Compare the domain before touching the record, so lazily loaded records
+        # of other domains stay undecoded
+        return [self.event_records[re_id] for re_id in self.event_records if
+                _domain_value(peek_field(self.event_records, re_id, 'domain_type')) == domain_type_value]
     
     def get_syntheses_by_domain(self, domain_type: DomainType) -> List[TrajectorySynthesis]:
         """
@@ -168,8 +480,8 @@ class UniversalHistory:
             List[TrajectorySynthesis]: List of Trajectory Syntheses for the specified domain
         """
         domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
-        return [ts for ts in self.trajectory_syntheses.values() if 
-                (ts.domain_type.value if isinstance(ts.domain_type, DomainType) else ts.domain_type) == domain_type_value]
+        return [self.trajectory_syntheses[st_id] for st_id in self.trajectory_syntheses if
+                _domain_value(peek_field(self.trajectory_syntheses, st_id, 'domain_type')) == domain_type_value]
     
     def get_recent_events(self, limit: int = 10) -> List[EventRecord]:
         """
@@ -192,9 +504,8 @@ class UniversalHistory:
             Set[str]: Set of domain type values
         """
         domains = set()
-        for er in self.event_records.values():
-            domain_type_value = er.domain_type.value if isinstance(er.domain_type, DomainType) else er.domain_type
-            domains.add(domain_type_value)
+        for re_id in self.event_records:
+            domains.add(_domain_value(peek_field(self.event_records, re_id, 'domain_type')))
         return domains
     
     def to_dict(self) -> Dict[str, Any]:
@@ -204,108 +515,7 @@ class UniversalHistory:
         Returns:
             Dict[str, Any]: Dictionary representation of the UniversalHistory
         """
-        result = {
-            'hu_id': self.hu_id,
-            'subject_id': self.subject_id,
-            'created_at': self.created_at.isoformat() if isinstance(self.created_at, datetime) else self.created_at,
-            'last_updated': self.last_updated.isoformat() if isinstance(self.last_updated, datetime) else self.last_updated,
-        }
-        
-        # Add event_records safely
-        if hasattr(self, 'event_records') and self.event_records:
-            event_records_dict = {}
-            for re_id, er in self.event_records.items():
-                try:
-                    if hasattr(er, 'to_dict') and callable(getattr(er, 'to_dict')):
-                        event_records_dict[re_id] = er.to_dict()
-                    else:
-                        # Simple representation if to_dict not available
-                        event_records_dict[re_id] = {
-                            're_id': getattr(er, 're_id', re_id),
-                            'subject_id': getattr(er, 'subject_id', self.subject_id),
-                            'domain_type': getattr(er, 'domain_type', None),
-                            'event_type': getattr(er, 'event_type', None)
-                        }
-                except RecursionError:
-                    # Fallback in case of recursion
-                    event_records_dict[re_id] = {
-                        're_id': re_id,
-                        'subject_id': self.subject_id,
-                        'note': 'Full representation unavailable due to recursion'
-                    }
-            result['event_records'] = event_records_dict
-        else:
-            result['event_records'] = {}
-            
-        # Add trajectory_syntheses safely
-        if hasattr(self, 'trajectory_syntheses') and self.trajectory_syntheses:
-            syntheses_dict = {}
-            for st_id, ts in self.trajectory_syntheses.items():
-                try:
-                    if hasattr(ts, 'to_dict') and callable(getattr(ts, 'to_dict')):
-                        syntheses_dict[st_id] = ts.to_dict()
-                    else:
-                        # Simple representation if to_dict not available
-                        syntheses_dict[st_id] = {
-                            'st_id': getattr(ts, 'st_id', st_id),
-                            'subject_id': getattr(ts, 'subject_id', self.subject_id),
-                            'domain_type': getattr(ts, 'domain_type', None),
-                            'synthesis_type': getattr(ts, 'synthesis_type', None)
-                        }
-                except RecursionError:
-                    # Fallback in case of recursion
-                    syntheses_dict[st_id] = {
-                        'st_id': st_id,
-                        'subject_id': self.subject_id,
-                        'note': 'Full representation unavailable due to recursion'
-                    }
-            result['trajectory_syntheses'] = syntheses_dict
-        else:
-            result['trajectory_syntheses'] = {}
-            
-        # Add domain_catalogs safely
-        if hasattr(self, 'domain_catalogs') and self.domain_catalogs:
-            catalogs_dict = {}
-            for domain, catalog in self.domain_catalogs.items():
-                try:
-                    if hasattr(catalog, 'to_dict') and callable(getattr(catalog, 'to_dict')):
-                        catalogs_dict[domain] = catalog.to_dict()
-                    else:
-                        # Simple representation if to_dict not available
-                        domain_type_value = domain
-                        catalogs_dict[domain] = {
-                            'domain_type': domain_type_value,
-                            'cdd_id': getattr(catalog, 'cdd_id', None),
-                        }
-                except RecursionError:
-                    # Fallback in case of recursion
-                    catalogs_dict[domain] = {
-                        'domain_type': domain,
-                        'note': 'Full representation unavailable due to recursion'
-                    }
-            result['domain_catalogs'] = catalogs_dict
-        else:
-            result['domain_catalogs'] = {}
-        
-        # Add state_document safely
-        if self.state_document:
-            try:
-                if hasattr(self.state_document, 'to_dict') and callable(getattr(self.state_document, 'to_dict')):
-                    result['state_document'] = self.state_document.to_dict()
-                else:
-                    # Simple representation if to_dict not available
-                    result['state_document'] = {
-                        'de_id': getattr(self.state_document, 'de_id', None),
-                        'subject_id': getattr(self.state_document, 'subject_id', self.subject_id)
-                    }
-            except RecursionError:
-                # Fallback in case of recursion
-                result['state_document'] = {
-                    'subject_id': self.subject_id,
-                    'note': 'Full representation unavailable due to recursion'
-                }
-            
-        return result
+        return _UNIVERSAL_HISTORY_SERIALIZER.encode(self)
     
     def to_json(self) -> str:
         """
@@ -314,56 +524,24 @@ class UniversalHistory:
         Returns:
             str: JSON representation of the UniversalHistory
         """
-        return json.dumps(self.to_dict(), default=str)
+        return json_utils.dumps(self.to_dict())
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'UniversalHistory':
+    def from_dict(cls, data: Dict[str, Any], lazy: bool = False) -> 'UniversalHistory':
         """
         Create a UniversalHistory from a dictionary.
         
         Args:
             data (Dict[str, Any]): Dictionary containing UniversalHistory data
+            lazy (bool): Whether to keep event records, trajectory syntheses and domain
+                catalogs as dictionaries until they are first accessed
             
         Returns:
             UniversalHistory: New UniversalHistory instance
         """
-        # Create a copy to avoid modifying the original
-        history_data = data.copy()
-        
-        # Create a basic history with just the subject ID
-        subject_id = history_data.pop('subject_id')
-        history = cls(subject_id=subject_id)
-        
-        # Set basic attributes
-        if 'hu_id' in history_data:
-            history.hu_id = history_data['hu_id']
-            
-        if 'created_at' in history_data and isinstance(history_data['created_at'], str):
-            history.created_at = datetime.fromisoformat(history_data['created_at'])
-            
-        if 'last_updated' in history_data and isinstance(history_data['last_updated'], str):
-            history.last_updated = datetime.fromisoformat(history_data['last_updated'])
-        
-        # Add Event Records
-        if 'event_records' in history_data:
-            for re_id, er_data in history_data['event_records'].items():
-                history.event_records[re_id] = EventRecord.from_dict(er_data)
-        
-        # Add Trajectory Syntheses
-        if 'trajectory_syntheses' in history_data:
-            for st_id, ts_data in history_data['trajectory_syntheses'].items():
-                history.trajectory_syntheses[st_id] = TrajectorySynthesis.from_dict(ts_data)
-        
-        # Set State Document
-        if 'state_document' in history_data and history_data['state_document']:
-            history.state_document = StateDocument.from_dict(history_data['state_document'])
-        
-        # Add Domain Catalogs
-        if 'domain_catalogs' in history_data:
-            for domain, catalog_data in history_data['domain_catalogs'].items():
-                history.domain_catalogs[domain] = DomainCatalog.from_dict(catalog_data)
-        
-        return history
+        if lazy:
+            return _LAZY_UNIVERSAL_HISTORY_SERIALIZER.decode(data)
+        return _UNIVERSAL_HISTORY_SERIALIZER.decode(data)
     
     @classmethod
     def from_json(cls, json_str: str) -> 'UniversalHistory':
@@ -376,41 +554,100 @@ class UniversalHistory:
         Returns:
             UniversalHistory: New UniversalHistory instance
         """
-        data = json.loads(json_str)
+        data = json_utils.loads(json_str)
         return cls.from_dict(data)
     
-    def verify_event_chain(self, domain_type: DomainType) -> bool:
+    def verify_event_chain(self, domain_type: DomainType, full: bool = False) -> bool:
         """
         Verify the integrity of the event chain for a specific domain.
         
         This method checks that each event's previous_re_hash matches the
-        current_re_hash of the previous event in the chain.
+        current_re_hash of the previous event in the chain. If the domain has a
+        verification checkpoint, only the events appended after it are rehashed;
+        a successful verification moves the checkpoint to the end of the chain.
         
         Args:
             domain_type (DomainType): The domain type to verify
+            full (bool): Whether to ignore the checkpoint and rehash every event
             
         Returns:
             bool: True if the chain is valid, False otherwise
         """
+        domain_key = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        
         # Get events for the domain sorted by timestamp
         events = sorted(self.get_events_by_domain(domain_type), key=lambda e: e.timestamp)
         
         if not events:
             return True  # No events to verify
         
-        # Check first event has no previous hash (or it's None)
-        if events[0].previous_re_hash not in (None, ""):
+        # Resume after the checkpoint if it still marks the same prefix of the chain
+        start = 0
+        checkpoint = None if full else self.verification_checkpoints.get(domain_key)
+        if checkpoint and checkpoint.event_count <= len(events):
+            last_verified = events[checkpoint.event_count - 1]
+            if (last_verified.re_id == checkpoint.re_id and
+                    last_verified.current_re_hash == checkpoint.current_re_hash):
+                start = checkpoint.event_count
+        
+        # Check the events after the checkpoint and their links
+        failed_re_id, _ = find_chain_break(events, start)
+        if failed_re_id is not None:
             return False
         
-        # Check that each event's current hash is correct
-        for event in events:
-            calculated_hash = event.calculate_hash()
-            if event.current_re_hash != calculated_hash:
-                return False
-        
-        # Check the chain
-        for i in range(1, len(events)):
-            if events[i].previous_re_hash != events[i-1].current_re_hash:
-                return False
+        # Move the checkpoint to the end of the verified chain
+        if start < len(events):
+            self.verification_checkpoints[domain_key] = VerificationCheckpoint(
+                re_id=events[-1].re_id,
+                current_re_hash=events[-1].current_re_hash,
+                event_count=len(events)
+            )
         
         return True
+
+def _domain_value(domain_type: Any) -> Any:
+    """Get the value of a domain type, which may already be a string."""
+    return domain_type.value if isinstance(domain_type, DomainType) else domain_type
+
+_UNIVERSAL_HISTORY_OPTIONS = dict(
+    order=[
+        'hu_id', 'subject_id', 'created_at', 'last_updated', 'event_records', 'trajectory_syntheses',
+        'domain_catalogs', 'chain_heads', 'verification_checkpoints', 'merkle_trees', 'state_document'
+    ],
+    exclude=['organization'],
+    omit_if_falsy=['merkle_trees', 'state_document'],
+    ignore_unknown=True
+)
+
+_UNIVERSAL_HISTORY_ENCODERS = {
+    'event_records': lambda v: encode_records(v, EventRecord.to_dict),
+    'trajectory_syntheses': lambda v: encode_records(v, TrajectorySynthesis.to_dict),
+    'domain_catalogs': lambda v: encode_records(v, DomainCatalog.to_dict),
+    'merkle_trees': lambda v: {domain: tree.to_dict() for domain, tree in v.items()}
+}
+
+_UNIVERSAL_HISTORY_DECODERS = {
+    'merkle_trees': lambda v: {domain: DomainMerkleTree.from_dict(tree) for domain, tree in v.items()},
+    'state_document': lambda v: StateDocument.from_dict(v) if v else None
+}
+
+_UNIVERSAL_HISTORY_SERIALIZER = Serializer(
+    UniversalHistory,
+    encoders=_UNIVERSAL_HISTORY_ENCODERS,
+    decoders=_UNIVERSAL_HISTORY_DECODERS,
+    **_UNIVERSAL_HISTORY_OPTIONS
+)
+
+# Used by from_dict(..., lazy=True): the record collections become LazyRecordMappings
+_LAZY_UNIVERSAL_HISTORY_SERIALIZER = Serializer(
+    UniversalHistory,
+    encoders=_UNIVERSAL_HISTORY_ENCODERS,
+    decoders={
+        **_UNIVERSAL_HISTORY_DECODERS,
+        'event_records': lambda v: LazyRecordMapping(v, EventRecord.from_dict),
+        'trajectory_syntheses': lambda v: LazyRecordMapping(v, TrajectorySynthesis.from_dict),
+        'domain_catalogs': lambda v: LazyRecordMapping(v, DomainCatalog.from_dict)
+    },
+    register=False,
+    **_UNIVERSAL_HISTORY_OPTIONS
+)
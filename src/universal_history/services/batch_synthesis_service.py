@@ -0,0 +1,227 @@
+"""
+Batch generation of Trajectory Syntheses for many subjects.
+
+Subjects are fanned out across a process pool. The repository and the period
+are sent to each worker process once, when it starts; a task only names a
+subject and its history. Each worker handles a whole subject: it reads the events of the requested domains in the period with one
+query (HistoryRepository.query_events, so backends filter at the source),
+builds the syntheses (build_synthesis_from_events) and writes them with one
+repository write (HistoryRepository.save_trajectory_syntheses). The calling
+thread only lists the subjects, from the repository's subject index.
+
+Repositories that keep their data in process memory cannot be shared with
+worker processes (see HistoryRepository.supports_worker_processes); their
+subjects are handled in the calling thread.
+
+Results are yielded per subject as soon as they are written, so a long run can
+report progress, and a failing subject (a missing history, a corrupt file...)
+does not stop the others.
+"""
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..models.event_record import EventRecord, DomainType
+from ..storage.query import EventFilter
+from ..storage.repository import HistoryRepository
+from ..utils.parallel import iter_parallel, resolve_workers
+from .synthesis_service import build_synthesis_from_events
+
+# Shared by every task of a run: repository, domains, start date, end date and level
+SynthesisRun = Tuple[HistoryRepository, List[DomainType], datetime, datetime, int]
+
+# A subject to synthesize: subject ID and history ID (None if the subject has no history)
+SynthesisTask = Tuple[str, Optional[str]]
+
+@dataclass
+class SubjectSynthesisResult:
+    """Outcome of the batch synthesis of one subject."""
+    subject_id: str
+    hu_id: Optional[str] = None
+    st_ids: List[str] = field(default_factory=list)  # One per domain with events in the period
+    event_count: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the subject was handled without error."""
+        return self.error is None
+
+@dataclass
+class BatchSynthesisReport:
+    """Summary of a batch synthesis run."""
+    subjects_processed: int = 0
+    subjects_skipped: int = 0  # No events in the period
+    syntheses_written: int = 0
+    events_read: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[SubjectSynthesisResult] = field(default_factory=list)
+
+    @property
+    def subjects_failed(self) -> int:
+        """Number of subjects that could not be synthesized."""
+        return len(self.errors)
+
+    @property
+    def subjects_per_second(self) -> float:
+        """Throughput of the run in subjects per second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.subjects_processed / self.elapsed_seconds
+
+    def add_result(self, result: SubjectSynthesisResult) -> None:
+        """
+        Account for the result of one subject.
+
+        Args:
+            result (SubjectSynthesisResult): The result
+        """
+        self.subjects_processed += 1
+        self.events_read += result.event_count
+        self.syntheses_written += len(result.st_ids)
+        if not result.ok:
+            self.errors.append(result)
+        elif not result.st_ids:
+            self.subjects_skipped += 1
+
+def _synthesize_subject(run: SynthesisRun, task: SynthesisTask) -> SubjectSynthesisResult:
+    """
+    Read, synthesize and save the events of one subject. Runs inside a worker process.
+
+    Args:
+        run (SynthesisRun): The repository and the period to synthesize
+        task (SynthesisTask): The subject to synthesize
+
+    Returns:
+        SubjectSynthesisResult: The result
+    """
+    repository, domain_types, start_date, end_date, level = run
+    subject_id, hu_id = task
+    result = SubjectSynthesisResult(subject_id=subject_id, hu_id=hu_id)
+    if hu_id is None:
+        result.error = f"No Universal History found for subject {subject_id}"
+        return result
+
+    try:
+        # Read the events of every requested domain in one pass, oldest first
+        event_filter = EventFilter(domain_type=domain_types, start_date=start_date, end_date=end_date)
+        events = repository.query_events(hu_id, event_filter, sort="timestamp").events
+        result.event_count = len(events)
+
+        by_domain: Dict[str, List[EventRecord]] = {}
+        for event in events:
+            domain_type = event.domain_type.value if isinstance(event.domain_type, DomainType) else event.domain_type
+            by_domain.setdefault(domain_type, []).append(event)
+
+        syntheses = [
+            build_synthesis_from_events(subject_id, domain_type, by_domain[domain_type.value], start_date, end_date, level)
+            for domain_type in domain_types
+            if by_domain.get(domain_type.value)
+        ]
+        if syntheses:
+            result.st_ids = repository.save_trajectory_syntheses(syntheses, hu_id)
+    except (TypeError, ValueError, KeyError, AttributeError, OSError) as e:
+        # ValueError includes the JSONDecodeError of a corrupt history file
+        result.error = f"{type(e).__name__}: {e}"
+        result.st_ids = []
+    return result
+
+class BatchSynthesisService:
+    """
+    Service for generating Trajectory Syntheses for many subjects in parallel.
+    """
+
+    def __init__(self, repository: HistoryRepository, workers: Optional[int] = None):
+        """
+        Initialize the service with a repository.
+
+        Args:
+            repository (HistoryRepository): The repository to read events from and write syntheses to
+            workers (Optional[int]): Number of worker processes, or None for one per CPU
+        """
+        self.repository = repository
+        self.workers = resolve_workers(workers)
+
+    def iter_generate_syntheses(self,
+                                domain_types: Union[str, DomainType, Iterable[Union[str, DomainType]]],
+                                start_date: datetime,
+                                end_date: datetime,
+                                subject_ids: Optional[Iterable[str]] = None,
+                                level: int = 1) -> Iterator[SubjectSynthesisResult]:
+        """
+        Generate and save the syntheses of a period for many subjects, yielding results as they are written.
+
+        Each subject gets one synthesis per domain with events in the period, as
+        SynthesisService.generate_synthesis_from_events would create; subjects
+        without events are reported with no synthesis IDs.
+
+        Args:
+            domain_types (Union[str, DomainType, Iterable[Union[str, DomainType]]]): Domain or domains to synthesize
+            start_date (datetime): Start date of the period
+            end_date (datetime): End date of the period
+            subject_ids (Optional[Iterable[str]]): Subjects to synthesize (defaults to every history in the repository)
+            level (int): Hierarchical level of the syntheses
+
+        Returns:
+            Iterator[SubjectSynthesisResult]: Results in completion order
+        """
+        if isinstance(domain_types, (str, DomainType)):
+            domain_types = [domain_types]
+        domain_types = [DomainType(d) if isinstance(d, str) else d for d in domain_types]
+
+        # Repositories held in process memory are worked on in this process
+        workers = self.workers if self.repository.supports_worker_processes else 1
+        run = (self.repository, domain_types, start_date, end_date, level)
+        tasks = self._iter_tasks(subject_ids)
+        yield from iter_parallel(_synthesize_subject, tasks, workers=workers, context=run)
+
+    def generate_syntheses(self,
+                           domain_types: Union[str, DomainType, Iterable[Union[str, DomainType]]],
+                           start_date: datetime,
+                           end_date: datetime,
+                           subject_ids: Optional[Iterable[str]] = None,
+                           level: int = 1,
+                           on_result: Optional[Callable[[SubjectSynthesisResult], None]] = None) -> BatchSynthesisReport:
+        """
+        Generate and save the syntheses of a period for many subjects and summarize the run.
+
+        Args:
+            domain_types (Union[str, DomainType, Iterable[Union[str, DomainType]]]): Domain or domains to synthesize
+            start_date (datetime): Start date of the period
+            end_date (datetime): End date of the period
+            subject_ids (Optional[Iterable[str]]): Subjects to synthesize (defaults to every history in the repository)
+            level (int): Hierarchical level of the syntheses
+            on_result (Optional[Callable[[SubjectSynthesisResult], None]]): Called with
+                each result as soon as it is available, e.g. to report progress
+
+        Returns:
+            BatchSynthesisReport: Counts, throughput and errors of the run
+        """
+        report = BatchSynthesisReport()
+        start = time.perf_counter()
+
+        for result in self.iter_generate_syntheses(domain_types, start_date, end_date, subject_ids, level):
+            report.add_result(result)
+            if on_result:
+                on_result(result)
+
+        report.elapsed_seconds = time.perf_counter() - start
+        return report
+
+    def _iter_tasks(self, subject_ids: Optional[Iterable[str]]) -> Iterator[SynthesisTask]:
+        """
+        List the subjects to synthesize, without reading their histories.
+
+        Args:
+            subject_ids (Optional[Iterable[str]]): Subjects to synthesize, or None for every history
+
+        Returns:
+            Iterator[SynthesisTask]: Synthesis tasks
+        """
+        subject_index = self.repository.get_subject_index()
+        if subject_ids is None:
+            subject_ids = subject_index
+
+        for subject_id in subject_ids:
+            yield subject_id, subject_index.get(subject_id)
@@ -0,0 +1,303 @@
+"""
+Token-budgeted LLM context for a subject.
+
+The State Document, its recent and significant events, the Trajectory
+Syntheses and the cross-domain insights of a subject are split into fragments.
+Each fragment gets a score from its kind, its rank within its domain and the
+weight of the domain. Fragments are then taken best first while they fit the
+token budget. Token counts are estimated from the text length, so no
+tokenizer is needed. Results are memoized per subject, budget, domains and
+version of the history, as reported by the repository.
+"""
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..models.event_record import DomainType
+from ..models.universal_history import UniversalHistory
+from ..storage.repository import HistoryRepository
+
+# Rough number of characters per token of English text for common LLM tokenizers
+CHARS_PER_TOKEN = 4
+
+DEFAULT_TOKEN_BUDGET = 2000
+
+# Base score of each kind of fragment, before domain weights and rank decay
+FRAGMENT_SCORES = {
+    'header': 100.0,
+    'status': 10.0,
+    'attributes': 6.0,
+    'significant_event': 5.0,
+    'recent_event': 4.0,
+    'synthesis': 3.0,
+    'insight': 3.0,
+}
+
+# Section of the fragments that do not belong to a domain
+INSIGHTS_SECTION = "cross-domain insights"
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text without a tokenizer.
+
+    The estimate is the larger of the word count and the character count divided
+    by CHARS_PER_TOKEN, which errs on the high side for typical prose.
+
+    Args:
+        text (str): The text
+
+    Returns:
+        int: Estimated number of tokens
+    """
+    return max(len(text.split()), math.ceil(len(text) / CHARS_PER_TOKEN))
+
+@dataclass
+class ContextFragment:
+    """A piece of context that is either included whole or left out."""
+    text: str
+    kind: str
+    score: float
+    section: Optional[str] = None  # Domain of the fragment, INSIGHTS_SECTION, or None for the header
+    position: int = 0  # Order of the fragment within its section
+    tokens: int = 0
+
+    def __post_init__(self):
+        if not self.tokens:
+            # Count the line break that joins the fragment to the next one
+            self.tokens = estimate_tokens(self.text + "\n")
+
+@dataclass
+class LLMContext:
+    """Context built for a subject within a token budget."""
+    text: str
+    tokens: int  # Estimated tokens of the included fragments and section headings
+    token_budget: int
+    fragments: List[ContextFragment] = field(default_factory=list)  # Included, in output order
+    omitted: int = 0  # Candidate fragments left out for lack of budget
+
+def _domain_key(domain_type: Union[str, DomainType]) -> str:
+    return domain_type.value if isinstance(domain_type, DomainType) else domain_type
+
+def _section_heading(section: str, history: UniversalHistory) -> str:
+    """Heading line of a section of the context."""
+    if section == INSIGHTS_SECTION:
+        return f"\n## {section.upper()}"
+    state = history.state_document.domains.get(section) if history.state_document else None
+    if state:
+        return f"\n## {section.upper()} (Updated: {state.last_updated.isoformat()})"
+    return f"\n## {section.upper()}"
+
+def collect_fragments(history: UniversalHistory,
+                      domains: Optional[Iterable[str]] = None,
+                      domain_weights: Optional[Dict[str, float]] = None) -> List[ContextFragment]:
+    """
+    Split the state, events, syntheses and insights of a history into scored fragments.
+
+    Args:
+        history (UniversalHistory): The history
+        domains (Optional[Iterable[str]]): Domains to include (defaults to all)
+        domain_weights (Optional[Dict[str, float]]): Weight of each domain (default 1.0;
+            0 leaves the domain out)
+
+    Returns:
+        List[ContextFragment]: The candidate fragments
+    """
+    weights = {_domain_key(d): w for d, w in (domain_weights or {}).items()}
+    selected = {_domain_key(d) for d in domains} if domains is not None else None
+
+    def weight(domain: str) -> float:
+        if selected is not None and domain not in selected:
+            return 0.0
+        return weights.get(domain, 1.0)
+
+    fragments = []
+    state_document = history.state_document
+
+    # Header
+    header = f"Subject ID: {history.subject_id}"
+    if state_document:
+        header += f"\nGeneral summary: {state_document.general_summary}"
+    fragments.append(ContextFragment(header, 'header', FRAGMENT_SCORES['header']))
+
+    # Domain states
+    if state_document:
+        for domain, state in state_document.domains.items():
+            w = weight(domain)
+            if w <= 0:
+                continue
+            fragments.append(ContextFragment(
+                f"Current status: {state.current_status}", 'status', FRAGMENT_SCORES['status'] * w, domain, 0
+            ))
+            if state.key_attributes:
+                attributes = ", ".join(f"{k}: {v}" for k, v in state.key_attributes.items())
+                fragments.append(ContextFragment(
+                    f"Key attributes: {attributes}", 'attributes', FRAGMENT_SCORES['attributes'] * w, domain, 1
+                ))
+            for rank, event in enumerate(state.significant_events):
+                fragments.append(ContextFragment(
+                    f"- Significant: {event.description}", 'significant_event',
+                    FRAGMENT_SCORES['significant_event'] * w / (1 + rank), domain, 100 + rank
+                ))
+            for rank, event in enumerate(state.recent_events):
+                when = f" ({event.timestamp.date().isoformat()})" if event.timestamp else ""
+                fragments.append(ContextFragment(
+                    f"- Recent{when}: {event.description}", 'recent_event',
+                    FRAGMENT_SCORES['recent_event'] * w / (1 + rank), domain, 200 + rank
+                ))
+
+        # Cross-domain insights
+        insights = state_document.aggregated_insights
+        for rank, (label, text) in enumerate(
+            [("Pattern", p) for p in insights.cross_domain_patterns]
+            + [("Risk", r) for r in insights.potential_risks]
+            + [("Recommended", a) for a in insights.recommended_actions]
+            + [("Opportunity", o) for o in insights.potential_opportunities]
+        ):
+            fragments.append(ContextFragment(
+                f"- {label}: {text}", 'insight', FRAGMENT_SCORES['insight'] / (1 + 0.5 * rank), INSIGHTS_SECTION, rank
+            ))
+
+    # Syntheses: higher levels summarize more, newer ones come first within a level
+    by_domain: Dict[str, List[Any]] = {}
+    for synthesis in history.trajectory_syntheses.values():
+        by_domain.setdefault(_domain_key(synthesis.domain_type), []).append(synthesis)
+    for domain, syntheses in by_domain.items():
+        w = weight(domain)
+        if w <= 0:
+            continue
+        syntheses.sort(key=lambda s: (s.level, s.time_frame.end), reverse=True)
+        for rank, synthesis in enumerate(syntheses):
+            period = f"{synthesis.time_frame.start.date().isoformat()} to {synthesis.time_frame.end.date().isoformat()}"
+            fragments.append(ContextFragment(
+                f"- Synthesis (level {synthesis.level}, {period}): {synthesis.summary}", 'synthesis',
+                FRAGMENT_SCORES['synthesis'] * w * synthesis.level / (1 + rank), domain, 300 + rank
+            ))
+
+    return fragments
+
+def pack_fragments(fragments: List[ContextFragment], token_budget: int,
+                   history: UniversalHistory) -> LLMContext:
+    """
+    Take the best fragments that fit a token budget and render them.
+
+    Fragments are considered best score first; a fragment that does not fit is
+    skipped and smaller ones may still be taken. Opening a section costs the
+    tokens of its heading.
+
+    Args:
+        fragments (List[ContextFragment]): The candidate fragments
+        token_budget (int): Maximum number of estimated tokens
+        history (UniversalHistory): The history the fragments come from
+
+    Returns:
+        LLMContext: The packed context
+    """
+    used = 0
+    included: List[ContextFragment] = []
+    headings: Dict[str, str] = {}
+    for fragment in sorted(fragments, key=lambda f: f.score, reverse=True):
+        cost = fragment.tokens
+        heading = None
+        if fragment.section is not None and fragment.section not in headings:
+            heading = _section_heading(fragment.section, history)
+            cost += estimate_tokens(heading + "\n")
+        if used + cost > token_budget:
+            continue
+        used += cost
+        included.append(fragment)
+        if heading is not None:
+            headings[fragment.section] = heading
+
+    # Render: header, then sections in order of their best fragment
+    section_rank: Dict[Optional[str], int] = {}
+    for fragment in included:
+        section_rank.setdefault(fragment.section, len(section_rank))
+    included.sort(key=lambda f: (f.section is not None, section_rank[f.section], f.position))
+
+    lines = []
+    current = None
+    for fragment in included:
+        if fragment.section is not None and fragment.section != current:
+            lines.append(headings[fragment.section])
+            current = fragment.section
+        lines.append(fragment.text)
+
+    return LLMContext(
+        text="\n".join(lines),
+        tokens=used,
+        token_budget=token_budget,
+        fragments=included,
+        omitted=len(fragments) - len(included)
+    )
+
+class ContextBuilder:
+    """
+    Builds token-budgeted LLM context for subjects, memoizing the results.
+    """
+
+    def __init__(self, repository: HistoryRepository, cache_size: int = 256):
+        """
+        Initialize the builder with a repository.
+
+        Args:
+            repository (HistoryRepository): The repository to read histories from
+            cache_size (int): Maximum number of memoized contexts
+        """
+        self.repository = repository
+        self.cache_size = max(0, cache_size)
+        self._cache: 'OrderedDict[Tuple[Any, ...], LLMContext]' = OrderedDict()
+
+    def build(self, subject_id: str,
+              token_budget: int = DEFAULT_TOKEN_BUDGET,
+              domains: Optional[Iterable[Union[str, DomainType]]] = None,
+              domain_weights: Optional[Dict[Union[str, DomainType], float]] = None) -> LLMContext:
+        """
+        Build the LLM context of a subject within a token budget.
+
+        A context is reused while the history has not been saved since it was
+        built. Whether it was is asked of the repository
+        (HistoryRepository.get_history_version), so a cache hit does not load the
+        history on backends that can tell without reading it.
+
+        Args:
+            subject_id (str): ID of the subject
+            token_budget (int): Maximum number of estimated tokens
+            domains (Optional[Iterable[Union[str, DomainType]]]): Domains to include (defaults to all)
+            domain_weights (Optional[Dict[Union[str, DomainType], float]]): Relative importance
+                of each domain (default 1.0)
+
+        Returns:
+            LLMContext: The context
+        """
+        version = self.repository.get_history_version(subject_id)
+        if version is None:
+            raise ValueError(f"No Universal History found for subject {subject_id}")
+
+        domain_list = sorted(_domain_key(d) for d in domains) if domains is not None else None
+        weights = sorted((_domain_key(d), float(w)) for d, w in (domain_weights or {}).items())
+        key = (subject_id, token_budget, tuple(domain_list) if domain_list is not None else None,
+               tuple(weights), version)
+
+        context = self._cache.get(key)
+        if context is not None:
+            self._cache.move_to_end(key)
+            return context
+
+        # The version was read first, so a save in between only makes the entry stale early
+        history = self.repository.get_history_by_subject(subject_id)
+        if not history:
+            raise ValueError(f"No Universal History found for subject {subject_id}")
+
+        fragments = collect_fragments(history, domain_list, dict(weights))
+        context = pack_fragments(fragments, token_budget, history)
+
+        if self.cache_size:
+            self._cache[key] = context
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return context
+
+    def clear_cache(self) -> None:
+        """Forget the memoized contexts."""
+        self._cache.clear()
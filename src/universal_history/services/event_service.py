@@ -1,13 +1,52 @@
 """
 Event service for creating and retrieving event records.
 """
-from typing import Dict, List, Optional, Any, Union, Tuple
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Any, Union, Tuple
 from datetime import datetime
 
 from ..models.event_record import EventRecord, DomainType, RawInput, Source, SourceType, ProcessedData
 from ..models.universal_history import UniversalHistory
+from ..storage.metric_series import MetricSummary
+from ..storage.query import EventFilter, EventPage
 from ..storage.repository import HistoryRepository
 
+logger = logging.getLogger(__name__)
+
+@dataclass
+class EventBatchItemResult:
+    """Outcome of one item of a batch passed to EventService.create_event_records."""
+    index: int
+    subject_id: Optional[str] = None
+    hu_id: Optional[str] = None
+    re_id: Optional[str] = None
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the event record was created."""
+        return self.error is None
+
+@dataclass
+class EventBatchResult:
+    """Outcome of EventService.create_event_records."""
+    items: List[EventBatchItemResult] = field(default_factory=list)
+    histories_written: int = 0
+    
+    @property
+    def created(self) -> List[EventBatchItemResult]:
+        """Items whose event record was created."""
+        return [item for item in self.items if item.ok]
+    
+    @property
+    def failed(self) -> List[EventBatchItemResult]:
+        """Items that could not be created."""
+        return [item for item in self.items if not item.ok]
+
+# Called with the ID of a history and the Event Records just saved to it
+EventSubscriber = Callable[[str, List[EventRecord]], None]
+
 class EventService:
     """
     Service for managing Event Records in the Universal History system.
@@ -21,6 +60,41 @@ class EventService:
             repository (HistoryRepository): The repository to use for storage
         """
         self.repository = repository
+        self._subscribers: List[EventSubscriber] = []
+    
+    def subscribe(self, subscriber: EventSubscriber) -> None:
+        """
+        Register a function to call after Event Records are saved through this service.
+        
+        The subscriber is called once per history written, with the history ID and
+        the saved records, after every write of the call has finished. It runs in
+        the saving thread, so it should be quick; exceptions it raises are logged
+        and do not make the save fail.
+        
+        Args:
+            subscriber (EventSubscriber): The function to call
+        """
+        if subscriber not in self._subscribers:
+            self._subscribers.append(subscriber)
+    
+    def unsubscribe(self, subscriber: EventSubscriber) -> None:
+        """
+        Stop calling a subscriber.
+        
+        Args:
+            subscriber (EventSubscriber): A function registered with subscribe
+        """
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+    
+    def _notify(self, hu_id: str, event_records: List[EventRecord]) -> None:
+        """Call the subscribers with Event Records saved to a history, logging their errors."""
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(hu_id, event_records)
+            except Exception:
+                # The events are already saved; a failing subscriber must not report them as failed
+                logger.exception("Event subscriber %r failed for history %s", subscriber, hu_id)
     
     def create_event_record(self, 
                            subject_id: str,
@@ -70,6 +144,150 @@ class EventService:
             history = UniversalHistory(subject_id=subject_id)
             self.repository.save_history(history)
         
+        # Create the event record
+        event_record = self.build_event_record(
+            subject_id=subject_id,
+            domain_type=domain_type,
+            event_type=event_type,
+            content=content,
+            content_type=content_type,
+            source_type=source_type,
+            source_id=source_id,
+            source_name=source_name,
+            creator_id=creator_id,
+            creator_name=creator_name,
+            creator_role=creator_role,
+            context=context,
+            metrics=metrics,
+            assessments=assessments,
+            insights=insights,
+            tags=tags
+        )
+        
+        # Add the event record to the history
+        event_record_id = self.repository.save_event_record(event_record, history.hu_id)
+        self._notify(history.hu_id, [event_record])
+        
+        return history.hu_id, event_record_id
+    
+    def create_event_records(self, events: Iterable[Dict[str, Any]]) -> EventBatchResult:
+        """
+        Create many Event Records, writing each Universal History once.
+        
+        An item that cannot be built is reported as failed without stopping the
+        rest of the batch; the others are saved with save_event_records.
+        
+        Args:
+            events (Iterable[Dict[str, Any]]): Keyword arguments of create_event_record
+                for each event, optionally with a 'timestamp' (datetime or ISO string)
+            
+        Returns:
+            EventBatchResult: The outcome of each item, in input order
+        """
+        result = EventBatchResult()
+        
+        # Build the event records
+        built: List[Tuple[EventBatchItemResult, EventRecord]] = []
+        for index, event_kwargs in enumerate(events):
+            item = EventBatchItemResult(index=index, subject_id=event_kwargs.get('subject_id'))
+            result.items.append(item)
+            try:
+                built.append((item, self.build_event_record(**event_kwargs)))
+            except (TypeError, ValueError) as e:
+                item.error = str(e)
+        
+        # Save them, carrying the outcome back to the input items
+        saved = self.save_event_records([event_record for _, event_record in built])
+        result.histories_written = saved.histories_written
+        for (item, _), saved_item in zip(built, saved.items):
+            item.hu_id = saved_item.hu_id
+            item.re_id = saved_item.re_id
+            item.error = saved_item.error
+        
+        return result
+    
+    def save_event_records(self, event_records: List[EventRecord]) -> EventBatchResult:
+        """
+        Save already built Event Records, writing each Universal History once.
+        
+        Records are grouped by subject; missing histories are created together with
+        their events, and each domain's hash chain links the events in timestamp
+        order. If a history cannot be written, its records are reported as failed
+        without stopping the other subjects.
+        
+        Args:
+            event_records (List[EventRecord]): The event records to save
+            
+        Returns:
+            EventBatchResult: The outcome of each record, in input order
+        """
+        result = EventBatchResult()
+        
+        # Group the records by subject
+        by_subject: Dict[str, List[Tuple[EventBatchItemResult, EventRecord]]] = {}
+        for index, event_record in enumerate(event_records):
+            item = EventBatchItemResult(index=index, subject_id=event_record.subject_id)
+            result.items.append(item)
+            by_subject.setdefault(event_record.subject_id, []).append((item, event_record))
+        
+        # Write each history once, notifying the subscribers after all writes
+        saved: List[Tuple[str, List[EventRecord]]] = []
+        for subject_id, entries in by_subject.items():
+            subject_records = [event_record for _, event_record in entries]
+            try:
+                history = self.repository.get_history_by_subject(subject_id)
+                if history:
+                    self.repository.save_event_records(subject_records, history.hu_id)
+                else:
+                    # Create the history with its events already in it
+                    history = UniversalHistory(subject_id=subject_id)
+                    history.add_event_records(subject_records)
+                    self.repository.save_history(history)
+            except (ValueError, OSError) as e:
+                for item, _ in entries:
+                    item.error = str(e)
+                continue
+            
+            result.histories_written += 1
+            for item, event_record in entries:
+                item.hu_id = history.hu_id
+                item.re_id = event_record.re_id
+            saved.append((history.hu_id, subject_records))
+        
+        for hu_id, subject_records in saved:
+            self._notify(hu_id, subject_records)
+        
+        return result
+    
+    def build_event_record(self,
+                           subject_id: str,
+                           domain_type: Union[str, DomainType],
+                           event_type: str,
+                           content: str,
+                           content_type: str,
+                           source_type: str,
+                           source_id: str,
+                           source_name: str,
+                           creator_id: Optional[str] = None,
+                           creator_name: Optional[str] = None,
+                           creator_role: Optional[str] = None,
+                           context: Optional[Dict[str, Any]] = None,
+                           metrics: Optional[Dict[str, float]] = None,
+                           assessments: Optional[Dict[str, str]] = None,
+                           insights: Optional[List[str]] = None,
+                           tags: Optional[List[str]] = None,
+                           timestamp: Optional[Union[str, datetime]] = None) -> EventRecord:
+        """
+        Build an Event Record without saving it.
+        
+        Takes the arguments of create_event_record, plus:
+        
+        Args:
+            timestamp (Optional[Union[str, datetime]]): When the event happened (defaults to now)
+            
+        Returns:
+            EventRecord: The new, not yet hashed, event record
+        """
         # Convert domain_type to enum if it's a string
         if isinstance(domain_type, str):
             domain_type = DomainType(domain_type)
@@ -131,13 +349,11 @@ class EventService:
                 tags=tags
             )
         
-        # Create the event record
-        event_record = EventRecord(**event_record_kwargs)
-        
-        # Add the event record to the history
-        event_record_id = self.repository.save_event_record(event_record, history.hu_id)
+        # Set the timestamp if provided
+        if timestamp:
+            event_record_kwargs['timestamp'] = datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp
         
-        return history.hu_id, event_record_id
+        return EventRecord(**event_record_kwargs)
     
     def get_event_record(self, re_id: str, hu_id: str) -> Optional[EventRecord]:
         """
@@ -184,15 +400,7 @@ class EventService:
         if not history:
             return []
         
-        # Get all events for this history
-        all_events = []
-        for domain in history.get_domains():
-            domain_events = self.repository.get_events_by_domain(domain, history.hu_id)
-            all_events.extend(domain_events)
-        
-        # Sort by timestamp (newest first) and limit
-        sorted_events = sorted(all_events, key=lambda e: e.timestamp, reverse=True)
-        return sorted_events[:limit]
+        return self.repository.query_events(history.hu_id, sort="-timestamp", limit=limit).events
     
     def search_events(self, 
                      subject_id: str, 
@@ -200,7 +408,8 @@ class EventService:
                      event_type: Optional[str] = None,
                      start_date: Optional[datetime] = None,
                      end_date: Optional[datetime] = None,
-                     tags: Optional[List[str]] = None) -> List[EventRecord]:
+                     tags: Optional[List[str]] = None,
+                     limit: Optional[int] = None) -> List[EventRecord]:
         """
         Search for Event Records with specific criteria.
         
@@ -211,47 +420,99 @@ class EventService:
             start_date (Optional[datetime]): Include events after this date
             end_date (Optional[datetime]): Include events before this date
             tags (Optional[List[str]]): Include events with any of these tags
+            limit (Optional[int]): Maximum number of events to return
+            
+        Returns:
+            List[EventRecord]: List of matching event records, newest first
+        """
+        event_filter = EventFilter(
+            domain_type=domain_type,
+            event_type=event_type,
+            start_date=start_date,
+            end_date=end_date,
+            tags=tags
+        )
+        return self.query_events(subject_id, event_filter, sort="-timestamp", limit=limit).events
+    
+    def query_events(self,
+                     subject_id: str,
+                     event_filter: Optional[EventFilter] = None,
+                     sort: str = "-timestamp",
+                     limit: Optional[int] = None,
+                     cursor: Optional[str] = None) -> EventPage:
+        """
+        Query the Event Records of a subject one page at a time.
+        
+        The filter is executed by the repository, so backends only read the
+        events that match.
+        
+        Args:
+            subject_id (str): ID of the subject
+            event_filter (Optional[EventFilter]): Criteria the events must meet (None for all events)
+            sort (str): "-timestamp" for newest first or "timestamp" for oldest first
+            limit (Optional[int]): Maximum number of events to return
+            cursor (Optional[str]): next_cursor of the previous page, to continue after it
+            
+        Returns:
+            EventPage: The matching events and the cursor of the next page
+        """
+        history = self.repository.get_history_by_subject(subject_id)
+        if not history:
+            return EventPage()
+        
+        return self.repository.query_events(history.hu_id, event_filter, sort=sort, limit=limit, cursor=cursor)
+    
+    def search_text(self, subject_id: str, query: str, limit: int = 10) -> List[EventRecord]:
+        """
+        Search the text of a subject's Event Records.
+        
+        Events mentioning any of the query terms in their raw input content,
+        qualitative assessments or derived insights are ranked with BM25.
+        
+        Args:
+            subject_id (str): ID of the subject
+            query (str): The search terms (e.g. "asthma calculus")
+            limit (int): Maximum number of events to return
             
         Returns:
-            List[EventRecord]: List of matching event records
+            List[EventRecord]: Matching event records, most relevant first
         """
         history = self.repository.get_history_by_subject(subject_id)
         if not history:
             return []
         
-        # Get events, filtered by domain if specified
-        if domain_type:
-            events = self.repository.get_events_by_domain(domain_type, history.hu_id)
-        else:
-            # Get all events for this history
-            events = []
-            for domain in history.get_domains():
-                domain_events = self.repository.get_events_by_domain(domain, history.hu_id)
-                events.extend(domain_events)
-        
-        # Apply additional filters
-        filtered_events = []
-        for event in events:
-            # Filter by event type
-            if event_type and event.event_type != event_type:
-                continue
-                
-            # Filter by date range
-            if start_date and event.timestamp < start_date:
-                continue
-            if end_date and event.timestamp > end_date:
-                continue
-                
-            # Filter by tags
-            if tags:
-                event_tags = event.metadata.tags if hasattr(event.metadata, 'tags') else []
-                if not any(tag in event_tags for tag in tags):
-                    continue
+        return [event for event, _ in self.repository.search_text(history.hu_id, query, limit)]
+    
+    def aggregate_metric(self,
+                         subject_id: str,
+                         domain_type: Union[str, DomainType],
+                         metric: str,
+                         start_date: Optional[datetime] = None,
+                         end_date: Optional[datetime] = None,
+                         percentiles: Tuple[float, ...] = (50, 90)) -> MetricSummary:
+        """
+        Aggregate a quantitative metric of a subject over a time window.
+        
+        Args:
+            subject_id (str): ID of the subject
+            domain_type (Union[str, DomainType]): The domain type
+            metric (str): Name of the quantitative metric (a key of quantitative_metrics)
+            start_date (Optional[datetime]): Start of the window, inclusive (None for no lower bound)
+            end_date (Optional[datetime]): End of the window, inclusive (None for no upper bound)
+            percentiles (Tuple[float, ...]): Percentiles to compute, between 0 and 100
             
-            filtered_events.append(event)
+        Returns:
+            MetricSummary: Count, min, max, mean, percentiles and slope of the metric
+        """
+        history = self.repository.get_history_by_subject(subject_id)
+        if not history:
+            return MetricSummary()
+        
+        series = self.repository.get_metric_series(domain_type, metric, history.hu_id)
+        if series is None:
+            return MetricSummary()
         
-        # Sort by timestamp (newest first)
-        return sorted(filtered_events, key=lambda e: e.timestamp, reverse=True)
+        return series.aggregate(start_date, end_date, percentiles)
     
     def verify_event_chain(self, subject_id: str, domain_type: Union[str, DomainType]) -> bool:
         """
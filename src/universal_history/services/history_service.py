@@ -4,9 +4,12 @@ History service for managing Universal Histories.
 from typing import Dict, List, Optional, Any, Union, Set
 
 from ..models.universal_history import UniversalHistory
-from ..models.event_record import DomainType
-from ..models.domain_catalog import Organization
+from ..models.event_record import EventRecord, DomainType
+from ..models.trajectory_synthesis import TrajectorySynthesis
+from ..models.domain_catalog import DomainCatalog, Organization
+from ..models.lazy_mapping import encode_records
 from ..storage.repository import HistoryRepository
+from ..utils.merkle_utils import InclusionProof
 
 class HistoryService:
     """
@@ -85,15 +88,19 @@ class HistoryService:
         
         return history.get_domains()
     
-    def verify_event_chains(self, subject_id: str) -> Dict[str, bool]:
+    def verify_event_chains(self, subject_id: str, full: bool = False) -> Dict[str, bool]:
         """
         Verify the integrity of all event chains for a subject.
         
         This method checks that each event's previous_re_hash matches the
         current_re_hash of the previous event in the chain, for all domains.
+        Only events appended since the last verification checkpoint are rehashed
+        unless a full verification is requested; advanced checkpoints are saved
+        together, with one repository write.
         
         Args:
             subject_id (str): ID of the subject
+            full (bool): Whether to ignore the checkpoints and rehash every event
             
         Returns:
             Dict[str, bool]: Dictionary mapping domain types to verification results
@@ -103,11 +110,58 @@ class HistoryService:
             return {}
         
         results = {}
+        moved_checkpoints = {}
         for domain in history.get_domains():
-            results[domain] = history.verify_event_chain(domain)
+            previous_checkpoint = history.verification_checkpoints.get(domain)
+            results[domain] = history.verify_event_chain(domain, full=full)
+            
+            # Collect the checkpoint if verification moved it
+            checkpoint = history.verification_checkpoints.get(domain)
+            if checkpoint is not None and checkpoint is not previous_checkpoint:
+                moved_checkpoints[domain] = checkpoint
+        
+        if moved_checkpoints:
+            self.repository.save_verification_checkpoints(moved_checkpoints, history.hu_id)
         
         return results
     
+    def enable_merkle_tree(self, subject_id: str, domain_type: Union[str, DomainType]) -> Optional[str]:
+        """
+        Start maintaining a Merkle tree over the event hashes of a domain.
+        
+        Args:
+            subject_id (str): ID of the subject
+            domain_type (Union[str, DomainType]): The domain type to build the tree for
+            
+        Returns:
+            Optional[str]: The Merkle root, or None if the domain has no events yet
+        """
+        history = self.repository.get_history_by_subject(subject_id)
+        if not history:
+            raise ValueError(f"No Universal History found for subject {subject_id}")
+        
+        return self.repository.enable_merkle_tree(domain_type, history.hu_id)
+    
+    def get_inclusion_proof(self, subject_id: str, re_id: str) -> Optional[InclusionProof]:
+        """
+        Get the proof that an Event Record is included in the Merkle tree of its domain.
+        
+        The proof can be checked with merkle_utils.verify_inclusion_proof against a
+        trusted root, without access to the rest of the history.
+        
+        Args:
+            subject_id (str): ID of the subject
+            re_id (str): ID of the Event Record
+            
+        Returns:
+            Optional[InclusionProof]: The proof, or None if the event is not in a Merkle tree
+        """
+        history = self.repository.get_history_by_subject(subject_id)
+        if not history:
+            return None
+        
+        return self.repository.get_inclusion_proof(re_id, history.hu_id)
+    
     def export_history(self, subject_id: str, include_events: bool = True, 
                       include_syntheses: bool = True, include_state: bool = True,
                       include_catalogs: bool = True) -> Dict[str, Any]:
@@ -140,25 +194,29 @@ class HistoryService:
         
         # Add the requested components
         if include_events:
-            result['event_records'] = {re_id: er.to_dict() for re_id, er in history.event_records.items()}
+            result['event_records'] = encode_records(history.event_records, EventRecord.to_dict)
         
         if include_syntheses:
-            result['trajectory_syntheses'] = {st_id: ts.to_dict() for st_id, ts in history.trajectory_syntheses.items()}
+            result['trajectory_syntheses'] = encode_records(history.trajectory_syntheses, TrajectorySynthesis.to_dict)
         
         if include_state and history.state_document:
             result['state_document'] = history.state_document.to_dict()
         
         if include_catalogs:
-            result['domain_catalogs'] = {domain: catalog.to_dict() for domain, catalog in history.domain_catalogs.items()}
+            result['domain_catalogs'] = encode_records(history.domain_catalogs, DomainCatalog.to_dict)
         
         return result
     
-    def import_history(self, history_data: Dict[str, Any]) -> str:
+    def import_history(self, history_data: Dict[str, Any], rehash: bool = False) -> str:
         """
         Import a Universal History from a dictionary.
         
+        Domains containing events without a hash are relinked and rehashed
+        in timestamp order.
+        
         Args:
             history_data (Dict[str, Any]): Dictionary representation of the history
+            rehash (bool): Whether to rebuild the hash chains of every domain
             
         Returns:
             str: ID of the imported Universal History
@@ -166,6 +224,14 @@ class HistoryService:
         # Create a new history from the data
         history = UniversalHistory.from_dict(history_data)
         
+        # Backfill missing (or, if requested, all) hash chains
+        stale_domains = set()
+        for er in history.event_records.values():
+            if rehash or not er.current_re_hash:
+                stale_domains.add(er.domain_type.value if isinstance(er.domain_type, DomainType) else er.domain_type)
+        for domain in stale_domains:
+            history.rebuild_event_chain(domain)
+        
         # Save the history
         hu_id = self.repository.save_history(history)
         
@@ -215,6 +281,7 @@ class HistoryService:
             history_data['state_document']['subject_id'] = target_subject_id
         
         # Import the history for the new subject
-        hu_id = self.import_history(history_data)
+        # The subject ID is part of every event hash, so the chains are rebuilt
+        hu_id = self.import_history(history_data, rehash=include_events)
         
         return hu_id
\ No newline at end of file
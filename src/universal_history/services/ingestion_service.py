@@ -0,0 +1,361 @@
+"""
+Ingestion service for loading large JSONL and CSV exports of Event Records.
+
+A file goes through three stages:
+
+- a reader thread splits it into chunks of rows and hands them over through a
+  bounded queue, so reading never runs far ahead of processing;
+- a process pool parses and validates the chunks (validate_event_record) and
+  builds the Event Records;
+- the calling thread collects the records, in file order, into batches that
+  EventService.save_event_records writes with one repository write per
+  subject, so each subject's hash chains stay ordered.
+
+After each batch a checkpoint with the number of records handled is written,
+and an interrupted run given the same checkpoint resumes after that point.
+Records without an re_id get one derived from the file, their position and
+their content, and records already stored are skipped, so a batch written again
+after a crash between the write and the checkpoint is not duplicated.
+"""
+import csv
+import os
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..models.event_record import EventRecord
+from ..storage.repository import HistoryRepository
+from ..utils import json_utils
+from ..utils.parallel import iter_parallel, resolve_workers
+from ..utils.validation import validate_event_record
+from .event_service import EventService
+
+_FORMATS_BY_EXTENSION = {'.jsonl': "jsonl", '.ndjson': "jsonl", '.csv': "csv"}
+
+_END_OF_FILE = object()
+
+@dataclass
+class IngestionError:
+    """A record of an ingested file that could not be stored."""
+    record_number: int  # 1-based position of the record in the file
+    error: str
+    subject_id: Optional[str] = None
+
+@dataclass
+class IngestionReport:
+    """Summary of an ingestion run."""
+    records_read: int = 0
+    records_written: int = 0
+    records_skipped: int = 0  # Handled by a previous run, according to the checkpoint
+    batches_written: int = 0
+    histories_written: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[IngestionError] = field(default_factory=list)
+
+    @property
+    def records_failed(self) -> int:
+        """Number of records that could not be stored."""
+        return len(self.errors)
+
+    @property
+    def records_per_second(self) -> float:
+        """Ingestion throughput in records read per second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.records_read / self.elapsed_seconds
+
+def _nest_csv_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn a CSV row into an event dictionary.
+
+    Column names are dotted paths into the dictionary (e.g. "raw_input.content"),
+    cells holding a JSON object or array are decoded and empty cells are left out.
+
+    Args:
+        row (Dict[str, Any]): The row, as read by csv.DictReader
+
+    Returns:
+        Dict[str, Any]: The event dictionary
+    """
+    event_data: Dict[str, Any] = {}
+    for column, value in row.items():
+        if not column or value is None or value == "":
+            continue
+        if value[:1] in ('{', '['):
+            value = json_utils.loads(value)
+        *parents, name = column.split('.')
+        target = event_data
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[name] = value
+    return event_data
+
+def _record_id(source: str, record_number: int, row: Any) -> str:
+    """
+    Derive the ID of a record that has none from the file, its position and its content.
+
+    Ingesting the same row again gives the same ID, so the repository can tell
+    it was already stored.
+
+    Args:
+        source (str): Absolute path of the file
+        record_number (int): 1-based position of the record in the file
+        row (Any): The row, as JSON text or a CSV dict
+
+    Returns:
+        str: The record ID
+    """
+    content = row if isinstance(row, str) else json_utils.dumps(row)
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"file://{source}#{record_number}\n{content}"))
+
+def _parse_chunk(task: Tuple[str, str, List[Tuple[int, Any]]]) -> List[Tuple[int, Optional[EventRecord], Optional[str]]]:
+    """
+    Parse, validate and build the Event Records of a chunk of rows (runs in a worker).
+
+    Args:
+        task (Tuple[str, str, List[Tuple[int, Any]]]): File format, absolute path of
+            the file and (record number, row) pairs
+
+    Returns:
+        List[Tuple[int, Optional[EventRecord], Optional[str]]]: Record number, event
+            record and error message of each row
+    """
+    file_format, source, rows = task
+    parsed = []
+    for record_number, row in rows:
+        try:
+            event_data = json_utils.loads(row) if file_format == "jsonl" else _nest_csv_row(row)
+            if not isinstance(event_data, dict):
+                raise ValueError("Event record must be an object")
+
+            errors = validate_event_record(event_data)
+            if errors:
+                messages = [message for field_errors in errors.values() for message in field_errors]
+                parsed.append((record_number, None, "; ".join(messages)))
+                continue
+
+            if not event_data.get('re_id'):
+                event_data['re_id'] = _record_id(source, record_number, row)
+            parsed.append((record_number, EventRecord.from_dict(event_data), None))
+        except (TypeError, ValueError, KeyError, AttributeError) as e:
+            parsed.append((record_number, None, f"{type(e).__name__}: {e}"))
+    return parsed
+
+def _iter_rows(f, file_format: str) -> Iterator[Any]:
+    """Yield the rows of a file: JSON text for JSONL (blank lines skipped), dicts for CSV."""
+    if file_format == "csv":
+        yield from csv.DictReader(f)
+        return
+    for line in f:
+        if line.strip():
+            yield line
+
+class IngestionService:
+    """
+    Service for loading Event Records from JSONL and CSV files.
+    """
+
+    def __init__(self, repository: HistoryRepository,
+                 workers: Optional[int] = None,
+                 batch_size: int = 5000,
+                 chunk_size: int = 500,
+                 queue_size: int = 8):
+        """
+        Initialize the service with a repository.
+
+        Args:
+            repository (HistoryRepository): The repository to store events in
+            workers (Optional[int]): Number of parsing processes, or None for one per CPU
+            batch_size (int): Number of records written per batch
+            chunk_size (int): Number of rows sent to a parsing process at a time
+            queue_size (int): Maximum number of chunks read ahead of the parsers
+        """
+        self.repository = repository
+        self.event_service = EventService(repository)
+        self.workers = resolve_workers(workers)
+        self.batch_size = max(1, batch_size)
+        self.chunk_size = max(1, chunk_size)
+        self.queue_size = max(1, queue_size)
+
+    def ingest_file(self, path: str, file_format: Optional[str] = None,
+                    checkpoint_path: Optional[str] = None) -> IngestionReport:
+        """
+        Load the Event Records of a JSONL or CSV file.
+
+        JSONL lines and CSV rows hold event records in the format of
+        EventRecord.to_dict; CSV columns name nested fields with dotted paths
+        (e.g. "source.id"). Records that fail validation are reported and skipped.
+        Records written after the last checkpoint of an interrupted run are
+        read again when it resumes, but not stored twice.
+
+        Args:
+            path (str): Path of the file
+            file_format (Optional[str]): "jsonl" or "csv" (defaults to the file extension)
+            checkpoint_path (Optional[str]): File recording progress, used to resume
+
+        Returns:
+            IngestionReport: Counts, throughput and errors of the run
+        """
+        if file_format is None:
+            extension = os.path.splitext(path)[1].lower()
+            if extension not in _FORMATS_BY_EXTENSION:
+                raise ValueError(f"Cannot tell the format of {path}; pass file_format='jsonl' or 'csv'")
+            file_format = _FORMATS_BY_EXTENSION[extension]
+        if file_format not in ("jsonl", "csv"):
+            raise ValueError(f"Unsupported ingestion format: {file_format}")
+
+        report = IngestionReport()
+        start = time.perf_counter()
+
+        records_done = self._load_checkpoint(checkpoint_path, path)
+        report.records_skipped = records_done
+
+        # Reader stage: chunks of rows go through a bounded queue
+        chunks: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=self._read_chunks,
+            args=(path, file_format, records_done, chunks, stop),
+            daemon=True
+        )
+        reader.start()
+
+        pending: List[Tuple[int, EventRecord]] = []
+        try:
+            # Parsing stage, in file order so batches follow each subject's order
+            source = os.path.abspath(path)
+            tasks = ((file_format, source, chunk) for chunk in self._drain(chunks))
+            for parsed in iter_parallel(_parse_chunk, tasks, workers=self.workers, ordered=True):
+                for record_number, event_record, error in parsed:
+                    report.records_read += 1
+                    records_done = record_number
+                    if error:
+                        report.errors.append(IngestionError(record_number, error))
+                    else:
+                        pending.append((record_number, event_record))
+
+                # Writer stage
+                if len(pending) >= self.batch_size:
+                    self._write_batch(pending, report)
+                    pending = []
+                    self._save_checkpoint(checkpoint_path, path, records_done)
+
+            if pending:
+                self._write_batch(pending, report)
+            self._save_checkpoint(checkpoint_path, path, records_done)
+        finally:
+            stop.set()
+            reader.join()
+
+        report.elapsed_seconds = time.perf_counter() - start
+        return report
+
+    def _read_chunks(self, path: str, file_format: str, skip: int,
+                     chunks: queue.Queue, stop: threading.Event) -> None:
+        """
+        Read a file into chunks of (record number, row) pairs (runs in the reader thread).
+
+        Args:
+            path (str): Path of the file
+            file_format (str): "jsonl" or "csv"
+            skip (int): Number of records to skip (already ingested)
+            chunks (queue.Queue): Queue receiving the chunks, then _END_OF_FILE
+            stop (threading.Event): Set when the consumer has stopped
+        """
+        def put(item: Any) -> bool:
+            # Block while the queue is full, unless the consumer is gone
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                chunk: List[Tuple[int, Any]] = []
+                for record_number, row in enumerate(_iter_rows(f, file_format), 1):
+                    if record_number <= skip:
+                        continue
+                    chunk.append((record_number, row))
+                    if len(chunk) >= self.chunk_size:
+                        if not put(chunk):
+                            return
+                        chunk = []
+                if chunk and not put(chunk):
+                    return
+        except Exception as e:
+            # Hand the failure over to the consumer
+            put(e)
+            return
+        put(_END_OF_FILE)
+
+    def _drain(self, chunks: queue.Queue) -> Iterator[List[Tuple[int, Any]]]:
+        """Yield the chunks put in the queue by the reader thread until the end of the file."""
+        while True:
+            chunk = chunks.get()
+            if chunk is _END_OF_FILE:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+    def _write_batch(self, pending: List[Tuple[int, EventRecord]], report: IngestionReport) -> None:
+        """
+        Write a batch of records and account for the outcome.
+
+        Args:
+            pending (List[Tuple[int, EventRecord]]): Record numbers and event records
+            report (IngestionReport): The report to update
+        """
+        result = self.event_service.save_event_records([event_record for _, event_record in pending])
+        report.batches_written += 1
+        report.histories_written += result.histories_written
+        for (record_number, _), item in zip(pending, result.items):
+            if item.ok:
+                report.records_written += 1
+            else:
+                report.errors.append(IngestionError(record_number, item.error, item.subject_id))
+
+    def _load_checkpoint(self, checkpoint_path: Optional[str], path: str) -> int:
+        """
+        Read the number of records a previous run handled.
+
+        Args:
+            checkpoint_path (Optional[str]): The checkpoint file
+            path (str): Path of the file being ingested
+
+        Returns:
+            int: Number of records to skip (0 without a checkpoint for this file)
+        """
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return 0
+
+        with open(checkpoint_path, 'rb') as f:
+            checkpoint = json_utils.load(f)
+
+        if checkpoint.get('path') != os.path.abspath(path):
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to {checkpoint.get('path')}, not {path}")
+        return int(checkpoint.get('records_done', 0))
+
+    def _save_checkpoint(self, checkpoint_path: Optional[str], path: str, records_done: int) -> None:
+        """
+        Record the number of records handled so far.
+
+        Args:
+            checkpoint_path (Optional[str]): The checkpoint file
+            path (str): Path of the file being ingested
+            records_done (int): Number of records read, written or reported as failed
+        """
+        if not checkpoint_path:
+            return
+
+        # Write to a temporary file first so an interruption never leaves a partial checkpoint
+        temp_path = f"{checkpoint_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            json_utils.dump({'path': os.path.abspath(path), 'records_done': records_done}, f)
+        os.replace(temp_path, checkpoint_path)
@@ -7,7 +7,208 @@ from datetime import datetime
 from ..models.event_record import EventRecord, DomainType
 from ..models.state_document import StateDocument, DomainState, EventReference, AggregatedInsights
 from ..models.trajectory_synthesis import TrajectorySynthesis
+from ..models.universal_history import UniversalHistory
+from ..storage.query import EventFilter
 from ..storage.repository import HistoryRepository
+from .event_service import EventService
+
+# Default number of events kept in the recent_events of a domain state by track_events
+RECENT_EVENTS_LIMIT = 10
+
+def _new_state_document(history: UniversalHistory) -> StateDocument:
+    """Create the initial State Document of a history, with an empty state for each domain that has events."""
+    # Create an initial general summary
+    general_summary = f"State document for subject {history.subject_id}, created on {datetime.now().isoformat()}"
+    
+    return StateDocument(
+        subject_id=history.subject_id,
+        general_summary=general_summary,
+        domains={domain: DomainState.empty() for domain in history.get_domains()}
+    )
+
+class StateSession:
+    """
+    Unit of work on the State Document of a subject.
+    
+    The history is loaded once; changes are applied to a copy of its State
+    Document and written with a single State Document save when the session is
+    committed, which keeps any events saved while the session was open. Used
+    as a context manager, the session commits when the block exits normally
+    and discards the changes if an exception is raised.
+    """
+    
+    def __init__(self, repository: HistoryRepository, subject_id: str):
+        """
+        Load the history and State Document of a subject.
+        
+        Args:
+            repository (HistoryRepository): The repository to use for storage
+            subject_id (str): ID of the subject
+        """
+        self.repository = repository
+        self.subject_id = subject_id
+        
+        # Get the Universal History for this subject, noting its version first so
+        # commit can tell whether it was saved by someone else in the meantime
+        self.version = repository.get_history_version(subject_id)
+        self.history = repository.get_history_by_subject(subject_id)
+        if not self.history:
+            raise ValueError(f"No Universal History found for subject {subject_id}")
+        
+        # Work on a copy of the State Document, or a new one if it doesn't exist
+        if self.history.state_document:
+            self.state_document = StateDocument.from_dict(self.history.state_document.to_dict())
+            self.dirty = False
+        else:
+            self.state_document = _new_state_document(self.history)
+            self.dirty = True
+    
+    def __enter__(self) -> 'StateSession':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+    
+    @property
+    def de_id(self) -> str:
+        """ID of the State Document."""
+        return self.state_document.de_id
+    
+    def update_domain_state(self,
+                            domain_type: Union[str, DomainType],
+                            current_status: Optional[str] = None,
+                            key_attributes: Optional[Dict[str, Any]] = None,
+                            recent_events: Optional[List[Dict[str, Any]]] = None,
+                            significant_events: Optional[List[Dict[str, str]]] = None,
+                            trends: Optional[Dict[str, str]] = None,
+                            domain_specific_data: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Update the state for a specific domain.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type
+            current_status (Optional[str]): Current status of the domain
+            key_attributes (Optional[Dict[str, Any]]): Key attributes for the domain
+            recent_events (Optional[List[Dict[str, Any]]]): Recent events (each dict must have 're_id', 'description', and optionally 'impact' and 'timestamp')
+            significant_events (Optional[List[Dict[str, str]]]): Significant events (each dict must have 're_id', 'description', and optionally 'significance')
+            trends (Optional[Dict[str, str]]): Trends in the domain
+            domain_specific_data (Optional[Dict[str, Any]]): Domain-specific data
+        """
+        # Convert domain_type to string if it's an enum
+        domain_key = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        
+        # Get the current domain state or create a new one
+        domain_state = self.state_document.domains.get(domain_key) or DomainState.empty()
+        
+        # Update the domain state with the provided values
+        if current_status is not None:
+            domain_state.current_status = current_status
+        
+        if key_attributes is not None:
+            domain_state.key_attributes = key_attributes
+        
+        if recent_events is not None:
+            domain_state.recent_events = [
+                EventReference(
+                    re_id=event['re_id'],
+                    description=event['description'],
+                    impact=event.get('impact'),
+                    timestamp=event.get('timestamp')
+                )
+                for event in recent_events
+            ]
+        
+        if significant_events is not None:
+            domain_state.significant_events = [
+                EventReference(
+                    re_id=event['re_id'],
+                    description=event['description'],
+                    significance=event.get('significance')
+                )
+                for event in significant_events
+            ]
+        
+        if trends is not None:
+            domain_state.trends = trends
+        
+        if domain_specific_data is not None:
+            domain_state.domain_specific_data = domain_specific_data
+        
+        # Update the last_updated timestamp
+        domain_state.last_updated = datetime.now()
+        
+        # Update the domain state in the state document
+        self.state_document.update_domain_state(domain_key, domain_state)
+        self.dirty = True
+    
+    def update_aggregated_insights(self,
+                                   cross_domain_patterns: Optional[List[str]] = None,
+                                   recommended_actions: Optional[List[str]] = None,
+                                   potential_opportunities: Optional[List[str]] = None,
+                                   potential_risks: Optional[List[str]] = None) -> None:
+        """
+        Update the aggregated insights in the State Document.
+        
+        Args:
+            cross_domain_patterns (Optional[List[str]]): Patterns across domains
+            recommended_actions (Optional[List[str]]): Recommended actions
+            potential_opportunities (Optional[List[str]]): Potential opportunities
+            potential_risks (Optional[List[str]]): Potential risks
+        """
+        insights = self.state_document.aggregated_insights
+        if cross_domain_patterns is not None:
+            insights.cross_domain_patterns = cross_domain_patterns
+        
+        if recommended_actions is not None:
+            insights.recommended_actions = recommended_actions
+        
+        if potential_opportunities is not None:
+            insights.potential_opportunities = potential_opportunities
+        
+        if potential_risks is not None:
+            insights.potential_risks = potential_risks
+        
+        # Update the last_updated timestamp
+        self.state_document.update_last_updated()
+        self.dirty = True
+    
+    def set_general_summary(self, general_summary: str) -> None:
+        """
+        Replace the general summary of the State Document.
+        
+        Args:
+            general_summary (str): The new summary
+        """
+        self.state_document.general_summary = general_summary
+        self.state_document.update_last_updated()
+        self.dirty = True
+    
+    def update_llm_optimized_summary(self) -> str:
+        """
+        Regenerate the LLM-optimized summary if the state of the document changed since it was generated.
+        
+        Returns:
+            str: The updated LLM-optimized summary
+        """
+        if self.state_document.is_llm_summary_current():
+            return self.state_document.llm_optimized_summary
+        
+        summary = self.state_document.generate_llm_optimized_summary()
+        self.dirty = True
+        return summary
+    
+    def commit(self) -> str:
+        """
+        Write the State Document if it changed.
+        
+        Returns:
+            str: ID of the State Document
+        """
+        if self.dirty:
+            self.repository.save_history_state_document(self.history, self.state_document, self.version)
+            self.dirty = False
+        return self.state_document.de_id
 
 class StateService:
     """
@@ -38,34 +239,33 @@ class StateService:
         if not history:
             raise ValueError(f"No Universal History found for subject {subject_id}")
         
-        # Create an initial general summary
-        general_summary = f"State document for subject {subject_id}, created on {datetime.now().isoformat()}"
-        
-        # Initialize with an empty domain state for each domain that has events
-        domains = {}
-        for domain in history.get_domains():
-            domains[domain] = DomainState(
-                last_updated=datetime.now(),
-                current_status="No detailed state information available yet",
-                key_attributes={},
-                recent_events=[],
-                significant_events=[],
-                trends={},
-                domain_specific_data={}
-            )
-        
         # Create the state document
-        state_document = StateDocument(
-            subject_id=subject_id,
-            general_summary=general_summary,
-            domains=domains
-        )
+        state_document = _new_state_document(history)
         
         # Save the state document
         de_id = self.repository.save_state_document(state_document, history.hu_id)
         
         return de_id
     
+    def session(self, subject_id: str) -> StateSession:
+        """
+        Start a unit of work on the State Document of a subject.
+        
+        The history is loaded once, and any number of domain, insight and summary
+        changes are written together with a single State Document save:
+        
+            with state_service.session(subject_id) as session:
+                session.update_domain_state(DomainType.HEALTH, current_status="Recovering")
+                session.update_aggregated_insights(potential_risks=["Relapse"])
+        
+        Args:
+            subject_id (str): ID of the subject
+        
+        Returns:
+            StateSession: The session (commits when the with block exits normally)
+        """
+        return StateSession(self.repository, subject_id)
+
     def get_state_document(self, subject_id: str) -> Optional[StateDocument]:
         """
         Get the State Document for a subject.
@@ -87,7 +287,7 @@ class StateService:
                            domain_type: Union[str, DomainType],
                            current_status: Optional[str] = None,
                            key_attributes: Optional[Dict[str, Any]] = None,
-                           recent_events: Optional[List[Dict[str, str]]] = None,
+                           recent_events: Optional[List[Dict[str, Any]]] = None,
                            significant_events: Optional[List[Dict[str, str]]] = None,
                            trends: Optional[Dict[str, str]] = None,
                            domain_specific_data: Optional[Dict[str, Any]] = None) -> str:
@@ -99,7 +299,7 @@ class StateService:
             domain_type (Union[str, DomainType]): The domain type
             current_status (Optional[str]): Current status of the domain
             key_attributes (Optional[Dict[str, Any]]): Key attributes for the domain
-            recent_events (Optional[List[Dict[str, str]]]): Recent events (each dict must have 're_id', 'description', and optionally 'impact')
+            recent_events (Optional[List[Dict[str, Any]]]): Recent events (each dict must have 're_id', 'description', and optionally 'impact' and 'timestamp')
             significant_events (Optional[List[Dict[str, str]]]): Significant events (each dict must have 're_id', 'description', and optionally 'significance')
             trends (Optional[Dict[str, str]]): Trends in the domain
             domain_specific_data (Optional[Dict[str, Any]]): Domain-specific data
@@ -107,79 +307,18 @@ class StateService:
         Returns:
             str: ID of the updated State Document
         """
-        # Get the Universal History for this subject
-        history = self.repository.get_history_by_subject(subject_id)
-        if not history:
-            raise ValueError(f"No Universal History found for subject {subject_id}")
-        
-        # Get the State Document, or create one if it doesn't exist
-        state_document = self.repository.get_state_document(history.hu_id)
-        if not state_document:
-            de_id = self.create_state_document(subject_id)
-            state_document = self.repository.get_state_document(history.hu_id)
-            if not state_document:
-                raise ValueError(f"Failed to create State Document for subject {subject_id}")
-        
-        # Convert domain_type to string if it's an enum
-        domain_key = domain_type.value if isinstance(domain_type, DomainType) else domain_type
-        
-        # Get the current domain state or create a new one
-        if domain_key in state_document.domains:
-            domain_state = state_document.domains[domain_key]
-        else:
-            domain_state = DomainState(
-                last_updated=datetime.now(),
-                current_status="No detailed state information available yet",
-                key_attributes={},
-                recent_events=[],
-                significant_events=[],
-                trends={},
-                domain_specific_data={}
+        with self.session(subject_id) as session:
+            session.update_domain_state(
+                domain_type,
+                current_status=current_status,
+                key_attributes=key_attributes,
+                recent_events=recent_events,
+                significant_events=significant_events,
+                trends=trends,
+                domain_specific_data=domain_specific_data
             )
         
-        # Update the domain state with the provided values
-        if current_status is not None:
-            domain_state.current_status = current_status
-        
-        if key_attributes is not None:
-            domain_state.key_attributes = key_attributes
-        
-        if recent_events is not None:
-            domain_state.recent_events = [
-                EventReference(
-                    re_id=event['re_id'],
-                    description=event['description'],
-                    impact=event.get('impact')
-                )
-                for event in recent_events
-            ]
-        
-        if significant_events is not None:
-            domain_state.significant_events = [
-                EventReference(
-                    re_id=event['re_id'],
-                    description=event['description'],
-                    significance=event.get('significance')
-                )
-                for event in significant_events
-            ]
-        
-        if trends is not None:
-            domain_state.trends = trends
-        
-        if domain_specific_data is not None:
-            domain_state.domain_specific_data = domain_specific_data
-        
-        # Update the last_updated timestamp
-        domain_state.last_updated = datetime.now()
-        
-        # Update the domain state in the state document
-        state_document.update_domain_state(domain_key, domain_state)
-        
-        # Save the state document
-        de_id = self.repository.save_state_document(state_document, history.hu_id)
-        
-        return de_id
+        return session.de_id
     
     def update_aggregated_insights(self,
                                   subject_id: str,
@@ -200,46 +339,23 @@ class StateService:
         Returns:
             str: ID of the updated State Document
         """
-        # Get the Universal History for this subject
-        history = self.repository.get_history_by_subject(subject_id)
-        if not history:
-            raise ValueError(f"No Universal History found for subject {subject_id}")
-        
-        # Get the State Document, or create one if it doesn't exist
-        state_document = self.repository.get_state_document(history.hu_id)
-        if not state_document:
-            de_id = self.create_state_document(subject_id)
-            state_document = self.repository.get_state_document(history.hu_id)
-            if not state_document:
-                raise ValueError(f"Failed to create State Document for subject {subject_id}")
-        
-        # Update the aggregated insights
-        if cross_domain_patterns is not None:
-            state_document.aggregated_insights.cross_domain_patterns = cross_domain_patterns
-        
-        if recommended_actions is not None:
-            state_document.aggregated_insights.recommended_actions = recommended_actions
-        
-        if potential_opportunities is not None:
-            state_document.aggregated_insights.potential_opportunities = potential_opportunities
-        
-        if potential_risks is not None:
-            state_document.aggregated_insights.potential_risks = potential_risks
-        
-        # Update the last_updated timestamp
-        state_document.update_last_updated()
-        
-        # Save the state document
-        de_id = self.repository.save_state_document(state_document, history.hu_id)
+        with self.session(subject_id) as session:
+            session.update_aggregated_insights(
+                cross_domain_patterns=cross_domain_patterns,
+                recommended_actions=recommended_actions,
+                potential_opportunities=potential_opportunities,
+                potential_risks=potential_risks
+            )
         
-        return de_id
+        return session.de_id
     
     def update_llm_optimized_summary(self, subject_id: str) -> str:
         """
         Update the LLM-optimized summary in the State Document.
         
         This method generates a new summary optimized for use with LLMs,
-        based on the current state of the document.
+        based on the current state of the document. Nothing is written if the
+        stored summary is still current.
         
         Args:
             subject_id (str): ID of the subject
@@ -247,24 +363,8 @@ class StateService:
         Returns:
             str: The updated LLM-optimized summary
         """
-        # Get the Universal History for this subject
-        history = self.repository.get_history_by_subject(subject_id)
-        if not history:
-            raise ValueError(f"No Universal History found for subject {subject_id}")
-        
-        # Get the State Document, or create one if it doesn't exist
-        state_document = self.repository.get_state_document(history.hu_id)
-        if not state_document:
-            de_id = self.create_state_document(subject_id)
-            state_document = self.repository.get_state_document(history.hu_id)
-            if not state_document:
-                raise ValueError(f"Failed to create State Document for subject {subject_id}")
-        
-        # Generate the LLM-optimized summary
-        summary = state_document.generate_llm_optimized_summary()
-        
-        # Save the state document
-        self.repository.save_state_document(state_document, history.hu_id)
+        with self.session(subject_id) as session:
+            summary = session.update_llm_optimized_summary()
         
         return summary
     
@@ -272,21 +372,30 @@ class StateService:
         """
         Get the LLM-optimized summary for a subject.
         
+        The stored summary is returned while the state it was generated from is
+        unchanged (see StateDocument.is_llm_summary_current). Otherwise it is
+        regenerated and stored, so only the first read after a change writes.
+        
         Args:
             subject_id (str): ID of the subject
             
         Returns:
             Optional[str]: The LLM-optimized summary, or None if not found
         """
-        state_document = self.get_state_document(subject_id)
-        if not state_document:
+        history = self.repository.get_history_by_subject(subject_id)
+        if not history or not history.state_document:
             return None
         
-        # Generate a new summary if it doesn't exist
-        if not state_document.llm_optimized_summary:
-            return self.update_llm_optimized_summary(subject_id)
+        state_document = history.state_document
+        if state_document.is_llm_summary_current():
+            return state_document.llm_optimized_summary
+        
+        # Regenerate the stale summary and keep it for the next reads; only the
+        # State Document is saved, so events written since the read are kept
+        summary = state_document.generate_llm_optimized_summary()
+        self.repository.save_state_document(state_document, history.hu_id)
         
-        return state_document.llm_optimized_summary
+        return summary
     
     def update_state_from_events(self, subject_id: str, domain_type: Union[str, DomainType], limit: int = 10) -> str:
         """
@@ -308,18 +417,17 @@ class StateService:
         if not history:
             raise ValueError(f"No Universal History found for subject {subject_id}")
         
-        # Get events for the domain
-        events = self.repository.get_events_by_domain(domain_type, history.hu_id)
-        
-        # Sort by timestamp (newest first) and limit
-        sorted_events = sorted(events, key=lambda e: e.timestamp, reverse=True)
-        recent_events = sorted_events[:limit]
+        # Get the most recent events for the domain
+        recent_events = self.repository.query_events(
+            history.hu_id, EventFilter(domain_type=domain_type), sort="-timestamp", limit=limit
+        ).events
         
         # Create recent event references
         event_references = [
             {
                 're_id': event.re_id,
-                'description': f"{event.event_type} - {event.raw_input.content[:50]}..."
+                'description': EventReference.from_event_record(event).description,
+                'timestamp': event.timestamp
             }
             for event in recent_events
         ]
@@ -340,6 +448,31 @@ class StateService:
         
         return de_id
     
+    def track_events(self, event_service: EventService, limit: int = RECENT_EVENTS_LIMIT) -> None:
+        """
+        Keep State Documents current as Event Records are saved through an event service.
+        
+        The repository of the event service adds saved events to the recent_events
+        of their domains, and updates their last_updated timestamps, in the same
+        write that stores the events (see HistoryRepository.recent_events_limit),
+        so the State Document does not need to be recomputed with
+        update_state_from_events.
+        
+        Args:
+            event_service (EventService): The service events are saved through
+            limit (int): Number of recent events kept per domain
+        """
+        event_service.repository.recent_events_limit = limit
+    
+    def untrack_events(self, event_service: EventService) -> None:
+        """
+        Stop updating State Documents from an event service.
+        
+        Args:
+            event_service (EventService): A service passed to track_events
+        """
+        event_service.repository.recent_events_limit = None
+    
     def update_state_from_synthesis(self, subject_id: str, st_id: str) -> str:
         """
         Update the domain state based on a Trajectory Synthesis.
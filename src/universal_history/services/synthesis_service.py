@@ -2,12 +2,135 @@
 Synthesis service for creating and managing trajectory syntheses.
 """
 from typing import Dict, List, Optional, Any, Union, Tuple
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from ..models.event_record import DomainType
+from ..models.event_record import EventRecord, DomainType
 from ..models.trajectory_synthesis import TrajectorySynthesis, TimeFrame, SignificantEvent, Metric
 from ..models.state_document import StateDocument
+from ..storage.query import EventFilter
 from ..storage.repository import HistoryRepository
+from ..utils.aggregates import SlidingWindow
+from ..utils.hash_utils import calculate_hash
+
+# Key of domain_specific_data holding the running aggregates of a window synthesis
+WINDOW_STATE_KEY = "window_state"
+
+# Key of domain_specific_data identifying a calendar rollup: its period and the fingerprint of its children
+ROLLUP_KEY = "rollup"
+
+# Calendar period of each rollup level (level 1 syntheses are monthly)
+ROLLUP_PERIODS = {2: 'quarter', 3: 'year'}
+
+def build_synthesis_from_events(subject_id: str,
+                                domain_type: Union[str, DomainType],
+                                events: List[EventRecord],
+                                start_date: datetime,
+                                end_date: datetime,
+                                level: int = 1) -> TrajectorySynthesis:
+    """
+    Build a Trajectory Synthesis from the Event Records of a period.
+
+    This is a module-level function so batch runs can call it in worker processes.
+
+    Args:
+        subject_id (str): ID of the subject
+        domain_type (Union[str, DomainType]): The domain type
+        events (List[EventRecord]): The events of the domain in the period, oldest first
+        start_date (datetime): Start date of the period
+        end_date (datetime): End date of the period
+        level (int): Hierarchical level of the synthesis
+
+    Returns:
+        TrajectorySynthesis: The synthesis (not saved)
+    """
+    if not events:
+        raise ValueError(f"No events found for domain {domain_type} in the specified time period")
+
+    # Generate a simple summary
+    summary = f"Synthesis of {len(events)} events in domain {domain_type} from {start_date.isoformat()} to {end_date.isoformat()}"
+
+    # TODO: Implement more sophisticated analysis to generate insights, metrics, patterns, etc.
+    # For now, create a basic synthesis with just a summary and source events
+    return TrajectorySynthesis(
+        subject_id=subject_id,
+        domain_type=DomainType(domain_type) if isinstance(domain_type, str) else domain_type,
+        time_frame=TimeFrame(start=start_date, end=end_date),
+        summary=summary,
+        level=level,
+        source_events=[e.re_id for e in events]
+    )
+
+def merge_syntheses(subject_id: str,
+                    domain_type: Union[str, DomainType],
+                    sources: List[TrajectorySynthesis],
+                    level: Optional[int] = None) -> TrajectorySynthesis:
+    """
+    Merge Trajectory Syntheses into one covering all of them.
+
+    Source events, key insights and significant events are combined in order,
+    without duplicates.
+
+    Args:
+        subject_id (str): ID of the subject
+        domain_type (Union[str, DomainType]): The domain type
+        sources (List[TrajectorySynthesis]): The syntheses to merge
+        level (Optional[int]): Level of the result (defaults to one above the highest source)
+
+    Returns:
+        TrajectorySynthesis: The merged synthesis (not saved)
+    """
+    if not sources:
+        raise ValueError("No valid source syntheses found")
+
+    start_date = min(s.time_frame.start for s in sources)
+    end_date = max(s.time_frame.end for s in sources)
+
+    # Combine the sources, dropping duplicates by hash lookup
+    source_events = list(dict.fromkeys(re_id for s in sources for re_id in s.source_events))
+    key_insights = list(dict.fromkeys(insight for s in sources for insight in s.key_insights))
+    significant_events = []
+    seen = set()
+    for synthesis in sources:
+        for event in synthesis.significant_events:
+            if event.re_id not in seen:
+                seen.add(event.re_id)
+                significant_events.append(SignificantEvent(
+                    re_id=event.re_id,
+                    description=event.description,
+                    significance=event.significance
+                ))
+
+    # Generate a simple summary
+    summary = f"Higher-level synthesis of {len(sources)} lower-level syntheses in domain {domain_type} from {start_date.isoformat()} to {end_date.isoformat()}"
+
+    # TODO: Implement more sophisticated analysis to generate combined metrics, patterns, recommendations, etc.
+    return TrajectorySynthesis(
+        subject_id=subject_id,
+        domain_type=DomainType(domain_type) if isinstance(domain_type, str) else domain_type,
+        time_frame=TimeFrame(start=start_date, end=end_date),
+        summary=summary,
+        level=level if level is not None else max(s.level for s in sources) + 1,
+        source_events=source_events,
+        key_insights=key_insights,
+        significant_events=significant_events
+    )
+
+def rollup_period(timestamp: datetime, level: int) -> str:
+    """
+    Get the calendar period of a rollup level containing a date.
+
+    Args:
+        timestamp (datetime): The date
+        level (int): Rollup level (2 for quarters, 3 for years)
+
+    Returns:
+        str: The period, e.g. "2024-Q1" or "2024"
+    """
+    if ROLLUP_PERIODS.get(level) == 'quarter':
+        return f"{timestamp.year}-Q{(timestamp.month - 1) // 3 + 1}"
+    if ROLLUP_PERIODS.get(level) == 'year':
+        return str(timestamp.year)
+    raise ValueError(f"Invalid rollup level: {level}. Must be one of {sorted(ROLLUP_PERIODS)}.")
 
 class SynthesisService:
     """
@@ -201,42 +324,120 @@ class SynthesisService:
         if not history:
             raise ValueError(f"No Universal History found for subject {subject_id}")
         
-        # Get events for the domain
-        events = self.repository.get_events_by_domain(domain_type, history.hu_id)
+        # Get the events of the domain in the period, oldest first
+        event_filter = EventFilter(domain_type=domain_type, start_date=start_date, end_date=end_date)
+        sorted_events = self.repository.query_events(history.hu_id, event_filter, sort="timestamp").events
         
-        # Filter events by date range
-        filtered_events = [
-            e for e in events 
-            if start_date <= e.timestamp <= end_date
-        ]
+        synthesis = build_synthesis_from_events(subject_id, domain_type, sorted_events, start_date, end_date, level)
         
-        if not filtered_events:
-            raise ValueError(f"No events found for domain {domain_type} in the specified time period")
-        
-        # Sort events by timestamp
-        sorted_events = sorted(filtered_events, key=lambda e: e.timestamp)
-        
-        # Get event IDs
-        source_events = [e.re_id for e in sorted_events]
+        return self.repository.save_trajectory_synthesis(synthesis, history.hu_id)
+    
+    def refresh_window_synthesis(self,
+                                 subject_id: str,
+                                 domain_type: Union[str, DomainType],
+                                 window: timedelta,
+                                 end_date: Optional[datetime] = None,
+                                 st_id: Optional[str] = None,
+                                 level: int = 1) -> str:
+        """
+        Create or refresh a Trajectory Synthesis of a sliding time window (e.g. the last 30 days).
         
-        # Generate a simple summary
-        summary = f"Synthesis of {len(sorted_events)} events in domain {domain_type} from {start_date.isoformat()} to {end_date.isoformat()}"
+        The synthesis keeps running aggregates of the events in its window (count,
+        first and last timestamps, and count, sum, sum of squares, minimum and
+        maximum of each quantitative metric) in its domain_specific_data. Refreshing
+        it only reads the events newer than the last refresh and retires the events
+        that left the window, instead of reloading the whole domain. Events added
+        with timestamps older than the last refresh are not picked up; create a new
+        synthesis (st_id=None) to rebuild from scratch.
         
-        # TODO: Implement more sophisticated analysis to generate insights, metrics, patterns, etc.
-        # For now, create a basic synthesis with just a summary and source events
+        Args:
+            subject_id (str): ID of the subject
+            domain_type (Union[str, DomainType]): The domain type
+            window (timedelta): Length of the window
+            end_date (Optional[datetime]): End of the window (defaults to now)
+            st_id (Optional[str]): ID of a window synthesis to refresh (None to create one)
+            level (int): Hierarchical level of a new synthesis
+            
+        Returns:
+            str: ID of the Trajectory Synthesis
+        """
+        # Get the Universal History for this subject
+        history = self.repository.get_history_by_subject(subject_id)
+        if not history:
+            raise ValueError(f"No Universal History found for subject {subject_id}")
         
-        # Create the synthesis
-        _, st_id = self.create_trajectory_synthesis(
-            subject_id=subject_id,
-            domain_type=domain_type,
-            summary=summary,
-            start_date=start_date,
-            end_date=end_date,
-            source_events=source_events,
-            level=level
-        )
+        end_date = end_date or datetime.now()
+        start_date = end_date - window
         
-        return st_id
+        # Reuse the running aggregates of the synthesis if its window only moved forward
+        synthesis = None
+        state = None
+        if st_id:
+            synthesis = self.repository.get_trajectory_synthesis(st_id, history.hu_id)
+            if not synthesis:
+                raise ValueError(f"Trajectory Synthesis with ID {st_id} not found")
+            state_data = synthesis.domain_specific_data.get(WINDOW_STATE_KEY)
+            if state_data:
+                state = SlidingWindow.from_dict(state_data)
+                if start_date < state.start or end_date < state.watermark:
+                    state = None
+        
+        previous_means = {}
+        if state is None:
+            state = SlidingWindow(start_date)
+            applied_at_watermark = set()
+        else:
+            previous_means = {name: stats.mean for name, stats in state.stats.items()}
+            state.expire(start_date)
+            # Events at the watermark itself may already be in the window
+            applied_at_watermark = {key for timestamp, key, _ in state.entries if timestamp == state.watermark}
+        
+        # Apply the events added since the last refresh
+        event_filter = EventFilter(domain_type=domain_type, start_date=max(state.watermark, start_date), end_date=end_date)
+        for event in self.repository.query_events(history.hu_id, event_filter, sort="timestamp").events:
+            if event.re_id in applied_at_watermark:
+                continue
+            metrics = event.processed_data.quantitative_metrics if event.processed_data else {}
+            state.add(event.timestamp, event.re_id, {
+                name: float(value) for name, value in metrics.items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+            })
+        
+        # Describe the window from its aggregates
+        domain_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        summary = f"Synthesis of {len(state)} events in domain {domain_value} from {start_date.isoformat()} to {end_date.isoformat()}"
+        metrics = {}
+        for name, stats in sorted(state.stats.items()):
+            previous = previous_means.get(name)
+            if previous is None or stats.mean == previous:
+                trend = "stable"
+            else:
+                trend = "improving" if stats.mean > previous else "declining"
+            metrics[name] = Metric(
+                value=stats.mean,
+                trend=trend,
+                analysis=f"{stats.count} values, min {stats.minimum}, max {stats.maximum}, std {stats.std:.4g}"
+            )
+        
+        if synthesis is None:
+            if isinstance(domain_type, str):
+                domain_type = DomainType(domain_type)
+            synthesis = TrajectorySynthesis(
+                subject_id=subject_id,
+                domain_type=domain_type,
+                time_frame=TimeFrame(start=start_date, end=end_date),
+                summary=summary,
+                level=level
+            )
+        
+        synthesis.time_frame = TimeFrame(start=start_date, end=end_date)
+        synthesis.summary = summary
+        synthesis.source_events = state.keys()
+        synthesis.metrics = metrics
+        synthesis.domain_specific_data[WINDOW_STATE_KEY] = state.to_dict()
+        synthesis.metadata.generated_on = datetime.now()
+        
+        return self.repository.save_trajectory_synthesis(synthesis, history.hu_id)
     
     def generate_higher_level_synthesis(self,
                                        subject_id: str,
@@ -271,56 +472,67 @@ class SynthesisService:
         if not source_syntheses:
             raise ValueError("No valid source syntheses found")
         
-        # Determine the level of the new synthesis
-        max_level = max(s.level for s in source_syntheses)
-        new_level = max_level + 1
-        
-        # Determine the time frame of the new synthesis
-        start_dates = [s.time_frame.start for s in source_syntheses]
-        end_dates = [s.time_frame.end for s in source_syntheses]
-        start_date = min(start_dates)
-        end_date = max(end_dates)
-        
-        # Collect source events from all syntheses
-        source_events = []
-        for synthesis in source_syntheses:
-            source_events.extend(synthesis.source_events)
-        # Remove duplicates
-        source_events = list(set(source_events))
-        
-        # Collect key insights from all syntheses
-        key_insights = []
-        for synthesis in source_syntheses:
-            key_insights.extend(synthesis.key_insights)
-        
-        # Collect significant events from all syntheses
-        significant_events = []
-        for synthesis in source_syntheses:
-            for event in synthesis.significant_events:
-                # Check if this event is already included
-                if not any(e['re_id'] == event.re_id for e in significant_events):
-                    significant_events.append({
-                        're_id': event.re_id,
-                        'description': event.description,
-                        'significance': event.significance
-                    })
-        
-        # Generate a simple summary
-        summary = f"Higher-level synthesis of {len(source_syntheses)} lower-level syntheses in domain {domain_type} from {start_date.isoformat()} to {end_date.isoformat()}"
-        
-        # TODO: Implement more sophisticated analysis to generate combined metrics, patterns, recommendations, etc.
-        
-        # Create the synthesis
-        _, st_id = self.create_trajectory_synthesis(
-            subject_id=subject_id,
-            domain_type=domain_type,
-            summary=summary,
-            start_date=start_date,
-            end_date=end_date,
-            source_events=source_events,
-            key_insights=key_insights,
-            significant_events=significant_events,
-            level=new_level
-        )
+        synthesis = merge_syntheses(subject_id, domain_type, source_syntheses)
+        
+        return self.repository.save_trajectory_synthesis(synthesis, history.hu_id)
+    
+    def rollup_syntheses(self, subject_id: str, domain_type: Union[str, DomainType]) -> List[str]:
+        """
+        Build or refresh the calendar hierarchy of syntheses of a domain.
+        
+        Level 1 syntheses (one per month, e.g. from generate_synthesis_from_events)
+        are merged into one level 2 synthesis per quarter, and those into one level 3
+        synthesis per year. Each rollup records a fingerprint of its children in
+        domain_specific_data, so only the periods whose children were added or
+        changed since the last call are rebuilt; a rebuilt rollup keeps its ID.
+        Window syntheses and syntheses made with generate_higher_level_synthesis are
+        not part of the hierarchy.
         
-        return st_id
\ No newline at end of file
+        Args:
+            subject_id (str): ID of the subject
+            domain_type (Union[str, DomainType]): The domain type
+            
+        Returns:
+            List[str]: IDs of the rollups built or refreshed, quarters before years
+        """
+        # Get the Universal History for this subject
+        history = self.repository.get_history_by_subject(subject_id)
+        if not history:
+            raise ValueError(f"No Universal History found for subject {subject_id}")
+        
+        syntheses = self.repository.get_syntheses_by_domain(domain_type, history.hu_id)
+        
+        # Existing rollups by (level, period)
+        rollups: Dict[Tuple[int, str], TrajectorySynthesis] = {}
+        for synthesis in syntheses:
+            rollup = synthesis.domain_specific_data.get(ROLLUP_KEY)
+            if rollup and synthesis.level in ROLLUP_PERIODS:
+                rollups.setdefault((synthesis.level, rollup['period']), synthesis)
+        
+        # Build each level from the one below, starting from the monthly syntheses
+        children = [s for s in syntheses if s.level == 1 and WINDOW_STATE_KEY not in s.domain_specific_data]
+        changed = []
+        for level in sorted(ROLLUP_PERIODS):
+            groups: Dict[str, List[TrajectorySynthesis]] = {}
+            for child in sorted(children, key=lambda s: (s.time_frame.start, s.st_id)):
+                groups.setdefault(rollup_period(child.time_frame.start, level), []).append(child)
+            
+            parents = []
+            for period, group in groups.items():
+                fingerprint = calculate_hash({'children': [[c.st_id, calculate_hash(c.to_dict())] for c in group]})
+                parent = rollups.get((level, period))
+                if parent is None or parent.domain_specific_data[ROLLUP_KEY].get('fingerprint') != fingerprint:
+                    rebuilt = merge_syntheses(subject_id, domain_type, group, level)
+                    if parent is not None:
+                        rebuilt.st_id = parent.st_id
+                    rebuilt.domain_specific_data[ROLLUP_KEY] = {'period': period, 'fingerprint': fingerprint}
+                    parent = rebuilt
+                    changed.append(parent)
+                parents.append(parent)
+            children = parents
+        
+        # Save the new and refreshed rollups with a single write
+        if changed:
+            self.repository.save_trajectory_syntheses(changed, history.hu_id)
+        
+        return [synthesis.st_id for synthesis in changed]
@@ -0,0 +1,196 @@
+"""
+Verification service for auditing event hash chains across a repository.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from ..models.event_record import EventRecord, DomainType
+from ..models.universal_history import find_chain_break
+from ..storage.repository import HistoryRepository
+from ..utils.parallel import iter_parallel
+
+@dataclass
+class ChainVerificationResult:
+    """Outcome of verifying the event chain of one domain of one history."""
+    hu_id: str
+    subject_id: str
+    domain_type: str
+    event_count: int
+    valid: bool
+    failed_re_id: Optional[str] = None
+    reason: Optional[str] = None
+
+@dataclass
+class VerificationReport:
+    """Summary of a repository-wide verification run."""
+    chains_verified: int = 0
+    events_verified: int = 0
+    elapsed_seconds: float = 0.0
+    failures: List[ChainVerificationResult] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        """Whether every verified chain is intact."""
+        return not self.failures
+
+    @property
+    def events_per_second(self) -> float:
+        """Verification throughput in events per second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.events_verified / self.elapsed_seconds
+
+    @property
+    def chains_per_second(self) -> float:
+        """Verification throughput in chains per second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.chains_verified / self.elapsed_seconds
+
+    def add_result(self, result: ChainVerificationResult) -> None:
+        """
+        Account for the result of one chain.
+
+        Args:
+            result (ChainVerificationResult): The result to add
+        """
+        self.chains_verified += 1
+        self.events_verified += result.event_count
+        if not result.valid:
+            self.failures.append(result)
+
+def verify_chain_events(events: List[EventRecord]) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Verify the hash chain formed by the events of a single domain.
+
+    The checks are those of UniversalHistory.verify_event_chain (see
+    find_chain_break), but the first offending event and the reason are reported.
+
+    Args:
+        events (List[EventRecord]): Events of one domain, in any order
+
+    Returns:
+        Tuple[bool, Optional[str], Optional[str]]: Validity, ID of the first failing
+            event and a description of the failure
+    """
+    failed_re_id, reason = find_chain_break(sorted(events, key=lambda e: e.timestamp))
+    return failed_re_id is None, failed_re_id, reason
+
+# A history to verify: history ID and the domains to verify (None for all)
+ChainTask = Tuple[str, Optional[FrozenSet[str]]]
+
+def _verify_history(repository: HistoryRepository, task: ChainTask) -> List[ChainVerificationResult]:
+    """
+    Read one history and verify the chain of each of its domains. Runs inside a worker process.
+
+    Args:
+        repository (HistoryRepository): The repository to read from
+        task (ChainTask): The history and the domains to verify
+
+    Returns:
+        List[ChainVerificationResult]: One result per verified domain (none if the history is missing)
+    """
+    hu_id, domain_filter = task
+    history = repository.get_history(hu_id)
+    if not history:
+        return []
+
+    results = []
+    for domain_type in sorted(history.get_domains()):
+        if domain_filter is not None and domain_type not in domain_filter:
+            continue
+        # Only the events of the verified domains are decoded
+        events = history.get_events_by_domain(domain_type)
+        valid, failed_re_id, reason = verify_chain_events(events)
+        results.append(ChainVerificationResult(
+            hu_id=hu_id,
+            subject_id=history.subject_id,
+            domain_type=domain_type,
+            event_count=len(events),
+            valid=valid,
+            failed_re_id=failed_re_id,
+            reason=reason
+        ))
+    return results
+
+def _iter_chain_tasks(repository: HistoryRepository, subject_ids: Optional[Iterable[str]] = None,
+                      domains: Optional[Iterable[str]] = None) -> Iterator[ChainTask]:
+    """
+    List the histories to verify, without reading them.
+
+    Args:
+        repository (HistoryRepository): The repository to read from
+        subject_ids (Optional[Iterable[str]]): Restrict to these subjects
+        domains (Optional[Iterable[str]]): Restrict to these domains
+
+    Returns:
+        Iterator[ChainTask]: Verification tasks
+    """
+    domain_filter = None
+    if domains is not None:
+        domain_filter = frozenset(d.value if isinstance(d, DomainType) else d for d in domains)
+
+    if subject_ids is not None:
+        subject_index = repository.get_subject_index()
+        hu_ids = (subject_index[subject_id] for subject_id in subject_ids if subject_id in subject_index)
+    else:
+        hu_ids = repository.get_history_ids()
+
+    for hu_id in hu_ids:
+        yield hu_id, domain_filter
+
+def iter_verify_all(repository: HistoryRepository, workers: Optional[int] = None,
+                    subject_ids: Optional[Iterable[str]] = None,
+                    domains: Optional[Iterable[str]] = None) -> Iterator[ChainVerificationResult]:
+    """
+    Verify every event chain in a repository, yielding results as they finish.
+
+    Histories are fanned out across a process pool: each worker reads its
+    histories from the repository and recomputes their hashes, so this process
+    only lists them. Repositories held in process memory (see
+    HistoryRepository.supports_worker_processes) are verified in this process.
+
+    Args:
+        repository (HistoryRepository): The repository to verify
+        workers (Optional[int]): Number of worker processes, or None for one per CPU
+        subject_ids (Optional[Iterable[str]]): Restrict to these subjects
+        domains (Optional[Iterable[str]]): Restrict to these domains
+
+    Returns:
+        Iterator[ChainVerificationResult]: Results in completion order
+    """
+    if not repository.supports_worker_processes:
+        workers = 1
+    tasks = _iter_chain_tasks(repository, subject_ids, domains)
+    for results in iter_parallel(_verify_history, tasks, workers=workers, context=repository):
+        yield from results
+
+def verify_all(repository: HistoryRepository, workers: Optional[int] = None,
+               subject_ids: Optional[Iterable[str]] = None,
+               domains: Optional[Iterable[str]] = None,
+               on_result: Optional[Callable[[ChainVerificationResult], None]] = None) -> VerificationReport:
+    """
+    Verify every event chain in a repository and summarize the run.
+
+    Args:
+        repository (HistoryRepository): The repository to verify
+        workers (Optional[int]): Number of worker processes, or None for one per CPU
+        subject_ids (Optional[Iterable[str]]): Restrict to these subjects
+        domains (Optional[Iterable[str]]): Restrict to these domains
+        on_result (Optional[Callable[[ChainVerificationResult], None]]): Called with
+            each result as soon as it is available
+
+    Returns:
+        VerificationReport: Throughput and failures of the run
+    """
+    report = VerificationReport()
+    start = time.perf_counter()
+
+    for result in iter_verify_all(repository, workers, subject_ids, domains):
+        report.add_result(result)
+        if on_result:
+            on_result(result)
+
+    report.elapsed_seconds = time.perf_counter() - start
+    return report
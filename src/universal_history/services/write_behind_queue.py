@@ -0,0 +1,272 @@
+"""
+Write-behind queue that persists Event Records in the background.
+
+Events are built and assigned their IDs by the caller, then written by worker
+threads. A worker takes every event waiting for a subject at once, so a burst
+of events for one history costs a single repository write; events of the same
+subject are never written by two workers at the same time, which keeps their
+hash chains in order.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from ..models.event_record import EventRecord
+from .event_service import EventService
+
+OVERFLOW_POLICIES = ("block", "reject")
+
+@dataclass
+class WriteBehindMetrics:
+    """Snapshot of the state of a write-behind queue."""
+    queue_depth: int = 0  # Events accepted and not yet committed (including those being written)
+    max_queue_depth: int = 0
+    accepted: int = 0
+    committed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    batches_written: int = 0
+    commit_latency_avg: float = 0.0  # Seconds from acceptance to commit, over recent events
+    commit_latency_p95: float = 0.0
+    commit_latency_max: float = 0.0  # Over the lifetime of the queue
+    last_error: Optional[str] = None
+
+class WriteBehindQueue:
+    """
+    Bounded queue of Event Records persisted by background worker threads.
+
+    Reads do not see events that are still queued; call flush() first when a
+    read must include them.
+    """
+
+    def __init__(self, event_service: EventService,
+                 workers: int = 1,
+                 max_size: int = 10000,
+                 overflow: str = "block",
+                 block_timeout: Optional[float] = None,
+                 max_batch: int = 1000,
+                 on_error: Optional[Callable[[EventRecord, str], None]] = None,
+                 latency_window: int = 1024):
+        """
+        Initialize the queue and start its workers.
+
+        Args:
+            event_service (EventService): Service used to save the events
+            workers (int): Number of writer threads (more than one requires a repository
+                that is safe to use from several threads, such as MongoDB)
+            max_size (int): Maximum number of events accepted and not yet committed
+            overflow (str): What to do when the queue is full: "block" the caller until
+                there is room, or "reject" the event with queue.Full
+            block_timeout (Optional[float]): Seconds a blocked caller waits before queue.Full
+                is raised (None waits indefinitely)
+            max_batch (int): Maximum number of events of one subject written at once
+            on_error (Optional[Callable[[EventRecord, str], None]]): Called from a worker
+                thread with each event that could not be written
+            latency_window (int): Number of recent events the latency statistics cover
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.event_service = event_service
+        self.max_size = max(1, max_size)
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.max_batch = max(1, max_batch)
+        self.on_error = on_error
+
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._has_room = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+
+        self._pending: Dict[str, List[Tuple[EventRecord, float]]] = {}  # Subject ID -> (event, accepted at)
+        self._ready: Deque[str] = deque()  # Subjects with pending events and no write in progress
+        self._writing: Set[str] = set()
+        self._closed = False
+
+        self._metrics = WriteBehindMetrics()
+        self._latencies: Deque[float] = deque(maxlen=max(1, latency_window))
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"write-behind-{index}", daemon=True)
+            for index in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, **event_kwargs: Any) -> str:
+        """
+        Build an Event Record and queue it for writing.
+
+        Args:
+            **event_kwargs: Arguments of EventService.create_event_record
+
+        Returns:
+            str: ID of the queued event record
+        """
+        return self.enqueue(self.event_service.build_event_record(**event_kwargs))
+
+    def enqueue(self, event_record: EventRecord) -> str:
+        """
+        Queue an Event Record for writing.
+
+        Args:
+            event_record (EventRecord): The event record to write
+
+        Returns:
+            str: ID of the event record
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed")
+
+            # Apply the overflow policy
+            if self._metrics.queue_depth >= self.max_size:
+                if self.overflow == "reject" or not self._has_room.wait_for(
+                        lambda: self._metrics.queue_depth < self.max_size or self._closed,
+                        timeout=self.block_timeout):
+                    self._metrics.rejected += 1
+                    raise queue.Full(f"Write-behind queue is full ({self.max_size} events)")
+                if self._closed:
+                    raise RuntimeError("Write-behind queue is closed")
+
+            subject_id = event_record.subject_id
+            if subject_id not in self._pending:
+                self._pending[subject_id] = []
+                if subject_id not in self._writing:
+                    self._ready.append(subject_id)
+            self._pending[subject_id].append((event_record, time.perf_counter()))
+
+            self._metrics.accepted += 1
+            self._metrics.queue_depth += 1
+            self._metrics.max_queue_depth = max(self._metrics.max_queue_depth, self._metrics.queue_depth)
+            self._has_work.notify()
+
+        return event_record.re_id
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every accepted event has been written (or has failed).
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait (None waits indefinitely)
+
+        Returns:
+            bool: True if the queue is empty, False if the timeout expired first
+        """
+        with self._lock:
+            return self._drained.wait_for(lambda: self._metrics.queue_depth == 0, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting events, write the queued ones and stop the workers.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait for the queue to drain
+
+        Returns:
+            bool: True if every queued event was written before the workers stopped
+        """
+        drained = self.flush(timeout)
+        with self._lock:
+            self._closed = True
+            self._has_work.notify_all()
+            self._has_room.notify_all()
+        if drained:
+            for thread in self._threads:
+                thread.join()
+        return drained
+
+    def metrics(self) -> WriteBehindMetrics:
+        """
+        Get the current queue depth, counters and commit latencies.
+
+        Returns:
+            WriteBehindMetrics: A snapshot of the metrics
+        """
+        with self._lock:
+            snapshot = replace(self._metrics)
+            latencies = sorted(self._latencies)
+
+        if latencies:
+            snapshot.commit_latency_avg = sum(latencies) / len(latencies)
+            snapshot.commit_latency_p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return snapshot
+
+    def __enter__(self) -> 'WriteBehindQueue':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Write queued events until the queue is closed and empty (runs in each worker)."""
+        while True:
+            with self._lock:
+                self._has_work.wait_for(lambda: self._ready or self._closed)
+                if not self._ready:
+                    return
+
+                # Take the subject's events, leaving any excess for the next round
+                subject_id = self._ready.popleft()
+                entries = self._pending.pop(subject_id)
+                if len(entries) > self.max_batch:
+                    self._pending[subject_id] = entries[self.max_batch:]
+                    entries = entries[:self.max_batch]
+                self._writing.add(subject_id)
+
+            errors = self._write(entries)
+
+            with self._lock:
+                self._writing.discard(subject_id)
+                if subject_id in self._pending:
+                    self._ready.append(subject_id)
+                    self._has_work.notify()
+
+                committed_at = time.perf_counter()
+                for event_record, accepted_at in entries:
+                    if event_record.re_id in errors:
+                        self._metrics.failed += 1
+                        continue
+                    latency = committed_at - accepted_at
+                    self._latencies.append(latency)
+                    self._metrics.commit_latency_max = max(self._metrics.commit_latency_max, latency)
+                    self._metrics.committed += 1
+                if errors:
+                    self._metrics.last_error = next(iter(errors.values()))
+                self._metrics.batches_written += 1
+                self._metrics.queue_depth -= len(entries)
+
+                self._has_room.notify_all()
+                if self._metrics.queue_depth == 0:
+                    self._drained.notify_all()
+
+            if self.on_error:
+                for event_record, _ in entries:
+                    if event_record.re_id in errors:
+                        self.on_error(event_record, errors[event_record.re_id])
+
+    def _write(self, entries: List[Tuple[EventRecord, float]]) -> Dict[str, str]:
+        """
+        Save the events of one subject.
+
+        Args:
+            entries (List[Tuple[EventRecord, float]]): The events and their acceptance times
+
+        Returns:
+            Dict[str, str]: Error message by ID of each event that could not be written
+        """
+        event_records = [event_record for event_record, _ in entries]
+        try:
+            result = self.event_service.save_event_records(event_records)
+        except Exception as e:
+            # Keep the worker alive; the events are reported as failed
+            return {event_record.re_id: f"{type(e).__name__}: {e}" for event_record in event_records}
+
+        return {
+            event_records[item.index].re_id: item.error
+            for item in result.items if not item.ok
+        }
@@ -1,14 +1,16 @@
 """
 Memory repository implementation for storage of Universal History objects.
 """
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 
 from ..models.event_record import EventRecord, DomainType
 from ..models.trajectory_synthesis import TrajectorySynthesis
 from ..models.state_document import StateDocument
 from ..models.domain_catalog import DomainCatalog
-from ..models.universal_history import UniversalHistory
+from ..models.universal_history import UniversalHistory, ChainHead
 from .repository import HistoryRepository
+from .text_index import TextIndex, event_text, sync_text_index
+from .metric_series import MetricSeries, MetricStore
 
 class MemoryHistoryRepository(HistoryRepository):
     """
@@ -18,10 +20,20 @@ class MemoryHistoryRepository(HistoryRepository):
     testing and small-scale usage, but does not persist data across restarts.
     """
     
-    def __init__(self):
-        """Initialize the repository with empty dictionaries."""
+    def __init__(self, text_index: bool = False, metric_series: bool = False):
+        """
+        Initialize the repository with empty dictionaries.
+        
+        Args:
+            text_index (bool): Maintain a full-text index of each history's events
+                to speed up search_text
+            metric_series (bool): Maintain columnar series of each history's quantitative
+                metrics to speed up get_metric_series
+        """
         self.histories: Dict[str, UniversalHistory] = {}
         self.subject_to_history: Dict[str, str] = {}  # subject_id -> hu_id
+        self.text_indexes: Optional[Dict[str, TextIndex]] = {} if text_index else None  # hu_id -> index
+        self.metric_stores: Optional[Dict[str, MetricStore]] = {} if metric_series else None  # hu_id -> store
     
     def save_history(self, history: UniversalHistory) -> str:
         """
@@ -35,6 +47,12 @@ class MemoryHistoryRepository(HistoryRepository):
         """
         self.histories[history.hu_id] = history
         self.subject_to_history[history.subject_id] = history.hu_id
+        
+        # Index the events added since the last save
+        if self.text_indexes is not None:
+            sync_text_index(self.text_indexes.setdefault(history.hu_id, TextIndex()), history)
+        if self.metric_stores is not None:
+            self.metric_stores.setdefault(history.hu_id, MetricStore()).sync(history)
         return history.hu_id
     
     def get_history(self, hu_id: str) -> Optional[UniversalHistory]:
@@ -49,6 +67,24 @@ class MemoryHistoryRepository(HistoryRepository):
         """
         return self.histories.get(hu_id)
     
+    def get_history_ids(self) -> List[str]:
+        """
+        Get the IDs of all Universal Histories in the repository.
+        
+        Returns:
+            List[str]: List of history IDs
+        """
+        return list(self.histories.keys())
+    
+    def get_subject_index(self) -> Dict[str, str]:
+        """
+        Get the ID of the history of every subject in the repository.
+        
+        Returns:
+            Dict[str, str]: Subject ID -> history ID
+        """
+        return dict(self.subject_to_history)
+    
     def get_history_by_subject(self, subject_id: str) -> Optional[UniversalHistory]:
         """
         Get a Universal History by subject ID.
@@ -80,6 +116,13 @@ class MemoryHistoryRepository(HistoryRepository):
             raise ValueError(f"Universal History with ID {hu_id} not found")
         
         history.add_event_record(event_record)
+        self._track_recent_events(history, [event_record])
+        if self.text_indexes is not None:
+            self.text_indexes.setdefault(hu_id, TextIndex()).add(
+                event_record.re_id, event_text(event_record), event_record.current_re_hash
+            )
+        if self.metric_stores is not None:
+            self.metric_stores.setdefault(hu_id, MetricStore()).add_event_record(event_record)
         return event_record.re_id
     
     def get_event_record(self, re_id: str, hu_id: str) -> Optional[EventRecord]:
@@ -235,4 +278,83 @@ class MemoryHistoryRepository(HistoryRepository):
         if not history:
             return []
         
-        return history.get_syntheses_by_domain(domain_type)
\ No newline at end of file
+        return history.get_syntheses_by_domain(domain_type)
+    
+    def search_text(self, hu_id: str, query: str, limit: int = 10) -> List[Tuple[EventRecord, float]]:
+        """
+        Search the text of the Event Records of a Universal History.
+        
+        With the text index enabled, only the postings of the query terms are
+        read. Events are indexed when they are saved through the repository.
+        
+        Args:
+            hu_id (str): The ID of the history to search
+            query (str): The search terms
+            limit (int): Maximum number of events to return
+            
+        Returns:
+            List[Tuple[EventRecord, float]]: Matching events and their scores, best first
+        """
+        if self.text_indexes is None:
+            return super().search_text(hu_id, query, limit)
+        
+        history = self.histories.get(hu_id)
+        if not history:
+            return []
+        
+        index = self.text_indexes.get(hu_id)
+        if index is None:
+            index = self.text_indexes[hu_id] = TextIndex()
+            sync_text_index(index, history)
+        
+        return [
+            (history.event_records[re_id], score)
+            for re_id, score in index.search(query, limit)
+            if re_id in history.event_records
+        ]
+    
+    def get_metric_series(self, domain_type: Union[str, DomainType], metric: str, hu_id: str) -> Optional[MetricSeries]:
+        """
+        Get the time series of a quantitative metric in a domain of a Universal History.
+        
+        With metric series enabled, the series is maintained as events are saved
+        through the repository and returned without reading any event.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type
+            metric (str): Name of the quantitative metric
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Optional[MetricSeries]: The series or None if no event has the metric
+        """
+        if self.metric_stores is None:
+            return super().get_metric_series(domain_type, metric, hu_id)
+        
+        history = self.histories.get(hu_id)
+        if not history:
+            return None
+        
+        store = self.metric_stores.get(hu_id)
+        if store is None:
+            store = self.metric_stores[hu_id] = MetricStore()
+            store.sync(history)
+        
+        return store.get_series(domain_type, metric)
+    
+    def get_chain_head(self, domain_type: Union[str, DomainType], hu_id: str) -> Optional[ChainHead]:
+        """
+        Get the head of the event hash chain for a domain of a Universal History.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to get the chain head for
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Optional[ChainHead]: The chain head or None if the domain has no events
+        """
+        history = self.histories.get(hu_id)
+        if not history:
+            return None
+        
+        return history.get_chain_head(domain_type)
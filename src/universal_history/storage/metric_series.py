@@ -0,0 +1,419 @@
+"""
+Columnar time series of the quantitative metrics of Event Records.
+
+Each (domain, metric) pair of a history gets a series holding two parallel
+arrays, epoch timestamps and values, kept in time order. Aggregating a window
+is then a binary search for its bounds and a few vectorized reductions over a
+slice, instead of a walk over Event Record objects. NumPy is used when it is
+installed; otherwise the series fall back to the standard array module.
+"""
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy not installed
+    np = None
+
+from ..models.event_record import EventRecord, DomainType
+from ..models.lazy_mapping import peek_field
+from ..models.universal_history import UniversalHistory
+
+SECONDS_PER_DAY = 86400.0
+
+def _domain_value(domain_type: Union[str, DomainType]) -> str:
+    return domain_type.value if isinstance(domain_type, DomainType) else domain_type
+
+@dataclass
+class MetricSummary:
+    """Aggregates of a metric over a time window."""
+    count: int = 0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    mean: Optional[float] = None
+    percentiles: Dict[float, float] = field(default_factory=dict)
+    slope_per_day: Optional[float] = None  # Least-squares trend; None with fewer than two points
+    first_timestamp: Optional[datetime] = None
+    last_timestamp: Optional[datetime] = None
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Percentile with linear interpolation between closest ranks (as numpy.percentile)."""
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+class MetricSeries:
+    """
+    Time-ordered series of one metric, stored as parallel timestamp and value arrays.
+    """
+
+    def __init__(self):
+        """Initialize an empty series."""
+        self._size = 0
+        if np is not None:
+            # Buffers grow by doubling; only the first _size entries are used
+            self._times = np.empty(16, dtype=np.float64)
+            self._values = np.empty(16, dtype=np.float64)
+        else:
+            self._times = array('d')
+            self._values = array('d')
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_points(cls, timestamps: Sequence[float], values: Sequence[float]) -> 'MetricSeries':
+        """
+        Create a series from epoch timestamps and values already in time order.
+
+        Args:
+            timestamps (Sequence[float]): Epoch timestamps, ascending
+            values (Sequence[float]): The values, in the same order
+
+        Returns:
+            MetricSeries: The series
+        """
+        series = cls()
+        if np is not None:
+            series._times = np.array(timestamps, dtype=np.float64)
+            series._values = np.array(values, dtype=np.float64)
+        else:
+            series._times = array('d', timestamps)
+            series._values = array('d', values)
+        series._size = len(series._times)
+        return series
+
+    @property
+    def timestamps(self) -> Any:
+        """Epoch timestamps of the points, in ascending order (a NumPy array or array.array)."""
+        return self._times[:self._size]
+
+    @property
+    def values(self) -> Any:
+        """Values of the points, in timestamp order (a NumPy array or array.array)."""
+        return self._values[:self._size]
+
+    def append(self, timestamp: datetime, value: float) -> None:
+        """
+        Add a point to the series.
+
+        Points are usually appended in time order; an older point is inserted at
+        its place, which costs a copy of the newer points.
+
+        Args:
+            timestamp (datetime): Time of the measurement
+            value (float): The measured value
+        """
+        epoch = timestamp.timestamp()
+        value = float(value)
+
+        if np is None:
+            if self._size and epoch < self._times[-1]:
+                position = bisect_right(self._times, epoch)
+                self._times.insert(position, epoch)
+                self._values.insert(position, value)
+            else:
+                self._times.append(epoch)
+                self._values.append(value)
+            self._size += 1
+            return
+
+        if self._size == len(self._times):
+            self._times = np.resize(self._times, 2 * self._size)
+            self._values = np.resize(self._values, 2 * self._size)
+
+        if self._size and epoch < self._times[self._size - 1]:
+            position = int(np.searchsorted(self._times[:self._size], epoch, side='right'))
+            self._times[position + 1:self._size + 1] = self._times[position:self._size]
+            self._values[position + 1:self._size + 1] = self._values[position:self._size]
+        else:
+            position = self._size
+        self._times[position] = epoch
+        self._values[position] = value
+        self._size += 1
+
+    def remove(self, epoch: float, value: float) -> bool:
+        """
+        Remove a point from the series.
+
+        Args:
+            epoch (float): Epoch timestamp of the point
+            value (float): Value of the point
+
+        Returns:
+            bool: True if a matching point was found and removed
+        """
+        times = self.timestamps
+        if np is not None:
+            lo = int(np.searchsorted(times, epoch, side='left'))
+            hi = int(np.searchsorted(times, epoch, side='right'))
+        else:
+            lo, hi = bisect_left(times, epoch), bisect_right(times, epoch)
+
+        for position in range(lo, hi):
+            stored = self._values[position]
+            if stored == value or (math.isnan(stored) and math.isnan(value)):
+                break
+        else:
+            return False
+
+        if np is None:
+            del self._times[position]
+            del self._values[position]
+        else:
+            self._times[position:self._size - 1] = self._times[position + 1:self._size]
+            self._values[position:self._size - 1] = self._values[position + 1:self._size]
+        self._size -= 1
+        return True
+
+    def _window(self, start: Optional[datetime], end: Optional[datetime]) -> Tuple[int, int]:
+        """Index range of the points between start and end (both inclusive)."""
+        times = self.timestamps
+        if np is not None:
+            lo = int(np.searchsorted(times, start.timestamp(), side='left')) if start else 0
+            hi = int(np.searchsorted(times, end.timestamp(), side='right')) if end else self._size
+        else:
+            lo = bisect_left(times, start.timestamp()) if start else 0
+            hi = bisect_right(times, end.timestamp()) if end else self._size
+        return lo, max(lo, hi)
+
+    def aggregate(self, start: Optional[datetime] = None,
+                  end: Optional[datetime] = None,
+                  percentiles: Iterable[float] = (50, 90)) -> MetricSummary:
+        """
+        Aggregate the points of a time window.
+
+        Args:
+            start (Optional[datetime]): Start of the window, inclusive (None for the first point)
+            end (Optional[datetime]): End of the window, inclusive (None for the last point)
+            percentiles (Iterable[float]): Percentiles to compute, between 0 and 100
+
+        Returns:
+            MetricSummary: The aggregates (count 0 for an empty window)
+        """
+        lo, hi = self._window(start, end)
+        count = hi - lo
+        if count == 0:
+            return MetricSummary()
+
+        times = self._times[lo:hi]
+        values = self._values[lo:hi]
+        percentiles = list(percentiles)
+
+        if np is not None:
+            summary = MetricSummary(
+                count=count,
+                minimum=float(values.min()),
+                maximum=float(values.max()),
+                mean=float(values.mean()),
+                percentiles=dict(zip(percentiles, np.percentile(values, percentiles).tolist())) if percentiles else {}
+            )
+            if count > 1:
+                centered = times - times.mean()
+                denominator = float(np.dot(centered, centered))
+                if denominator > 0:
+                    summary.slope_per_day = float(np.dot(centered, values - values.mean())) / denominator * SECONDS_PER_DAY
+        else:
+            sorted_values = sorted(values)
+            mean = sum(values) / count
+            summary = MetricSummary(
+                count=count,
+                minimum=sorted_values[0],
+                maximum=sorted_values[-1],
+                mean=mean,
+                percentiles={q: _percentile(sorted_values, q) for q in percentiles}
+            )
+            if count > 1:
+                mean_time = sum(times) / count
+                denominator = sum((t - mean_time) ** 2 for t in times)
+                if denominator > 0:
+                    numerator = sum((t - mean_time) * (v - mean) for t, v in zip(times, values))
+                    summary.slope_per_day = numerator / denominator * SECONDS_PER_DAY
+
+        summary.first_timestamp = datetime.fromtimestamp(float(times[0]))
+        summary.last_timestamp = datetime.fromtimestamp(float(times[-1]))
+        return summary
+
+class MetricStore:
+    """
+    Metric series of one Universal History, by domain and metric name.
+
+    The store remembers the points each Event Record contributed, along with
+    the hash of the record, so an edited record's points can be replaced and a
+    removed record's points dropped.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._series: Dict[Tuple[str, str], MetricSeries] = {}
+        # re_id -> (hash, domain, epoch timestamp, metrics) of each event added
+        self._events: Dict[str, Tuple[Optional[str], str, float, Dict[str, float]]] = {}
+
+    def add_event_record(self, event_record: EventRecord) -> None:
+        """
+        Add the quantitative metrics of an Event Record to the series of its domain.
+
+        An event added before is replaced if its hash changed, and ignored otherwise.
+
+        Args:
+            event_record (EventRecord): The event record
+        """
+        entry = self._events.get(event_record.re_id)
+        if entry is not None:
+            if entry[0] == event_record.current_re_hash:
+                return
+            self.remove_event_record(event_record.re_id)
+
+        domain_type = _domain_value(event_record.domain_type)
+        epoch = event_record.timestamp.timestamp()
+        metrics = {}
+        if event_record.processed_data:
+            for name, value in event_record.processed_data.quantitative_metrics.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metrics[name] = float(value)
+        self._events[event_record.re_id] = (event_record.current_re_hash, domain_type, epoch, metrics)
+
+        for name, value in metrics.items():
+            key = (domain_type, name)
+            if key not in self._series:
+                self._series[key] = MetricSeries()
+            self._series[key].append(event_record.timestamp, value)
+
+    def remove_event_record(self, re_id: str) -> None:
+        """
+        Remove the points of an Event Record from the series.
+
+        Args:
+            re_id (str): ID of the event record (ignored if not in the store)
+        """
+        entry = self._events.pop(re_id, None)
+        if entry is None:
+            return
+        _, domain_type, epoch, metrics = entry
+        for name, value in metrics.items():
+            key = (domain_type, name)
+            series = self._series.get(key)
+            if series is not None:
+                series.remove(epoch, value)
+                if not len(series):
+                    del self._series[key]
+
+    def sync(self, history: UniversalHistory) -> bool:
+        """
+        Bring the store in line with the Event Records of a history.
+
+        Events not yet added are added, events whose hash changed since they were
+        added (their content was edited) replace their old points, and events no
+        longer in the history are removed. Only the hash of events already added
+        is read, so records of a lazily loaded history stay undecoded.
+
+        Args:
+            history (UniversalHistory): The history
+
+        Returns:
+            bool: True if the store changed
+        """
+        removed = [re_id for re_id in self._events if re_id not in history.event_records]
+        missing = [
+            re_id for re_id in history.event_records
+            if re_id not in self._events
+            or self._events[re_id][0] != peek_field(history.event_records, re_id, 'current_re_hash')
+        ]
+
+        for re_id in removed:
+            self.remove_event_record(re_id)
+        for re_id in missing:
+            self.add_event_record(history.event_records[re_id])
+        return bool(removed or missing)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the store to a dictionary.
+
+        Returns:
+            Dict[str, Any]: Dictionary representation of the store
+        """
+        return {
+            'events': {
+                re_id: {'version': version, 'domain_type': domain_type, 'timestamp': epoch, 'metrics': metrics}
+                for re_id, (version, domain_type, epoch, metrics) in self._events.items()
+            },
+            'series': [
+                {
+                    'domain_type': domain_type,
+                    'metric': name,
+                    'timestamps': [float(epoch) for epoch in series.timestamps],
+                    'values': [float(value) for value in series.values]
+                }
+                for (domain_type, name), series in self._series.items()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MetricStore':
+        """
+        Create a store from a dictionary.
+
+        Args:
+            data (Dict[str, Any]): Dictionary representation of the store
+
+        Returns:
+            MetricStore: The store
+        """
+        store = cls()
+        store._events = {
+            re_id: (event['version'], event['domain_type'], event['timestamp'], event['metrics'])
+            for re_id, event in data.get('events', {}).items()
+        }
+        for series_data in data.get('series', []):
+            store._series[(series_data['domain_type'], series_data['metric'])] = MetricSeries.from_points(
+                series_data['timestamps'], series_data['values']
+            )
+        return store
+
+    @classmethod
+    def from_event_records(cls, event_records: Iterable[EventRecord]) -> 'MetricStore':
+        """
+        Build a store from Event Records.
+
+        Args:
+            event_records (Iterable[EventRecord]): The event records
+
+        Returns:
+            MetricStore: The store
+        """
+        store = cls()
+        for event_record in event_records:
+            store.add_event_record(event_record)
+        return store
+
+    def get_series(self, domain_type: Union[str, DomainType], metric: str) -> Optional[MetricSeries]:
+        """
+        Get the series of a metric in a domain.
+
+        Args:
+            domain_type (Union[str, DomainType]): The domain type
+            metric (str): Name of the quantitative metric
+
+        Returns:
+            Optional[MetricSeries]: The series or None if no event has the metric
+        """
+        return self._series.get((_domain_value(domain_type), metric))
+
+    def get_metric_names(self, domain_type: Union[str, DomainType]) -> List[str]:
+        """
+        Get the names of the metrics recorded in a domain.
+
+        Args:
+            domain_type (Union[str, DomainType]): The domain type
+
+        Returns:
+            List[str]: The metric names, sorted
+        """
+        domain_type = _domain_value(domain_type)
+        return sorted(name for domain, name in self._series if domain == domain_type)
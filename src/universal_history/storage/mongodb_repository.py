@@ -1,19 +1,23 @@
 """
 MongoDB repository implementation for storage of Universal History objects.
 """
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 import json
 from datetime import datetime
 
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne, ASCENDING, DESCENDING
 from pymongo.collection import Collection
 from pymongo.database import Database
 
 from ..models.event_record import EventRecord, DomainType
 from ..models.trajectory_synthesis import TrajectorySynthesis
-from ..models.state_document import StateDocument
+from ..models.state_document import StateDocument, DomainState, EventReference
 from ..models.domain_catalog import DomainCatalog
-from ..models.universal_history import UniversalHistory
+from ..models.universal_history import UniversalHistory, ChainHead, VerificationCheckpoint, DomainMerkleTree
+from ..models.lazy_mapping import LazyRecordMapping
+from ..utils.merkle_utils import InclusionProof, extend_frontier, frontier_root
+from .metric_series import MetricSeries
+from .query import EventFilter, EventPage, decode_cursor, paginate, validate_sort
 from .repository import HistoryRepository
 
 class MongoDBHistoryRepository(HistoryRepository):
@@ -41,17 +45,24 @@ class MongoDBHistoryRepository(HistoryRepository):
         self.trajectory_syntheses: Collection = self.db.trajectory_syntheses
         self.state_documents: Collection = self.db.state_documents
         self.domain_catalogs: Collection = self.db.domain_catalogs
+        self.chain_heads: Collection = self.db.chain_heads
+        self.verification_checkpoints: Collection = self.db.verification_checkpoints
+        self.merkle_trees: Collection = self.db.merkle_trees
         
         # Indexes
         self.histories.create_index("hu_id", unique=True)
         self.histories.create_index("subject_id", unique=True)
         self.event_records.create_index("re_id", unique=True)
         self.event_records.create_index(["hu_id", "domain_type"])
+        self.event_records.create_index(["hu_id", "timestamp"])
         self.trajectory_syntheses.create_index("st_id", unique=True)
         self.trajectory_syntheses.create_index(["hu_id", "domain_type"])
         self.state_documents.create_index("de_id", unique=True)
         self.state_documents.create_index("hu_id", unique=True)
         self.domain_catalogs.create_index(["hu_id", "domain_type"], unique=True)
+        self.chain_heads.create_index(["hu_id", "domain_type"], unique=True)
+        self.verification_checkpoints.create_index(["hu_id", "domain_type"], unique=True)
+        self.merkle_trees.create_index(["hu_id", "domain_type"], unique=True)
     
     def _serialize_datetime(self, obj: Any) -> Any:
         """
@@ -89,6 +100,9 @@ class MongoDBHistoryRepository(HistoryRepository):
         history_dict.pop('trajectory_syntheses', None)
         history_dict.pop('state_document', None)
         history_dict.pop('domain_catalogs', None)
+        history_dict.pop('chain_heads', None)
+        history_dict.pop('verification_checkpoints', None)
+        history_dict.pop('merkle_trees', None)
         
         # Convert datetimes to strings
         history_dict = self._serialize_datetime(history_dict)
@@ -116,6 +130,17 @@ class MongoDBHistoryRepository(HistoryRepository):
         for domain_type, catalog in history.domain_catalogs.items():
             self.save_domain_catalog(catalog, history.hu_id)
         
+        # Save verification checkpoints
+        self.save_verification_checkpoints(history.verification_checkpoints, history.hu_id)
+        
+        # Save Merkle trees
+        for domain_type, merkle_tree in history.merkle_trees.items():
+            self.merkle_trees.update_one(
+                {"hu_id": history.hu_id, "domain_type": domain_type},
+                {"$set": merkle_tree.to_dict()},
+                upsert=True
+            )
+        
         return history.hu_id
     
     def get_history(self, hu_id: str) -> Optional[UniversalHistory]:
@@ -143,25 +168,25 @@ class MongoDBHistoryRepository(HistoryRepository):
         if "last_updated" in history_dict:
             history.last_updated = datetime.fromisoformat(history_dict["last_updated"])
         
-        # Get event records
-        event_records = self.event_records.find({"hu_id": hu_id})
-        for er_dict in event_records:
+        # Get event records (decoded when first accessed)
+        raw_events = {}
+        for er_dict in self.event_records.find({"hu_id": hu_id}):
             # Remove MongoDB _id
             er_dict.pop("_id", None)
             er_dict.pop("hu_id", None)
             
-            event_record = EventRecord.from_dict(er_dict)
-            history.event_records[event_record.re_id] = event_record
+            raw_events[er_dict["re_id"]] = er_dict
+        history.event_records = LazyRecordMapping(raw_events, EventRecord.from_dict)
         
-        # Get trajectory syntheses
-        syntheses = self.trajectory_syntheses.find({"hu_id": hu_id})
-        for s_dict in syntheses:
+        # Get trajectory syntheses (decoded when first accessed)
+        raw_syntheses = {}
+        for s_dict in self.trajectory_syntheses.find({"hu_id": hu_id}):
             # Remove MongoDB _id
             s_dict.pop("_id", None)
             s_dict.pop("hu_id", None)
             
-            synthesis = TrajectorySynthesis.from_dict(s_dict)
-            history.trajectory_syntheses[synthesis.st_id] = synthesis
+            raw_syntheses[s_dict["st_id"]] = s_dict
+        history.trajectory_syntheses = LazyRecordMapping(raw_syntheses, TrajectorySynthesis.from_dict)
         
         # Get state document
         state_dict = self.state_documents.find_one({"hu_id": hu_id})
@@ -183,6 +208,27 @@ class MongoDBHistoryRepository(HistoryRepository):
             domain_type = catalog.domain_type.value if isinstance(catalog.domain_type, DomainType) else catalog.domain_type
             history.domain_catalogs[domain_type] = catalog
         
+        # Get chain heads
+        for head_dict in self.chain_heads.find({"hu_id": hu_id}):
+            domain_type = head_dict.pop("domain_type")
+            head_dict.pop("_id", None)
+            head_dict.pop("hu_id", None)
+            
+            history.chain_heads[domain_type] = ChainHead.from_dict(head_dict)
+        
+        # Get verification checkpoints
+        for checkpoint_dict in self.verification_checkpoints.find({"hu_id": hu_id}):
+            domain_type = checkpoint_dict.pop("domain_type")
+            checkpoint_dict.pop("_id", None)
+            checkpoint_dict.pop("hu_id", None)
+            
+            history.verification_checkpoints[domain_type] = VerificationCheckpoint.from_dict(checkpoint_dict)
+        
+        # Get Merkle trees
+        for tree_dict in self.merkle_trees.find({"hu_id": hu_id}):
+            domain_type = tree_dict.pop("domain_type")
+            history.merkle_trees[domain_type] = DomainMerkleTree.from_dict(tree_dict)
+        
         return history
     
     def get_history_by_subject(self, subject_id: str) -> Optional[UniversalHistory]:
@@ -201,6 +247,46 @@ class MongoDBHistoryRepository(HistoryRepository):
         
         return self.get_history(history_dict["hu_id"])
     
+    def get_history_version(self, subject_id: str) -> Optional[Any]:
+        """
+        Get a value that changes whenever the Universal History of a subject is saved.
+        
+        Every write to a history updates its last_updated timestamp, so only that
+        field is read.
+        
+        Args:
+            subject_id (str): The subject ID to look for
+            
+        Returns:
+            Optional[Any]: The version, or None if the subject has no history
+        """
+        history_dict = self.histories.find_one({"subject_id": subject_id}, {"hu_id": 1, "last_updated": 1, "_id": 0})
+        if not history_dict:
+            return None
+        
+        return history_dict["hu_id"], history_dict.get("last_updated")
+    
+    def get_history_ids(self) -> List[str]:
+        """
+        Get the IDs of all Universal Histories in the repository.
+        
+        Returns:
+            List[str]: List of history IDs
+        """
+        return self.histories.distinct("hu_id")
+    
+    def get_subject_index(self) -> Dict[str, str]:
+        """
+        Get the ID of the history of every subject in the repository.
+        
+        Returns:
+            Dict[str, str]: Subject ID -> history ID
+        """
+        return {
+            doc["subject_id"]: doc["hu_id"]
+            for doc in self.histories.find({}, {"subject_id": 1, "hu_id": 1, "_id": 0})
+        }
+    
     def save_event_record(self, event_record: EventRecord, hu_id: str) -> str:
         """
         Save an Event Record to a Universal History.
@@ -217,16 +303,12 @@ class MongoDBHistoryRepository(HistoryRepository):
         if not history_dict:
             raise ValueError(f"Universal History with ID {hu_id} not found")
         
-        # Check for previous event hash if not provided
-        if not event_record.previous_re_hash:
-            # Find the most recent event in the same domain
-            domain_type = event_record.domain_type.value if isinstance(event_record.domain_type, DomainType) else event_record.domain_type
-            latest_event = self.event_records.find_one(
-                {"hu_id": hu_id, "domain_type": domain_type},
-                sort=[("timestamp", -1)]
-            )
-            if latest_event:
-                event_record.previous_re_hash = latest_event.get("current_re_hash")
+        # Check for previous event hash if not provided (only for events not hashed yet,
+        # so re-saving the first event of a chain does not link it to the head)
+        domain_type = event_record.domain_type.value if isinstance(event_record.domain_type, DomainType) else event_record.domain_type
+        head = self.get_chain_head(domain_type, hu_id)
+        if not event_record.previous_re_hash and not event_record.current_re_hash and head:
+            event_record.previous_re_hash = head.current_re_hash
         
         # Update the hash
         if not event_record.current_re_hash:
@@ -242,12 +324,23 @@ class MongoDBHistoryRepository(HistoryRepository):
         er_dict = self._serialize_datetime(er_dict)
         
         # Save or update the event record
-        self.event_records.update_one(
+        result = self.event_records.update_one(
             {"re_id": event_record.re_id},
             {"$set": er_dict},
             upsert=True
         )
         
+        # Advance the chain head if the event is the most recent in the domain
+        if head is None or head.re_id == event_record.re_id or event_record.timestamp >= head.timestamp:
+            self._save_chain_head(ChainHead.from_event_record(event_record), domain_type, hu_id)
+        
+        # Append new events to the Merkle tree of the domain, if enabled
+        if result.upserted_id is not None:
+            self._append_merkle_leaf(event_record, domain_type, hu_id)
+        
+        # Add the event to the recent events of the State Document, if tracked
+        self._push_recent_events([event_record], hu_id)
+        
         # Update the last_updated timestamp of the history
         self.histories.update_one(
             {"hu_id": hu_id},
@@ -256,6 +349,352 @@ class MongoDBHistoryRepository(HistoryRepository):
         
         return event_record.re_id
     
+    def save_event_records(self, event_records: List[EventRecord], hu_id: str) -> List[str]:
+        """
+        Save several Event Records to a Universal History with a single bulk write.
+        
+        Records that are not hashed yet are chained in timestamp order, reading each
+        domain's chain head once. Records already stored are skipped.
+        
+        Args:
+            event_records (List[EventRecord]): The event records to save
+            hu_id (str): The ID of the history to save to
+            
+        Returns:
+            List[str]: The IDs of the saved event records, in the order given
+        """
+        # Check if the history exists
+        if not self.histories.find_one({"hu_id": hu_id}, {"_id": 1}):
+            raise ValueError(f"Universal History with ID {hu_id} not found")
+        
+        # Skip the records already stored, so a replayed batch is not relinked
+        stored = {
+            doc["re_id"]
+            for doc in self.event_records.find(
+                {"hu_id": hu_id, "re_id": {"$in": [er.re_id for er in event_records]}}, {"re_id": 1}
+            )
+        }
+        
+        # Chain the new events per domain, in timestamp order
+        heads: Dict[str, Optional[ChainHead]] = {}
+        moved_heads = set()
+        operations = []
+        ordered = sorted((er for er in event_records if er.re_id not in stored), key=lambda er: er.timestamp)
+        for event_record in ordered:
+            domain_type = event_record.domain_type.value if isinstance(event_record.domain_type, DomainType) else event_record.domain_type
+            if domain_type not in heads:
+                heads[domain_type] = self.get_chain_head(domain_type, hu_id)
+            head = heads[domain_type]
+            if not event_record.previous_re_hash and not event_record.current_re_hash and head:
+                event_record.previous_re_hash = head.current_re_hash
+            if not event_record.current_re_hash:
+                event_record.update_hash()
+            
+            if head is None or head.re_id == event_record.re_id or event_record.timestamp >= head.timestamp:
+                heads[domain_type] = ChainHead.from_event_record(event_record)
+                moved_heads.add(domain_type)
+            
+            er_dict = self._serialize_datetime(event_record.to_dict())
+            er_dict["hu_id"] = hu_id
+            operations.append(UpdateOne({"re_id": event_record.re_id}, {"$set": er_dict}, upsert=True))
+        
+        if operations:
+            result = self.event_records.bulk_write(operations, ordered=True)
+            
+            # Save the heads that moved, once per domain
+            for domain_type in moved_heads:
+                self._save_chain_head(heads[domain_type], domain_type, hu_id)
+            
+            # Append the new events to the Merkle trees of their domains, if enabled
+            for index, event_record in enumerate(ordered):
+                if index in result.upserted_ids:
+                    domain_type = event_record.domain_type.value if isinstance(event_record.domain_type, DomainType) else event_record.domain_type
+                    self._append_merkle_leaf(event_record, domain_type, hu_id)
+            
+            # Add the new events to the recent events of the State Document, if tracked
+            self._push_recent_events(ordered, hu_id)
+        
+        # Update the last_updated timestamp of the history
+        self.histories.update_one(
+            {"hu_id": hu_id},
+            {"$set": {"last_updated": datetime.now().isoformat()}}
+        )
+        
+        return [event_record.re_id for event_record in event_records]
+    
+    def get_chain_head(self, domain_type: Union[str, DomainType], hu_id: str) -> Optional[ChainHead]:
+        """
+        Get the head of the event hash chain for a domain of a Universal History.
+        
+        The head is read from the chain_heads collection. Histories stored before
+        the collection existed get their head rebuilt from the most recent event.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to get the chain head for
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Optional[ChainHead]: The chain head or None if the domain has no events
+        """
+        domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        
+        head_dict = self.chain_heads.find_one({"hu_id": hu_id, "domain_type": domain_type_value})
+        if head_dict:
+            head_dict.pop("_id", None)
+            head_dict.pop("hu_id", None)
+            head_dict.pop("domain_type", None)
+            return ChainHead.from_dict(head_dict)
+        
+        # Rebuild the head from the most recent event in the domain
+        latest_event = self.event_records.find_one(
+            {"hu_id": hu_id, "domain_type": domain_type_value},
+            sort=[("timestamp", -1)]
+        )
+        if not latest_event:
+            return None
+        
+        head = ChainHead(
+            re_id=latest_event["re_id"],
+            current_re_hash=latest_event.get("current_re_hash"),
+            timestamp=datetime.fromisoformat(latest_event["timestamp"])
+        )
+        self._save_chain_head(head, domain_type_value, hu_id)
+        return head
+    
+    def _push_recent_events(self, event_records: List[EventRecord], hu_id: str) -> None:
+        """
+        Add saved Event Records to the recent events of a history's State Document in place.
+        
+        Each domain's list gets one $push that sorts it newest first and trims it
+        to recent_events_limit, so the State Document is never read back. Does
+        nothing unless recent_events_limit is set or if the history has no State Document.
+        
+        Args:
+            event_records (List[EventRecord]): The saved event records
+            hu_id (str): The ID of the history they were saved to
+        """
+        if self.recent_events_limit is None or not event_records:
+            return
+        
+        # Order the references of each domain by the rules of DomainState.add_recent_event
+        batches: Dict[str, DomainState] = {}
+        for event_record in event_records:
+            domain_type = event_record.domain_type.value if isinstance(event_record.domain_type, DomainType) else event_record.domain_type
+            batches.setdefault(domain_type, DomainState.empty()).add_recent_event(
+                EventReference.from_event_record(event_record), self.recent_events_limit
+            )
+        
+        now = datetime.now().isoformat()
+        for domain_type, batch in batches.items():
+            domain_path = f"domains.{domain_type}"
+            references = self._serialize_datetime(batch.to_dict()['recent_events'])
+            
+            # Give the domain an empty state if it has none, and drop re-saved events
+            self.state_documents.update_one(
+                {"hu_id": hu_id, domain_path: {"$exists": False}},
+                {"$set": {domain_path: self._serialize_datetime(DomainState.empty().to_dict())}}
+            )
+            self.state_documents.update_one(
+                {"hu_id": hu_id},
+                {"$pull": {f"{domain_path}.recent_events": {"re_id": {"$in": [r["re_id"] for r in references]}}}}
+            )
+            
+            self.state_documents.update_one(
+                {"hu_id": hu_id},
+                {
+                    "$push": {f"{domain_path}.recent_events": {
+                        "$each": references,
+                        "$sort": {"timestamp": -1},
+                        "$slice": self.recent_events_limit
+                    }},
+                    "$set": {
+                        f"{domain_path}.last_updated": now,
+                        "last_updated": now,
+                        "metadata.generated_on": now
+                    }
+                }
+            )
+    
+    def _save_chain_head(self, head: ChainHead, domain_type: str, hu_id: str) -> None:
+        """
+        Save the head of the event hash chain for a domain.
+        
+        Args:
+            head (ChainHead): The chain head to save
+            domain_type (str): The domain type value
+            hu_id (str): The ID of the history
+        """
+        self.chain_heads.update_one(
+            {"hu_id": hu_id, "domain_type": domain_type},
+            {"$set": head.to_dict()},
+            upsert=True
+        )
+    
+    def get_verification_checkpoint(self, domain_type: Union[str, DomainType], hu_id: str) -> Optional[VerificationCheckpoint]:
+        """
+        Get the verification checkpoint of the event chain for a domain of a Universal History.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to get the checkpoint for
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Optional[VerificationCheckpoint]: The checkpoint or None if the chain was never verified
+        """
+        domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        
+        checkpoint_dict = self.verification_checkpoints.find_one({"hu_id": hu_id, "domain_type": domain_type_value})
+        if not checkpoint_dict:
+            return None
+        
+        checkpoint_dict.pop("_id", None)
+        checkpoint_dict.pop("hu_id", None)
+        checkpoint_dict.pop("domain_type", None)
+        return VerificationCheckpoint.from_dict(checkpoint_dict)
+    
+    def save_verification_checkpoint(self, checkpoint: VerificationCheckpoint,
+                                     domain_type: Union[str, DomainType], hu_id: str) -> None:
+        """
+        Save the verification checkpoint of the event chain for a domain of a Universal History.
+        
+        Args:
+            checkpoint (VerificationCheckpoint): The checkpoint to save
+            domain_type (Union[str, DomainType]): The domain type the checkpoint belongs to
+            hu_id (str): The ID of the history to save to
+        """
+        domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        
+        self.verification_checkpoints.update_one(
+            {"hu_id": hu_id, "domain_type": domain_type_value},
+            {"$set": checkpoint.to_dict()},
+            upsert=True
+        )
+    
+    def save_verification_checkpoints(self, checkpoints: Dict[Union[str, DomainType], VerificationCheckpoint],
+                                      hu_id: str) -> None:
+        """
+        Save the verification checkpoints of several domains of a Universal History with a single bulk write.
+        
+        Args:
+            checkpoints (Dict[Union[str, DomainType], VerificationCheckpoint]): Domain type -> checkpoint to save
+            hu_id (str): The ID of the history to save to
+        """
+        operations = [
+            UpdateOne(
+                {"hu_id": hu_id, "domain_type": domain_type.value if isinstance(domain_type, DomainType) else domain_type},
+                {"$set": checkpoint.to_dict()},
+                upsert=True
+            )
+            for domain_type, checkpoint in checkpoints.items()
+        ]
+        if operations:
+            self.verification_checkpoints.bulk_write(operations, ordered=False)
+    
+    def _append_merkle_leaf(self, event_record: EventRecord, domain_type: str, hu_id: str) -> None:
+        """
+        Append an Event Record to the Merkle tree of its domain, if the tree is enabled.
+        
+        Only the frontier of the tree is read, so the append costs O(log n).
+        
+        Args:
+            event_record (EventRecord): The event record to append
+            domain_type (str): The domain type value
+            hu_id (str): The ID of the history
+        """
+        tree_dict = self.merkle_trees.find_one(
+            {"hu_id": hu_id, "domain_type": domain_type},
+            {"frontier": 1}
+        )
+        if not tree_dict:
+            return
+        
+        leaf = event_record.current_re_hash or ""
+        frontier = extend_frontier([tuple(node) for node in tree_dict.get("frontier", [])], leaf)
+        self.merkle_trees.update_one(
+            {"hu_id": hu_id, "domain_type": domain_type},
+            {
+                "$push": {"re_ids": event_record.re_id, "leaves": leaf},
+                "$set": {"frontier": [list(node) for node in frontier], "root": frontier_root(frontier)}
+            }
+        )
+    
+    def enable_merkle_tree(self, domain_type: Union[str, DomainType], hu_id: str) -> Optional[str]:
+        """
+        Start maintaining a Merkle tree over the event hashes of a domain of a Universal History.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to build the tree for
+            hu_id (str): The ID of the history
+            
+        Returns:
+            Optional[str]: The Merkle root, or None if the domain has no events yet
+        """
+        domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        
+        tree_dict = self.merkle_trees.find_one({"hu_id": hu_id, "domain_type": domain_type_value}, {"root": 1})
+        if tree_dict:
+            return tree_dict.get("root")
+        
+        if not self.histories.find_one({"hu_id": hu_id}, {"_id": 1}):
+            raise ValueError(f"Universal History with ID {hu_id} not found")
+        
+        # Build the tree from the stored hashes, in timestamp order
+        merkle_tree = DomainMerkleTree()
+        events = self.event_records.find(
+            {"hu_id": hu_id, "domain_type": domain_type_value},
+            {"re_id": 1, "current_re_hash": 1}
+        ).sort("timestamp", 1)
+        for er_dict in events:
+            merkle_tree.re_ids.append(er_dict["re_id"])
+            merkle_tree.tree.append(er_dict.get("current_re_hash") or "")
+        
+        self.merkle_trees.update_one(
+            {"hu_id": hu_id, "domain_type": domain_type_value},
+            {"$set": merkle_tree.to_dict()},
+            upsert=True
+        )
+        return merkle_tree.root
+    
+    def get_merkle_root(self, domain_type: Union[str, DomainType], hu_id: str) -> Optional[str]:
+        """
+        Get the Merkle root of a domain of a Universal History.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to get the root for
+            hu_id (str): The ID of the history
+            
+        Returns:
+            Optional[str]: The Merkle root, or None if the tree is not enabled or empty
+        """
+        domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        
+        tree_dict = self.merkle_trees.find_one({"hu_id": hu_id, "domain_type": domain_type_value}, {"root": 1})
+        return tree_dict.get("root") if tree_dict else None
+    
+    def get_inclusion_proof(self, re_id: str, hu_id: str) -> Optional[InclusionProof]:
+        """
+        Get the Merkle inclusion proof of an Event Record.
+        
+        Only the Merkle tree of the event's domain is loaded.
+        
+        Args:
+            re_id (str): The ID of the event record
+            hu_id (str): The ID of the history
+            
+        Returns:
+            Optional[InclusionProof]: The proof, or None if the event is not in a Merkle tree
+        """
+        er_dict = self.event_records.find_one({"re_id": re_id, "hu_id": hu_id}, {"domain_type": 1})
+        if not er_dict:
+            return None
+        
+        tree_dict = self.merkle_trees.find_one({"hu_id": hu_id, "domain_type": er_dict["domain_type"]})
+        if not tree_dict:
+            return None
+        
+        tree_dict.pop("_id", None)
+        return DomainMerkleTree.from_dict(tree_dict).get_proof(re_id)
+    
     def get_event_record(self, re_id: str, hu_id: str) -> Optional[EventRecord]:
         """
         Get an Event Record by ID from a Universal History.
@@ -317,6 +756,38 @@ class MongoDBHistoryRepository(HistoryRepository):
         
         return synthesis.st_id
     
+    def save_trajectory_syntheses(self, syntheses: List[TrajectorySynthesis], hu_id: str) -> List[str]:
+        """
+        Save several Trajectory Syntheses to a Universal History with a single bulk write.
+        
+        Args:
+            syntheses (List[TrajectorySynthesis]): The syntheses to save
+            hu_id (str): The ID of the history to save to
+            
+        Returns:
+            List[str]: The IDs of the saved syntheses, in the order given
+        """
+        # Check if the history exists
+        if not self.histories.find_one({"hu_id": hu_id}, {"_id": 1}):
+            raise ValueError(f"Universal History with ID {hu_id} not found")
+        
+        operations = []
+        for synthesis in syntheses:
+            s_dict = self._serialize_datetime(synthesis.to_dict())
+            s_dict["hu_id"] = hu_id
+            operations.append(UpdateOne({"st_id": synthesis.st_id}, {"$set": s_dict}, upsert=True))
+        
+        if operations:
+            self.trajectory_syntheses.bulk_write(operations, ordered=False)
+        
+        # Update the last_updated timestamp of the history
+        self.histories.update_one(
+            {"hu_id": hu_id},
+            {"$set": {"last_updated": datetime.now().isoformat()}}
+        )
+        
+        return [synthesis.st_id for synthesis in syntheses]
+    
     def get_trajectory_synthesis(self, st_id: str, hu_id: str) -> Optional[TrajectorySynthesis]:
         """
         Get a Trajectory Synthesis by ID from a Universal History.
@@ -475,17 +946,109 @@ class MongoDBHistoryRepository(HistoryRepository):
         Returns:
             List[EventRecord]: List of Event Records for the specified domain
         """
+        return list(self.iter_events_by_domain(domain_type, hu_id))
+    
+    def iter_events_by_domain(self, domain_type: Union[str, DomainType], hu_id: str) -> Iterator[EventRecord]:
+        """
+        Iterate over the Event Records of a specific domain from a Universal History.
+        
+        Events are decoded as the cursor returns them.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to filter by
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Iterator[EventRecord]: The Event Records for the specified domain
+        """
         domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
         
-        events = []
         for er_dict in self.event_records.find({"hu_id": hu_id, "domain_type": domain_type_value}):
             # Remove MongoDB _id and hu_id
             er_dict.pop("_id", None)
             er_dict.pop("hu_id", None)
             
+            yield EventRecord.from_dict(er_dict)
+    
+    def query_events(self, hu_id: str,
+                     event_filter: Optional[EventFilter] = None,
+                     sort: str = "-timestamp",
+                     limit: Optional[int] = None,
+                     cursor: Optional[str] = None) -> EventPage:
+        """
+        Query the Event Records of a Universal History.
+        
+        The filter, sort order, cursor and limit are all translated into a single
+        MongoDB query, so only the events of the page are read.
+        
+        Args:
+            hu_id (str): The ID of the history to query
+            event_filter (Optional[EventFilter]): Criteria the events must meet (None for all events)
+            sort (str): "-timestamp" for newest first or "timestamp" for oldest first
+            limit (Optional[int]): Maximum number of events to return
+            cursor (Optional[str]): Cursor of the previous page, to continue after it
+            
+        Returns:
+            EventPage: The matching events and the cursor of the next page
+        """
+        descending = validate_sort(sort)
+        
+        query = event_filter.to_mongo() if event_filter else {}
+        query["hu_id"] = hu_id
+        
+        # Continue after the last event of the previous page (ties broken by ID)
+        if cursor:
+            timestamp, re_id = decode_cursor(cursor)
+            timestamp_value = timestamp.isoformat()
+            operator = "$lt" if descending else "$gt"
+            query = {"$and": [query, {"$or": [
+                {"timestamp": {operator: timestamp_value}},
+                {"timestamp": timestamp_value, "re_id": {operator: re_id}}
+            ]}]}
+        
+        direction = DESCENDING if descending else ASCENDING
+        found = self.event_records.find(query).sort([("timestamp", direction), ("re_id", direction)])
+        if limit is not None:
+            # One extra event tells whether there is a next page
+            found = found.limit(limit + 1)
+        
+        events = []
+        for er_dict in found:
+            # Remove MongoDB _id and hu_id
+            er_dict.pop("_id", None)
+            er_dict.pop("hu_id", None)
+            
             events.append(EventRecord.from_dict(er_dict))
         
-        return events
+        return paginate(events, limit)
+    
+    def get_metric_series(self, domain_type: Union[str, DomainType], metric: str, hu_id: str) -> Optional[MetricSeries]:
+        """
+        Get the time series of a quantitative metric in a domain of a Universal History.
+        
+        Only the timestamp and the metric of each event are read, in time order.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type
+            metric (str): Name of the quantitative metric
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Optional[MetricSeries]: The series or None if no event has the metric
+        """
+        domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        field_name = f"processed_data.quantitative_metrics.{metric}"
+        
+        series = MetricSeries()
+        found = self.event_records.find(
+            {"hu_id": hu_id, "domain_type": domain_type_value, field_name: {"$type": "number"}},
+            {"_id": 0, "timestamp": 1, field_name: 1}
+        ).sort("timestamp", ASCENDING)
+        for er_dict in found:
+            value = er_dict["processed_data"]["quantitative_metrics"][metric]
+            series.append(datetime.fromisoformat(er_dict["timestamp"]), value)
+        
+        return series if len(series) else None
     
     def get_syntheses_by_domain(self, domain_type: Union[str, DomainType], hu_id: str) -> List[TrajectorySynthesis]:
         """
@@ -0,0 +1,310 @@
+"""
+Structured queries over the Event Records of a Universal History.
+
+An EventFilter describes which events a caller wants; repositories translate it
+into the most selective read their backend supports (a MongoDB query, a scan of
+undecoded records, ...) instead of returning every event for the caller to
+filter. Results come back one page at a time, ordered by timestamp, with an
+opaque cursor that resumes after the last event of the page.
+"""
+import base64
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..models.event_record import EventRecord, DomainType, SourceType
+from ..utils import json_utils
+
+SORT_ORDERS = ("timestamp", "-timestamp")
+
+MetricRange = Tuple[Optional[float], Optional[float]]
+
+def _enum_value(value: Any) -> Any:
+    """Return the value of an enum member, or the value itself."""
+    return value.value if isinstance(value, (DomainType, SourceType)) else value
+
+def _as_list(value: Any) -> Optional[List[Any]]:
+    """Normalize a single value or a collection of values to a list of plain values."""
+    if value is None:
+        return None
+    if isinstance(value, (str, DomainType, SourceType)):
+        value = [value]
+    return [_enum_value(item) for item in value]
+
+@dataclass
+class EventFilter:
+    """
+    Criteria an Event Record must meet to be returned by a query.
+
+    Every criterion that is set must match. Fields taking several values match
+    events with any of them; time bounds are inclusive and metric ranges are
+    inclusive (min, max) pairs where None leaves a side open.
+    """
+    domain_type: Optional[Union[str, DomainType, List[Union[str, DomainType]]]] = None
+    event_type: Optional[Union[str, List[str]]] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    tags: Optional[List[str]] = None  # Events with any of these tags
+    source_id: Optional[Union[str, List[str]]] = None
+    source_type: Optional[Union[str, SourceType, List[Union[str, SourceType]]]] = None
+    metrics: Dict[str, MetricRange] = field(default_factory=dict)  # Quantitative metric name -> (min, max)
+
+    def __post_init__(self):
+        self.domain_type = _as_list(self.domain_type)
+        self.event_type = _as_list(self.event_type)
+        self.source_id = _as_list(self.source_id)
+        self.source_type = _as_list(self.source_type)
+        self.tags = list(self.tags) if self.tags else None
+
+    def matches(self, event_record: EventRecord) -> bool:
+        """
+        Check whether an Event Record meets the criteria.
+
+        Args:
+            event_record (EventRecord): The event record to check
+
+        Returns:
+            bool: True if the event record matches
+        """
+        source = event_record.source
+        return self._matches(
+            _enum_value(event_record.domain_type),
+            event_record.event_type,
+            lambda: event_record.timestamp,
+            lambda: event_record.metadata.tags if event_record.metadata else [],
+            lambda: (source.id, _enum_value(source.type)) if source else (None, None),
+            lambda: event_record.processed_data.quantitative_metrics if event_record.processed_data else {}
+        )
+
+    def matches_dict(self, er_dict: Dict[str, Any]) -> bool:
+        """
+        Check whether a serialized Event Record meets the criteria, without decoding it.
+
+        Args:
+            er_dict (Dict[str, Any]): The event record in the format of EventRecord.to_dict
+
+        Returns:
+            bool: True if the event record matches
+        """
+        def source() -> Tuple[Any, Any]:
+            source_dict = er_dict.get('source') or {}
+            return source_dict.get('id'), source_dict.get('type')
+
+        return self._matches(
+            er_dict.get('domain_type'),
+            er_dict.get('event_type'),
+            lambda: datetime.fromisoformat(er_dict['timestamp']),
+            lambda: (er_dict.get('metadata') or {}).get('tags') or [],
+            source,
+            lambda: (er_dict.get('processed_data') or {}).get('quantitative_metrics') or {}
+        )
+
+    def _matches(self, domain_type, event_type, timestamp, tags, source, metrics) -> bool:
+        """Apply the criteria; everything but the domain and event type is read only when needed."""
+        if self.domain_type is not None and domain_type not in self.domain_type:
+            return False
+        if self.event_type is not None and event_type not in self.event_type:
+            return False
+
+        if self.start_date is not None or self.end_date is not None:
+            event_time = timestamp()
+            if self.start_date is not None and event_time < self.start_date:
+                return False
+            if self.end_date is not None and event_time > self.end_date:
+                return False
+
+        if self.tags and not any(tag in tags() for tag in self.tags):
+            return False
+
+        if self.source_id is not None or self.source_type is not None:
+            source_id, source_type = source()
+            if self.source_id is not None and source_id not in self.source_id:
+                return False
+            if self.source_type is not None and source_type not in self.source_type:
+                return False
+
+        if self.metrics:
+            event_metrics = metrics()
+            for name, (minimum, maximum) in self.metrics.items():
+                value = event_metrics.get(name)
+                if value is None:
+                    return False
+                try:
+                    if minimum is not None and value < minimum:
+                        return False
+                    if maximum is not None and value > maximum:
+                        return False
+                except TypeError:
+                    return False  # A stored value that is not a number is out of any range
+
+        return True
+
+    def to_mongo(self) -> Dict[str, Any]:
+        """
+        Translate the criteria into a MongoDB query on the event_records collection.
+
+        Timestamps are stored as ISO 8601 strings, which compare in time order.
+
+        Returns:
+            Dict[str, Any]: The query (without the history ID)
+        """
+        query: Dict[str, Any] = {}
+        if self.domain_type is not None:
+            query['domain_type'] = {'$in': self.domain_type}
+        if self.event_type is not None:
+            query['event_type'] = {'$in': self.event_type}
+
+        time_range = {}
+        if self.start_date is not None:
+            time_range['$gte'] = self.start_date.isoformat()
+        if self.end_date is not None:
+            time_range['$lte'] = self.end_date.isoformat()
+        if time_range:
+            query['timestamp'] = time_range
+
+        if self.tags:
+            query['metadata.tags'] = {'$in': self.tags}
+        if self.source_id is not None:
+            query['source.id'] = {'$in': self.source_id}
+        if self.source_type is not None:
+            query['source.type'] = {'$in': self.source_type}
+
+        for name, (minimum, maximum) in self.metrics.items():
+            metric_range: Dict[str, Any] = {'$exists': True, '$ne': None}
+            if minimum is not None:
+                metric_range['$gte'] = minimum
+            if maximum is not None:
+                metric_range['$lte'] = maximum
+            query[f'processed_data.quantitative_metrics.{name}'] = metric_range
+
+        return query
+
+@dataclass
+class EventPage:
+    """A page of query results."""
+    events: List[EventRecord] = field(default_factory=list)
+    next_cursor: Optional[str] = None  # Pass to the next query to continue; None on the last page
+
+def validate_sort(sort: str) -> bool:
+    """
+    Check a sort order and tell whether it is descending.
+
+    Args:
+        sort (str): "timestamp" (oldest first) or "-timestamp" (newest first)
+
+    Returns:
+        bool: True for newest first
+    """
+    if sort not in SORT_ORDERS:
+        raise ValueError(f"Unsupported sort order: {sort}")
+    return sort.startswith('-')
+
+def encode_cursor(event_record: EventRecord) -> str:
+    """
+    Build the cursor that resumes a query after an Event Record.
+
+    Args:
+        event_record (EventRecord): The last event record of a page
+
+    Returns:
+        str: The opaque cursor
+    """
+    position = [event_record.timestamp.isoformat(), event_record.re_id]
+    return base64.urlsafe_b64encode(json_utils.dumps_bytes(position)).decode('ascii')
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Read the position stored in a cursor.
+
+    Args:
+        cursor (str): A cursor returned by encode_cursor
+
+    Returns:
+        Tuple[datetime, str]: Timestamp and ID of the last event record returned
+    """
+    try:
+        timestamp, re_id = json_utils.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(timestamp), re_id
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid query cursor: {cursor}") from e
+
+def query_event_records(event_records: Iterable[EventRecord],
+                        event_filter: Optional[EventFilter] = None,
+                        sort: str = "-timestamp",
+                        limit: Optional[int] = None,
+                        cursor: Optional[str] = None) -> EventPage:
+    """
+    Run a query over Event Records held by the caller.
+
+    Events are ordered by timestamp and then ID, so pages never skip or repeat
+    events that share a timestamp. With a limit only the best limit + 1
+    candidates are kept while scanning.
+
+    Args:
+        event_records (Iterable[EventRecord]): The candidate event records
+        event_filter (Optional[EventFilter]): Criteria to apply (None matches everything)
+        sort (str): "timestamp" (oldest first) or "-timestamp" (newest first)
+        limit (Optional[int]): Maximum number of events in the page
+        cursor (Optional[str]): Cursor returned with the previous page
+
+    Returns:
+        EventPage: The matching events and the cursor of the next page
+    """
+    descending = validate_sort(sort)
+    after = decode_cursor(cursor) if cursor else None
+
+    entries = (
+        ((event_record.timestamp, event_record.re_id), event_record)
+        for event_record in event_records
+        if event_filter is None or event_filter.matches(event_record)
+    )
+    return paginate(select_in_order(entries, descending, limit, after), limit)
+
+def select_in_order(entries: Iterable[Tuple[Tuple[datetime, str], Any]],
+                    descending: bool,
+                    limit: Optional[int] = None,
+                    after: Optional[Tuple[datetime, str]] = None) -> List[Any]:
+    """
+    Order query candidates by (timestamp, ID) and keep those of the next page.
+
+    The items themselves are never compared, so they can be undecoded records
+    that the caller decodes once selected.
+
+    Args:
+        entries (Iterable[Tuple[Tuple[datetime, str], Any]]): (timestamp, ID) and item of each candidate
+        descending (bool): Whether to order newest first
+        limit (Optional[int]): Maximum number of events in the page (limit + 1 are kept)
+        after (Optional[Tuple[datetime, str]]): Position decoded from the cursor of the previous page
+
+    Returns:
+        List[Any]: The items, in query order
+    """
+    if after is not None:
+        entries = (
+            entry for entry in entries
+            if (entry[0] > after if not descending else entry[0] < after)
+        )
+
+    if limit is None:
+        return [item for _, item in sorted(entries, key=lambda entry: entry[0], reverse=descending)]
+
+    # One extra event tells whether there is a next page
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return [item for _, item in select(limit + 1, entries, key=lambda entry: entry[0])]
+
+def paginate(ordered_events: List[EventRecord], limit: Optional[int]) -> EventPage:
+    """
+    Cut a page from events already in query order.
+
+    Args:
+        ordered_events (List[EventRecord]): Up to limit + 1 events, in order
+        limit (Optional[int]): Maximum number of events in the page
+
+    Returns:
+        EventPage: The page, with a cursor if more events follow
+    """
+    if limit is None or len(ordered_events) <= limit:
+        return EventPage(ordered_events)
+    events = ordered_events[:limit]
+    return EventPage(events, encode_cursor(events[-1]) if events else None)
@@ -2,8 +2,7 @@
 Repository interfaces and implementations for storage of Universal History objects.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Union
-import json
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 import os
 import shutil
 from datetime import datetime
@@ -12,7 +11,15 @@ from ..models.event_record import EventRecord, DomainType
 from ..models.trajectory_synthesis import TrajectorySynthesis
 from ..models.state_document import StateDocument
 from ..models.domain_catalog import DomainCatalog
-from ..models.universal_history import UniversalHistory
+from ..models.universal_history import UniversalHistory, ChainHead, VerificationCheckpoint
+from ..utils.merkle_utils import InclusionProof
+from ..utils import json_utils
+from ..utils.json_stream import iter_object_items
+from .query import (
+    EventFilter, EventPage, decode_cursor, encode_cursor, query_event_records, select_in_order, validate_sort
+)
+from .text_index import TextIndex, sync_text_index
+from .metric_series import MetricSeries, MetricStore
 
 class HistoryRepository(ABC):
     """
@@ -21,6 +28,15 @@ class HistoryRepository(ABC):
     This class defines the interface that all storage implementations must follow.
     """
     
+    # Whether a pickled copy of the repository, used in a worker process, reads and
+    # writes the same data as the original (true for storage outside the process)
+    supports_worker_processes = False
+    
+    # When set (see StateService.track_events), saving Event Records also adds them
+    # to the recent_events of the history's State Document, keeping this many per
+    # domain, in the same write that stores the events
+    recent_events_limit: Optional[int] = None
+    
     @abstractmethod
     def save_history(self, history: UniversalHistory) -> str:
         """
@@ -60,6 +76,33 @@ class HistoryRepository(ABC):
         """
         pass
     
+    def get_history_version(self, subject_id: str) -> Optional[Any]:
+        """
+        Get a value that changes whenever the Universal History of a subject is saved.
+        
+        Callers use it to tell whether something derived from the history is still
+        current. The default implementation loads the history; backends that can
+        tell without reading it override this method.
+        
+        Args:
+            subject_id (str): The subject ID to look for
+            
+        Returns:
+            Optional[Any]: The version (comparable for equality and hashable), or None
+                if the subject has no history
+        """
+        history = self.get_history_by_subject(subject_id)
+        if not history:
+            return None
+        
+        state_document = history.state_document
+        return (
+            history.last_updated,
+            len(history.event_records),
+            len(history.trajectory_syntheses),
+            state_document.last_updated if state_document else None
+        )
+    
     @abstractmethod
     def save_event_record(self, event_record: EventRecord, hu_id: str) -> str:
         """
@@ -74,6 +117,47 @@ class HistoryRepository(ABC):
         """
         pass
     
+    def save_event_records(self, event_records: List[EventRecord], hu_id: str) -> List[str]:
+        """
+        Save several Event Records to a Universal History with a single write.
+        
+        The records are chained in timestamp order (see UniversalHistory.add_event_records).
+        Records whose ID is already in the history are skipped, so replaying a batch
+        (e.g. a resumed ingestion) neither duplicates nor relinks them. Backends that
+        store events separately override this method to write them in bulk.
+        
+        Args:
+            event_records (List[EventRecord]): The event records to save
+            hu_id (str): The ID of the history to save to
+            
+        Returns:
+            List[str]: The IDs of the saved event records, in the order given
+        """
+        history = self.get_history(hu_id)
+        if not history:
+            raise ValueError(f"Universal History with ID {hu_id} not found")
+        
+        new_records = [er for er in event_records if er.re_id not in history.event_records]
+        if new_records:
+            history.add_event_records(new_records)
+            self._track_recent_events(history, new_records)
+            self.save_history(history)
+        
+        return [event_record.re_id for event_record in event_records]
+    
+    def _track_recent_events(self, history: UniversalHistory, event_records: List[EventRecord]) -> None:
+        """
+        Add saved Event Records to the recent events of a loaded history's State Document.
+        
+        Does nothing unless recent_events_limit is set or if the history has no State Document.
+        
+        Args:
+            history (UniversalHistory): The loaded history, about to be written
+            event_records (List[EventRecord]): The saved event records
+        """
+        if self.recent_events_limit is not None and history.state_document:
+            history.state_document.add_recent_events(event_records, self.recent_events_limit)
+    
     @abstractmethod
     def get_event_record(self, re_id: str, hu_id: str) -> Optional[EventRecord]:
         """
@@ -102,6 +186,29 @@ class HistoryRepository(ABC):
         """
         pass
     
+    def save_trajectory_syntheses(self, syntheses: List[TrajectorySynthesis], hu_id: str) -> List[str]:
+        """
+        Save several Trajectory Syntheses to a Universal History with a single write.
+        
+        Backends that store syntheses separately override this method to write them in bulk.
+        
+        Args:
+            syntheses (List[TrajectorySynthesis]): The syntheses to save
+            hu_id (str): The ID of the history to save to
+            
+        Returns:
+            List[str]: The IDs of the saved syntheses, in the order given
+        """
+        history = self.get_history(hu_id)
+        if not history:
+            raise ValueError(f"Universal History with ID {hu_id} not found")
+        
+        for synthesis in syntheses:
+            history.add_trajectory_synthesis(synthesis)
+        self.save_history(history)
+        
+        return [synthesis.st_id for synthesis in syntheses]
+    
     @abstractmethod
     def get_trajectory_synthesis(self, st_id: str, hu_id: str) -> Optional[TrajectorySynthesis]:
         """
@@ -130,6 +237,28 @@ class HistoryRepository(ABC):
         """
         pass
     
+    def save_history_state_document(self, history: UniversalHistory, state_document: StateDocument,
+                                    version: Optional[Any] = None) -> str:
+        """
+        Save a State Document to a Universal History that has already been loaded.
+        
+        The loaded history is updated in memory, but the write goes through
+        save_state_document, so events and syntheses saved since the history was
+        loaded are kept. Backends must not write the loaded history back as is,
+        unless version shows nothing was saved since it was loaded.
+        
+        Args:
+            history (UniversalHistory): The loaded history to save to
+            state_document (StateDocument): The state document to save
+            version (Optional[Any]): get_history_version of the subject, read before
+                the history was loaded (None if unknown)
+            
+        Returns:
+            str: The ID of the saved state document
+        """
+        history.set_state_document(state_document)
+        return self.save_state_document(state_document, history.hu_id)
+    
     @abstractmethod
     def get_state_document(self, hu_id: str) -> Optional[StateDocument]:
         """
@@ -198,6 +327,260 @@ class HistoryRepository(ABC):
             List[TrajectorySynthesis]: List of Trajectory Syntheses for the specified domain
         """
         pass
+    
+    def iter_events_by_domain(self, domain_type: Union[str, DomainType], hu_id: str) -> Iterator[EventRecord]:
+        """
+        Iterate over the Event Records of a specific domain from a Universal History.
+        
+        Backends that can read events one at a time override this method so a
+        domain can be scanned without holding the whole history in memory.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to filter by
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Iterator[EventRecord]: The Event Records for the specified domain
+        """
+        return iter(self.get_events_by_domain(domain_type, hu_id))
+    
+    def query_events(self, hu_id: str,
+                     event_filter: Optional[EventFilter] = None,
+                     sort: str = "-timestamp",
+                     limit: Optional[int] = None,
+                     cursor: Optional[str] = None) -> EventPage:
+        """
+        Query the Event Records of a Universal History.
+        
+        The default implementation filters the events of the loaded history
+        (only the requested domains when the filter names any). Backends that
+        can filter, sort and limit closer to the data override this method.
+        
+        Args:
+            hu_id (str): The ID of the history to query
+            event_filter (Optional[EventFilter]): Criteria the events must meet (None for all events)
+            sort (str): "-timestamp" for newest first or "timestamp" for oldest first
+            limit (Optional[int]): Maximum number of events to return
+            cursor (Optional[str]): Cursor of the previous page, to continue after it
+            
+        Returns:
+            EventPage: The matching events and the cursor of the next page
+        """
+        history = self.get_history(hu_id)
+        if not history:
+            return EventPage()
+        
+        if event_filter is not None and event_filter.domain_type is not None:
+            candidates = [
+                event_record
+                for domain_type in event_filter.domain_type
+                for event_record in history.get_events_by_domain(domain_type)
+            ]
+        else:
+            candidates = history.event_records.values()
+        
+        return query_event_records(candidates, event_filter, sort, limit, cursor)
+    
+    def search_text(self, hu_id: str, query: str, limit: int = 10) -> List[Tuple[EventRecord, float]]:
+        """
+        Search the text of the Event Records of a Universal History.
+        
+        Events matching any query term are ranked with BM25 over their raw input
+        content, qualitative assessments and derived insights. The default
+        implementation indexes the whole history on every call; backends that
+        maintain a text index override this method.
+        
+        Args:
+            hu_id (str): The ID of the history to search
+            query (str): The search terms
+            limit (int): Maximum number of events to return
+            
+        Returns:
+            List[Tuple[EventRecord, float]]: Matching events and their scores, best first
+        """
+        history = self.get_history(hu_id)
+        if not history:
+            return []
+        
+        index = TextIndex()
+        sync_text_index(index, history)
+        return [(history.event_records[re_id], score) for re_id, score in index.search(query, limit)]
+    
+    def get_metric_series(self, domain_type: Union[str, DomainType], metric: str, hu_id: str) -> Optional[MetricSeries]:
+        """
+        Get the time series of a quantitative metric in a domain of a Universal History.
+        
+        The default implementation builds the series from the events of the
+        domain on every call; backends that maintain the series as events are
+        saved, or can read the metric alone, override this method.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type
+            metric (str): Name of the quantitative metric
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Optional[MetricSeries]: The series or None if no event has the metric
+        """
+        store = MetricStore.from_event_records(self.iter_events_by_domain(domain_type, hu_id))
+        return store.get_series(domain_type, metric)
+    
+    def get_chain_head(self, domain_type: Union[str, DomainType], hu_id: str) -> Optional[ChainHead]:
+        """
+        Get the head of the event hash chain for a domain of a Universal History.
+        
+        Backends that keep a dedicated chain-head table override this method so the
+        previous hash of an append can be read without loading the history.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to get the chain head for
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Optional[ChainHead]: The chain head or None if the domain has no events
+        """
+        history = self.get_history(hu_id)
+        if not history:
+            return None
+        
+        return history.get_chain_head(domain_type)
+    
+    def get_verification_checkpoint(self, domain_type: Union[str, DomainType], hu_id: str) -> Optional[VerificationCheckpoint]:
+        """
+        Get the verification checkpoint of the event chain for a domain of a Universal History.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to get the checkpoint for
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Optional[VerificationCheckpoint]: The checkpoint or None if the chain was never verified
+        """
+        history = self.get_history(hu_id)
+        if not history:
+            return None
+        
+        domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        return history.verification_checkpoints.get(domain_type_value)
+    
+    def save_verification_checkpoint(self, checkpoint: VerificationCheckpoint,
+                                     domain_type: Union[str, DomainType], hu_id: str) -> None:
+        """
+        Save the verification checkpoint of the event chain for a domain of a Universal History.
+        
+        Args:
+            checkpoint (VerificationCheckpoint): The checkpoint to save
+            domain_type (Union[str, DomainType]): The domain type the checkpoint belongs to
+            hu_id (str): The ID of the history to save to
+        """
+        self.save_verification_checkpoints({domain_type: checkpoint}, hu_id)
+    
+    def save_verification_checkpoints(self, checkpoints: Dict[Union[str, DomainType], VerificationCheckpoint],
+                                      hu_id: str) -> None:
+        """
+        Save the verification checkpoints of several domains of a Universal History with a single write.
+        
+        Backends that store checkpoints separately override this method so
+        checkpoints can be written without rewriting the history.
+        
+        Args:
+            checkpoints (Dict[Union[str, DomainType], VerificationCheckpoint]): Domain type -> checkpoint to save
+            hu_id (str): The ID of the history to save to
+        """
+        if not checkpoints:
+            return
+        
+        history = self.get_history(hu_id)
+        if not history:
+            raise ValueError(f"Universal History with ID {hu_id} not found")
+        
+        for domain_type, checkpoint in checkpoints.items():
+            domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+            history.verification_checkpoints[domain_type_value] = checkpoint
+        self.save_history(history)
+    
+    def enable_merkle_tree(self, domain_type: Union[str, DomainType], hu_id: str) -> Optional[str]:
+        """
+        Start maintaining a Merkle tree over the event hashes of a domain of a Universal History.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to build the tree for
+            hu_id (str): The ID of the history
+            
+        Returns:
+            Optional[str]: The Merkle root, or None if the domain has no events yet
+        """
+        history = self.get_history(hu_id)
+        if not history:
+            raise ValueError(f"Universal History with ID {hu_id} not found")
+        
+        root = history.enable_merkle_tree(domain_type)
+        self.save_history(history)
+        return root
+    
+    def get_merkle_root(self, domain_type: Union[str, DomainType], hu_id: str) -> Optional[str]:
+        """
+        Get the Merkle root of a domain of a Universal History.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to get the root for
+            hu_id (str): The ID of the history
+            
+        Returns:
+            Optional[str]: The Merkle root, or None if the tree is not enabled or empty
+        """
+        history = self.get_history(hu_id)
+        if not history:
+            return None
+        
+        return history.get_merkle_root(domain_type)
+    
+    def get_inclusion_proof(self, re_id: str, hu_id: str) -> Optional[InclusionProof]:
+        """
+        Get the Merkle inclusion proof of an Event Record.
+        
+        Backends that store Merkle trees separately override this method so a proof
+        can be built without loading the history.
+        
+        Args:
+            re_id (str): The ID of the event record
+            hu_id (str): The ID of the history
+            
+        Returns:
+            Optional[InclusionProof]: The proof, or None if the event is not in a Merkle tree
+        """
+        history = self.get_history(hu_id)
+        if not history:
+            return None
+        
+        return history.get_inclusion_proof(re_id)
+    
+    @abstractmethod
+    def get_history_ids(self) -> List[str]:
+        """
+        Get the IDs of all Universal Histories in the repository.
+        
+        Returns:
+            List[str]: List of history IDs
+        """
+        pass
+    
+    def get_subject_index(self) -> Dict[str, str]:
+        """
+        Get the ID of the history of every subject in the repository.
+        
+        The default implementation loads every history; backends that keep an
+        index of subjects override this method.
+        
+        Returns:
+            Dict[str, str]: Subject ID -> history ID
+        """
+        index = {}
+        for hu_id in self.get_history_ids():
+            history = self.get_history(hu_id)
+            if history:
+                index[history.subject_id] = history.hu_id
+        return index
 
 class MemoryHistoryRepository(HistoryRepository):
     """
@@ -238,6 +621,24 @@ class MemoryHistoryRepository(HistoryRepository):
         """
         return self.histories.get(hu_id)
     
+    def get_history_ids(self) -> List[str]:
+        """
+        Get the IDs of all Universal Histories in the repository.
+        
+        Returns:
+            List[str]: List of history IDs
+        """
+        return list(self.histories.keys())
+    
+    def get_subject_index(self) -> Dict[str, str]:
+        """
+        Get the ID of the history of every subject in the repository.
+        
+        Returns:
+            Dict[str, str]: Subject ID -> history ID
+        """
+        return dict(self.subject_to_history)
+    
     def get_history_by_subject(self, subject_id: str) -> Optional[UniversalHistory]:
         """
         Get a Universal History by subject ID.
@@ -269,6 +670,7 @@ class MemoryHistoryRepository(HistoryRepository):
             raise ValueError(f"Universal History with ID {hu_id} not found")
         
         history.add_event_record(event_record)
+        self._track_recent_events(history, [event_record])
         return event_record.re_id
     
     def get_event_record(self, re_id: str, hu_id: str) -> Optional[EventRecord]:
@@ -434,14 +836,24 @@ class FileHistoryRepository(HistoryRepository):
     small to medium-scale usage and persists data across restarts.
     """
     
-    def __init__(self, storage_dir: str):
+    supports_worker_processes = True
+    
+    def __init__(self, storage_dir: str, text_index: bool = False, metric_series: bool = False):
         """
         Initialize the repository with a storage directory.
         
         Args:
             storage_dir (str): Directory where history files will be stored
+            text_index (bool): Maintain a full-text index of each history's events,
+                stored with the other indexes, to speed up search_text
+            metric_series (bool): Maintain the metric series of each history,
+                stored with the other indexes, to speed up get_metric_series
         """
         self.storage_dir = storage_dir
+        self.text_index = text_index
+        self.metric_series = metric_series
+        self._text_indexes: Dict[str, TextIndex] = {}  # hu_id -> loaded text index
+        self._metric_stores: Dict[str, MetricStore] = {}  # hu_id -> loaded metric series
         
         # Create directories if they don't exist
         os.makedirs(self.storage_dir, exist_ok=True)
@@ -450,7 +862,23 @@ class FileHistoryRepository(HistoryRepository):
         
         # Load or create the subject index
         self.subject_index_path = os.path.join(self.storage_dir, "indexes", "subject_to_history.json")
-        self.subject_to_history = self._load_subject_index()
+        self._subject_to_history: Optional[Dict[str, str]] = self._load_subject_index()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Loaded indexes are a per-process cache; a copy sent to a worker reads its own
+        # (the subject index included, which grows with the number of subjects)
+        state = self.__dict__.copy()
+        state['_subject_to_history'] = None
+        state['_text_indexes'] = {}
+        state['_metric_stores'] = {}
+        return state
+    
+    @property
+    def subject_to_history(self) -> Dict[str, str]:
+        """The subject index (subject_id -> hu_id), read from disk on first use."""
+        if self._subject_to_history is None:
+            self._subject_to_history = self._load_subject_index()
+        return self._subject_to_history
     
     def _load_subject_index(self) -> Dict[str, str]:
         """
@@ -460,14 +888,14 @@ class FileHistoryRepository(HistoryRepository):
             Dict[str, str]: The subject index (subject_id -> hu_id)
         """
         if os.path.exists(self.subject_index_path):
-            with open(self.subject_index_path, 'r') as f:
-                return json.load(f)
+            with open(self.subject_index_path, 'rb') as f:
+                return json_utils.load(f)
         return {}
     
     def _save_subject_index(self) -> None:
         """Save the subject index to disk."""
-        with open(self.subject_index_path, 'w') as f:
-            json.dump(self.subject_to_history, f)
+        with open(self.subject_index_path, 'wb') as f:
+            json_utils.dump(self.subject_to_history, f)
     
     def _get_history_path(self, hu_id: str) -> str:
         """
@@ -493,15 +921,112 @@ class FileHistoryRepository(HistoryRepository):
         """
         # Save the history
         history_path = self._get_history_path(history.hu_id)
-        with open(history_path, 'w') as f:
-            json.dump(history.to_dict(), f, default=str)
-        
-        # Update the subject index
-        self.subject_to_history[history.subject_id] = history.hu_id
-        self._save_subject_index()
+        with open(history_path, 'wb') as f:
+            json_utils.dump(history.to_dict(), f)
+        
+        # Update the subject index if the history is new
+        if self.subject_to_history.get(history.subject_id) != history.hu_id:
+            self.subject_to_history[history.subject_id] = history.hu_id
+            self._save_subject_index()
+        
+        # Index the events added since the last save
+        if self.text_index:
+            index = self._load_text_index(history.hu_id)
+            if sync_text_index(index, history):
+                self._save_text_index(history.hu_id, index)
+        
+        # Add the metrics of the events added since the last save
+        if self.metric_series:
+            store = self._load_metric_store(history.hu_id)
+            if store.sync(history):
+                self._save_metric_store(history.hu_id, store)
         
         return history.hu_id
     
+    def _get_text_index_path(self, hu_id: str) -> str:
+        """
+        Get the path to the text index file of a history.
+        
+        Args:
+            hu_id (str): The ID of the history
+            
+        Returns:
+            str: The path to the text index file
+        """
+        return os.path.join(self.storage_dir, "indexes", f"text_{hu_id}.json")
+    
+    def _load_text_index(self, hu_id: str) -> TextIndex:
+        """
+        Get the text index of a history, reading it from disk the first time.
+        
+        Args:
+            hu_id (str): The ID of the history
+            
+        Returns:
+            TextIndex: The text index (empty if none has been saved)
+        """
+        index = self._text_indexes.get(hu_id)
+        if index is None:
+            index_path = self._get_text_index_path(hu_id)
+            if os.path.exists(index_path):
+                with open(index_path, 'rb') as f:
+                    index = TextIndex.from_dict(json_utils.load(f))
+            else:
+                index = TextIndex()
+            self._text_indexes[hu_id] = index
+        return index
+    
+    def _save_text_index(self, hu_id: str, index: TextIndex) -> None:
+        """Save the text index of a history to disk."""
+        # Write to a temporary file first so an interruption never leaves a partial index
+        index_path = self._get_text_index_path(hu_id)
+        temp_path = f"{index_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            json_utils.dump(index.to_dict(), f)
+        os.replace(temp_path, index_path)
+    
+    def _get_metric_store_path(self, hu_id: str) -> str:
+        """
+        Get the path to the metric series file of a history.
+        
+        Args:
+            hu_id (str): The ID of the history
+            
+        Returns:
+            str: The path to the metric series file
+        """
+        return os.path.join(self.storage_dir, "indexes", f"metrics_{hu_id}.json")
+    
+    def _load_metric_store(self, hu_id: str) -> MetricStore:
+        """
+        Get the metric series of a history, reading them from disk the first time.
+        
+        Args:
+            hu_id (str): The ID of the history
+            
+        Returns:
+            MetricStore: The metric series (empty if none have been saved)
+        """
+        store = self._metric_stores.get(hu_id)
+        if store is None:
+            store_path = self._get_metric_store_path(hu_id)
+            if os.path.exists(store_path):
+                with open(store_path, 'rb') as f:
+                    store = MetricStore.from_dict(json_utils.load(f))
+            else:
+                store = MetricStore()
+            self._metric_stores[hu_id] = store
+        return store
+    
+    def _save_metric_store(self, hu_id: str, store: MetricStore) -> None:
+        """Save the metric series of a history to disk."""
+        # Write to a temporary file first so an interruption never leaves partial series
+        store_path = self._get_metric_store_path(hu_id)
+        temp_path = f"{store_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            json_utils.dump(store.to_dict(), f)
+        os.replace(temp_path, store_path)
+    
     def get_history(self, hu_id: str) -> Optional[UniversalHistory]:
         """
         Get a Universal History by ID.
@@ -517,10 +1042,31 @@ class FileHistoryRepository(HistoryRepository):
         if not os.path.exists(history_path):
             return None
         
-        with open(history_path, 'r') as f:
-            history_data = json.load(f)
-            
-        return UniversalHistory.from_dict(history_data)
+        with open(history_path, 'rb') as f:
+            history_data = json_utils.load(f)
+        
+        # Records are decoded when first used, so reading part of a large
+        # history does not pay for decoding all of it
+        return UniversalHistory.from_dict(history_data, lazy=True)
+    
+    def get_history_ids(self) -> List[str]:
+        """
+        Get the IDs of all Universal Histories in the repository.
+        
+        Returns:
+            List[str]: List of history IDs
+        """
+        histories_dir = os.path.join(self.storage_dir, "histories")
+        return [name[:-len(".json")] for name in sorted(os.listdir(histories_dir)) if name.endswith(".json")]
+    
+    def get_subject_index(self) -> Dict[str, str]:
+        """
+        Get the ID of the history of every subject in the repository.
+        
+        Returns:
+            Dict[str, str]: Subject ID -> history ID
+        """
+        return dict(self.subject_to_history)
     
     def get_history_by_subject(self, subject_id: str) -> Optional[UniversalHistory]:
         """
@@ -538,6 +1084,55 @@ class FileHistoryRepository(HistoryRepository):
             
         return self.get_history(hu_id)
     
+    def get_history_version(self, subject_id: str) -> Optional[Any]:
+        """
+        Get a value that changes whenever the Universal History of a subject is saved.
+        
+        The modification time and size of the history file are used, so the
+        history is not read.
+        
+        Args:
+            subject_id (str): The subject ID to look for
+            
+        Returns:
+            Optional[Any]: The version, or None if the subject has no history
+        """
+        hu_id = self.subject_to_history.get(subject_id)
+        if not hu_id:
+            return None
+        
+        try:
+            stat = os.stat(self._get_history_path(hu_id))
+        except FileNotFoundError:
+            return None
+        return hu_id, stat.st_mtime_ns, stat.st_size
+    
+    def save_history_state_document(self, history: UniversalHistory, state_document: StateDocument,
+                                    version: Optional[Any] = None) -> str:
+        """
+        Save a State Document to a Universal History that has already been loaded.
+        
+        If the history file has not changed since the history was loaded, the
+        loaded history is written back without reading the file again; otherwise
+        the State Document is saved through save_state_document, which keeps what
+        was saved in the meantime.
+        
+        Args:
+            history (UniversalHistory): The loaded history to save to
+            state_document (StateDocument): The state document to save
+            version (Optional[Any]): get_history_version of the subject, read before
+                the history was loaded (None if unknown)
+            
+        Returns:
+            str: The ID of the saved state document
+        """
+        if version is None or version != self.get_history_version(history.subject_id):
+            return super().save_history_state_document(history, state_document, version)
+        
+        history.set_state_document(state_document)
+        self.save_history(history)
+        return state_document.de_id
+    
     def save_event_record(self, event_record: EventRecord, hu_id: str) -> str:
         """
         Save an Event Record to a Universal History.
@@ -554,8 +1149,9 @@ class FileHistoryRepository(HistoryRepository):
         if not history:
             raise ValueError(f"Universal History with ID {hu_id} not found")
         
-        # Add the event record
+        # Add the event record, and to the recent events if tracked
         history.add_event_record(event_record)
+        self._track_recent_events(history, [event_record])
         
         # Save the history
         self.save_history(history)
@@ -712,11 +1308,148 @@ class FileHistoryRepository(HistoryRepository):
         Returns:
             List[EventRecord]: List of Event Records for the specified domain
         """
-        history = self.get_history(hu_id)
-        if not history:
+        return list(self.iter_events_by_domain(domain_type, hu_id))
+    
+    def iter_events_by_domain(self, domain_type: Union[str, DomainType], hu_id: str) -> Iterator[EventRecord]:
+        """
+        Iterate over the Event Records of a specific domain from a Universal History.
+        
+        The history file is read incrementally, so only one event is held in
+        memory at a time. Every event is still parsed from JSON to check its
+        domain; only the events of the requested domain become Event Records.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type to filter by
+            hu_id (str): The ID of the history to get from
+            
+        Returns:
+            Iterator[EventRecord]: The Event Records for the specified domain
+        """
+        history_path = self._get_history_path(hu_id)
+        
+        if not os.path.exists(history_path):
+            return
+        
+        domain_type_value = domain_type.value if isinstance(domain_type, DomainType) else domain_type
+        with open(history_path, 'r', encoding='utf-8') as f:
+            for _, er_dict in iter_object_items(f, ['event_records']):
+                if er_dict.get('domain_type') == domain_type_value:
+                    yield EventRecord.from_dict(er_dict)
+    
+    def query_events(self, hu_id: str,
+                     event_filter: Optional[EventFilter] = None,
+                     sort: str = "-timestamp",
+                     limit: Optional[int] = None,
+                     cursor: Optional[str] = None) -> EventPage:
+        """
+        Query the Event Records of a Universal History.
+        
+        The history file is read incrementally and the filter, sort and limit are
+        applied to the stored dictionaries, so only the events of the returned
+        page are decoded.
+        
+        Args:
+            hu_id (str): The ID of the history to query
+            event_filter (Optional[EventFilter]): Criteria the events must meet (None for all events)
+            sort (str): "-timestamp" for newest first or "timestamp" for oldest first
+            limit (Optional[int]): Maximum number of events to return
+            cursor (Optional[str]): Cursor of the previous page, to continue after it
+            
+        Returns:
+            EventPage: The matching events and the cursor of the next page
+        """
+        history_path = self._get_history_path(hu_id)
+        
+        if not os.path.exists(history_path):
+            return EventPage()
+        
+        descending = validate_sort(sort)
+        after = decode_cursor(cursor) if cursor else None
+        
+        with open(history_path, 'r', encoding='utf-8') as f:
+            entries = (
+                ((datetime.fromisoformat(er_dict['timestamp']), re_id), er_dict)
+                for re_id, er_dict in iter_object_items(f, ['event_records'])
+                if event_filter is None or event_filter.matches_dict(er_dict)
+            )
+            selected = select_in_order(entries, descending, limit, after)
+        
+        # The extra candidate only tells whether there is a next page, so it is not decoded
+        has_more = limit is not None and len(selected) > limit
+        events = [EventRecord.from_dict(er_dict) for er_dict in (selected[:limit] if has_more else selected)]
+        return EventPage(events, encode_cursor(events[-1]) if has_more and events else None)
+    
+    def search_text(self, hu_id: str, query: str, limit: int = 10) -> List[Tuple[EventRecord, float]]:
+        """
+        Search the text of the Event Records of a Universal History.
+        
+        With the text index enabled, matches are found in the index and only the
+        matching events are decoded from the history file. A history saved
+        before the index was enabled is indexed on its first search.
+        
+        Args:
+            hu_id (str): The ID of the history to search
+            query (str): The search terms
+            limit (int): Maximum number of events to return
+            
+        Returns:
+            List[Tuple[EventRecord, float]]: Matching events and their scores, best first
+        """
+        if not self.text_index:
+            return super().search_text(hu_id, query, limit)
+        
+        history_path = self._get_history_path(hu_id)
+        if not os.path.exists(history_path):
+            return []
+        
+        index = self._load_text_index(hu_id)
+        if not os.path.exists(self._get_text_index_path(hu_id)):
+            sync_text_index(index, self.get_history(hu_id))
+            self._save_text_index(hu_id, index)
+        
+        hits = index.search(query, limit)
+        if not hits:
             return []
+        
+        # Decode only the matching events, skipping the others, and stop once all have been found
+        scores = dict(hits)
+        found = {}
+        with open(history_path, 'r', encoding='utf-8') as f:
+            for re_id, er_dict in iter_object_items(f, ['event_records'], keys=scores):
+                found[re_id] = EventRecord.from_dict(er_dict)
+                if len(found) == len(scores):
+                    break
+        
+        return [(found[re_id], score) for re_id, score in hits if re_id in found]
+    
+    def get_metric_series(self, domain_type: Union[str, DomainType], metric: str, hu_id: str) -> Optional[MetricSeries]:
+        """
+        Get the time series of a quantitative metric in a domain of a Universal History.
+        
+        With the metric series enabled, the series are read from the file kept
+        next to the history and the history itself is not parsed. A history
+        saved before the series were enabled is scanned once, on its first read.
+        
+        Args:
+            domain_type (Union[str, DomainType]): The domain type
+            metric (str): Name of the quantitative metric
+            hu_id (str): The ID of the history to get from
             
-        return history.get_events_by_domain(domain_type)
+        Returns:
+            Optional[MetricSeries]: The series or None if no event has the metric
+        """
+        if not self.metric_series:
+            return super().get_metric_series(domain_type, metric, hu_id)
+        
+        if not os.path.exists(self._get_history_path(hu_id)):
+            return None
+        
+        store = self._load_metric_store(hu_id)
+        if not os.path.exists(self._get_metric_store_path(hu_id)):
+            store.sync(self.get_history(hu_id))
+            self._save_metric_store(hu_id, store)
+        
+        return store.get_series(domain_type, metric)
     
     def get_syntheses_by_domain(self, domain_type: Union[str, DomainType], hu_id: str) -> List[TrajectorySynthesis]:
         """
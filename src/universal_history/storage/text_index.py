@@ -0,0 +1,243 @@
+"""
+Full-text index over the content of Event Records.
+
+The index maps each term to the events containing it (a postings list with term
+frequencies) and ranks matches with BM25, so a search only touches the postings
+of the query terms. Repositories keep one index per Universal History and
+update it as events are saved.
+"""
+import heapq
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.event_record import EventRecord
+from ..models.lazy_mapping import peek_field
+from ..models.universal_history import UniversalHistory
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+# BM25 parameters (term frequency saturation and document length normalization)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase terms.
+
+    Args:
+        text (str): The text to split
+
+    Returns:
+        List[str]: The terms, in order of appearance
+    """
+    return _TOKEN.findall(text.casefold())
+
+def event_text(event_record: EventRecord) -> str:
+    """
+    Get the searchable text of an Event Record.
+
+    This is the raw input content, the qualitative assessments and the derived insights.
+
+    Args:
+        event_record (EventRecord): The event record
+
+    Returns:
+        str: The text to index
+    """
+    parts = []
+    if event_record.raw_input and event_record.raw_input.content:
+        parts.append(str(event_record.raw_input.content))
+    if event_record.processed_data:
+        parts.extend(str(value) for value in event_record.processed_data.qualitative_assessments.values())
+        parts.extend(str(insight) for insight in event_record.processed_data.derived_insights)
+    return "\n".join(parts)
+
+class TextIndex:
+    """
+    Inverted index of documents ranked with BM25.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> document ID -> term frequency
+        self._lengths: Dict[str, int] = {}  # document ID -> number of terms
+        self._terms: Dict[str, List[str]] = {}  # document ID -> distinct terms, for removal
+        self._versions: Dict[str, str] = {}  # document ID -> version of the indexed text, if known
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._lengths
+
+    def document_ids(self) -> Set[str]:
+        """
+        Get the IDs of the indexed documents.
+
+        Returns:
+            Set[str]: The document IDs
+        """
+        return set(self._lengths)
+
+    def version(self, doc_id: str) -> Optional[str]:
+        """
+        Get the version a document was indexed at.
+
+        Args:
+            doc_id (str): ID of the document
+
+        Returns:
+            Optional[str]: The version given to add, or None
+        """
+        return self._versions.get(doc_id)
+
+    def add(self, doc_id: str, text: str, version: Optional[str] = None) -> None:
+        """
+        Index a document, replacing any previous version.
+
+        Args:
+            doc_id (str): ID of the document
+            text (str): Text of the document
+            version (Optional[str]): Version of the document (e.g. a content hash),
+                to tell later whether it changed
+        """
+        if doc_id in self._lengths:
+            self.remove(doc_id)
+
+        terms = tokenize(text)
+        frequencies: Dict[str, int] = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        self._lengths[doc_id] = len(terms)
+        self._terms[doc_id] = list(frequencies)
+        self._total_length += len(terms)
+        if version is not None:
+            self._versions[doc_id] = version
+
+    def remove(self, doc_id: str) -> None:
+        """
+        Remove a document from the index, if present.
+
+        Args:
+            doc_id (str): ID of the document
+        """
+        if doc_id not in self._lengths:
+            return
+
+        for term in self._terms.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        self._versions.pop(doc_id, None)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the documents matching any term of a query, best first.
+
+        Args:
+            query (str): The query text
+            limit (int): Maximum number of results
+
+        Returns:
+            List[Tuple[str, float]]: (document ID, BM25 score) pairs
+        """
+        if not self._lengths or limit <= 0:
+            return []
+
+        document_count = len(self._lengths)
+        average_length = self._total_length / document_count or 1.0
+
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the index to a dictionary.
+
+        Returns:
+            Dict[str, Any]: Dictionary representation of the index
+        """
+        return {
+            'lengths': self._lengths,
+            'postings': self._postings,
+            'versions': self._versions
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TextIndex':
+        """
+        Create an index from a dictionary.
+
+        Args:
+            data (Dict[str, Any]): Dictionary representation of the index
+
+        Returns:
+            TextIndex: The index
+        """
+        index = cls()
+        index._lengths = dict(data.get('lengths', {}))
+        index._postings = {term: dict(postings) for term, postings in data.get('postings', {}).items()}
+        index._versions = dict(data.get('versions', {}))
+        index._total_length = sum(index._lengths.values())
+        index._terms = {doc_id: [] for doc_id in index._lengths}
+        for term, postings in index._postings.items():
+            for doc_id in postings:
+                index._terms[doc_id].append(term)
+        return index
+
+def index_event_records(index: TextIndex, event_records: Iterable[EventRecord]) -> None:
+    """
+    Add Event Records to an index.
+
+    Args:
+        index (TextIndex): The index to update
+        event_records (Iterable[EventRecord]): The event records to index
+    """
+    for event_record in event_records:
+        index.add(event_record.re_id, event_text(event_record), event_record.current_re_hash)
+
+def sync_text_index(index: TextIndex, history: UniversalHistory) -> bool:
+    """
+    Bring an index in line with the Event Records of a history.
+
+    Events not yet indexed are added, events whose hash changed since they were
+    indexed (their content was edited) are indexed again, and events no longer
+    in the history are removed. Only the hash of events already indexed is
+    read, so records of a lazily loaded history stay undecoded.
+
+    Args:
+        index (TextIndex): The index of the history
+        history (UniversalHistory): The history
+
+    Returns:
+        bool: True if the index changed
+    """
+    indexed = index.document_ids()
+    removed = indexed.difference(history.event_records)
+    missing = [
+        re_id for re_id in history.event_records
+        if re_id not in indexed
+        or index.version(re_id) != peek_field(history.event_records, re_id, 'current_re_hash')
+    ]
+
+    for re_id in removed:
+        index.remove(re_id)
+    index_event_records(index, (history.event_records[re_id] for re_id in missing))
+
+    return bool(removed or missing)
@@ -0,0 +1,241 @@
+"""
+Running aggregates that can be updated one value at a time.
+
+RunningStats keeps the count, sum, sum of squares, minimum and maximum of a
+stream of values. Two of them merge into the statistics of the combined
+stream, so per-period aggregates can be rolled up without revisiting values.
+SlidingWindow keeps RunningStats for several metrics over a time window that
+moves forward: new entries are added and entries that fall out of the window
+are retired, so a refresh costs in proportion to what changed.
+"""
+import math
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+@dataclass
+class RunningStats:
+    """Mergeable count, sum, sum of squares, minimum and maximum of a stream of values."""
+    count: int = 0
+    total: float = 0.0
+    total_squares: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of the values, or None if there are none."""
+        return self.total / self.count if self.count else None
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Population variance of the values, or None if there are none."""
+        if not self.count:
+            return None
+        mean = self.total / self.count
+        return max(0.0, self.total_squares / self.count - mean * mean)
+
+    @property
+    def std(self) -> Optional[float]:
+        """Population standard deviation of the values, or None if there are none."""
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    def add(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value (float): The value
+        """
+        self.count += 1
+        self.total += value
+        self.total_squares += value * value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def remove(self, value: float) -> bool:
+        """
+        Remove a value that was added before.
+
+        The count and sums are updated exactly; the minimum and maximum cannot be
+        when the removed value was one of them.
+
+        Args:
+            value (float): The value
+
+        Returns:
+            bool: False if the minimum or maximum must be recomputed from the remaining values
+        """
+        self.count -= 1
+        if self.count <= 0:
+            self.count = 0
+            self.total = self.total_squares = 0.0
+            self.minimum = self.maximum = None
+            return True
+        self.total -= value
+        self.total_squares -= value * value
+        return value != self.minimum and value != self.maximum
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """
+        Combine with the statistics of another stream.
+
+        Args:
+            other (RunningStats): The other statistics
+
+        Returns:
+            RunningStats: Statistics of both streams together
+        """
+        lows = [value for value in (self.minimum, other.minimum) if value is not None]
+        highs = [value for value in (self.maximum, other.maximum) if value is not None]
+        return RunningStats(
+            count=self.count + other.count,
+            total=self.total + other.total,
+            total_squares=self.total_squares + other.total_squares,
+            minimum=min(lows) if lows else None,
+            maximum=max(highs) if highs else None
+        )
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> 'RunningStats':
+        """
+        Compute the statistics of a sequence of values.
+
+        Args:
+            values (Iterable[float]): The values
+
+        Returns:
+            RunningStats: The statistics
+        """
+        stats = cls()
+        for value in values:
+            stats.add(value)
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return self.__dict__.copy()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RunningStats':
+        """Create from dictionary."""
+        return cls(**data)
+
+# An entry of a sliding window: (timestamp, key, metric values)
+WindowEntry = Tuple[datetime, str, Dict[str, float]]
+
+class SlidingWindow:
+    """
+    Running statistics of keyed, timestamped metric values over a moving time window.
+
+    Entries are kept in timestamp order so the oldest can be retired when the
+    window start moves forward. Retiring an entry that held a metric's minimum
+    or maximum recomputes that metric from the entries still in the window.
+    """
+
+    def __init__(self, start: datetime, watermark: Optional[datetime] = None):
+        """
+        Initialize an empty window.
+
+        Args:
+            start (datetime): Start of the window (entries before it are retired)
+            watermark (Optional[datetime]): Timestamp up to which entries have been added
+                (defaults to start)
+        """
+        self.start = start
+        self.watermark = watermark or start
+        self.entries: Deque[WindowEntry] = deque()
+        self.stats: Dict[str, RunningStats] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: object) -> bool:
+        return any(entry_key == key for _, entry_key, _ in self.entries)
+
+    @property
+    def first_timestamp(self) -> Optional[datetime]:
+        """Timestamp of the oldest entry in the window."""
+        return self.entries[0][0] if self.entries else None
+
+    @property
+    def last_timestamp(self) -> Optional[datetime]:
+        """Timestamp of the newest entry in the window."""
+        return self.entries[-1][0] if self.entries else None
+
+    def keys(self) -> List[str]:
+        """Keys of the entries in the window, oldest first."""
+        return [key for _, key, _ in self.entries]
+
+    def add(self, timestamp: datetime, key: str, values: Dict[str, float]) -> None:
+        """
+        Add an entry to the window.
+
+        Args:
+            timestamp (datetime): Time of the entry (not before the window start)
+            key (str): Identifier of the entry
+            values (Dict[str, float]): Metric values of the entry
+        """
+        entry = (timestamp, key, dict(values))
+        if self.entries and timestamp < self.entries[-1][0]:
+            # Entries normally arrive in order; keep the deque sorted otherwise
+            position = bisect_right([entry_time for entry_time, _, _ in self.entries], timestamp)
+            self.entries.insert(position, entry)
+        else:
+            self.entries.append(entry)
+
+        for name, value in values.items():
+            if name not in self.stats:
+                self.stats[name] = RunningStats()
+            self.stats[name].add(value)
+        self.watermark = max(self.watermark, timestamp)
+
+    def expire(self, start: datetime) -> List[str]:
+        """
+        Move the window start forward, retiring the entries before it.
+
+        Args:
+            start (datetime): New start of the window
+
+        Returns:
+            List[str]: Keys of the retired entries
+        """
+        retired = []
+        stale = set()
+        while self.entries and self.entries[0][0] < start:
+            _, key, values = self.entries.popleft()
+            retired.append(key)
+            for name, value in values.items():
+                if not self.stats[name].remove(value):
+                    stale.add(name)
+
+        for name in stale:
+            remaining = [values[name] for _, _, values in self.entries if name in values]
+            self.stats[name] = RunningStats.from_values(remaining)
+        for name in [name for name, stats in self.stats.items() if stats.count == 0]:
+            del self.stats[name]
+
+        self.start = max(self.start, start)
+        return retired
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary with ISO format dates."""
+        return {
+            'start': self.start.isoformat(),
+            'watermark': self.watermark.isoformat(),
+            'entries': [[timestamp.isoformat(), key, values] for timestamp, key, values in self.entries],
+            'stats': {name: stats.to_dict() for name, stats in self.stats.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SlidingWindow':
+        """Create from dictionary with ISO format dates."""
+        window = cls(datetime.fromisoformat(data['start']), datetime.fromisoformat(data['watermark']))
+        window.entries = deque(
+            (datetime.fromisoformat(timestamp), key, values) for timestamp, key, values in data.get('entries', [])
+        )
+        window.stats = {name: RunningStats.from_dict(stats) for name, stats in data.get('stats', {}).items()}
+        return window
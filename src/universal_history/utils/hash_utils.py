@@ -3,23 +3,177 @@ Utility functions for hashing and integrity verification.
 """
 import hashlib
 import json
-from typing import Any, Dict, Optional
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-def calculate_hash(data: Dict[str, Any]) -> str:
+from .parallel import iter_parallel
+
+# Built once and reused; equivalent to json.dumps(data, sort_keys=True, default=str)
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
+# Batches smaller than this are hashed inline even when workers are requested
+PARALLEL_HASH_THRESHOLD = 2048
+
+# Algorithm of records that predate per-record algorithms
+LEGACY_HASH_ALGORITHM = "sha256"
+
+# Hash algorithm name -> factory of hashlib-compatible objects. Every algorithm
+# produces 32-byte digests so hashes of different algorithms can share a chain.
+_HASH_ALGORITHMS: Dict[str, Callable[[], Any]] = {
+    "sha256": hashlib.sha256,
+    "blake2b": lambda: hashlib.blake2b(digest_size=32),
+}
+
+def register_hash_algorithm(name: str, factory: Callable[[], Any]) -> None:
+    """
+    Register a hash algorithm usable for event chains.
+    
+    Args:
+        name (str): Name recorded on the events hashed with the algorithm
+        factory (Callable[[], Any]): Function returning a new hashlib-compatible object
+    """
+    _HASH_ALGORITHMS[name] = factory
+
+def get_hash_algorithm(name: Optional[str] = None) -> Callable[[], Any]:
     """
-    Calculate a SHA-256 hash of a dictionary.
+    Get the factory of a registered hash algorithm.
+    
+    Args:
+        name (Optional[str]): Name of the algorithm (None for the legacy SHA-256)
+        
+    Returns:
+        Callable[[], Any]: Function returning a new hashlib-compatible object
+    """
+    factory = _HASH_ALGORITHMS.get(name or LEGACY_HASH_ALGORITHM)
+    if factory is None:
+        raise ValueError(f"Unsupported hash algorithm: {name}")
+    return factory
+
+def get_hash_algorithms() -> List[str]:
+    """
+    Get the names of the registered hash algorithms.
+    
+    Returns:
+        List[str]: Names of the registered algorithms
+    """
+    return list(_HASH_ALGORITHMS.keys())
+
+def calculate_hash(data: Dict[str, Any], algorithm: Optional[str] = None) -> str:
+    """
+    Calculate a hash of a dictionary.
     
     Args:
         data (Dict[str, Any]): The data to hash
+        algorithm (Optional[str]): Name of the hash algorithm (default: SHA-256)
         
     Returns:
         str: Hexadecimal representation of the hash
     """
     # Convert to a canonical string representation
-    data_str = json.dumps(data, sort_keys=True, default=str)
+    data_str = _CANONICAL_ENCODER.encode(data)
     
     # Calculate the hash
-    return hashlib.sha256(data_str.encode()).hexdigest()
+    hasher = get_hash_algorithm(algorithm)()
+    hasher.update(data_str.encode())
+    return hasher.hexdigest()
+
+def _hash_item(item: Any, factory: Callable[[], Any]) -> str:
+    """
+    Hash a dictionary, or an object that knows its own hash (e.g. an EventRecord).
+    
+    Args:
+        item (Any): The item to hash
+        factory (Callable[[], Any]): Hash algorithm used for dictionaries
+        
+    Returns:
+        str: Hexadecimal representation of the hash
+    """
+    if isinstance(item, dict):
+        hasher = factory()
+        hasher.update(_CANONICAL_ENCODER.encode(item).encode())
+        return hasher.hexdigest()
+    return item.calculate_hash()
+
+def _hash_chunk(chunk: List[Any], algorithm: Optional[str] = None) -> List[str]:
+    """
+    Hash a chunk of items. Runs inside a worker process for parallel batches.
+    
+    Args:
+        chunk (List[Any]): The items to hash
+        algorithm (Optional[str]): Name of the hash algorithm used for dictionaries
+        
+    Returns:
+        List[str]: The hashes, in order
+    """
+    factory = get_hash_algorithm(algorithm)
+    return [_hash_item(item, factory) for item in chunk]
+
+def _iter_chunks(items: Sequence[Any], chunk_size: int) -> Iterator[List[Any]]:
+    """
+    Split a sequence into consecutive chunks.
+    
+    Args:
+        items (Sequence[Any]): The items to split
+        chunk_size (int): Maximum number of items per chunk
+        
+    Returns:
+        Iterator[List[Any]]: The chunks, in order
+    """
+    for start in range(0, len(items), chunk_size):
+        yield list(items[start:start + chunk_size])
+
+def calculate_hashes(items: Iterable[Any], workers: Optional[int] = None,
+                     chunk_size: int = 512, algorithm: Optional[str] = None) -> List[str]:
+    """
+    Calculate the hashes of a batch of items.
+    
+    Items are dictionaries (hashed like calculate_hash with the given algorithm)
+    or objects with a calculate_hash() method such as EventRecord, which use
+    their own recorded algorithm. Batches of at least PARALLEL_HASH_THRESHOLD
+    items are split into chunks and fanned out to a process pool when more than
+    one worker is requested.
+    
+    Args:
+        items (Iterable[Any]): The items to hash
+        workers (Optional[int]): Number of worker processes (None or 1 hashes inline)
+        chunk_size (int): Number of items sent to a worker at a time
+        algorithm (Optional[str]): Name of the hash algorithm for dictionaries (default: SHA-256)
+        
+    Returns:
+        List[str]: The hashes, in the order of the items
+    """
+    items = items if isinstance(items, (list, tuple)) else list(items)
+    
+    if not workers or workers <= 1 or len(items) < PARALLEL_HASH_THRESHOLD:
+        return _hash_chunk(items, algorithm)
+    
+    hashes: List[str] = []
+    for chunk_hashes in iter_parallel(partial(_hash_chunk, algorithm=algorithm), _iter_chunks(items, chunk_size),
+                                      workers=workers, ordered=True):
+        hashes.extend(chunk_hashes)
+    return hashes
+
+def verify_hashes(items: Iterable[Any], expected_hashes: Iterable[Optional[str]],
+                  workers: Optional[int] = None, algorithm: Optional[str] = None) -> List[bool]:
+    """
+    Verify that a batch of items matches their expected hashes.
+    
+    Args:
+        items (Iterable[Any]): The items to verify
+        expected_hashes (Iterable[Optional[str]]): The expected hashes, in the same order
+        workers (Optional[int]): Number of worker processes (None or 1 hashes inline)
+        algorithm (Optional[str]): Name of the hash algorithm for dictionaries (default: SHA-256)
+        
+    Returns:
+        List[bool]: For each item, True if its hash matches, False otherwise
+    """
+    items = items if isinstance(items, (list, tuple)) else list(items)
+    expected_hashes = list(expected_hashes)
+    if len(items) != len(expected_hashes):
+        raise ValueError(f"Got {len(items)} items but {len(expected_hashes)} expected hashes")
+    
+    actual_hashes = calculate_hashes(items, workers=workers, algorithm=algorithm)
+    return [actual == expected for actual, expected in zip(actual_hashes, expected_hashes)]
 
 def verify_hash(data: Dict[str, Any], expected_hash: str) -> bool:
     """
@@ -70,26 +224,48 @@ def verify_hash_chain(items: list, hash_getter, previous_hash_getter) -> bool:
     
     return True
 
-def create_hash_chain(items: list, hash_generator, previous_hash_setter) -> None:
+def iter_hash_chain(items: Iterable[Any], hash_generator: Callable[[Any], str],
+                    previous_hash_setter: Callable[[Any, Optional[str]], None],
+                    previous_hash: Optional[str] = None) -> Iterator[Tuple[Any, str]]:
     """
-    Create a hash chain from a list of items.
+    Chain items lazily, yielding each item with its hash as soon as it is linked.
     
     Args:
-        items (list): List of items to chain, ordered by time
+        items (Iterable[Any]): Items to chain, ordered by time
         hash_generator: Function to generate a hash for an item
         previous_hash_setter: Function to set the previous hash on an item
+        previous_hash (Optional[str]): Hash to link the first item to, to extend an existing chain
+        
+    Returns:
+        Iterator[Tuple[Any, str]]: Pairs of item and its hash
     """
-    if not items:
-        return  # Nothing to do
-    
-    previous_hash = None
-    
     for item in items:
         # Set the previous hash
         previous_hash_setter(item, previous_hash)
         
         # Generate the current hash
         current_hash = hash_generator(item)
+        yield item, current_hash
         
         # Update previous hash for the next item
-        previous_hash = current_hash
\ No newline at end of file
+        previous_hash = current_hash
+
+def create_hash_chain(items: Iterable[Any], hash_generator: Callable[[Any], str],
+                      previous_hash_setter: Callable[[Any, Optional[str]], None],
+                      previous_hash: Optional[str] = None) -> Optional[str]:
+    """
+    Create a hash chain from a list or a stream of items.
+    
+    Args:
+        items (Iterable[Any]): Items to chain, ordered by time
+        hash_generator: Function to generate a hash for an item
+        previous_hash_setter: Function to set the previous hash on an item
+        previous_hash (Optional[str]): Hash to link the first item to, to extend an existing chain
+        
+    Returns:
+        Optional[str]: Hash of the last item, or previous_hash if there were no items
+    """
+    for _, previous_hash in iter_hash_chain(items, hash_generator, previous_hash_setter, previous_hash):
+        pass
+    
+    return previous_hash
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Incremental reading of large JSON documents.
+
+The reader pulls a file in chunks and only keeps the text of the value it is
+currently decoding, so scanning the entries of one object in a document does
+not require loading the whole document. Values that are not needed are
+skipped without being decoded.
+"""
+import json
+import re
+from typing import Any, Container, Iterator, Optional, Sequence, TextIO, Tuple
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'\s*')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_SCALAR = re.compile(r'[^\s,:\]}]+')
+_DECODER = json.JSONDecoder()
+_DELIMITERS = frozenset(' \t\r\n,:]}')
+
+class _StreamReader:
+    """Cursor over a JSON document read in chunks."""
+
+    def __init__(self, fp: TextIO, chunk_size: int):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Read more of the file, dropping the text already consumed. Returns False at EOF."""
+        if self._eof:
+            return False
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        chunk = self._fp.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(self._chunk_size):
+                raise ValueError("Unexpected end of JSON document")
+
+    def _expect(self, char: str) -> None:
+        """Consume the next character, which must be char."""
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in JSON document")
+        self._pos += 1
+
+    def _skip_string(self) -> None:
+        while True:
+            match = _STRING.match(self._buffer, self._pos)
+            if match:
+                self._pos = match.end()
+                return
+            if not self._fill(self._chunk_size):
+                raise ValueError("Unterminated string in JSON document")
+
+    def _skip_value(self) -> None:
+        char = self._peek()
+        if char == '"':
+            self._skip_string()
+        elif char in '{[':
+            # Jump between brackets and strings, counting the nesting depth
+            depth = 0
+            while True:
+                match = _STRUCTURAL.search(self._buffer, self._pos)
+                if match is None:
+                    self._pos = len(self._buffer)
+                    if not self._fill(self._chunk_size):
+                        raise ValueError("Unterminated container in JSON document")
+                    continue
+                self._pos = match.start()
+                if match.group() == '"':
+                    self._skip_string()
+                    continue
+                self._pos += 1
+                depth += 1 if match.group() in '{[' else -1
+                if depth == 0:
+                    return
+        else:
+            # Numbers, true, false and null end at a delimiter
+            while True:
+                match = _SCALAR.match(self._buffer, self._pos)
+                if match is None:
+                    raise ValueError(f"Unexpected '{char}' in JSON document")
+                if match.end() < len(self._buffer) or not self._fill(self._chunk_size):
+                    self._pos = match.end()
+                    return
+
+    def _decode_value(self) -> Any:
+        """Decode the next value, reading more of the file until the value is complete."""
+        self._peek()
+        read_size = self._chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # A value must be followed by a delimiter, otherwise it may be a number
+                # cut off by the end of the buffer ("-2." decodes as -2)
+                if self._eof or (end < len(self._buffer) and self._buffer[end] in _DELIMITERS):
+                    self._pos = end
+                    return value
+            # Read larger chunks each time so a huge value is not decoded too often
+            self._fill(read_size)
+            read_size *= 2
+
+    def iter_items(self, path: Sequence[str], keys: Optional[Container[str]] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield the entries of the object found by following path from the current object.
+
+        With keys, only the entries with those keys are decoded and yielded; the others are skipped.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._decode_value()
+            self._expect(':')
+            if not path:
+                if keys is None or key in keys:
+                    yield key, self._decode_value()
+                else:
+                    self._skip_value()
+            elif key == path[0]:
+                # The rest of the document is not needed
+                if self._peek() == '{':
+                    yield from self.iter_items(path[1:], keys)
+                return
+            else:
+                self._skip_value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' but found '{separator}' in JSON document")
+
+def iter_object_items(fp: TextIO, path: Sequence[str] = (),
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      keys: Optional[Container[str]] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Iterate over the entries of an object inside a JSON document without loading the document.
+
+    Only one entry is decoded and held in memory at a time. Iteration stops once the
+    object has been read, so the rest of the document is never read.
+
+    Args:
+        fp (TextIO): The file to read, opened in text mode
+        path (Sequence[str]): Keys leading from the top-level object to the object to read
+            (empty for the top-level object itself)
+        chunk_size (int): Number of characters read from the file at a time
+        keys (Optional[Container[str]]): Keys of the entries to return; the values of
+            other entries are skipped without being decoded (default: every entry)
+
+    Returns:
+        Iterator[Tuple[str, Any]]: The (key, decoded value) pairs of the object; nothing if
+            the path does not lead to an object
+    """
+    return _StreamReader(fp, chunk_size).iter_items(tuple(path), keys)
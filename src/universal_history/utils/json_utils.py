@@ -0,0 +1,142 @@
+"""
+Utility functions for JSON encoding and decoding.
+
+orjson is used when it is installed and the standard library json module
+otherwise. Both backends produce the same JSON values: values JSON has no type
+for (datetimes, dataclasses, UUIDs...) are written as str(value), exactly like
+json.dumps(..., default=str). That keeps values that round-trip through storage
+identical to what the canonical event hash saw, whichever backend wrote them.
+The canonical hash encoding itself always uses the standard library (see
+hash_utils), since its byte layout is part of the hash format.
+"""
+import json
+import math
+from typing import Any, IO, Union
+
+try:
+    import orjson
+except ImportError:  # orjson not installed
+    orjson = None
+
+_STDLIB_ENCODER = json.JSONEncoder(default=str)
+
+if orjson is not None:
+    # Non-string keys are stringified (like json); datetimes and dataclasses go
+    # through default=str instead of orjson's own formats
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+_backend = "orjson" if orjson is not None else "json"
+
+def _has_non_finite_float(obj: Any) -> bool:
+    """Whether a value contains NaN or an infinity, which orjson would write as null."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+def get_json_backend() -> str:
+    """
+    Get the name of the JSON backend in use.
+
+    Returns:
+        str: "orjson" or "json"
+    """
+    return _backend
+
+def set_json_backend(name: str) -> None:
+    """
+    Select the JSON backend.
+
+    Args:
+        name (str): "orjson" or "json"
+    """
+    global _backend
+    if name == "orjson" and orjson is None:
+        raise ImportError(
+            "The orjson backend requires additional dependencies. "
+            "Install them with 'pip install universal-history[fast-json]'"
+        )
+    if name not in ("orjson", "json"):
+        raise ValueError(f"Unknown JSON backend: {name}")
+    _backend = name
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Encode a value as UTF-8 JSON.
+
+    Args:
+        obj (Any): The value to encode
+
+    Returns:
+        bytes: The JSON document
+    """
+    # orjson silently writes NaN and infinities as null, so values holding them
+    # go to json, which keeps them like the canonical hash encoding does
+    if _backend == "orjson" and not _has_non_finite_float(obj):
+        try:
+            return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass  # Values orjson rejects (e.g. integers over 64 bits) fall back to json
+    return _STDLIB_ENCODER.encode(obj).encode()
+
+def dumps(obj: Any) -> str:
+    """
+    Encode a value as a JSON string.
+
+    Args:
+        obj (Any): The value to encode
+
+    Returns:
+        str: The JSON document
+    """
+    if _backend == "orjson":
+        return dumps_bytes(obj).decode()
+    return _STDLIB_ENCODER.encode(obj)
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Decode a JSON document.
+
+    Args:
+        data (Union[str, bytes]): The JSON document
+
+    Returns:
+        Any: The decoded value
+    """
+    if _backend == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # Documents orjson rejects (e.g. NaN written by json) fall back to json
+    return json.loads(data)
+
+def dump(obj: Any, fp: IO[bytes]) -> None:
+    """
+    Write a value as JSON to a file opened in binary mode.
+
+    Args:
+        obj (Any): The value to encode
+        fp (IO[bytes]): The file to write to
+    """
+    fp.write(dumps_bytes(obj))
+
+def load(fp: IO[bytes]) -> Any:
+    """
+    Read a JSON value from a file opened in binary mode.
+
+    Args:
+        fp (IO[bytes]): The file to read from
+
+    Returns:
+        Any: The decoded value
+    """
+    return loads(fp.read())
@@ -0,0 +1,256 @@
+"""
+Utility functions for Merkle trees over event hashes.
+
+Leaves and interior nodes are hashed with distinct prefixes so a leaf can never
+be passed off as an interior node. A node without a sibling is promoted to the
+next level unchanged, which makes the tree of n leaves identical to folding the
+roots of its perfect subtrees (one per set bit of n) from right to left. That
+right edge (the "frontier") is all that is needed to append and compute the root.
+"""
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+def hash_leaf(value: str) -> str:
+    """
+    Calculate the hash of a Merkle leaf.
+
+    Args:
+        value (str): The leaf value (e.g. the current_re_hash of an event)
+
+    Returns:
+        str: Hexadecimal representation of the leaf hash
+    """
+    return hashlib.sha256(LEAF_PREFIX + value.encode()).hexdigest()
+
+def hash_node(left: str, right: str) -> str:
+    """
+    Calculate the hash of an interior Merkle node.
+
+    Args:
+        left (str): Hash of the left child
+        right (str): Hash of the right child
+
+    Returns:
+        str: Hexadecimal representation of the node hash
+    """
+    return hashlib.sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+def extend_frontier(frontier: List[Tuple[int, str]], value: str) -> List[Tuple[int, str]]:
+    """
+    Append a leaf to a Merkle frontier in O(log n).
+
+    Args:
+        frontier (List[Tuple[int, str]]): Roots of the perfect subtrees as (height, hash),
+            leftmost first. The list is modified in place.
+        value (str): The value of the new leaf
+
+    Returns:
+        List[Tuple[int, str]]: The updated frontier
+    """
+    frontier.append((0, hash_leaf(value)))
+    while len(frontier) >= 2 and frontier[-1][0] == frontier[-2][0]:
+        height, right = frontier.pop()
+        _, left = frontier.pop()
+        frontier.append((height + 1, hash_node(left, right)))
+    return frontier
+
+def frontier_root(frontier: List[Tuple[int, str]]) -> Optional[str]:
+    """
+    Calculate the Merkle root from a frontier.
+
+    Args:
+        frontier (List[Tuple[int, str]]): Roots of the perfect subtrees, leftmost first
+
+    Returns:
+        Optional[str]: The root hash, or None for an empty tree
+    """
+    if not frontier:
+        return None
+
+    root = frontier[-1][1]
+    for _, subtree_root in reversed(frontier[:-1]):
+        root = hash_node(subtree_root, root)
+    return root
+
+@dataclass
+class InclusionProof:
+    """Proof that a value is the leaf at a given index of a Merkle tree."""
+    value: str
+    leaf_index: int
+    tree_size: int
+    root: str
+    path: List[Tuple[str, str]] = field(default_factory=list)  # (sibling side, sibling hash), leaf upwards
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            'value': self.value,
+            'leaf_index': self.leaf_index,
+            'tree_size': self.tree_size,
+            'root': self.root,
+            'path': [{'side': side, 'hash': sibling} for side, sibling in self.path]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'InclusionProof':
+        """Create from dictionary."""
+        proof_data = data.copy()
+        proof_data['path'] = [(step['side'], step['hash']) for step in proof_data.get('path', [])]
+        return cls(**proof_data)
+
+def verify_inclusion_proof(proof: InclusionProof, root: Optional[str] = None) -> bool:
+    """
+    Verify a Merkle inclusion proof.
+
+    Args:
+        proof (InclusionProof): The proof to verify
+        root (Optional[str]): Trusted root to check against (defaults to the root in the proof)
+
+    Returns:
+        bool: True if the proof leads from the value to the root, False otherwise
+    """
+    expected_root = root if root is not None else proof.root
+
+    current = hash_leaf(proof.value)
+    for side, sibling in proof.path:
+        if side == 'left':
+            current = hash_node(sibling, current)
+        elif side == 'right':
+            current = hash_node(current, sibling)
+        else:
+            return False
+
+    return current == expected_root
+
+class MerkleTree:
+    """
+    Append-only Merkle tree over string values.
+
+    Appends and the root only need the frontier. The full node levels used to
+    build inclusion proofs are materialized on the first proof request and
+    maintained incrementally afterwards.
+    """
+
+    def __init__(self, values: Optional[Iterable[str]] = None,
+                 frontier: Optional[List[Tuple[int, str]]] = None):
+        """
+        Initialize the tree.
+
+        Args:
+            values (Optional[Iterable[str]]): Leaf values, in order
+            frontier (Optional[List[Tuple[int, str]]]): Precomputed frontier for the values
+        """
+        self.values: List[str] = []
+        self.frontier: List[Tuple[int, str]] = []
+        self._levels: Optional[List[List[str]]] = None
+
+        if frontier is not None:
+            self.values = list(values or [])
+            self.frontier = [(int(height), node) for height, node in frontier]
+        else:
+            for value in values or []:
+                self.append(value)
+
+    @property
+    def size(self) -> int:
+        """Number of leaves in the tree."""
+        return len(self.values)
+
+    @property
+    def root(self) -> Optional[str]:
+        """Root hash of the tree, or None if it is empty."""
+        return frontier_root(self.frontier)
+
+    def append(self, value: str) -> int:
+        """
+        Append a leaf to the tree.
+
+        Args:
+            value (str): The value of the new leaf
+
+        Returns:
+            int: Index of the new leaf
+        """
+        index = len(self.values)
+        self.values.append(value)
+        extend_frontier(self.frontier, value)
+
+        if self._levels is not None:
+            self._append_to_levels(hash_leaf(value))
+
+        return index
+
+    def _append_to_levels(self, leaf_hash: str) -> None:
+        """
+        Add a leaf hash to the materialized levels, updating the right edge.
+
+        Args:
+            leaf_hash (str): Hash of the new leaf
+        """
+        levels = self._levels
+        levels[0].append(leaf_hash)
+
+        level = 0
+        while len(levels[level]) > 1:
+            nodes = levels[level]
+            index = len(nodes) - 1
+            if index % 2 == 1:
+                parent = hash_node(nodes[index - 1], nodes[index])
+            else:
+                parent = nodes[index]  # Promote the node without a sibling
+
+            if level + 1 == len(levels):
+                levels.append([])
+            parents = levels[level + 1]
+            if index // 2 < len(parents):
+                parents[index // 2] = parent
+            else:
+                parents.append(parent)
+            level += 1
+
+    def _build_levels(self) -> List[List[str]]:
+        """
+        Materialize every level of the tree.
+
+        Returns:
+            List[List[str]]: Node hashes per level, leaves first
+        """
+        if self._levels is None:
+            self._levels = [[]]
+            for value in self.values:
+                self._append_to_levels(hash_leaf(value))
+        return self._levels
+
+    def get_proof(self, index: int) -> InclusionProof:
+        """
+        Build the inclusion proof for a leaf.
+
+        Args:
+            index (int): Index of the leaf
+
+        Returns:
+            InclusionProof: The proof, with O(log n) steps
+        """
+        if index < 0 or index >= len(self.values):
+            raise ValueError(f"Leaf index {index} out of range for tree of size {len(self.values)}")
+
+        levels = self._build_levels()
+        path = []
+        position = index
+        for nodes in levels[:-1]:
+            sibling = position ^ 1
+            if sibling < len(nodes):
+                path.append(('left' if sibling < position else 'right', nodes[sibling]))
+            position //= 2
+
+        return InclusionProof(
+            value=self.values[index],
+            leaf_index=index,
+            tree_size=len(self.values),
+            root=self.root,
+            path=path
+        )
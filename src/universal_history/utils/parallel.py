@@ -0,0 +1,111 @@
+"""
+Utility functions for fanning work out across a process pool.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional, Set
+
+_NO_CONTEXT = object()
+
+# Context of the tasks run by this worker process, set once when the process starts
+_worker_context: Any = _NO_CONTEXT
+
+def _init_worker(context: Any) -> None:
+    """Store the task context in a newly started worker process."""
+    global _worker_context
+    _worker_context = context
+
+def _call_with_context(func: Callable[[Any, Any], Any], item: Any) -> Any:
+    """Apply a function to an item with the context of this worker process."""
+    return func(_worker_context, item)
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """
+    Resolve the number of worker processes to use.
+
+    Args:
+        workers (Optional[int]): Requested number of workers, or None for one per CPU
+
+    Returns:
+        int: Number of workers (at least 1)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, int(workers))
+
+def iter_parallel(func: Callable[..., Any], items: Iterable[Any],
+                  workers: Optional[int] = None, ordered: bool = False,
+                  max_in_flight: Optional[int] = None,
+                  context: Any = _NO_CONTEXT) -> Iterator[Any]:
+    """
+    Apply a function to every item, yielding results as they become available.
+
+    With a single worker the items are processed inline, in order, without
+    starting a pool. Otherwise at most max_in_flight tasks are submitted at a
+    time, so the input iterable is consumed lazily and memory stays bounded.
+
+    State shared by every task (a repository, the parameters of a run...) is
+    passed as context rather than in each item: it is sent to each worker
+    process once, when the process starts, instead of with every task.
+
+    Args:
+        func (Callable[..., Any]): Module-level (picklable) function to apply; called
+            as func(item), or func(context, item) when a context is given
+        items (Iterable[Any]): Items to process
+        workers (Optional[int]): Number of worker processes, or None for one per CPU
+        ordered (bool): Whether to yield results in input order instead of completion order
+        max_in_flight (Optional[int]): Maximum number of pending tasks (default: 2 per worker)
+        context (Any): State passed to every call of func
+
+    Returns:
+        Iterator[Any]: Iterator over the results
+    """
+    workers = resolve_workers(workers)
+    if workers == 1:
+        for item in items:
+            yield func(item) if context is _NO_CONTEXT else func(context, item)
+        return
+
+    # With a context, workers receive it once at startup and each task only names the function
+    if context is _NO_CONTEXT:
+        pool_options = {}
+        call = (func,)
+    else:
+        pool_options = {'initializer': _init_worker, 'initargs': (context,)}
+        call = (_call_with_context, func)
+
+    if max_in_flight is None:
+        max_in_flight = workers * 2
+    max_in_flight = max(1, max_in_flight)
+
+    item_iter = iter(items)
+    with ProcessPoolExecutor(max_workers=workers, **pool_options) as executor:
+        if ordered:
+            pending: Deque = deque()
+            for item in item_iter:
+                pending.append(executor.submit(*call, item))
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+            return
+
+        in_flight: Set = set()
+        exhausted = False
+        while True:
+            # Top up the pool before waiting on the next completion
+            while not exhausted and len(in_flight) < max_in_flight:
+                try:
+                    item = next(item_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                in_flight.add(executor.submit(*call, item))
+
+            if not in_flight:
+                return
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
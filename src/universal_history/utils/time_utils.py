@@ -2,8 +2,19 @@
 Utility functions for handling time and dates in the Universal History system.
 """
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 import re
+import warnings
+
+try:
+    import numpy as np
+except ImportError:  # numpy not installed
+    np = None
+
+PERIODS = ('day', 'week', 'month', 'year')
+
+# Inputs at least this large are handled by the NumPy implementations when available
+VECTORIZE_THRESHOLD = 10000
 
 def parse_iso_date(date_str: str) -> datetime:
     """
@@ -67,6 +78,12 @@ def group_by_period(items: List[Dict],
     Returns:
         Dict[str, List[Dict]]: Dictionary mapping period keys to lists of items
     """
+    # Large inputs are bucketed in one vectorized pass when possible
+    if np is not None and len(items) >= VECTORIZE_THRESHOLD:
+        grouped = _group_by_period_vectorized(items, date_key, period)
+        if grouped is not None:
+            return grouped
+    
     result = {}
     
     for item in items:
@@ -252,6 +269,11 @@ def get_time_periods_between(start_date: Union[str, datetime],
     if isinstance(end_date, str):
         end_date = datetime.fromisoformat(end_date)
     
+    # Long ranges are generated in one vectorized pass when possible
+    if (np is not None and period in _PERIOD_DAYS and start_date.tzinfo is None and end_date.tzinfo is None
+            and (end_date - start_date).days / _PERIOD_DAYS[period] >= VECTORIZE_THRESHOLD):
+        return _get_time_periods_between_vectorized(start_date, end_date, period)
+    
     result = []
     
     if period == 'day':
@@ -309,4 +331,186 @@ def get_time_periods_between(start_date: Union[str, datetime],
     else:
         raise ValueError(f"Invalid period: {period}. Must be 'day', 'week', 'month', or 'year'.")
     
-    return result
\ No newline at end of file
+    return result
+
+# Approximate length of each period, used to estimate the number of periods in a range
+_PERIOD_DAYS = {'day': 1, 'week': 7, 'month': 28, 'year': 365}
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for vectorized time functions; install universal-history[analytics]")
+
+def to_datetime64(values: Sequence[Any]) -> Any:
+    """
+    Convert timestamps to a NumPy datetime64 array with microsecond precision.
+    
+    Args:
+        values (Sequence[Any]): Naive datetimes, dates, ISO format strings or a datetime64 array
+        
+    Returns:
+        numpy.ndarray: The timestamps as datetime64[us]
+        
+    Raises:
+        ValueError: If a value cannot be converted, is missing or carries a time zone
+    """
+    _require_numpy()
+    with warnings.catch_warnings():
+        # NumPy converts time zone offsets to UTC with a warning; refuse them instead
+        warnings.simplefilter('error')
+        try:
+            stamps = np.asarray(values, dtype='datetime64[us]')
+        except (ValueError, TypeError, OverflowError, Warning) as e:
+            raise ValueError(f"Cannot convert timestamps to datetime64: {e}") from e
+    
+    if np.isnat(stamps).any():
+        raise ValueError("Cannot convert timestamps to datetime64: missing values")
+    return stamps
+
+def _period_codes(stamps: Any, period: str) -> Any:
+    """Integer code of the period containing each timestamp (days, weeks by their Monday, months or years)."""
+    if period == 'day':
+        return stamps.astype('datetime64[D]').astype(np.int64)
+    if period == 'week':
+        days = stamps.astype('datetime64[D]').astype(np.int64)
+        # 1970-01-01 was a Thursday, so Monday-based weekdays are offset by 3
+        return days - (days + 3) % 7
+    if period == 'month':
+        return stamps.astype('datetime64[M]').astype(np.int64)
+    if period == 'year':
+        return stamps.astype('datetime64[Y]').astype(np.int64)
+    raise ValueError(f"Invalid period: {period}. Must be 'day', 'week', 'month', or 'year'.")
+
+def _period_labels(codes: Any, period: str) -> List[str]:
+    """Keys of periods, in the format of group_by_period."""
+    if period == 'week':
+        # The ISO week of a Monday is the week of its Thursday
+        thursdays = (codes + 3).astype('datetime64[D]')
+        years = thursdays.astype('datetime64[Y]')
+        weeks = (thursdays - years.astype('datetime64[D]')).astype(np.int64) // 7 + 1
+        return [f"{year}-W{week:02d}" for year, week in zip((years.astype(np.int64) + 1970).tolist(), weeks.tolist())]
+    unit = {'day': 'D', 'month': 'M', 'year': 'Y'}[period]
+    return [str(label) for label in codes.astype(f'datetime64[{unit}]')]
+
+def count_by_period(timestamps: Sequence[Any], period: str = 'month') -> Dict[str, int]:
+    """
+    Count timestamps by time period in one vectorized pass.
+    
+    Args:
+        timestamps (Sequence[Any]): The timestamps (see to_datetime64)
+        period (str): The period to count by ('day', 'week', 'month', 'year')
+        
+    Returns:
+        Dict[str, int]: Number of timestamps by period key, in period order
+    """
+    stamps = to_datetime64(timestamps)
+    codes, counts = np.unique(_period_codes(stamps, period), return_counts=True)
+    return dict(zip(_period_labels(codes, period), counts.tolist()))
+
+def group_indices_by_period(timestamps: Sequence[Any], period: str = 'month') -> Dict[str, Any]:
+    """
+    Group the positions of timestamps by time period in one vectorized pass.
+    
+    Args:
+        timestamps (Sequence[Any]): The timestamps (see to_datetime64)
+        period (str): The period to group by ('day', 'week', 'month', 'year')
+        
+    Returns:
+        Dict[str, numpy.ndarray]: Positions of the timestamps of each period, in input
+            order; periods are ordered by their first timestamp, like group_by_period
+    """
+    stamps = to_datetime64(timestamps)
+    codes, first_positions, inverse, counts = np.unique(
+        _period_codes(stamps, period), return_index=True, return_inverse=True, return_counts=True
+    )
+    order = np.argsort(inverse.ravel(), kind='stable')
+    groups = np.split(order, np.cumsum(counts)[:-1])
+    labels = _period_labels(codes, period)
+    return {labels[i]: groups[i] for i in np.argsort(first_positions, kind='stable').tolist()}
+
+def _group_by_period_vectorized(items: List[Dict], date_key: str, period: str) -> Optional[Dict[str, List[Dict]]]:
+    """
+    Vectorized group_by_period.
+    
+    Returns:
+        Optional[Dict[str, List[Dict]]]: The groups, or None if some dates carry a
+            time zone and need the item-by-item implementation
+    """
+    positions = []
+    values = []
+    for position, item in enumerate(items):
+        value = item.get(date_key)
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            return None
+        if isinstance(value, (str, date)):
+            positions.append(position)
+            values.append(value)
+    
+    if not values:
+        return {}
+    if period not in PERIODS:
+        raise ValueError(f"Invalid period: {period}. Must be 'day', 'week', 'month', or 'year'.")
+    
+    try:
+        groups = group_indices_by_period(values, period)
+    except ValueError:
+        # Drop the strings group_by_period would skip and try again
+        valid_positions = []
+        valid_values = []
+        for position, value in zip(positions, values):
+            if isinstance(value, str):
+                try:
+                    if datetime.fromisoformat(value).tzinfo is not None:
+                        return None
+                except ValueError:
+                    continue
+            valid_positions.append(position)
+            valid_values.append(value)
+        if not valid_values:
+            return {}
+        try:
+            groups = group_indices_by_period(valid_values, period)
+        except ValueError:
+            return None
+        positions = valid_positions
+    
+    item_positions = np.asarray(positions)
+    return {
+        key: [items[position] for position in item_positions[group].tolist()]
+        for key, group in groups.items()
+    }
+
+def _get_time_periods_between_vectorized(start_date: datetime, end_date: datetime,
+                                         period: str) -> List[Tuple[datetime, datetime]]:
+    """Vectorized get_time_periods_between for naive datetimes and a valid period."""
+    start = np.datetime64(start_date, 'us')
+    end = np.datetime64(end_date, 'us')
+    one_second = np.timedelta64(1, 's')
+    
+    if period == 'day':
+        # Whole days, one per day from start_date while not after end_date
+        count = max(0, int((end - start) // np.timedelta64(1, 'D')) + 1)
+        starts = start.astype('datetime64[D]') + np.arange(count)
+        ends = starts + np.timedelta64(1, 'D') - one_second
+        return list(zip(starts.astype('datetime64[us]').tolist(), ends.astype('datetime64[us]').tolist()))
+    
+    if period == 'week':
+        first = start.astype('datetime64[D]')
+        first = first - (first.astype(np.int64) + 3) % 7
+        count = max(0, int((end - first.astype('datetime64[us]')) // np.timedelta64(7, 'D')) + 1)
+        starts = first + 7 * np.arange(count)
+        next_starts = starts + 7
+    else:
+        unit = 'M' if period == 'month' else 'Y'
+        first = start.astype(f'datetime64[{unit}]')
+        count = max(0, int(end.astype(f'datetime64[{unit}]').astype(np.int64) - first.astype(np.int64)) + 1)
+        starts = first + np.arange(count)
+        next_starts = starts + 1
+    
+    starts = starts.astype('datetime64[us]')
+    ends = next_starts.astype('datetime64[us]') - one_second
+    
+    # Only periods that overlap with the range, clipped to it
+    overlapping = ends >= start
+    starts = np.maximum(starts[overlapping], start)
+    ends = np.minimum(ends[overlapping], end)
+    return list(zip(starts.tolist(), ends.tolist()))
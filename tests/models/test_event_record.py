@@ -3,11 +3,15 @@ Tests for the EventRecord model.
 """
 import pytest
 import json
+import hashlib
 from datetime import datetime
 
+import universal_history.config as config_module
+from universal_history.config import Config
+
 from universal_history.models.event_record import (
     EventRecord, DomainType, ContentType, SourceType, 
-    InputMethod, ProcessingMethod, RawInput, Source, Creator
+    InputMethod, ProcessingMethod, RawInput, Source, Creator, ProcessedData, Context
 )
 
 
@@ -194,4 +198,81 @@ def test_event_record_calculate_hash(sample_event_record):
     hash_value4 = sample_event_record.calculate_hash()
     
     # Verify the hash is the same as the original
-    assert hash_value == hash_value4
\ No newline at end of file
+    assert hash_value == hash_value4
+
+
+def _reference_hash(event_record):
+    """Hash an EventRecord the way it was hashed before the canonical encoder existed."""
+    data = event_record.to_dict()
+    data.pop('current_re_hash', None)
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def test_event_record_calculate_hash_matches_reference(sample_event_record):
+    """Test that the canonical hash is byte-identical to the sorted JSON dump hash."""
+    # Hash the sample record, then chain and enrich it
+    assert sample_event_record.calculate_hash() == _reference_hash(sample_event_record)
+    
+    sample_event_record.previous_re_hash = "a" * 64
+    sample_event_record.raw_input.content = "Caf\u00e9 \"quoted\" \n\u2603"
+    sample_event_record.processed_data = ProcessedData(
+        quantitative_metrics={"score": 92.5, "attempts": 2, "ratio": float("nan")},
+        qualitative_assessments={"teacher": "Excellent", "peer": "Good"},
+        derived_insights=["Strong algebra skills"]
+    )
+    sample_event_record.context = Context(location="Room 1", participants=["a", "b"])
+    sample_event_record.metadata.tags = ["math", "exam"]
+    
+    # Verify the hashes still match
+    assert sample_event_record.calculate_hash() == _reference_hash(sample_event_record)
+
+
+def test_event_record_calculate_hash_raw_values():
+    """Test the canonical hash with raw strings in enumeration fields and no creator."""
+    # Create an EventRecord whose enumerations and timestamp are plain strings
+    event_record = EventRecord(
+        subject_id="subject-1",
+        domain_type="health",
+        event_type="checkup",
+        raw_input=RawInput(type="text", content="Routine checkup"),
+        source=Source(type="institution", id="clinic-1", name="Clinic"),
+        timestamp="2023-01-01T10:00:00"
+    )
+    
+    # Verify the hashes match
+    assert event_record.calculate_hash() == _reference_hash(event_record)
+
+
+
+def test_event_record_hash_algorithm(sample_event_record, monkeypatch):
+    """Test stamping and hashing an EventRecord with a configured hash algorithm."""
+    # Verify legacy records are hashed with SHA-256 and do not carry an algorithm
+    sample_event_record.update_hash()
+    assert sample_event_record.hash_algorithm is None
+    assert "hash_algorithm" not in sample_event_record.to_dict()
+    assert sample_event_record.current_re_hash == _reference_hash(sample_event_record)
+    
+    # Configure BLAKE2b and hash a new record
+    monkeypatch.setattr(config_module, "config", Config({"hash_algorithm": "blake2b"}))
+    event_record = EventRecord.from_dict(sample_event_record.to_dict())
+    event_record.re_id = "re-blake2b"
+    event_record.update_hash()
+    
+    # Verify the algorithm is recorded, hashed and round-tripped
+    data = event_record.to_dict()
+    assert data["hash_algorithm"] == "blake2b"
+    data.pop("current_re_hash")
+    expected = hashlib.blake2b(json.dumps(data, sort_keys=True, default=str).encode(), digest_size=32).hexdigest()
+    assert event_record.current_re_hash == expected
+    assert EventRecord.from_dict(event_record.to_dict()).calculate_hash() == expected
+    
+    # Verify existing legacy hashes are unaffected by the new default
+    assert sample_event_record.calculate_hash() == sample_event_record.current_re_hash
+
+
+def test_event_record_unknown_hash_algorithm(sample_event_record):
+    """Test that an unknown hash algorithm is rejected."""
+    sample_event_record.hash_algorithm = "unknown"
+    
+    with pytest.raises(ValueError):
+        sample_event_record.calculate_hash()
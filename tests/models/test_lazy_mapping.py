@@ -0,0 +1,85 @@
+"""
+Tests for lazily decoded record collections.
+"""
+import pytest
+import json
+
+from universal_history.models.event_record import EventRecord, DomainType, RawInput, ContentType
+from universal_history.models.lazy_mapping import LazyRecordMapping
+from universal_history.models.universal_history import UniversalHistory
+
+
+@pytest.fixture
+def multi_domain_history(sample_universal_history, sample_raw_input, sample_source):
+    """Create a history with events in two domains."""
+    history = sample_universal_history
+    for index, domain_type in enumerate([DomainType.EDUCATION, DomainType.HEALTH, DomainType.EDUCATION]):
+        history.add_event_record(EventRecord(
+            subject_id=history.subject_id,
+            domain_type=domain_type,
+            event_type=f"event_{index}",
+            raw_input=sample_raw_input,
+            source=sample_source
+        ))
+    return history
+
+
+def test_lazy_from_dict_decodes_nothing(multi_domain_history):
+    """Test that a lazy history keeps its records as dictionaries until they are used."""
+    data = json.loads(json.dumps(multi_domain_history.to_dict()))
+
+    history = UniversalHistory.from_dict(data, lazy=True)
+
+    assert isinstance(history.event_records, LazyRecordMapping)
+    assert history.event_records.pending_count == 3
+    assert list(history.event_records) == list(multi_domain_history.event_records)
+    assert history.get_domains() == {"education", "health"}
+    assert history.event_records.pending_count == 3
+
+
+def test_get_events_by_domain_decodes_matches_only(multi_domain_history):
+    """Test that filtering by domain only decodes the records of that domain."""
+    data = json.loads(json.dumps(multi_domain_history.to_dict()))
+    history = UniversalHistory.from_dict(data, lazy=True)
+
+    events = history.get_events_by_domain(DomainType.HEALTH)
+
+    assert [er.re_id for er in events] == [
+        er.re_id for er in multi_domain_history.get_events_by_domain(DomainType.HEALTH)
+    ]
+    assert isinstance(events[0], EventRecord)
+    assert history.event_records.pending_count == 2
+
+
+def test_lazy_history_round_trip(multi_domain_history):
+    """Test that a lazy history encodes to the same dictionary, with or without decoding."""
+    data = json.loads(json.dumps(multi_domain_history.to_dict()))
+    history = UniversalHistory.from_dict(data, lazy=True)
+
+    assert history.to_dict() == data
+
+    history.get_events_by_domain(DomainType.EDUCATION)
+    assert history.to_dict() == data
+    assert history.event_records == UniversalHistory.from_dict(data).event_records
+
+
+def test_lazy_history_accepts_new_records(multi_domain_history, sample_source):
+    """Test that records can be added to and removed from a lazy history."""
+    data = json.loads(json.dumps(multi_domain_history.to_dict()))
+    history = UniversalHistory.from_dict(data, lazy=True)
+    first_id = next(iter(history.event_records))
+
+    event = EventRecord(
+        subject_id=history.subject_id,
+        domain_type=DomainType.HEALTH,
+        event_type="new_event",
+        raw_input=RawInput(type=ContentType.TEXT, content="New"),
+        source=sample_source
+    )
+    history.add_event_record(event)
+    del history.event_records[first_id]
+
+    assert len(history.event_records) == 3
+    assert history.event_records[event.re_id] is event
+    assert len(history.get_events_by_domain(DomainType.HEALTH)) == 2
+    assert first_id not in history.to_dict()['event_records']
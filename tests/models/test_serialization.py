@@ -0,0 +1,216 @@
+"""
+Tests for the compiled model serializers.
+"""
+import pytest
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from universal_history.models.serialization import Serializer, serializer_for
+from universal_history.models.event_record import (
+    EventRecord, DomainType, ContentType, SourceType, RawInput, Source, Creator
+)
+from universal_history.models.trajectory_synthesis import (
+    TrajectorySynthesis, TimeFrame, SignificantEvent, Metric
+)
+from universal_history.models.state_document import StateDocument, DomainState, EventReference
+from universal_history.models.domain_catalog import DomainCatalog, Organization, TermDefinition
+from universal_history.models.universal_history import UniversalHistory
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+@dataclass
+class Shape:
+    name: str
+    kind: ContentType
+    created: datetime
+    points: List[Point] = field(default_factory=list)
+    labels: Dict[str, Point] = field(default_factory=dict)
+    origin: Optional[Point] = None
+    day: Optional[date] = None
+    note: Optional[str] = None
+
+
+def test_serializer_encodes_by_type():
+    """Test that enums, dates and nested dataclasses are encoded from the field types."""
+    shape = Shape(
+        name="square",
+        kind=ContentType.IMAGE,
+        created=datetime(2024, 1, 2, 3, 4, 5),
+        points=[Point(0, 0), Point(1, 1)],
+        labels={"a": Point(2, 3)},
+        day=date(2024, 1, 2)
+    )
+
+    data = serializer_for(Shape).encode(shape)
+
+    assert data == {
+        'name': "square",
+        'kind': "image",
+        'created': "2024-01-02T03:04:05",
+        'points': [{'x': 0, 'y': 0}, {'x': 1, 'y': 1}],
+        'labels': {'a': {'x': 2, 'y': 3}},
+        'origin': None,
+        'day': "2024-01-02",
+        'note': None
+    }
+    assert serializer_for(Shape).decode(json.loads(json.dumps(data))) == shape
+
+
+def test_serializer_options():
+    """Test key order, omitted fields and shallow copies."""
+    serializer = Serializer(
+        Shape,
+        order=['kind', 'name', 'points', 'note', 'origin'],
+        omit_if_none=['note'],
+        omit_if_falsy=['origin'],
+        copy=['points']
+    )
+    shape = Shape(name="dot", kind=ContentType.TEXT, created=datetime(2024, 1, 1))
+
+    data = serializer.encode(shape)
+
+    assert list(data) == ['kind', 'name', 'points']
+    assert data['points'] is not shape.points
+
+    shape.note = "n"
+    shape.origin = Point(1, 2)
+    assert list(serializer.encode(shape)) == ['kind', 'name', 'points', 'note', 'origin']
+
+
+def test_serializer_unknown_keys():
+    """Test that unknown keys are rejected unless the serializer ignores them."""
+    data = {'x': 1, 'y': 2, 'z': 3}
+
+    with pytest.raises(TypeError):
+        Serializer(Point).decode(data)
+
+    assert Serializer(Point, ignore_unknown=True).decode(data) == Point(1, 2)
+    assert data == {'x': 1, 'y': 2, 'z': 3}
+
+
+def test_event_record_format(sample_event_record):
+    """Test the key order and omitted fields of an encoded EventRecord."""
+    sample_event_record.source.creator = None
+    data = sample_event_record.to_dict()
+
+    assert list(data) == [
+        'subject_id', 'domain_type', 'event_type', 're_id', 'timestamp', 'previous_re_hash',
+        'current_re_hash', 'verification_status', 'raw_input', 'source', 'processed_data',
+        'context', 'metadata', 'confidence_level'
+    ]
+    assert list(data['source']) == ['type', 'id', 'name', 'input_method', 'processing_method']
+
+    sample_event_record.hash_algorithm = "blake2b"
+    assert list(sample_event_record.to_dict())[8] == 'hash_algorithm'
+
+
+def test_event_record_decode_leaves_input_untouched():
+    """Test that decoding does not modify the dictionary (so it can be decoded again)."""
+    event = EventRecord(
+        subject_id="subject-1",
+        domain_type=DomainType.HEALTH,
+        event_type="visit",
+        raw_input=RawInput(type=ContentType.TEXT, content="Checkup"),
+        source=Source(type=SourceType.INDIVIDUAL, id="doc-1", name="Doctor",
+                      creator=Creator(id="c-1", role="doctor", name="Ann"))
+    )
+    data = json.loads(json.dumps(event.to_dict()))
+    snapshot = json.dumps(data)
+
+    first = EventRecord.from_dict(data)
+    second = EventRecord.from_dict(data)
+
+    assert json.dumps(data) == snapshot
+    assert first == second
+    assert first.source.creator == Creator(id="c-1", role="doctor", name="Ann")
+    assert first.domain_type is DomainType.HEALTH
+
+
+def test_trajectory_synthesis_format():
+    """Test the key order and optional fields of an encoded TrajectorySynthesis."""
+    synthesis = TrajectorySynthesis(
+        subject_id="subject-1",
+        domain_type=DomainType.EDUCATION,
+        time_frame=TimeFrame(start=datetime(2024, 1, 1), end=datetime(2024, 2, 1)),
+        summary="Summary",
+        significant_events=[SignificantEvent(re_id="re-1", description="Exam", significance="high")],
+        metrics={"score": Metric(value=9.0, trend="improving")}
+    )
+
+    data = synthesis.to_dict()
+
+    assert list(data) == [
+        'st_id', 'subject_id', 'domain_type', 'level', 'summary', 'source_events', 'key_insights',
+        'patterns', 'recommendations', 'domain_specific_data', 'confidence_level', 'time_frame',
+        'significant_events', 'metrics', 'metadata'
+    ]
+    assert list(data['metadata']) == ['generated_by', 'generated_on']
+    assert data['source_events'] is not synthesis.source_events
+    assert TrajectorySynthesis.from_dict(json.loads(json.dumps(data))).to_dict() == data
+
+
+def test_state_document_round_trip():
+    """Test encoding and decoding a StateDocument with nested domain states."""
+    reference = EventReference(re_id="re-1", description="Exam")
+    state_document = StateDocument(
+        subject_id="subject-1",
+        general_summary="Summary",
+        domains={"education": DomainState(
+            last_updated=datetime(2024, 1, 1),
+            current_status="active",
+            recent_events=[reference]
+        )}
+    )
+
+    data = state_document.to_dict()
+    restored = StateDocument.from_dict(json.loads(json.dumps(data)))
+
+    assert data['domains']['education']['recent_events'] == [
+        {'re_id': "re-1", 'description': "Exam", 'impact': None, 'significance': None}
+    ]
+    assert restored.domains["education"].recent_events == [reference]
+    assert restored.to_dict() == data
+
+
+def test_domain_catalog_format():
+    """Test that DomainCatalog keeps its encoded layout and restores its definitions."""
+    catalog = DomainCatalog(
+        domain_type=DomainType.EDUCATION,
+        organization=Organization(id="org-1", name="School"),
+        event_types=["exam"],
+        last_updated=date(2024, 1, 1)
+    )
+    catalog.add_term("gpa", "Grade point average")
+    catalog.last_updated = date(2024, 1, 1)
+
+    data = catalog.to_dict()
+    restored = DomainCatalog.from_dict(json.loads(json.dumps(data)))
+
+    assert list(data) == [
+        'cdd_id', 'domain_type', 'version', 'last_updated', 'definitions', 'mappings',
+        'custom_extensions', 'organization'
+    ]
+    assert data['last_updated'] == "2024-01-01"
+    assert restored.get_term_definition("gpa") == TermDefinition(definition="Grade point average")
+    assert restored.last_updated == date(2024, 1, 1)
+
+
+def test_universal_history_ignores_unknown_keys(populated_history):
+    """Test that histories decode from documents carrying extra keys (e.g. storage IDs)."""
+    data = json.loads(json.dumps(populated_history.to_dict()))
+    data['_id'] = "storage-id"
+    data['organization'] = None
+
+    restored = UniversalHistory.from_dict(data)
+
+    assert restored.hu_id == populated_history.hu_id
+    assert restored.organization is None
+    assert restored.to_dict() == populated_history.to_dict()
+    assert 'state_document' not in data
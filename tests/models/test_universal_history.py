@@ -5,11 +5,15 @@ import pytest
 import json
 from datetime import datetime
 
+import universal_history.config as config_module
+from universal_history.config import Config
+
 from universal_history.models.universal_history import UniversalHistory
 from universal_history.models.event_record import EventRecord, DomainType, ContentType, SourceType, InputMethod, ProcessingMethod, RawInput, Source, Creator
 from universal_history.models.trajectory_synthesis import TrajectorySynthesis, TimeFrame
 from universal_history.models.state_document import StateDocument, DomainState, EventReference
 from universal_history.models.domain_catalog import DomainCatalog
+from universal_history.utils.merkle_utils import MerkleTree, verify_inclusion_proof
 
 
 def test_universal_history_creation(sample_subject_id):
@@ -452,4 +456,207 @@ def test_verify_event_chain(sample_universal_history, sample_event_record):
     sample_event_record.current_re_hash = "tampered-hash"
     
     # Verify the event chain again
-    assert not sample_universal_history.verify_event_chain(DomainType.EDUCATION)
\ No newline at end of file
+    assert not sample_universal_history.verify_event_chain(DomainType.EDUCATION)
+
+def test_chain_head_tracks_most_recent_event(sample_universal_history, sample_raw_input, sample_source):
+    """Test that the chain head follows the most recent event of each domain."""
+    # Add two events in the same domain
+    first_event = EventRecord(
+        subject_id=sample_universal_history.subject_id,
+        domain_type=DomainType.EDUCATION,
+        event_type="first_event",
+        raw_input=sample_raw_input,
+        source=sample_source,
+        timestamp=datetime(2023, 1, 1)
+    )
+    second_event = EventRecord(
+        subject_id=sample_universal_history.subject_id,
+        domain_type=DomainType.EDUCATION,
+        event_type="second_event",
+        raw_input=sample_raw_input,
+        source=sample_source,
+        timestamp=datetime(2023, 2, 1)
+    )
+    sample_universal_history.add_event_record(first_event)
+    sample_universal_history.add_event_record(second_event)
+    
+    # Verify the head points to the second event
+    head = sample_universal_history.get_chain_head(DomainType.EDUCATION)
+    assert head.re_id == second_event.re_id
+    assert head.current_re_hash == second_event.current_re_hash
+    assert second_event.previous_re_hash == first_event.current_re_hash
+    
+    # Verify other domains have no head
+    assert sample_universal_history.get_chain_head(DomainType.HEALTH) is None
+
+
+def test_chain_heads_round_trip(sample_universal_history, sample_event_record):
+    """Test that chain heads survive a dictionary round trip."""
+    # Add an event record
+    sample_universal_history.add_event_record(sample_event_record)
+    
+    # Round trip the history
+    history_dict = sample_universal_history.to_dict()
+    assert "education" in history_dict["chain_heads"]
+    history = UniversalHistory.from_dict(history_dict)
+    
+    # Verify the chain head was restored
+    head = history.get_chain_head(DomainType.EDUCATION)
+    assert head.re_id == sample_event_record.re_id
+    assert head.current_re_hash == sample_event_record.current_re_hash
+
+
+def test_chain_head_rebuilt_when_missing(sample_universal_history, sample_event_record):
+    """Test that a missing chain head is rebuilt from the events."""
+    # Add an event record and drop the chain heads
+    sample_universal_history.add_event_record(sample_event_record)
+    sample_universal_history.chain_heads.clear()
+    
+    # Verify the head is rebuilt
+    head = sample_universal_history.get_chain_head(DomainType.EDUCATION)
+    assert head.re_id == sample_event_record.re_id
+
+
+def _add_education_events(history, sample_raw_input, sample_source, count, start_month=1):
+    """Add `count` monthly education events to a history."""
+    events = []
+    for i in range(count):
+        event = EventRecord(
+            subject_id=history.subject_id,
+            domain_type=DomainType.EDUCATION,
+            event_type=f"event_{start_month + i}",
+            raw_input=sample_raw_input,
+            source=sample_source,
+            timestamp=datetime(2023, start_month + i, 1)
+        )
+        history.add_event_record(event)
+        events.append(event)
+    return events
+
+
+def test_verify_event_chain_resumes_from_checkpoint(sample_universal_history, sample_raw_input, sample_source, monkeypatch):
+    """Test that verification only rehashes events appended after the checkpoint."""
+    # Verify an initial chain of three events
+    _add_education_events(sample_universal_history, sample_raw_input, sample_source, 3)
+    assert sample_universal_history.verify_event_chain(DomainType.EDUCATION)
+    
+    checkpoint = sample_universal_history.verification_checkpoints[DomainType.EDUCATION.value]
+    assert checkpoint.event_count == 3
+    
+    # Append two events and count the hashes computed by the next verification
+    new_events = _add_education_events(sample_universal_history, sample_raw_input, sample_source, 2, start_month=4)
+    hashed = []
+    original_calculate_hash = EventRecord.calculate_hash
+    def counting_calculate_hash(self):
+        hashed.append(self.re_id)
+        return original_calculate_hash(self)
+    monkeypatch.setattr(EventRecord, "calculate_hash", counting_calculate_hash)
+    
+    assert sample_universal_history.verify_event_chain(DomainType.EDUCATION)
+    assert hashed == [event.re_id for event in new_events]
+    assert sample_universal_history.verification_checkpoints[DomainType.EDUCATION.value].re_id == new_events[-1].re_id
+
+
+def test_verify_event_chain_full_ignores_checkpoint(sample_universal_history, sample_raw_input, sample_source):
+    """Test that a full verification detects tampering behind the checkpoint."""
+    events = _add_education_events(sample_universal_history, sample_raw_input, sample_source, 3)
+    assert sample_universal_history.verify_event_chain(DomainType.EDUCATION)
+    
+    # Tamper with an already verified event without touching its stored hash
+    events[0].event_type = "tampered"
+    
+    # Verify only the full verification notices
+    assert sample_universal_history.verify_event_chain(DomainType.EDUCATION)
+    assert not sample_universal_history.verify_event_chain(DomainType.EDUCATION, full=True)
+
+
+def test_verification_checkpoints_round_trip(sample_subject_id, sample_event_record):
+    """Test that verification checkpoints survive a dictionary round trip."""
+    history = UniversalHistory(subject_id=sample_subject_id)
+    history.add_event_record(sample_event_record)
+    history.verify_event_chain(DomainType.EDUCATION)
+    
+    restored = UniversalHistory.from_dict(history.to_dict())
+    
+    checkpoint = restored.verification_checkpoints[DomainType.EDUCATION.value]
+    assert checkpoint.re_id == sample_event_record.re_id
+    assert checkpoint.current_re_hash == sample_event_record.current_re_hash
+    assert checkpoint.event_count == 1
+
+
+def test_merkle_tree_maintained_on_append(sample_subject_id, sample_raw_input, sample_source):
+    """Test that an enabled Merkle tree follows appended events and proves inclusion."""
+    history = UniversalHistory(subject_id=sample_subject_id)
+    events = _add_education_events(history, sample_raw_input, sample_source, 2)
+    
+    # Enable the tree over the existing events
+    root = history.enable_merkle_tree(DomainType.EDUCATION)
+    assert root == MerkleTree([e.current_re_hash for e in events]).root
+    
+    # Append an event and verify the root moved
+    events += _add_education_events(history, sample_raw_input, sample_source, 1, start_month=3)
+    assert history.get_merkle_root(DomainType.EDUCATION) == MerkleTree([e.current_re_hash for e in events]).root
+    
+    # Verify an inclusion proof for every event
+    for event in events:
+        proof = history.get_inclusion_proof(event.re_id)
+        assert proof.value == event.current_re_hash
+        assert verify_inclusion_proof(proof, history.get_merkle_root(DomainType.EDUCATION))
+    
+    # Verify domains without a tree have no root
+    assert history.get_merkle_root(DomainType.HEALTH) is None
+
+
+def test_merkle_trees_round_trip(sample_subject_id, sample_raw_input, sample_source):
+    """Test that Merkle trees survive a dictionary round trip."""
+    history = UniversalHistory(subject_id=sample_subject_id)
+    history.enable_merkle_tree(DomainType.EDUCATION)
+    events = _add_education_events(history, sample_raw_input, sample_source, 3)
+    
+    restored = UniversalHistory.from_dict(history.to_dict())
+    
+    assert restored.get_merkle_root(DomainType.EDUCATION) == history.get_merkle_root(DomainType.EDUCATION)
+    proof = restored.get_inclusion_proof(events[1].re_id)
+    assert verify_inclusion_proof(proof, history.get_merkle_root(DomainType.EDUCATION))
+
+
+def test_verify_mixed_algorithm_chain(sample_subject_id, sample_raw_input, sample_source, monkeypatch):
+    """Test that a chain switching hash algorithms midway verifies end to end."""
+    history = UniversalHistory(subject_id=sample_subject_id)
+    legacy_events = _add_education_events(history, sample_raw_input, sample_source, 2)
+    
+    # Switch the default algorithm for new events
+    monkeypatch.setattr(config_module, "config", Config({"hash_algorithm": "blake2b"}))
+    new_events = _add_education_events(history, sample_raw_input, sample_source, 2, start_month=3)
+    
+    # Verify the algorithms recorded on each segment and the whole chain
+    assert [e.hash_algorithm for e in legacy_events + new_events] == [None, None, "blake2b", "blake2b"]
+    assert new_events[0].previous_re_hash == legacy_events[-1].current_re_hash
+    assert history.verify_event_chain(DomainType.EDUCATION, full=True)
+    
+    # Verify a tampered event of the new segment is detected
+    new_events[0].event_type = "tampered"
+    assert not history.verify_event_chain(DomainType.EDUCATION, full=True)
+
+
+def test_add_event_records_chains_in_timestamp_order(sample_universal_history, sample_raw_input, sample_source):
+    """Test that a batch of events is chained by timestamp, whatever the input order."""
+    events = [
+        EventRecord(
+            subject_id=sample_universal_history.subject_id,
+            domain_type=DomainType.EDUCATION,
+            event_type=f"event_{day}",
+            raw_input=sample_raw_input,
+            source=sample_source,
+            timestamp=datetime(2024, 1, day)
+        )
+        for day in (3, 1, 2)
+    ]
+    
+    sample_universal_history.add_event_records(events)
+    
+    assert events[1].previous_re_hash is None
+    assert events[2].previous_re_hash == events[1].current_re_hash
+    assert events[0].previous_re_hash == events[2].current_re_hash
+    assert sample_universal_history.get_chain_head(DomainType.EDUCATION).re_id == events[0].re_id
+    assert sample_universal_history.verify_event_chain(DomainType.EDUCATION)
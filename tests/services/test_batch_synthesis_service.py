@@ -0,0 +1,107 @@
+"""
+Tests for the batch synthesis service.
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from universal_history.models.event_record import EventRecord, DomainType
+from universal_history.models.universal_history import UniversalHistory
+from universal_history.services.batch_synthesis_service import BatchSynthesisService
+from universal_history.storage.repository import FileHistoryRepository
+
+
+def _populate(repository, raw_input, source):
+    """Add three subjects to a repository; subject-c has no events in January."""
+    base = datetime(2024, 1, 1)
+    for subject_id, offset in (("subject-a", 0), ("subject-b", 0), ("subject-c", 60)):
+        history = UniversalHistory(subject_id=subject_id)
+        for domain in (DomainType.EDUCATION, DomainType.HEALTH):
+            for i in range(3):
+                history.add_event_record(EventRecord(
+                    subject_id=subject_id,
+                    domain_type=domain,
+                    event_type="test_event",
+                    raw_input=raw_input,
+                    source=source,
+                    timestamp=base + timedelta(days=offset + 7 * i)
+                ))
+        repository.save_history(history)
+    return repository
+
+
+@pytest.fixture
+def populated_repository(memory_repository, sample_raw_input, sample_source):
+    """Create a memory repository with three subjects."""
+    return _populate(memory_repository, sample_raw_input, sample_source)
+
+
+@pytest.fixture
+def file_repository(tmp_path, sample_raw_input, sample_source):
+    """Create a file repository with three subjects."""
+    return _populate(FileHistoryRepository(str(tmp_path)), sample_raw_input, sample_source)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_generate_syntheses_whole_repository(populated_repository, workers):
+    """Test that every subject gets one saved synthesis per domain with events."""
+    streamed = []
+    report = BatchSynthesisService(populated_repository, workers=workers).generate_syntheses(
+        [DomainType.EDUCATION, "health"], datetime(2024, 1, 1), datetime(2024, 1, 31),
+        on_result=streamed.append
+    )
+
+    assert report.subjects_processed == len(streamed) == 3
+    assert report.syntheses_written == 4
+    assert report.events_read == 12
+    assert report.subjects_skipped == 1
+    assert report.subjects_failed == 0
+
+    for result in streamed:
+        history = populated_repository.get_history(result.hu_id)
+        assert set(history.trajectory_syntheses) == set(result.st_ids)
+        for st_id in result.st_ids:
+            synthesis = history.trajectory_syntheses[st_id]
+            assert synthesis.subject_id == result.subject_id
+            assert len(synthesis.source_events) == 3
+
+
+def test_generate_syntheses_reports_missing_subjects(populated_repository):
+    """Test that an unknown subject is reported without stopping the run."""
+    service = BatchSynthesisService(populated_repository, workers=1)
+    results = list(service.iter_generate_syntheses(
+        "education", datetime(2024, 1, 1), datetime(2024, 1, 31), subject_ids=["subject-a", "unknown-subject"]
+    ))
+
+    assert [result.subject_id for result in results] == ["subject-a", "unknown-subject"]
+    assert results[0].ok and len(results[0].st_ids) == 1
+    assert not results[1].ok
+    assert "unknown-subject" in results[1].error
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_generate_syntheses_in_workers_isolates_corrupt_histories(file_repository, workers):
+    """Test that workers write to shared storage and a corrupt history only fails its own subject."""
+    corrupt_hu_id = file_repository.get_subject_index()["subject-b"]
+    history_path = file_repository._get_history_path(corrupt_hu_id)
+    with open(history_path, 'rb') as f:
+        data = f.read()
+    with open(history_path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+
+    report = BatchSynthesisService(file_repository, workers=workers).generate_syntheses(
+        [DomainType.EDUCATION, DomainType.HEALTH], datetime(2024, 1, 1), datetime(2024, 1, 31)
+    )
+
+    assert report.subjects_processed == 3
+    assert report.syntheses_written == 2
+    assert [result.subject_id for result in report.errors] == ["subject-b"]
+
+    history = FileHistoryRepository(file_repository.storage_dir).get_history_by_subject("subject-a")
+    assert len(history.trajectory_syntheses) == 2
+
+
+def test_tasks_only_name_subjects(populated_repository):
+    """Test that the repository and the period are not copied into every task."""
+    tasks = list(BatchSynthesisService(populated_repository)._iter_tasks(["subject-a", "unknown-subject"]))
+
+    assert tasks == [("subject-a", populated_repository.get_subject_index()["subject-a"]), ("unknown-subject", None)]
@@ -0,0 +1,98 @@
+"""
+Tests for the token-budgeted LLM context builder.
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from universal_history.models.event_record import DomainType
+from universal_history.services.context_builder import ContextBuilder, estimate_tokens
+
+
+@pytest.fixture
+def rich_subject(history_service, state_service, synthesis_service, sample_subject_id):
+    """Create a subject with state in two domains, many events, syntheses and insights."""
+    history_service.create_history(sample_subject_id)
+    start = datetime(2024, 1, 1)
+    for domain, status in ((DomainType.HEALTH, "Recovering from a knee injury"),
+                           (DomainType.EDUCATION, "Top of the class in calculus")):
+        state_service.update_domain_state(
+            sample_subject_id, domain,
+            current_status=status,
+            key_attributes={"checked": "weekly"},
+            recent_events=[
+                {'re_id': f"{domain.value}-{i}", 'description': f"{domain.value} event number {i} " + "detail " * 10,
+                 'timestamp': start + timedelta(days=30 - i)}
+                for i in range(20)
+            ]
+        )
+        synthesis_service.create_trajectory_synthesis(
+            subject_id=sample_subject_id, domain_type=domain, summary=f"Quarterly {domain.value} synthesis",
+            start_date=start, end_date=start + timedelta(days=89), source_events=[], level=2
+        )
+    state_service.update_aggregated_insights(sample_subject_id, cross_domain_patterns=["Sport helps focus"])
+    return sample_subject_id
+
+
+def test_context_fits_budget_and_prefers_weighted_domains(memory_repository, rich_subject):
+    """Test that the context stays within budget and ranks fragments by kind, rank and domain weight."""
+    builder = ContextBuilder(memory_repository)
+
+    small = builder.build(rich_subject, token_budget=200, domain_weights={DomainType.EDUCATION: 3.0})
+    assert small.tokens <= 200
+    assert estimate_tokens(small.text) <= 200
+    assert small.omitted > 0
+    assert small.text.startswith(f"Subject ID: {rich_subject}")
+    assert "Top of the class in calculus" in small.text
+    assert small.text.index("## EDUCATION") < small.text.index("## HEALTH")
+    assert "education event number 0" in small.text
+    assert "health event number 19" not in small.text
+
+    full = builder.build(rich_subject, token_budget=100000)
+    assert full.omitted == 0
+    assert "Quarterly health synthesis" in full.text
+    assert "Sport helps focus" in full.text
+
+    health_only = builder.build(rich_subject, token_budget=100000, domains=["health"])
+    assert "## EDUCATION" not in health_only.text
+    assert "## HEALTH" in health_only.text
+
+
+def test_context_memoized_until_history_changes(memory_repository, state_service, rich_subject):
+    """Test that contexts are reused for the same request and rebuilt after a change."""
+    builder = ContextBuilder(memory_repository)
+
+    first = builder.build(rich_subject, token_budget=500)
+    assert builder.build(rich_subject, token_budget=500) is first
+    assert builder.build(rich_subject, token_budget=400) is not first
+
+    state_service.update_domain_state(rich_subject, DomainType.HEALTH, current_status="Fully recovered")
+    rebuilt = builder.build(rich_subject, token_budget=500)
+    assert rebuilt is not first
+    assert "Fully recovered" in rebuilt.text
+
+    with pytest.raises(ValueError):
+        builder.build("unknown-subject")
+
+
+def test_cached_context_does_not_load_history(tmp_path, sample_universal_history, monkeypatch):
+    """Test that a cache hit on the file backend checks the history version without reading it."""
+    from universal_history.storage.repository import FileHistoryRepository
+    from universal_history.services.state_service import StateService
+
+    repository = FileHistoryRepository(str(tmp_path))
+    repository.save_history(sample_universal_history)
+    subject_id = sample_universal_history.subject_id
+    StateService(repository).update_domain_state(subject_id, DomainType.HEALTH, current_status="Stable")
+    builder = ContextBuilder(repository)
+    first = builder.build(subject_id)
+
+    loads = []
+    get_history = repository.get_history
+    monkeypatch.setattr(repository, "get_history", lambda hu_id: loads.append(hu_id) or get_history(hu_id))
+
+    assert builder.build(subject_id) is first
+    assert loads == []
+
+    monkeypatch.undo()
+    StateService(repository).update_domain_state(subject_id, DomainType.HEALTH, current_status="Recovering")
+    assert "Recovering" in builder.build(subject_id).text
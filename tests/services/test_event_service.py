@@ -388,4 +388,99 @@ def test_search_events_with_sort(event_service, history_service, sample_subject_
     
     # Verify the order
     assert asc_events[0].timestamp < asc_events[1].timestamp < asc_events[2].timestamp
-    assert desc_events[0].timestamp > desc_events[1].timestamp > desc_events[2].timestamp
\ No newline at end of file
+    assert desc_events[0].timestamp > desc_events[1].timestamp > desc_events[2].timestamp
+
+def _batch_item(subject_id, domain_type, timestamp, **kwargs):
+    """Build the keyword arguments of one item of an event batch."""
+    item = {
+        'subject_id': subject_id,
+        'domain_type': domain_type,
+        'event_type': "batch_event",
+        'content': "Batch content",
+        'content_type': "text",
+        'source_type': "system",
+        'source_id': "source-1",
+        'source_name': "Loader",
+        'timestamp': timestamp
+    }
+    item.update(kwargs)
+    return item
+
+
+def test_create_event_records(event_service, history_service, memory_repository, sample_subject_id):
+    """Test creating a batch of events for an existing and a new subject."""
+    hu_id = history_service.create_history(sample_subject_id)
+    base = datetime(2024, 1, 1)
+    batch = [
+        _batch_item(sample_subject_id, "education", base + timedelta(days=2)),
+        _batch_item("new-subject", "health", base.isoformat()),
+        _batch_item(sample_subject_id, "education", base),
+        _batch_item(sample_subject_id, "not-a-domain", base),
+        {'subject_id': sample_subject_id}
+    ]
+    
+    result = event_service.create_event_records(batch)
+    
+    assert [item.ok for item in result.items] == [True, True, True, False, False]
+    assert result.histories_written == 2
+    assert [item.index for item in result.failed] == [3, 4]
+    assert result.items[0].hu_id == hu_id
+    assert memory_repository.get_history_by_subject("new-subject").hu_id == result.items[1].hu_id
+    
+    # The chain links the events in timestamp order, not input order
+    first = event_service.get_event_record(result.items[2].re_id, hu_id)
+    second = event_service.get_event_record(result.items[0].re_id, hu_id)
+    assert second.previous_re_hash == first.current_re_hash
+    assert memory_repository.get_history(hu_id).verify_event_chain(DomainType.EDUCATION)
+
+
+def test_create_event_records_writes_each_history_once(event_service, history_service, memory_repository, sample_subject_id, monkeypatch):
+    """Test that a batch does one repository write per history."""
+    history_service.create_history(sample_subject_id)
+    writes = []
+    save_history = memory_repository.save_history
+    monkeypatch.setattr(memory_repository, "save_history", lambda history: writes.append(history.hu_id) or save_history(history))
+    monkeypatch.setattr(memory_repository, "save_event_record", None)
+    
+    batch = [_batch_item(sample_subject_id, "education", datetime(2024, 1, day)) for day in range(1, 6)]
+    result = event_service.create_event_records(batch)
+    
+    assert len(result.created) == 5
+    assert len(writes) == 1
+
+
+def test_failing_subscriber_does_not_fail_saves(event_service, memory_repository, caplog):
+    """Test that subscribers run after every write and their errors are logged, not reported."""
+    calls = []
+    def failing(hu_id, event_records):
+        calls.append((hu_id, memory_repository.get_history_by_subject("subject-b") is not None))
+        raise RuntimeError("subscriber failed")
+    event_service.subscribe(failing)
+    
+    batch = [_batch_item(subject_id, "education", datetime(2024, 1, 1)) for subject_id in ("subject-a", "subject-b")]
+    result = event_service.create_event_records(batch)
+    
+    assert len(result.created) == 2
+    assert result.histories_written == 2
+    assert [written for _, written in calls] == [True, True]
+    assert "subscriber failed" in caplog.text
+
+
+def test_save_event_records_isolates_write_errors(event_service, history_service, memory_repository, monkeypatch):
+    """Test that an I/O error writing one history does not stop the other subjects."""
+    history_service.create_history("subject-a")
+    history_service.create_history("subject-b")
+    hu_id_a = memory_repository.get_history_by_subject("subject-a").hu_id
+    save_event_records = memory_repository.save_event_records
+    def failing(event_records, hu_id):
+        if hu_id == hu_id_a:
+            raise OSError("disk full")
+        return save_event_records(event_records, hu_id)
+    monkeypatch.setattr(memory_repository, "save_event_records", failing)
+    
+    batch = [_batch_item(subject_id, "education", datetime(2024, 1, 1)) for subject_id in ("subject-a", "subject-b")]
+    result = event_service.create_event_records(batch)
+    
+    assert [item.ok for item in result.items] == [False, True]
+    assert "disk full" in result.items[0].error
+    assert len(memory_repository.get_history_by_subject("subject-b").event_records) == 1
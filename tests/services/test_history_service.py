@@ -8,6 +8,7 @@ from universal_history.models.event_record import EventRecord, DomainType
 from universal_history.models.universal_history import UniversalHistory
 
 from universal_history.services.history_service import HistoryService
+from universal_history.utils.merkle_utils import verify_inclusion_proof
 
 
 def test_history_service_initialization(memory_repository):
@@ -154,6 +155,35 @@ def test_verify_event_chains(history_service, sample_subject_id, sample_event_re
     assert results[DomainType.EDUCATION.value] is True
 
 
+def test_verify_event_chains_saves_checkpoints(history_service, sample_subject_id, sample_event_record, monkeypatch):
+    """Test that verifying event chains persists advanced checkpoints with a HistoryService."""
+    # Create a history with an event record in two domains
+    hu_id = history_service.create_history(sample_subject_id)
+    sample_event_record.subject_id = sample_subject_id
+    history_service.repository.save_event_record(sample_event_record, hu_id)
+    health_event = EventRecord.from_dict({**sample_event_record.to_dict(), 're_id': "health-event",
+                                          'domain_type': DomainType.HEALTH.value,
+                                          'previous_re_hash': None, 'current_re_hash': None})
+    history_service.repository.save_event_record(health_event, hu_id)
+    
+    # Record checkpoint saves
+    saved = []
+    original_save = history_service.repository.save_verification_checkpoints
+    def recording_save(checkpoints, hu_id):
+        saved.append(sorted(checkpoints))
+        original_save(checkpoints, hu_id)
+    monkeypatch.setattr(history_service.repository, "save_verification_checkpoints", recording_save)
+    
+    # Verify twice; only the first run advances the checkpoints, which are saved together
+    history_service.verify_event_chains(sample_subject_id)
+    history_service.verify_event_chains(sample_subject_id)
+    
+    assert saved == [[DomainType.EDUCATION.value, DomainType.HEALTH.value]]
+    checkpoint = history_service.repository.get_verification_checkpoint(DomainType.EDUCATION, hu_id)
+    assert checkpoint.re_id == sample_event_record.re_id
+    assert history_service.repository.get_verification_checkpoint("health", hu_id).re_id == "health-event"
+
+
 def test_verify_event_chains_nonexistent_subject(history_service):
     """Test verifying event chains for a nonexistent subject with a HistoryService."""
     # Verify event chains for a nonexistent subject
@@ -163,6 +193,22 @@ def test_verify_event_chains_nonexistent_subject(history_service):
     assert results == {}
 
 
+def test_inclusion_proof(history_service, sample_subject_id, sample_event_record):
+    """Test enabling a Merkle tree and proving an event's inclusion with a HistoryService."""
+    # Create a history with an event record
+    hu_id = history_service.create_history(sample_subject_id)
+    sample_event_record.subject_id = sample_subject_id
+    history_service.repository.save_event_record(sample_event_record, hu_id)
+    
+    # Enable the Merkle tree and get a proof
+    root = history_service.enable_merkle_tree(sample_subject_id, DomainType.EDUCATION)
+    proof = history_service.get_inclusion_proof(sample_subject_id, sample_event_record.re_id)
+    
+    # Verify the proof against the root
+    assert proof.value == sample_event_record.current_re_hash
+    assert verify_inclusion_proof(proof, root)
+
+
 def test_export_history(history_service, sample_subject_id, sample_event_record):
     """Test exporting a UniversalHistory as a dictionary with a HistoryService."""
     # Create a history
@@ -248,6 +294,25 @@ def test_import_history(history_service):
     assert history.subject_id == "test-subject"
 
 
+def test_import_history_backfills_hashes(history_service, sample_subject_id, sample_event_record):
+    """Test that importing events without hashes rebuilds their chain with a HistoryService."""
+    # Export a history whose event lost its hash
+    history = UniversalHistory(subject_id=sample_subject_id)
+    history.add_event_record(sample_event_record)
+    history_data = history.to_dict()
+    history_data["event_records"][sample_event_record.re_id]["current_re_hash"] = None
+    history_data.pop("chain_heads")
+    
+    # Import the history
+    hu_id = history_service.import_history(history_data)
+    
+    # Verify the hash was backfilled and the chain is valid
+    imported = history_service.get_history(hu_id)
+    assert imported.get_event_record(sample_event_record.re_id).current_re_hash == sample_event_record.current_re_hash
+    assert imported.get_chain_head(DomainType.EDUCATION).current_re_hash == sample_event_record.current_re_hash
+    assert imported.verify_event_chain(DomainType.EDUCATION)
+
+
 def test_copy_history(history_service, sample_subject_id, sample_event_record, sample_organization):
     """Test copying a UniversalHistory from one subject to another with a HistoryService."""
     # Create a source history
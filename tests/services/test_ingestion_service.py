@@ -0,0 +1,126 @@
+"""
+Tests for the IngestionService.
+"""
+import pytest
+import csv
+import json
+
+from universal_history.models.event_record import DomainType
+from universal_history.services.ingestion_service import IngestionService
+
+
+def _event_data(subject_id, day, domain_type="education"):
+    """Build one event record in the export format."""
+    return {
+        'subject_id': subject_id,
+        'domain_type': domain_type,
+        'event_type': "exam",
+        'timestamp': f"2024-01-{day:02d}T09:00:00",
+        'raw_input': {'type': "text", 'content': f"Exam on day {day}"},
+        'source': {'type': "institution", 'id': "school-1", 'name': "School"}
+    }
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    """Write a JSONL export with two subjects, a blank line and two bad records."""
+    lines = [
+        json.dumps(_event_data("subject-a", 2)),
+        json.dumps(_event_data("subject-a", 1)),
+        "",
+        "{not json",
+        json.dumps({**_event_data("subject-a", 2), 'domain_type': "astrology"}),
+        json.dumps(_event_data("subject-b", 1, "health")),
+        json.dumps(_event_data("subject-a", 3))
+    ]
+    path = tmp_path / "events.jsonl"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ingest_jsonl(memory_repository, jsonl_file, workers):
+    """Test loading a JSONL file, with and without a process pool."""
+    service = IngestionService(memory_repository, workers=workers, batch_size=2, chunk_size=2)
+
+    report = service.ingest_file(jsonl_file)
+
+    assert report.records_read == 6
+    assert report.records_written == 4
+    assert [error.record_number for error in report.errors] == [3, 4]
+    assert "astrology" in report.errors[1].error
+    assert report.batches_written == 2
+
+    history = memory_repository.get_history_by_subject("subject-a")
+    events = history.get_events_by_domain(DomainType.EDUCATION)
+    assert sorted(event.timestamp.day for event in events) == [1, 2, 3]
+    assert history.verify_event_chain(DomainType.EDUCATION)
+    assert memory_repository.get_history_by_subject("subject-b") is not None
+
+
+def test_ingest_csv(memory_repository, tmp_path):
+    """Test loading a CSV file with dotted column names."""
+    path = tmp_path / "events.csv"
+    columns = ['subject_id', 'domain_type', 'event_type', 'timestamp', 'raw_input.type',
+               'raw_input.content', 'source.type', 'source.id', 'source.name', 'metadata.tags']
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerow(["subject-c", "work", "review", "2024-02-01T00:00:00", "text",
+                         "Annual review", "institution", "acme", "ACME", '["review"]'])
+
+    report = IngestionService(memory_repository, workers=1).ingest_file(str(path))
+
+    assert report.records_written == 1
+    event = memory_repository.get_history_by_subject("subject-c").get_events_by_domain(DomainType.WORK)[0]
+    assert event.raw_input.content == "Annual review"
+    assert event.metadata.tags == ["review"]
+
+
+def test_ingest_resumes_from_checkpoint(memory_repository, jsonl_file, tmp_path):
+    """Test that a checkpointed run is not ingested twice."""
+    checkpoint_path = str(tmp_path / "events.checkpoint")
+    service = IngestionService(memory_repository, workers=1, batch_size=2)
+
+    first = service.ingest_file(jsonl_file, checkpoint_path=checkpoint_path)
+    second = service.ingest_file(jsonl_file, checkpoint_path=checkpoint_path)
+
+    assert first.records_written == 4
+    assert second.records_skipped == 6
+    assert second.records_read == 0
+    assert len(memory_repository.get_history_by_subject("subject-a").event_records) == 3
+
+
+def test_ingest_resume_after_crash_before_checkpoint(memory_repository, tmp_path, monkeypatch):
+    """Test that a batch written again after a crash between write and checkpoint is not duplicated."""
+    path = tmp_path / "events.jsonl"
+    lines = [
+        json.dumps({**_event_data("subject-a", 1), 're_id': "exported-1"}),
+        json.dumps(_event_data("subject-a", 2)),
+        json.dumps(_event_data("subject-a", 3))
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    checkpoint_path = str(tmp_path / "events.checkpoint")
+    service = IngestionService(memory_repository, workers=1, batch_size=2)
+
+    def crash(*args):
+        raise RuntimeError("crash")
+    monkeypatch.setattr(service, "_save_checkpoint", crash)
+    with pytest.raises(RuntimeError):
+        service.ingest_file(str(path), checkpoint_path=checkpoint_path)
+    monkeypatch.undo()
+
+    service.ingest_file(str(path), checkpoint_path=checkpoint_path)
+
+    history = memory_repository.get_history_by_subject("subject-a")
+    assert len(history.event_records) == 3
+    assert "exported-1" in history.event_records
+    assert history.verify_event_chain(DomainType.EDUCATION, full=True)
+
+def test_ingest_unknown_format(memory_repository, tmp_path):
+    """Test that files of unknown format are rejected."""
+    path = tmp_path / "events.txt"
+    path.write_text("", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        IngestionService(memory_repository).ingest_file(str(path))
@@ -327,4 +327,204 @@ def test_get_llm_optimized_summary_nonexistent_state_document(state_service, his
     )
     
     # Verify the result is an empty string
-    assert summary == ""
\ No newline at end of file
+    assert summary == ""
+
+def test_session_commits_once(tmp_path, sample_universal_history, monkeypatch):
+    """Test that a session applies several changes with one history read and one write."""
+    from universal_history.storage.repository import FileHistoryRepository
+    
+    repository = FileHistoryRepository(str(tmp_path))
+    repository.save_history(sample_universal_history)
+    subject_id = sample_universal_history.subject_id
+    
+    calls = {'get_history': 0, 'save_history': 0}
+    for name in calls:
+        def counted(*args, _name=name, _method=getattr(repository, name)):
+            calls[_name] += 1
+            return _method(*args)
+        monkeypatch.setattr(repository, name, counted)
+    
+    service = StateService(repository)
+    with service.session(subject_id) as session:
+        for domain in (DomainType.HEALTH, DomainType.EDUCATION, "professional"):
+            session.update_domain_state(domain, current_status=f"{domain} status")
+        session.update_aggregated_insights(potential_risks=["Burnout"])
+        session.set_general_summary("Busy year")
+        summary = session.update_llm_optimized_summary()
+    
+    # Nothing else was saved while the session was open, so the loaded history is written back
+    assert calls == {'get_history': 1, 'save_history': 1}
+    
+    state_document = StateService(FileHistoryRepository(str(tmp_path))).get_state_document(subject_id)
+    assert state_document.de_id == session.de_id
+    assert set(state_document.domains) >= {"health", "education", "professional"}
+    assert state_document.domains["health"].current_status == "DomainType.HEALTH status"
+    assert state_document.aggregated_insights.potential_risks == ["Burnout"]
+    assert state_document.general_summary == "Busy year"
+    assert state_document.llm_optimized_summary == summary
+
+
+def test_session_commit_keeps_events_saved_while_open(tmp_path, sample_universal_history, sample_event_record):
+    """Test that committing a session does not erase events saved after it was opened."""
+    from universal_history.storage.repository import FileHistoryRepository
+    from universal_history.services.event_service import EventService
+    
+    repository = FileHistoryRepository(str(tmp_path))
+    sample_universal_history.add_event_record(sample_event_record)
+    repository.save_history(sample_universal_history)
+    subject_id = sample_universal_history.subject_id
+    
+    with StateService(repository).session(subject_id) as session:
+        session.update_domain_state(DomainType.HEALTH, current_status="Stable")
+        EventService(repository).create_event_record(
+            subject_id=subject_id, domain_type=DomainType.HEALTH, event_type="visit",
+            content="Checkup", content_type=ContentType.TEXT, source_type=SourceType.INSTITUTION,
+            source_id="clinic", source_name="Clinic"
+        )
+    
+    history = FileHistoryRepository(str(tmp_path)).get_history_by_subject(subject_id)
+    assert len(history.event_records) == 2
+    assert history.state_document.domains["health"].current_status == "Stable"
+    assert history.verify_event_chain(DomainType.HEALTH)
+
+def test_session_discards_changes_on_error(state_service, history_service, sample_subject_id):
+    """Test that an exception inside the session leaves the stored State Document unchanged."""
+    history_service.create_history(sample_subject_id)
+    state_service.update_domain_state(sample_subject_id, DomainType.HEALTH, current_status="Stable")
+    
+    with pytest.raises(RuntimeError):
+        with state_service.session(sample_subject_id) as session:
+            session.update_domain_state(DomainType.HEALTH, current_status="Critical")
+            raise RuntimeError("abort")
+    
+    state_document = state_service.get_state_document(sample_subject_id)
+    assert state_document.domains["health"].current_status == "Stable"
+    
+    with pytest.raises(ValueError):
+        state_service.session("nonexistent-subject")
+
+
+def test_track_events_keeps_recent_events(state_service, event_service, history_service, sample_subject_id):
+    """Test that saved events update the bounded recent events of their domain, newest first."""
+    from datetime import timedelta
+    
+    history_service.create_history(sample_subject_id)
+    state_service.create_state_document(sample_subject_id)
+    state_service.track_events(event_service, limit=3)
+    
+    start = datetime(2024, 1, 1)
+    def event(day, domain=DomainType.HEALTH):
+        return {
+            'subject_id': sample_subject_id, 'domain_type': domain, 'event_type': "visit",
+            'content': f"Day {day}", 'content_type': ContentType.TEXT, 'source_type': SourceType.INSTITUTION, 'source_id': "clinic",
+            'source_name': "Clinic", 'timestamp': start + timedelta(days=day)
+        }
+    
+    event_service.create_event_records([event(day) for day in (1, 5, 2)])
+    event_service.create_event_records([event(4), event(0), event(3, DomainType.EDUCATION)])
+    
+    state_document = state_service.get_state_document(sample_subject_id)
+    health = state_document.domains["health"].recent_events
+    assert [ref.timestamp.day for ref in health] == [6, 5, 3]
+    assert health[0].description.startswith("visit - Day 5")
+    assert [ref.timestamp.day for ref in state_document.domains["education"].recent_events] == [4]
+    
+    restored = StateDocument.from_dict(state_document.to_dict())
+    assert restored.domains["health"].recent_events == health
+    
+    # Untracked services no longer update the state
+    state_service.untrack_events(event_service)
+    event_service.create_event_records([event(9)])
+    assert state_service.get_state_document(sample_subject_id).domains["health"].recent_events == health
+
+
+def test_track_events_updates_state_in_the_event_write(tmp_path, sample_universal_history, monkeypatch):
+    """Test that tracked saves on the file backend add no history reads or writes."""
+    from datetime import timedelta
+    from universal_history.services.event_service import EventService
+    from universal_history.storage.repository import FileHistoryRepository
+    
+    repository = FileHistoryRepository(str(tmp_path))
+    repository.save_history(sample_universal_history)
+    subject_id = sample_universal_history.subject_id
+    state_service = StateService(repository)
+    state_service.create_state_document(subject_id)
+    event_service = EventService(repository)
+    state_service.track_events(event_service, limit=2)
+    
+    calls = []
+    for name in ("get_history", "save_history"):
+        method = getattr(repository, name)
+        monkeypatch.setattr(repository, name, lambda *args, _method=method, _name=name: calls.append(_name) or _method(*args))
+    
+    start = datetime(2024, 1, 1)
+    def event(day):
+        return {
+            'subject_id': subject_id, 'domain_type': DomainType.HEALTH, 'event_type': "visit",
+            'content': f"Day {day}", 'content_type': ContentType.TEXT, 'source_type': SourceType.INSTITUTION, 'source_id': "clinic",
+            'source_name': "Clinic", 'timestamp': start + timedelta(days=day)
+        }
+    
+    for days in ([1], [3, 2]):
+        calls.clear()
+        event_service.create_event_records([event(day) for day in days])
+        # The subject lookup and the event write; the State Document is updated in that write
+        assert calls == ["get_history", "get_history", "save_history"]
+    
+    recent_events = StateService(FileHistoryRepository(str(tmp_path))).get_state_document(subject_id).domains["health"].recent_events
+    assert [ref.timestamp.day for ref in recent_events] == [4, 3]
+
+
+def test_llm_summary_regenerated_only_when_state_changes(tmp_path, sample_universal_history, monkeypatch):
+    """Test that the cached summary is reused until the state changes, without writes on cache hits."""
+    from universal_history.storage.repository import FileHistoryRepository
+    
+    repository = FileHistoryRepository(str(tmp_path))
+    repository.save_history(sample_universal_history)
+    subject_id = sample_universal_history.subject_id
+    service = StateService(repository)
+    service.update_domain_state(subject_id, DomainType.HEALTH, current_status="Stable")
+    
+    writes = []
+    save_history = repository.save_history
+    monkeypatch.setattr(repository, "save_history", lambda history: writes.append(1) or save_history(history))
+    
+    summary = service.get_llm_optimized_summary(subject_id)
+    assert "Current status: Stable" in summary
+    assert len(writes) == 1
+    
+    assert service.get_llm_optimized_summary(subject_id) == summary
+    assert service.update_llm_optimized_summary(subject_id) == summary
+    assert len(writes) == 1
+    
+    service.update_aggregated_insights(subject_id, cross_domain_patterns=["Sleep affects grades"])
+    updated = service.get_llm_optimized_summary(subject_id)
+    assert "Sleep affects grades" in updated
+    assert StateService(FileHistoryRepository(str(tmp_path))).get_state_document(subject_id).is_llm_summary_current()
+
+
+def test_llm_summary_refresh_keeps_concurrent_events(tmp_path, sample_universal_history, monkeypatch):
+    """Test that storing a regenerated summary does not erase events saved after the stale read."""
+    from universal_history.storage.repository import FileHistoryRepository
+    from universal_history.services.event_service import EventService
+    
+    repository = FileHistoryRepository(str(tmp_path))
+    repository.save_history(sample_universal_history)
+    subject_id = sample_universal_history.subject_id
+    service = StateService(repository)
+    service.update_domain_state(subject_id, DomainType.HEALTH, current_status="Stable")
+    
+    # The summary read loads the history before another writer saves an event
+    stale = repository.get_history_by_subject(subject_id)
+    EventService(repository).create_event_record(
+        subject_id=subject_id, domain_type=DomainType.HEALTH, event_type="visit",
+        content="Checkup", content_type=ContentType.TEXT, source_type=SourceType.INSTITUTION,
+        source_id="clinic", source_name="Clinic"
+    )
+    monkeypatch.setattr(repository, "get_history_by_subject", lambda _subject_id: stale)
+    
+    assert "Current status: Stable" in service.get_llm_optimized_summary(subject_id)
+    
+    history = FileHistoryRepository(str(tmp_path)).get_history_by_subject(subject_id)
+    assert len(history.event_records) == 1
+    assert history.state_document.is_llm_summary_current()
@@ -227,4 +227,92 @@ def test_get_syntheses_by_domain(synthesis_service, history_service, sample_subj
     
     assert len(health_syntheses) == 1
     assert health_syntheses[0].st_id == health_st_id
-    assert health_syntheses[0].domain_type == DomainType.HEALTH
\ No newline at end of file
+    assert health_syntheses[0].domain_type == DomainType.HEALTH
+
+def test_refresh_window_synthesis(synthesis_service, memory_repository, sample_universal_history,
+                                  sample_raw_input, sample_source):
+    """Test that refreshing a window synthesis matches a synthesis rebuilt from scratch."""
+    from datetime import timedelta
+    from universal_history.models.event_record import ProcessedData
+    
+    history = sample_universal_history
+    memory_repository.save_history(history)
+    start = datetime(2024, 1, 1)
+    
+    def add_events(days):
+        for day in days:
+            memory_repository.save_event_record(EventRecord(
+                subject_id=history.subject_id,
+                domain_type=DomainType.HEALTH,
+                event_type="reading",
+                timestamp=start + timedelta(days=day),
+                raw_input=sample_raw_input,
+                source=sample_source,
+                processed_data=ProcessedData(quantitative_metrics={"weight": 80.0 - day})
+            ), history.hu_id)
+    
+    add_events(range(10))
+    st_id = synthesis_service.refresh_window_synthesis(
+        history.subject_id, DomainType.HEALTH, timedelta(days=5), end_date=start + timedelta(days=9)
+    )
+    assert len(synthesis_service.get_trajectory_synthesis(st_id, history.hu_id).source_events) == 6
+    
+    add_events(range(10, 13))
+    refreshed_id = synthesis_service.refresh_window_synthesis(
+        history.subject_id, DomainType.HEALTH, timedelta(days=5), end_date=start + timedelta(days=12), st_id=st_id
+    )
+    rebuilt_id = synthesis_service.refresh_window_synthesis(
+        history.subject_id, DomainType.HEALTH, timedelta(days=5), end_date=start + timedelta(days=12)
+    )
+    
+    refreshed = synthesis_service.get_trajectory_synthesis(refreshed_id, history.hu_id)
+    rebuilt = synthesis_service.get_trajectory_synthesis(rebuilt_id, history.hu_id)
+    assert refreshed_id == st_id
+    assert refreshed.source_events == rebuilt.source_events
+    assert [e.timestamp.day for e in map(history.event_records.get, refreshed.source_events)] == list(range(8, 14))
+    assert refreshed.metrics["weight"].value == rebuilt.metrics["weight"].value == pytest.approx(70.5)
+    assert refreshed.metrics["weight"].trend == "declining"
+    assert refreshed.domain_specific_data["window_state"]["stats"] == rebuilt.domain_specific_data["window_state"]["stats"]
+
+def test_rollup_syntheses(synthesis_service, memory_repository, sample_universal_history):
+    """Test that rollups cover quarters and years and only changed periods are rebuilt."""
+    history = sample_universal_history
+    memory_repository.save_history(history)
+    
+    def add_month(month, re_ids, significant=None):
+        start = datetime(2024, month, 1)
+        _, st_id = synthesis_service.create_trajectory_synthesis(
+            subject_id=history.subject_id, domain_type=DomainType.HEALTH,
+            summary=f"Month {month}", start_date=start, end_date=start.replace(day=28),
+            source_events=re_ids, significant_events=significant
+        )
+        return st_id
+    
+    checkup = {'re_id': "re-1", 'description': "Checkup", 'significance': "Baseline"}
+    add_month(1, ["re-1", "re-2"], [checkup])
+    add_month(2, ["re-2", "re-3"], [checkup])
+    add_month(4, ["re-4"])
+    
+    built = synthesis_service.rollup_syntheses(history.subject_id, DomainType.HEALTH)
+    rollups = {s.domain_specific_data['rollup']['period']: s
+               for s in synthesis_service.get_syntheses_by_domain(history.subject_id, DomainType.HEALTH)
+               if 'rollup' in s.domain_specific_data}
+    assert set(rollups) == {"2024-Q1", "2024-Q2", "2024"}
+    assert set(built) == {s.st_id for s in rollups.values()}
+    
+    q1 = rollups["2024-Q1"]
+    assert q1.level == 2
+    assert q1.source_events == ["re-1", "re-2", "re-3"]
+    assert [e.re_id for e in q1.significant_events] == ["re-1"]
+    assert rollups["2024"].level == 3
+    assert rollups["2024"].source_events == ["re-1", "re-2", "re-3", "re-4"]
+    
+    # Nothing changed: nothing is rebuilt
+    assert synthesis_service.rollup_syntheses(history.subject_id, DomainType.HEALTH) == []
+    
+    # A new month rebuilds its quarter and the year, keeping their IDs
+    add_month(5, ["re-5"])
+    rebuilt = synthesis_service.rollup_syntheses(history.subject_id, DomainType.HEALTH)
+    assert rebuilt == [rollups["2024-Q2"].st_id, rollups["2024"].st_id]
+    year = synthesis_service.get_trajectory_synthesis(rollups["2024"].st_id, history.hu_id)
+    assert year.source_events[-1] == "re-5"
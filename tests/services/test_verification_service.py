@@ -0,0 +1,147 @@
+"""
+Tests for the verification service.
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from universal_history.models.event_record import EventRecord, DomainType
+from universal_history.models.universal_history import UniversalHistory
+from universal_history.services.verification_service import (
+    verify_all, iter_verify_all, verify_chain_events, _iter_chain_tasks
+)
+from universal_history.storage.repository import FileHistoryRepository
+
+
+def _build_history(subject_id, sample_raw_input, sample_source, domains, count=3):
+    """Create a history with `count` chained events in each domain."""
+    history = UniversalHistory(subject_id=subject_id)
+    base = datetime(2024, 1, 1)
+    for domain in domains:
+        for i in range(count):
+            history.add_event_record(EventRecord(
+                subject_id=subject_id,
+                domain_type=domain,
+                event_type="test_event",
+                raw_input=sample_raw_input,
+                source=sample_source,
+                timestamp=base + timedelta(days=i)
+            ))
+    return history
+
+
+@pytest.fixture
+def audited_repository(memory_repository, sample_raw_input, sample_source):
+    """Create a repository with two subjects, each with two domains."""
+    for subject_id in ("subject-a", "subject-b"):
+        history = _build_history(subject_id, sample_raw_input, sample_source,
+                                 [DomainType.EDUCATION, DomainType.HEALTH])
+        memory_repository.save_history(history)
+    return memory_repository
+
+
+def test_verify_all_valid(audited_repository):
+    """Test verifying an intact repository inline."""
+    streamed = []
+    report = verify_all(audited_repository, workers=1, on_result=streamed.append)
+
+    assert report.valid
+    assert report.chains_verified == 4
+    assert report.events_verified == 12
+    assert len(streamed) == 4
+    assert report.events_per_second > 0
+
+
+def test_verify_all_reports_failures(audited_repository):
+    """Test that a tampered event is reported with its chain."""
+    history = audited_repository.get_history_by_subject("subject-b")
+    tampered = history.get_events_by_domain(DomainType.HEALTH)[1]
+    tampered.event_type = "tampered"
+
+    report = verify_all(audited_repository, workers=1)
+
+    assert not report.valid
+    assert report.chains_verified == 4
+    assert len(report.failures) == 1
+    failure = report.failures[0]
+    assert failure.subject_id == "subject-b"
+    assert failure.domain_type == DomainType.HEALTH.value
+    assert failure.failed_re_id == tampered.re_id
+    assert failure.reason == "hash mismatch"
+
+
+def test_verify_all_process_pool(audited_repository):
+    """Test that verification across a process pool matches the inline run."""
+    results = list(iter_verify_all(audited_repository, workers=2))
+
+    assert len(results) == 4
+    assert all(result.valid for result in results)
+    assert {(r.subject_id, r.domain_type) for r in results} == {
+        (subject_id, domain.value)
+        for subject_id in ("subject-a", "subject-b")
+        for domain in (DomainType.EDUCATION, DomainType.HEALTH)
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_all_file_repository_in_workers(tmp_path, sample_raw_input, sample_source, workers):
+    """Test that workers read the histories themselves and report a tampered event."""
+    repository = FileHistoryRepository(str(tmp_path))
+    for subject_id in ("subject-a", "subject-b"):
+        repository.save_history(_build_history(subject_id, sample_raw_input, sample_source,
+                                               [DomainType.EDUCATION, DomainType.HEALTH]))
+    history = repository.get_history_by_subject("subject-b")
+    tampered = history.get_events_by_domain(DomainType.HEALTH)[1]
+    tampered.event_type = "tampered"
+    repository.save_history(history)
+
+    tasks = list(_iter_chain_tasks(repository))
+    assert sorted(tasks) == sorted((hu_id, None) for hu_id in repository.get_history_ids())
+
+    report = verify_all(repository, workers=workers)
+
+    assert report.chains_verified == 4
+    assert report.events_verified == 12
+    assert [failure.failed_re_id for failure in report.failures] == [tampered.re_id]
+
+
+def test_verify_all_filters(audited_repository):
+    """Test restricting verification to some subjects and domains."""
+    report = verify_all(audited_repository, workers=1, subject_ids=["subject-a"],
+                        domains=[DomainType.EDUCATION])
+
+    assert report.chains_verified == 1
+    assert report.events_verified == 3
+
+
+def test_verify_chain_events_broken_link(sample_raw_input, sample_source):
+    """Test that a broken link is attributed to the event after the break."""
+    history = _build_history("subject-c", sample_raw_input, sample_source, [DomainType.EDUCATION])
+    events = sorted(history.event_records.values(), key=lambda e: e.timestamp)
+    events[2].previous_re_hash = "0" * 64
+    events[2].update_hash()
+
+    valid, failed_re_id, reason = verify_chain_events(events)
+
+    assert not valid
+    assert failed_re_id == events[2].re_id
+    assert reason == "broken link to previous event"
+
+
+@pytest.mark.parametrize("tamper", ["first", "content", "link"])
+def test_verify_chain_events_agrees_with_history(sample_raw_input, sample_source, tamper):
+    """Test that the audit and UniversalHistory.verify_event_chain judge a tampered chain alike."""
+    history = _build_history("subject-d", sample_raw_input, sample_source, [DomainType.EDUCATION])
+    events = sorted(history.event_records.values(), key=lambda e: e.timestamp)
+    if tamper == "first":
+        events[0].previous_re_hash = "0" * 64
+        events[0].update_hash()
+    elif tamper == "content":
+        events[1].event_type = "edited"
+    else:
+        events[2].previous_re_hash = "0" * 64
+        events[2].update_hash()
+
+    valid, _, _ = verify_chain_events(events)
+
+    assert not valid
+    assert valid == history.verify_event_chain(DomainType.EDUCATION, full=True)
@@ -0,0 +1,132 @@
+"""
+Tests for the WriteBehindQueue.
+"""
+import pytest
+import queue
+import threading
+
+from universal_history import UniversalHistoryClient
+from universal_history.models.event_record import DomainType
+from universal_history.services.write_behind_queue import WriteBehindQueue
+
+
+def _event_kwargs(subject_id, event_type="visit", domain_type="health"):
+    """Build the arguments of one event."""
+    return {
+        'subject_id': subject_id,
+        'domain_type': domain_type,
+        'event_type': event_type,
+        'content': "Checkup",
+        'content_type': "text",
+        'source_type': "institution",
+        'source_id': "clinic-1",
+        'source_name': "Clinic"
+    }
+
+
+class BlockingRepository:
+    """Wraps a repository and holds writes until released."""
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.writes = 0
+
+    def _write(self):
+        self.started.set()
+        self.release.wait(5)
+        self.writes += 1
+
+    def save_history(self, history):
+        self._write()
+        return self.repository.save_history(history)
+
+    def save_event_records(self, event_records, hu_id):
+        self._write()
+        return self.repository.save_event_records(event_records, hu_id)
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+
+def test_events_are_written_in_background(event_service, memory_repository):
+    """Test that queued events get their IDs at once and are persisted by flush()."""
+    with WriteBehindQueue(event_service) as write_behind:
+        re_ids = [write_behind.submit(**_event_kwargs("subject-1", f"visit_{i}")) for i in range(5)]
+        assert write_behind.flush(timeout=5)
+
+        metrics = write_behind.metrics()
+
+    history = memory_repository.get_history_by_subject("subject-1")
+    assert set(history.event_records) == set(re_ids)
+    assert history.verify_event_chain(DomainType.HEALTH)
+    assert metrics.accepted == metrics.committed == 5
+    assert metrics.queue_depth == 0
+    assert metrics.commit_latency_max >= metrics.commit_latency_avg > 0
+
+
+def test_writes_are_coalesced_per_history(event_service, memory_repository):
+    """Test that events queued while a subject is being written go out in one write."""
+    blocking = BlockingRepository(memory_repository)
+    event_service.repository = blocking
+    write_behind = WriteBehindQueue(event_service)
+
+    write_behind.submit(**_event_kwargs("subject-1", "first"))
+    assert blocking.started.wait(5)
+    for i in range(10):
+        write_behind.submit(**_event_kwargs("subject-1", f"visit_{i}"))
+    assert write_behind.metrics().queue_depth == 11
+
+    blocking.release.set()
+    assert write_behind.close(timeout=5)
+
+    assert blocking.writes == 2
+    assert len(memory_repository.get_history_by_subject("subject-1").event_records) == 11
+
+
+def test_reject_overflow_policy(event_service, memory_repository):
+    """Test that a full queue rejects events under the reject policy."""
+    blocking = BlockingRepository(memory_repository)
+    event_service.repository = blocking
+    write_behind = WriteBehindQueue(event_service, max_size=2, overflow="reject")
+
+    write_behind.submit(**_event_kwargs("subject-1"))
+    write_behind.submit(**_event_kwargs("subject-1"))
+    with pytest.raises(queue.Full):
+        write_behind.submit(**_event_kwargs("subject-1"))
+
+    blocking.release.set()
+    write_behind.close(timeout=5)
+    assert write_behind.metrics().rejected == 1
+    with pytest.raises(RuntimeError):
+        write_behind.submit(**_event_kwargs("subject-1"))
+
+
+def test_failed_writes_are_reported(event_service):
+    """Test that a failing repository does not stop the workers."""
+    failures = []
+    event_service.repository.save_history = lambda history: (_ for _ in ()).throw(IOError("disk full"))
+
+    with WriteBehindQueue(event_service, on_error=lambda event, error: failures.append(error)) as write_behind:
+        write_behind.submit(**_event_kwargs("subject-1"))
+        write_behind.flush(timeout=5)
+        metrics = write_behind.metrics()
+
+    assert metrics.failed == 1
+    assert "disk full" in metrics.last_error
+    assert failures == [metrics.last_error]
+
+
+def test_client_write_behind():
+    """Test create_event through the client with write-behind enabled."""
+    client = UniversalHistoryClient()
+    client.enable_write_behind(max_size=100)
+
+    hu_id, re_id = client.create_event(**_event_kwargs("subject-1"))
+    client.flush()
+
+    assert hu_id is None
+    history = client.get_history_by_subject("subject-1")
+    assert re_id in history.event_records
+    assert client.close()
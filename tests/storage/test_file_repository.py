@@ -0,0 +1,62 @@
+"""
+Tests for the FileHistoryRepository.
+"""
+import pickle
+
+import pytest
+
+from universal_history.models.event_record import EventRecord, DomainType
+from universal_history.storage.repository import FileHistoryRepository
+
+
+@pytest.fixture
+def file_repository(tmp_path):
+    """Create a file repository in a temporary directory."""
+    return FileHistoryRepository(str(tmp_path))
+
+
+@pytest.fixture
+def stored_history(file_repository, sample_universal_history, sample_raw_input, sample_source):
+    """Store a history with events in two domains."""
+    history = sample_universal_history
+    for index, domain_type in enumerate([DomainType.EDUCATION, DomainType.HEALTH, DomainType.EDUCATION]):
+        history.add_event_record(EventRecord(
+            subject_id=history.subject_id,
+            domain_type=domain_type,
+            event_type=f"event_{index}",
+            raw_input=sample_raw_input,
+            source=sample_source
+        ))
+    file_repository.save_history(history)
+    return history
+
+
+def test_get_history_round_trip(file_repository, stored_history):
+    """Test that a stored history reads back unchanged."""
+    restored = file_repository.get_history(stored_history.hu_id)
+
+    assert restored.to_dict() == stored_history.to_dict()
+    assert restored.get_events_by_domain(DomainType.HEALTH) == stored_history.get_events_by_domain(DomainType.HEALTH)
+
+
+def test_iter_events_by_domain(file_repository, stored_history):
+    """Test streaming the events of one domain from the history file."""
+    events = file_repository.iter_events_by_domain(DomainType.EDUCATION, stored_history.hu_id)
+
+    assert not isinstance(events, list)
+    assert list(events) == stored_history.get_events_by_domain(DomainType.EDUCATION)
+    assert file_repository.get_events_by_domain("health", stored_history.hu_id) == \
+        stored_history.get_events_by_domain(DomainType.HEALTH)
+
+
+def test_iter_events_by_domain_missing_history(file_repository):
+    """Test that streaming from a history that does not exist yields nothing."""
+    assert list(file_repository.iter_events_by_domain(DomainType.EDUCATION, "missing")) == []
+
+
+def test_pickled_repository_reloads_subject_index(file_repository, stored_history):
+    """Test that a copy sent to a worker leaves the subject index behind and reads it on first use."""
+    copy = pickle.loads(pickle.dumps(file_repository))
+
+    assert copy._subject_to_history is None
+    assert copy.get_history_by_subject(stored_history.subject_id).hu_id == stored_history.hu_id
@@ -414,4 +414,29 @@ def test_get_events_by_domain_from_nonexistent_history(memory_repository):
     events = memory_repository.get_events_by_domain(DomainType.EDUCATION, "nonexistent-id")
     
     # Verify the result is an empty list
-    assert events == []
\ No newline at end of file
+    assert events == []
+
+def test_get_chain_head(memory_repository, sample_universal_history, sample_event_record):
+    """Test getting the chain head of a domain from a MemoryHistoryRepository."""
+    # Save the history and an event record
+    hu_id = memory_repository.save_history(sample_universal_history)
+    memory_repository.save_event_record(sample_event_record, hu_id)
+    
+    # Get the chain head
+    head = memory_repository.get_chain_head(DomainType.EDUCATION, hu_id)
+    
+    # Verify the chain head
+    assert head.re_id == sample_event_record.re_id
+    assert head.current_re_hash == sample_event_record.current_re_hash
+    assert memory_repository.get_chain_head(DomainType.EDUCATION, "nonexistent-id") is None
+
+def test_get_history_ids(memory_repository, sample_universal_history):
+    """Test listing the UniversalHistory IDs of a MemoryHistoryRepository."""
+    # Verify an empty repository has no histories
+    assert memory_repository.get_history_ids() == []
+    
+    # Save a history and list the IDs
+    hu_id = memory_repository.save_history(sample_universal_history)
+    
+    # Verify the ID is listed
+    assert memory_repository.get_history_ids() == [hu_id]
@@ -0,0 +1,153 @@
+"""
+Tests for the columnar metric series.
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from universal_history.models.event_record import EventRecord, DomainType, ProcessedData
+from universal_history.services.event_service import EventService
+from universal_history.storage import metric_series
+from universal_history.storage.memory_repository import MemoryHistoryRepository
+from universal_history.storage.metric_series import MetricSeries
+from universal_history.storage.repository import FileHistoryRepository
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    """Run a test with NumPy arrays and with the standard array fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(metric_series, "np", None)
+    return request.param
+
+
+def test_series_aggregate(backend):
+    """Test window aggregates, including points appended out of order."""
+    start = datetime(2024, 1, 1)
+    series = MetricSeries()
+    for day in [0, 1, 2, 4, 3] + list(range(5, 40)):
+        series.append(start + timedelta(days=day), 10.0 + 2.0 * day)
+
+    assert len(series) == 40
+    assert list(series.values[:6]) == [10.0, 12.0, 14.0, 16.0, 18.0, 20.0]
+
+    summary = series.aggregate(start + timedelta(days=2), start + timedelta(days=6), percentiles=(0, 50, 75))
+    assert summary.count == 5
+    assert (summary.minimum, summary.maximum, summary.mean) == (14.0, 22.0, 18.0)
+    assert summary.percentiles == {0: 14.0, 50: 18.0, 75: 20.0}
+    assert summary.slope_per_day == pytest.approx(2.0)
+    assert summary.first_timestamp == start + timedelta(days=2)
+    assert summary.last_timestamp == start + timedelta(days=6)
+
+    assert series.aggregate().count == 40
+    assert series.aggregate(start + timedelta(days=100)).count == 0
+    assert series.aggregate(end=start).slope_per_day is None
+
+
+@pytest.mark.parametrize("maintained", [False, True])
+def test_aggregate_metric(maintained, sample_universal_history, sample_raw_input, sample_source):
+    """Test aggregating a metric through the service, with and without maintained series."""
+    repository = MemoryHistoryRepository(metric_series=maintained)
+    history = sample_universal_history
+    repository.save_history(history)
+
+    start = datetime(2024, 1, 1)
+    for day, (domain_type, score) in enumerate([
+        (DomainType.EDUCATION, 70), (DomainType.HEALTH, 5), (DomainType.EDUCATION, 80), (DomainType.EDUCATION, 90)
+    ]):
+        repository.save_event_record(EventRecord(
+            subject_id=history.subject_id,
+            domain_type=domain_type,
+            event_type="exam",
+            timestamp=start + timedelta(days=day),
+            raw_input=sample_raw_input,
+            source=sample_source,
+            processed_data=ProcessedData(quantitative_metrics={"score": score})
+        ), history.hu_id)
+
+    service = EventService(repository)
+    summary = service.aggregate_metric(history.subject_id, DomainType.EDUCATION, "score",
+                                       end_date=start + timedelta(days=2))
+    assert (summary.count, summary.mean) == (2, 75.0)
+    assert service.aggregate_metric(history.subject_id, "education", "score").maximum == 90.0
+    assert service.aggregate_metric(history.subject_id, "education", "missing").count == 0
+    assert service.aggregate_metric("unknown-subject", "education", "score").count == 0
+
+
+def test_file_metric_series_persisted(tmp_path, monkeypatch, sample_universal_history, sample_raw_input, sample_source):
+    """Test that the file repository keeps the series on disk and reads them without the history."""
+    history = sample_universal_history
+    repository = FileHistoryRepository(str(tmp_path), metric_series=True)
+    repository.save_history(history)
+
+    start = datetime(2024, 1, 1)
+    for day, score in enumerate([70, 80]):
+        repository.save_event_record(EventRecord(
+            subject_id=history.subject_id,
+            domain_type=DomainType.EDUCATION,
+            event_type="exam",
+            timestamp=start + timedelta(days=day),
+            raw_input=sample_raw_input,
+            source=sample_source,
+            processed_data=ProcessedData(quantitative_metrics={"score": score})
+        ), history.hu_id)
+
+    assert (tmp_path / "indexes" / f"metrics_{history.hu_id}.json").exists()
+
+    reopened = FileHistoryRepository(str(tmp_path), metric_series=True)
+    monkeypatch.setattr(reopened, "get_history", lambda hu_id: pytest.fail("history was loaded"))
+    series = reopened.get_metric_series(DomainType.EDUCATION, "score", history.hu_id)
+
+    assert list(series.values) == [70.0, 80.0]
+    assert reopened.get_metric_series(DomainType.HEALTH, "score", history.hu_id) is None
+
+
+@pytest.mark.parametrize("reopen", [False, True])
+def test_file_metric_series_follow_edits_and_removals(tmp_path, reopen, sample_universal_history,
+                                                      sample_raw_input, sample_source):
+    """Test that an edited metric replaces its old point and a removed event drops its points."""
+    history = sample_universal_history
+    start = datetime(2024, 1, 1)
+    events = [
+        EventRecord(
+            subject_id=history.subject_id,
+            domain_type=DomainType.HEALTH,
+            event_type="checkup",
+            timestamp=start + timedelta(days=day),
+            raw_input=sample_raw_input,
+            source=sample_source,
+            processed_data=ProcessedData(quantitative_metrics={"weight": weight})
+        )
+        for day, weight in enumerate([1.0, 2.0])
+    ]
+    for event in events:
+        history.add_event_record(event)
+    repository = FileHistoryRepository(str(tmp_path), metric_series=True)
+    repository.save_history(history)
+
+    events[0].processed_data.quantitative_metrics["weight"] = 99.0
+    events[0].update_hash()
+    repository.save_history(history)
+    if reopen:
+        repository = FileHistoryRepository(str(tmp_path), metric_series=True)
+    assert list(repository.get_metric_series(DomainType.HEALTH, "weight", history.hu_id).values) == [99.0, 2.0]
+
+    del history.event_records[events[1].re_id]
+    repository.save_history(history)
+    if reopen:
+        repository = FileHistoryRepository(str(tmp_path), metric_series=True)
+    assert list(repository.get_metric_series(DomainType.HEALTH, "weight", history.hu_id).values) == [99.0]
+
+
+def test_series_remove(backend):
+    """Test removing points, including one of two points with the same timestamp."""
+    start = datetime(2024, 1, 1)
+    series = MetricSeries()
+    for day, value in [(0, 1.0), (1, 2.0), (1, 3.0), (2, 4.0)]:
+        series.append(start + timedelta(days=day), value)
+
+    assert series.remove((start + timedelta(days=1)).timestamp(), 3.0)
+    assert not series.remove((start + timedelta(days=1)).timestamp(), 5.0)
+    assert series.remove(start.timestamp(), 1.0)
+    assert list(series.values) == [2.0, 4.0]
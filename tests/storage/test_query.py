@@ -0,0 +1,127 @@
+"""
+Tests for repository event queries.
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from universal_history.models.event_record import EventRecord, DomainType, ProcessedData, Metadata
+from universal_history.storage.query import EventFilter, decode_cursor
+from universal_history.storage.repository import FileHistoryRepository
+from universal_history.storage.memory_repository import MemoryHistoryRepository
+
+
+@pytest.fixture(params=["memory", "file"])
+def query_repository(request, tmp_path, sample_universal_history, sample_raw_input, sample_source):
+    """Store a history with six events, one day apart, in each backend."""
+    repository = MemoryHistoryRepository() if request.param == "memory" else FileHistoryRepository(str(tmp_path))
+    history = sample_universal_history
+    start = datetime(2024, 1, 1)
+    for index in range(6):
+        history.add_event_record(EventRecord(
+            subject_id=history.subject_id,
+            domain_type=DomainType.HEALTH if index % 2 else DomainType.EDUCATION,
+            event_type="exam" if index < 3 else "visit",
+            timestamp=start + timedelta(days=index),
+            raw_input=sample_raw_input,
+            source=sample_source,
+            processed_data=ProcessedData(quantitative_metrics={"score": float(index * 10)}),
+            metadata=Metadata(tags=["important"] if index in (1, 4) else [])
+        ))
+    repository.save_history(history)
+    return repository, history
+
+
+def test_query_events_filters(query_repository):
+    """Test that every criterion of a filter is applied."""
+    repository, history = query_repository
+
+    page = repository.query_events(history.hu_id, EventFilter(domain_type=DomainType.HEALTH))
+    assert [e.timestamp.day for e in page.events] == [6, 4, 2]
+    assert page.next_cursor is None
+
+    page = repository.query_events(history.hu_id, EventFilter(
+        event_type="exam",
+        start_date=datetime(2024, 1, 2),
+        end_date=datetime(2024, 1, 3)
+    ), sort="timestamp")
+    assert [e.timestamp.day for e in page.events] == [2, 3]
+
+    page = repository.query_events(history.hu_id, EventFilter(tags=["important", "other"]))
+    assert [e.timestamp.day for e in page.events] == [5, 2]
+
+    page = repository.query_events(history.hu_id, EventFilter(metrics={"score": (15, 40)}, source_type="system"))
+    assert [e.timestamp.day for e in page.events] == [5, 4, 3]
+    assert repository.query_events(history.hu_id, EventFilter(metrics={"missing": (None, 1)})).events == []
+
+
+def test_query_events_pages(query_repository):
+    """Test that cursors walk through all results without repeating any."""
+    repository, history = query_repository
+
+    seen = []
+    cursor = None
+    while True:
+        page = repository.query_events(history.hu_id, sort="timestamp", limit=4, cursor=cursor)
+        seen.extend(e.timestamp.day for e in page.events)
+        if page.next_cursor is None:
+            break
+        assert decode_cursor(page.next_cursor)[1] == page.events[-1].re_id
+        cursor = page.next_cursor
+
+    assert seen == [1, 2, 3, 4, 5, 6]
+    assert repository.query_events("missing").events == []
+
+
+def test_query_events_invalid_arguments(query_repository):
+    """Test that unknown sort orders and malformed cursors are rejected."""
+    repository, history = query_repository
+
+    with pytest.raises(ValueError):
+        repository.query_events(history.hu_id, sort="event_type")
+    with pytest.raises(ValueError):
+        repository.query_events(history.hu_id, cursor="not-a-cursor")
+
+
+def test_filter_matches_serialized_records(sample_event_record):
+    """Test that a filter gives the same answer for an event and its dictionary."""
+    er_dict = sample_event_record.to_dict()
+    filters = [
+        EventFilter(),
+        EventFilter(domain_type=[DomainType.HEALTH, sample_event_record.domain_type]),
+        EventFilter(event_type="other"),
+        EventFilter(end_date=sample_event_record.timestamp - timedelta(seconds=1)),
+        EventFilter(source_id=sample_event_record.source.id),
+    ]
+
+    for event_filter in filters:
+        assert event_filter.matches_dict(er_dict) == event_filter.matches(sample_event_record)
+
+
+def test_file_query_decodes_only_the_page(tmp_path, sample_universal_history, sample_raw_input, sample_source, monkeypatch):
+    """Test that the file backend decodes only the events of the returned page."""
+    repository = FileHistoryRepository(str(tmp_path))
+    for day in range(1, 11):
+        sample_universal_history.add_event_record(EventRecord(
+            subject_id=sample_universal_history.subject_id, domain_type=DomainType.HEALTH,
+            event_type="visit", timestamp=datetime(2024, 1, day), raw_input=sample_raw_input, source=sample_source
+        ))
+    repository.save_history(sample_universal_history)
+
+    decoded = []
+    from_dict = EventRecord.from_dict
+    monkeypatch.setattr(EventRecord, "from_dict", classmethod(lambda cls, data: decoded.append(1) or from_dict(data)))
+
+    page = repository.query_events(sample_universal_history.hu_id, EventFilter(domain_type="health"), limit=3)
+
+    assert [e.timestamp.day for e in page.events] == [10, 9, 8]
+    assert page.next_cursor is not None
+    assert len(decoded) == 3
+
+
+def test_filter_metric_range_ignores_non_numeric_values(sample_event_record):
+    """Test that a stored metric that is not a number never falls in a range."""
+    sample_event_record.processed_data.quantitative_metrics = {"score": "high"}
+    event_filter = EventFilter(metrics={"score": (1, None)})
+
+    assert not event_filter.matches_dict(sample_event_record.to_dict())
+    assert not event_filter.matches(sample_event_record)
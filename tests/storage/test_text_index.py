@@ -0,0 +1,114 @@
+"""
+Tests for the full-text index of Event Records.
+"""
+import pytest
+
+from universal_history.models.event_record import EventRecord, DomainType, RawInput, ContentType, ProcessedData
+from universal_history.services.event_service import EventService
+from universal_history.storage.memory_repository import MemoryHistoryRepository
+from universal_history.storage.repository import FileHistoryRepository
+from universal_history.storage.text_index import TextIndex, tokenize
+
+
+def _event(history, source, content, insights=None):
+    return EventRecord(
+        subject_id=history.subject_id,
+        domain_type=DomainType.HEALTH,
+        event_type="note",
+        raw_input=RawInput(type=ContentType.TEXT, content=content),
+        source=source,
+        processed_data=ProcessedData(derived_insights=insights or [])
+    )
+
+
+def test_text_index_ranking_and_removal():
+    """Test BM25 ranking, replacement and removal of documents."""
+    index = TextIndex()
+    index.add("a", "Asthma attack, asthma inhaler")
+    index.add("b", "Calculus exam passed")
+    index.add("c", "Mild asthma symptoms")
+
+    assert tokenize("Asthma, CALCULUS_exam") == ["asthma", "calculus", "exam"]
+    assert [doc_id for doc_id, _ in index.search("asthma")] == ["a", "c"]
+    assert {doc_id for doc_id, _ in index.search("asthma calculus", limit=5)} == {"a", "b", "c"}
+    assert index.search("asthma", limit=1)[0][0] == "a"
+
+    index.add("a", "Routine checkup")
+    index.remove("b")
+    assert [doc_id for doc_id, _ in index.search("asthma calculus")] == ["c"]
+
+    restored = TextIndex.from_dict(index.to_dict())
+    assert restored.search("asthma routine") == index.search("asthma routine")
+    restored.remove("c")
+    assert restored.search("asthma") == []
+
+
+@pytest.mark.parametrize("text_index", [False, True])
+def test_search_text_memory(text_index, sample_universal_history, sample_source):
+    """Test that events are found by content and insights, with or without an index."""
+    repository = MemoryHistoryRepository(text_index=text_index)
+    history = sample_universal_history
+    repository.save_history(history)
+
+    asthma = _event(history, sample_source, "Asthma follow-up visit")
+    calculus = _event(history, sample_source, "Homework", insights=["Struggles with calculus"])
+    repository.save_event_record(asthma, history.hu_id)
+    repository.save_event_record(calculus, history.hu_id)
+    repository.save_event_record(_event(history, sample_source, "Dentist appointment"), history.hu_id)
+
+    service = EventService(repository)
+    assert service.search_text(history.subject_id, "asthma") == [asthma]
+    assert {e.re_id for e in service.search_text(history.subject_id, "asthma or calculus")} == \
+        {asthma.re_id, calculus.re_id}
+    assert service.search_text(history.subject_id, "fracture") == []
+    assert service.search_text("unknown-subject", "asthma") == []
+
+
+def test_search_text_file_index_persisted(tmp_path, sample_universal_history, sample_source):
+    """Test that the file repository keeps its index on disk and updates it on save."""
+    history = sample_universal_history
+    repository = FileHistoryRepository(str(tmp_path), text_index=True)
+    repository.save_history(history)
+    repository.save_event_record(_event(history, sample_source, "Asthma follow-up visit"), history.hu_id)
+
+    assert (tmp_path / "indexes" / f"text_{history.hu_id}.json").exists()
+
+    reopened = FileHistoryRepository(str(tmp_path), text_index=True)
+    calculus = _event(history, sample_source, "Calculus exam")
+    reopened.save_event_record(calculus, history.hu_id)
+
+    assert len(reopened.search_text(history.hu_id, "calculus asthma")) == 2
+    assert [event for event, _ in reopened.search_text(history.hu_id, "calculus")] == [calculus]
+
+
+def test_search_text_file_indexes_existing_history(tmp_path, sample_universal_history, sample_source):
+    """Test that a history saved without the index is indexed on its first search."""
+    history = sample_universal_history
+    history.add_event_record(_event(history, sample_source, "Asthma follow-up visit"))
+    FileHistoryRepository(str(tmp_path)).save_history(history)
+
+    repository = FileHistoryRepository(str(tmp_path), text_index=True)
+    results = repository.search_text(history.hu_id, "asthma")
+
+    assert [event.raw_input.content for event, _ in results] == ["Asthma follow-up visit"]
+    assert (tmp_path / "indexes" / f"text_{history.hu_id}.json").exists()
+    assert repository.search_text("missing", "asthma") == []
+
+
+def test_search_text_file_reindexes_edited_events(tmp_path, sample_universal_history, sample_source):
+    """Test that an event whose content was edited and rehashed is indexed again."""
+    history = sample_universal_history
+    repository = FileHistoryRepository(str(tmp_path), text_index=True)
+    event = _event(history, sample_source, "Asthma follow-up visit")
+    history.add_event_record(event)
+    repository.save_history(history)
+
+    edited = repository.get_history(history.hu_id)
+    edited.event_records[event.re_id].raw_input.content = "Fracture follow-up visit"
+    edited.event_records[event.re_id].update_hash()
+    repository.save_history(edited)
+
+    reopened = FileHistoryRepository(str(tmp_path), text_index=True)
+    assert reopened.search_text(history.hu_id, "asthma") == []
+    assert [e.re_id for e, _ in reopened.search_text(history.hu_id, "fracture")] == [event.re_id]
+    assert not (tmp_path / "indexes" / f"text_{history.hu_id}.json.tmp").exists()
@@ -0,0 +1,48 @@
+"""
+Tests for the aggregates module.
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from universal_history.utils.aggregates import RunningStats, SlidingWindow
+
+
+def test_running_stats_merge_and_remove():
+    """Test that merged and reduced statistics match statistics computed directly."""
+    left = RunningStats.from_values([1.0, 5.0, 3.0])
+    right = RunningStats.from_values([4.0, -2.0])
+    merged = left.merge(right)
+    
+    expected = RunningStats.from_values([1.0, 5.0, 3.0, 4.0, -2.0])
+    assert merged == expected
+    assert merged.mean == pytest.approx(2.2)
+    assert merged.std == pytest.approx(expected.std)
+    
+    assert merged.remove(3.0) is True
+    assert merged.remove(5.0) is False  # The maximum must be recomputed
+    assert (merged.count, merged.total) == (3, 3.0)
+    assert RunningStats().merge(RunningStats()).mean is None
+
+
+def test_sliding_window_expire():
+    """Test retiring entries, recomputing extremes and round-tripping the state."""
+    start = datetime(2024, 1, 1)
+    window = SlidingWindow(start)
+    for day, value in enumerate([9.0, 2.0, 5.0, 7.0]):
+        window.add(start + timedelta(days=day), f"e{day}", {"score": value})
+    window.add(start + timedelta(days=1, hours=12), "late", {"other": 1.0})
+    
+    assert window.keys() == ["e0", "e1", "late", "e2", "e3"]
+    assert window.stats["score"].maximum == 9.0
+    
+    retired = window.expire(start + timedelta(days=2))
+    
+    assert retired == ["e0", "e1", "late"]
+    assert window.stats["score"] == RunningStats.from_values([5.0, 7.0])
+    assert "other" not in window.stats
+    assert window.first_timestamp == start + timedelta(days=2)
+    
+    restored = SlidingWindow.from_dict(window.to_dict())
+    assert restored.keys() == window.keys()
+    assert restored.stats == window.stats
+    assert (restored.start, restored.watermark) == (window.start, window.watermark)
@@ -5,7 +5,8 @@ import pytest
 from datetime import datetime
 
 from universal_history.utils.hash_utils import (
-    calculate_hash, verify_hash, verify_hash_chain, create_hash_chain
+    calculate_hash, verify_hash, verify_hash_chain, create_hash_chain,
+    calculate_hashes, verify_hashes, iter_hash_chain, PARALLEL_HASH_THRESHOLD
 )
 
 
@@ -195,4 +196,73 @@ def test_create_hash_chain_empty():
     create_hash_chain(items, hash_generator, previous_hash_setter)
     
     # Verify the empty list is unchanged
-    assert items == []
\ No newline at end of file
+    assert items == []
+
+def test_calculate_hashes_matches_calculate_hash(sample_event_record):
+    """Test that batch hashing matches hashing one item at a time."""
+    # Create a batch of dictionaries and an EventRecord
+    items = [{"id": f"item-{i}", "value": i, "timestamp": datetime(2023, 1, 1)} for i in range(5)]
+    sample_event_record.update_hash()
+    
+    # Calculate the hashes in one batch
+    hashes = calculate_hashes(items + [sample_event_record])
+    
+    # Verify the results
+    assert hashes[:5] == [calculate_hash(item) for item in items]
+    assert hashes[5] == sample_event_record.current_re_hash
+
+
+def test_calculate_hashes_process_pool():
+    """Test that a large batch fanned out to a process pool keeps its order."""
+    items = [{"id": f"item-{i}"} for i in range(PARALLEL_HASH_THRESHOLD)]
+    
+    assert calculate_hashes(items, workers=2, chunk_size=256) == [calculate_hash(item) for item in items]
+
+
+def test_verify_hashes():
+    """Test verifying a batch of items against expected hashes."""
+    items = [{"id": "item-1"}, {"id": "item-2"}]
+    expected = [calculate_hash(items[0]), "wrong-hash"]
+    
+    assert verify_hashes(items, expected) == [True, False]
+    
+    with pytest.raises(ValueError):
+        verify_hashes(items, expected[:1])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_hashes_with_algorithm(workers):
+    """Test that batch hashing and verification follow the requested algorithm."""
+    items = [{"id": f"item-{i}"} for i in range(PARALLEL_HASH_THRESHOLD)]
+    expected = [calculate_hash(item, algorithm="blake2b") for item in items]
+    
+    assert calculate_hashes(items, workers=workers, chunk_size=512, algorithm="blake2b") == expected
+    assert all(verify_hashes(items, expected, workers=workers, algorithm="blake2b"))
+    assert not any(verify_hashes(items[:2], expected[:2]))
+
+
+def test_create_hash_chain_streams_iterator():
+    """Test chaining items from a generator and extending an existing chain."""
+    seen = []
+    def items():
+        for i in range(3):
+            item = {"id": f"item-{i}", "previous_hash": None}
+            seen.append(item)
+            yield item
+    
+    def hash_generator(item):
+        return f"hash-{item['id']}"
+    
+    def previous_hash_setter(item, prev_hash):
+        item["previous_hash"] = prev_hash
+    
+    # Chain lazily; each item is linked before the next one is produced
+    chained = iter_hash_chain(items(), hash_generator, previous_hash_setter, previous_hash="hash-root")
+    first_item, first_hash = next(chained)
+    assert len(seen) == 1
+    assert first_item["previous_hash"] == "hash-root"
+    assert first_hash == "hash-item-0"
+    
+    # Verify the last hash is returned by create_hash_chain
+    assert create_hash_chain(items(), hash_generator, previous_hash_setter) == "hash-item-2"
+    assert create_hash_chain([], hash_generator, previous_hash_setter, previous_hash="hash-root") == "hash-root"
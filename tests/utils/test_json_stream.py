@@ -0,0 +1,72 @@
+"""
+Tests for the json_stream module.
+"""
+import pytest
+import io
+import json
+
+from universal_history.utils.json_stream import iter_object_items
+
+
+DOCUMENT = {
+    "before": {"text": "braces } ] { [ and \"quotes\" \\", "values": [1, -2.5e3, None, True, False]},
+    "records": {
+        "a": {"name": "ünïcode", "items": [{"x": 1}, []]},
+        "b": 42,
+        "c": "plain"
+    },
+    "after": [{"records": "not this one"}]
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_object_items(chunk_size, indent):
+    """Test reading one object of a document with chunks of any size."""
+    text = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False)
+
+    items = list(iter_object_items(io.StringIO(text), ["records"], chunk_size=chunk_size))
+
+    assert items == list(DOCUMENT["records"].items())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_iter_object_items_keys(chunk_size, monkeypatch):
+    """Test that only the entries with the requested keys are decoded."""
+    from universal_history.utils import json_stream
+
+    decoded = []
+    decode = json_stream._DECODER.raw_decode
+    monkeypatch.setattr(json_stream, "_DECODER", type("Decoder", (), {
+        "raw_decode": staticmethod(lambda text, pos: decoded.append(text[pos]) or decode(text, pos))
+    }))
+    text = json.dumps(DOCUMENT)
+
+    items = list(iter_object_items(io.StringIO(text), ["records"], chunk_size=chunk_size, keys={"a", "c"}))
+
+    assert items == [("a", DOCUMENT["records"]["a"]), ("c", "plain")]
+    assert "4" not in decoded  # The value of "b" was skipped
+
+
+def test_iter_object_items_paths():
+    """Test the top-level object, nested paths and paths that do not lead to an object."""
+    text = json.dumps(DOCUMENT)
+
+    assert list(iter_object_items(io.StringIO(text))) == list(DOCUMENT.items())
+    assert list(iter_object_items(io.StringIO(text), ["records", "a"])) == list(DOCUMENT["records"]["a"].items())
+    assert list(iter_object_items(io.StringIO(text), ["after"])) == []
+    assert list(iter_object_items(io.StringIO(text), ["missing"])) == []
+    assert list(iter_object_items(io.StringIO('{"records": {}}'), ["records"])) == []
+
+
+def test_iter_object_items_stops_after_object():
+    """Test that the rest of the document is not read once the object is done."""
+    stream = io.StringIO('{"records": {"a": 1}, "broken": ')
+
+    assert list(iter_object_items(stream, ["records"])) == [("a", 1)]
+
+
+def test_iter_object_items_truncated():
+    """Test that a truncated document raises ValueError."""
+    with pytest.raises(ValueError):
+        list(iter_object_items(io.StringIO('{"records": {"a": [1, 2'), ["records"]))
@@ -0,0 +1,91 @@
+"""
+Tests for the json_utils module.
+"""
+import pytest
+import io
+import json
+from datetime import datetime
+
+from universal_history.utils import json_utils
+from universal_history.models.event_record import EventRecord, DomainType
+
+BACKENDS = ["json"]
+try:
+    import orjson  # noqa: F401
+    BACKENDS.append("orjson")
+except ImportError:
+    pass
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    """Run a test with each available JSON backend."""
+    previous = json_utils.get_json_backend()
+    json_utils.set_json_backend(request.param)
+    yield request.param
+    json_utils.set_json_backend(previous)
+
+
+def test_dumps_matches_stdlib_values(backend):
+    """Test that every backend encodes the same values as json.dumps(default=str)."""
+    value = {
+        "when": datetime(2024, 1, 2, 3, 4, 5, 678),
+        "items": [1, 2.5, None, True, "ünïcode"],
+        1: "integer key"
+    }
+
+    encoded = json_utils.dumps(value)
+
+    assert json.loads(encoded) == json.loads(json.dumps(value, default=str))
+    assert json_utils.loads(encoded)["when"] == "2024-01-02 03:04:05.000678"
+
+
+def test_dump_and_load_files(backend):
+    """Test writing and reading binary file objects."""
+    buffer = io.BytesIO()
+    json_utils.dump({"a": [1, 2]}, buffer)
+    buffer.seek(0)
+
+    assert json_utils.load(buffer) == {"a": [1, 2]}
+
+
+def test_loads_accepts_stdlib_extensions(backend):
+    """Test that documents written by json with NaN still load."""
+    document = json.dumps({"score": float("nan")})
+
+    assert json_utils.loads(document)["score"] != json_utils.loads(document)["score"]
+
+
+def test_event_hash_survives_round_trip(backend, sample_event_record):
+    """Test that free-form values keep the canonical hash valid after a JSON round trip."""
+    sample_event_record.domain_type = DomainType.HEALTH
+    sample_event_record.processed_data.derived_insights = [datetime(2024, 5, 6, 7, 8, 9)]
+    sample_event_record.update_hash()
+
+    restored = EventRecord.from_json(sample_event_record.to_json())
+
+    assert restored.calculate_hash() == sample_event_record.current_re_hash
+
+
+def test_set_json_backend_unknown():
+    """Test that unknown backends are rejected."""
+    with pytest.raises(ValueError):
+        json_utils.set_json_backend("yaml")
+
+
+def test_non_finite_metrics_round_trip_through_storage(backend, tmp_path, sample_universal_history, sample_event_record):
+    """Test that NaN and infinities are stored as written, so the event chain still verifies."""
+    from universal_history.storage.repository import FileHistoryRepository
+
+    sample_event_record.processed_data.quantitative_metrics = {"m": float("nan"), "top": float("inf")}
+    sample_universal_history.add_event_record(sample_event_record)
+    repository = FileHistoryRepository(str(tmp_path))
+    repository.save_history(sample_universal_history)
+
+    assert b"NaN" in json_utils.dumps_bytes({"m": float("nan")})
+
+    history = repository.get_history(sample_universal_history.hu_id)
+    metrics = history.get_event_record(sample_event_record.re_id).processed_data.quantitative_metrics
+    assert metrics["m"] != metrics["m"]
+    assert metrics["top"] == float("inf")
+    assert history.verify_event_chain(DomainType.EDUCATION, full=True)
@@ -0,0 +1,65 @@
+"""
+Tests for the merkle_utils module.
+"""
+import pytest
+
+from universal_history.utils.merkle_utils import (
+    MerkleTree, InclusionProof, hash_leaf, hash_node, verify_inclusion_proof
+)
+
+
+def test_merkle_root_small_trees():
+    """Test the root of small trees, including a promoted odd node."""
+    a, b, c = hash_leaf("a"), hash_leaf("b"), hash_leaf("c")
+    
+    assert MerkleTree().root is None
+    assert MerkleTree(["a"]).root == a
+    assert MerkleTree(["a", "b"]).root == hash_node(a, b)
+    assert MerkleTree(["a", "b", "c"]).root == hash_node(hash_node(a, b), c)
+
+
+def test_merkle_incremental_append_matches_rebuild():
+    """Test that appending leaves one by one gives the same root as a rebuild."""
+    values = [f"value-{i}" for i in range(37)]
+    tree = MerkleTree()
+    
+    for i, value in enumerate(values):
+        assert tree.append(value) == i
+        assert tree.root == MerkleTree(values[:i + 1]).root
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 13])
+def test_inclusion_proofs(size):
+    """Test that every leaf has a valid logarithmic inclusion proof."""
+    tree = MerkleTree([f"value-{i}" for i in range(size)])
+    
+    for index in range(size):
+        proof = tree.get_proof(index)
+        assert proof.value == f"value-{index}"
+        assert len(proof.path) <= max(1, size).bit_length()
+        assert verify_inclusion_proof(proof, tree.root)
+        assert verify_inclusion_proof(InclusionProof.from_dict(proof.to_dict()), tree.root)
+
+
+def test_inclusion_proof_after_append():
+    """Test that proofs stay valid when the tree grows after they were first built."""
+    tree = MerkleTree(["a", "b", "c"])
+    tree.get_proof(0)
+    tree.append("d")
+    tree.append("e")
+    
+    for index in range(5):
+        assert verify_inclusion_proof(tree.get_proof(index), tree.root)
+
+
+def test_inclusion_proof_rejects_tampering():
+    """Test that a proof fails for another value or another root."""
+    tree = MerkleTree(["a", "b", "c", "d"])
+    proof = tree.get_proof(2)
+    
+    forged = InclusionProof.from_dict(dict(proof.to_dict(), value="x"))
+    assert not verify_inclusion_proof(forged, tree.root)
+    assert not verify_inclusion_proof(proof, MerkleTree(["a", "b", "x", "d"]).root)
+    
+    with pytest.raises(ValueError):
+        tree.get_proof(4)
@@ -399,4 +399,43 @@ def test_get_time_periods_between_invalid_period():
         get_time_periods_between(start_date, end_date, "invalid")
     
     # Verify the error message
-    assert "Invalid period" in str(excinfo.value)
\ No newline at end of file
+    assert "Invalid period" in str(excinfo.value)
+
+def test_count_by_period():
+    """Test vectorized counting, including ISO weeks across a year boundary."""
+    pytest.importorskip("numpy")
+    from universal_history.utils.time_utils import count_by_period
+    
+    timestamps = ["2020-12-31T10:00:00", "2021-01-03T23:00:00", "2021-01-04T01:00:00", "2021-02-01T00:00:00"]
+    
+    assert count_by_period(timestamps, "week") == {"2020-W53": 2, "2021-W01": 1, "2021-W05": 1}
+    assert count_by_period(timestamps, "month") == {"2020-12": 1, "2021-01": 2, "2021-02": 1}
+    assert count_by_period(timestamps, "year") == {"2020": 1, "2021": 3}
+    
+    with pytest.raises(ValueError):
+        count_by_period(["2021-01-01T00:00:00+02:00"], "day")
+
+
+@pytest.mark.parametrize("period", ["day", "week", "month", "year"])
+def test_vectorized_functions_match_loops(period, monkeypatch):
+    """Test that large inputs dispatched to NumPy give the same results as the loops."""
+    pytest.importorskip("numpy")
+    from universal_history.utils import time_utils
+    
+    start = datetime(2019, 12, 28, 15, 30)
+    items = [{"date": (start + timedelta(hours=7 * i)).isoformat(), "id": i} for i in range(400)]
+    items[5]["date"] = "invalid-date"
+    items[9]["date"] = start + timedelta(days=3)
+    del items[11]["date"]
+    periods_args = (datetime(2000, 3, 15, 10), datetime(2001, 2, 3, 9), period)
+    
+    monkeypatch.setattr(time_utils, "VECTORIZE_THRESHOLD", 10 ** 9)
+    expected_groups = group_by_period(items, "date", period)
+    expected_periods = get_time_periods_between(*periods_args)
+    
+    monkeypatch.setattr(time_utils, "VECTORIZE_THRESHOLD", 0)
+    groups = group_by_period(items, "date", period)
+    
+    assert list(groups) == list(expected_groups)
+    assert groups == expected_groups
+    assert get_time_periods_between(*periods_args) == expected_periods